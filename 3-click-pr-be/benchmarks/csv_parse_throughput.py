@@ -0,0 +1,133 @@
+"""
+CSV Parse Throughput Benchmark
+
+Generates a timesheet CSV and times three ways of parsing and validating
+it (no database access):
+
+- legacy: csv.DictReader with per-row strptime/float/TimeEntryType, as the
+  upload endpoint did before rows were parsed by the compiled parser
+- compiled: the compiled row parser in-process
+- parallel: the compiled row parser in the process pool
+
+For the parallel run, the CPU time of the main process is the part that
+does not spread across workers (splitting, transfer, unpacking), so it
+bounds the wall time reachable with enough cores.
+
+Usage:
+    python benchmarks/csv_parse_throughput.py [rows] [workers]
+"""
+
+import asyncio
+import csv
+import io
+import os
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.core.config import settings  # noqa: E402
+from src.schemas.timesheet import TimeEntryType  # noqa: E402
+from src.services import timesheet_row_parser  # noqa: E402
+
+
+HEADER = (
+    "employee_id,employee_number,employee_name,work_date,entry_type,hours_worked,"
+    "regular_hours,overtime_hours,shift_start,shift_end,break_minutes,department,"
+    "job_title,hourly_rate,notes"
+)
+
+
+def make_csv(rows: int) -> str:
+    """Build a timesheet CSV with the given number of data rows"""
+    start = date(2025, 1, 6)
+    lines = [HEADER]
+    for index in range(rows):
+        employee = index % 500
+        work_date = start + timedelta(days=index // 500)
+        lines.append(
+            f"65a1b2c3d4e5f6a7b8c9{employee:04x},EMP{employee:04d},Employee {employee},"
+            f"{work_date.isoformat()},regular,8.5,8,0.5,09:00,18:00,30,Operations,"
+            f"Operator,25.50,Imported"
+        )
+    return "\n".join(lines) + "\n"
+
+
+def parse_legacy(text: str) -> int:
+    """Per-row parsing as done by the original upload loop"""
+    parsed = 0
+    for row in csv.DictReader(io.StringIO(text)):
+        employee_id = row.get("employee_id", "").strip()
+        work_date_str = row.get("work_date", "").strip()
+        if not employee_id or not work_date_str:
+            continue
+        try:
+            datetime.strptime(work_date_str, "%Y-%m-%d").date()
+        except ValueError:
+            continue
+        try:
+            TimeEntryType(row.get("entry_type", "regular").strip().lower())
+        except ValueError:
+            pass
+        try:
+            float(row.get("hours_worked", 0) or 0)
+            float(row.get("regular_hours", 0) or 0)
+            float(row.get("overtime_hours", 0) or 0)
+        except ValueError:
+            continue
+        shift_start = row.get("shift_start", "").strip()
+        shift_end = row.get("shift_end", "").strip()
+        if shift_start and shift_end:
+            try:
+                datetime.strptime(shift_start, "%H:%M")
+                datetime.strptime(shift_end, "%H:%M")
+                int(row.get("break_minutes", 0) or 0)
+            except Exception:
+                pass
+        rate = row.get("hourly_rate", "").strip()
+        if rate:
+            float(rate)
+        parsed += 1
+    return parsed
+
+
+async def parse_compiled(text: str, parallel: bool) -> int:
+    """Parse with the compiled row parser"""
+    parsed = 0
+    async for batch in timesheet_row_parser.iter_csv_batches(io.BytesIO(text.encode()), parallel=parallel):
+        parsed += len(batch.rows)
+    return parsed
+
+
+def timed(label: str, function, rows: int) -> None:
+    """Run function and print wall time and this process's CPU time"""
+    started = time.perf_counter()
+    cpu_started = time.process_time()
+    parsed = function()
+    elapsed = time.perf_counter() - started
+    cpu = time.process_time() - cpu_started
+    print(f"{label:<10} {elapsed:6.2f}s  {rows / elapsed:>10,.0f} rows/s  "
+          f"main process cpu {cpu:6.2f}s  ({parsed} valid)")
+
+
+def main() -> None:
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    if len(sys.argv) > 2:
+        settings.TIMESHEET_PARSE_WORKERS = int(sys.argv[2])
+
+    text = make_csv(rows)
+    print(f"rows={rows} size={len(text) / 1024 / 1024:.1f} MiB "
+          f"cpus={os.cpu_count()} workers={timesheet_row_parser.get_parse_worker_count()}")
+
+    timed("legacy", lambda: parse_legacy(text), rows)
+    timed("compiled", lambda: asyncio.run(parse_compiled(text, parallel=False)), rows)
+
+    # Start the workers outside the timed run
+    asyncio.run(parse_compiled(make_csv(10), parallel=True))
+    timed("parallel", lambda: asyncio.run(parse_compiled(text, parallel=True)), rows)
+    timesheet_row_parser.shutdown_parse_executor()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Department Head Count Benchmark
+
+Seeds a scratch database with generated employees (see
+employee_search_latency.py) spread over generated departments, and
+compares the number of database commands and the latency of counting
+employees for every department:
+
+- legacy: one count() per department, as GET /departments did before
+- grouped: one $group aggregation over the department_id index
+
+Usage:
+    python benchmarks/department_head_counts.py [employees] [departments] [runs]
+"""
+
+import asyncio
+import os
+import sys
+
+from beanie import init_beanie
+from motor.motor_asyncio import AsyncIOMotorClient
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from employee_list_queries import CommandCounter, measure  # noqa: E402
+from employee_search_latency import seed  # noqa: E402
+from src.core.config import settings  # noqa: E402
+from src.schemas.employee import Employee  # noqa: E402
+from src.services.employee_head_count_service import EmployeeHeadCountService  # noqa: E402
+
+
+async def assign_departments(department_ids: list) -> None:
+    """Spread the seeded employees over the departments by employee number"""
+    await Employee.get_motor_collection().update_many({}, [{
+        "$set": {"department_id": {"$arrayElemAt": [
+            department_ids,
+            {"$mod": [{"$toInt": {"$substrCP": ["$employee_number", 4, 6]}}, len(department_ids)]}
+        ]}}
+    }])
+
+
+async def legacy_counts(department_ids: list) -> None:
+    """Count each department separately"""
+    for department_id in department_ids:
+        await Employee.find({"department_id": department_id}).count()
+
+
+async def main() -> None:
+    employees = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    departments = int(sys.argv[2]) if len(sys.argv) > 2 else 300
+    runs = int(sys.argv[3]) if len(sys.argv) > 3 else 20
+
+    counter = CommandCounter()
+    client = AsyncIOMotorClient(settings.MONGODB_URL, event_listeners=[counter])
+    await init_beanie(database=client[f"{settings.MONGODB_DB_NAME}_benchmark"], document_models=[Employee])
+    await seed(employees)
+
+    department_ids = [f"{index:024x}" for index in range(departments)]
+    await assign_departments(department_ids)
+    service = EmployeeHeadCountService()
+
+    print(f"employees={employees} departments={departments} runs={runs}")
+    await measure("legacy", counter, [lambda: legacy_counts(department_ids)] * runs)
+    await measure("grouped", counter, [lambda: service.count_by_department(department_ids)] * runs)
+    client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
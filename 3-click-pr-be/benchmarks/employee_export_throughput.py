@@ -0,0 +1,72 @@
+"""
+Employee Export Throughput Benchmark
+
+Feeds generated employee documents (no database access) through the CSV
+and XLSX export writers and reports the time, output size and peak
+resident memory of each. Peak memory should stay close to flat as the
+number of employees grows.
+
+Usage:
+    python benchmarks/employee_export_throughput.py [employees]
+"""
+
+import asyncio
+import os
+import resource
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.services.employee_export_service import EmployeeExportService  # noqa: E402
+
+
+def peak_rss_mib() -> float:
+    """Peak resident memory of this process so far"""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+async def documents(count: int):
+    """Generate raw employee documents shaped like the export projection"""
+    for index in range(count):
+        yield {
+            "employee_number": f"EMP-{index:06d}",
+            "first_name": "Jane",
+            "last_name": f"Doe{index}",
+            "email": f"employee{index}@example.com",
+            "phone": "+1-416-555-0123",
+            "worker_category": "direct_employee",
+            "employment_type": "full_time",
+            "job_title": "Analyst",
+            "department_id": "65a1b2c3d4e5f6a7b8c9d0e1",
+            "department_name": "Operations",
+            "province_of_employment": "Ontario",
+            "hire_date": datetime(2020, 1, 1),
+            "annual_salary": 50000.0 + index % 40000,
+            "pay_frequency": "biweekly",
+            "status": "active",
+        }
+
+
+async def run(label: str, stream) -> None:
+    """Drain an export stream, printing time, size and peak memory"""
+    started = time.perf_counter()
+    size = 0
+    async for chunk in stream:
+        size += len(chunk)
+    elapsed = time.perf_counter() - started
+    print(f"{label:<5} {elapsed:6.2f}s  {size / 1024 / 1024:7.1f} MiB  peak rss {peak_rss_mib():7.1f} MiB")
+
+
+async def main() -> None:
+    employees = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    service = EmployeeExportService()
+
+    print(f"employees={employees} start rss {peak_rss_mib():.1f} MiB")
+    await run("csv", service.stream_csv(documents(employees)))
+    await run("xlsx", service.stream_xlsx(documents(employees)))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
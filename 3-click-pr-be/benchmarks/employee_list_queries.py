@@ -0,0 +1,116 @@
+"""
+Employee List Queries Benchmark
+
+Seeds a scratch database with generated employees (see
+employee_search_latency.py) and compares, for GET /employees pages, the
+number of database commands and the latency of:
+
+- legacy: count() plus find().skip().limit() of full documents, as the
+  endpoint did before the $facet listing
+- facet: the one-aggregation listing with page numbers
+- keyset: the one-aggregation listing following next_cursor
+
+Usage:
+    python benchmarks/employee_list_queries.py [employees] [pages]
+"""
+
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+from beanie import init_beanie
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import monitoring
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from employee_search_latency import seed  # noqa: E402
+from src.core.config import settings  # noqa: E402
+from src.models.employee import EmployeeResponse  # noqa: E402
+from src.schemas.employee import Employee  # noqa: E402
+from src.services.employee_listing_service import EmployeeListingService  # noqa: E402
+
+
+PAGE_SIZE = 50
+
+
+class CommandCounter(monitoring.CommandListener):
+    """Count the database commands sent by the client"""
+
+    def __init__(self):
+        self.commands = 0
+
+    def started(self, event):
+        self.commands += 1
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+
+async def legacy_page(page: int) -> None:
+    """Count and page the way the endpoint used to"""
+    await Employee.find({}).count()
+    employees = await Employee.find({}).skip((page - 1) * PAGE_SIZE).limit(PAGE_SIZE).to_list()
+    [EmployeeResponse(id=str(employee.id), **employee.model_dump(exclude={"id"})) for employee in employees]
+
+
+async def measure(label: str, counter: CommandCounter, calls) -> None:
+    """Run each call, printing commands per call and latency percentiles"""
+    samples = []
+    counter.commands = 0
+    for call in calls:
+        started = time.perf_counter()
+        await call()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    p95 = samples[max(int(len(samples) * 0.95) - 1, 0)]
+    print(f"{label:<18} {counter.commands / len(samples):5.1f} commands/page  "
+          f"p50 {statistics.median(samples):8.2f} ms  p95 {p95:8.2f} ms")
+
+
+async def main() -> None:
+    employees = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    pages = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+
+    counter = CommandCounter()
+    client = AsyncIOMotorClient(settings.MONGODB_URL, event_listeners=[counter])
+    await init_beanie(database=client[f"{settings.MONGODB_DB_NAME}_benchmark"], document_models=[Employee])
+    await seed(employees)
+
+    service = EmployeeListingService()
+    last_page = employees // PAGE_SIZE
+    deep_pages = range(last_page - pages + 1, last_page + 1)
+
+    # Cursors for the deep pages, collected outside the timed runs
+    cursors = []
+    listing = await service.list_employees({}, PAGE_SIZE, (deep_pages[0] - 2) * PAGE_SIZE)
+    for _ in deep_pages:
+        after_id = service.decode_list_cursor(listing["next_cursor"])
+        cursors.append(after_id)
+        listing = await service.list_employees({}, PAGE_SIZE, after_id=after_id)
+
+    print(f"employees={employees} pages={pages} page_size={PAGE_SIZE}")
+    await measure("legacy first", counter, [lambda page=page: legacy_page(page) for page in range(1, pages + 1)])
+    await measure("facet first", counter, [
+        lambda page=page: service.list_employees({}, PAGE_SIZE, (page - 1) * PAGE_SIZE)
+        for page in range(1, pages + 1)
+    ])
+    await measure("legacy deep", counter, [lambda page=page: legacy_page(page) for page in deep_pages])
+    await measure("facet deep", counter, [
+        lambda page=page: service.list_employees({}, PAGE_SIZE, (page - 1) * PAGE_SIZE)
+        for page in deep_pages
+    ])
+    await measure("keyset deep", counter, [
+        lambda after_id=after_id: service.list_employees({}, PAGE_SIZE, after_id=after_id)
+        for after_id in cursors
+    ])
+    client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,147 @@
+"""
+Employee Search Latency Benchmark
+
+Seeds a scratch database with generated employees and measures the latency
+of directory searches (count plus first page, as GET /employees does):
+
+- regex: the former $or of case-insensitive unanchored $regex clauses
+- prefix: $all over the search_tokens index
+- text: the whole-word text index fallback
+
+Runs against MONGODB_URL, in the database MONGODB_DB_NAME + "_benchmark",
+whose employees are deleted and reseeded when their count differs.
+
+Usage:
+    python benchmarks/employee_search_latency.py [employees] [searches]
+"""
+
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+
+from beanie import init_beanie
+from motor.motor_asyncio import AsyncIOMotorClient
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.core.config import settings  # noqa: E402
+from src.schemas.employee import Employee, EMPLOYEE_SEARCH_FIELDS  # noqa: E402
+from src.services.employee_search_service import EmployeeSearchService, TEXT_SCORE_SORT  # noqa: E402
+from src.utils.search_tokens import build_search_tokens  # noqa: E402
+
+
+FIRST_NAMES = [
+    "James", "Mary", "Robert", "Patricia", "John", "Jennifer", "Michael", "Linda", "David", "Elizabeth",
+    "William", "Barbara", "Richard", "Susan", "Joseph", "Jessica", "Thomas", "Sarah", "Amélie", "Zoë",
+    "Wei", "Priya", "Mohammed", "Olga", "Kenji", "Aisha", "Mateo", "Chloé", "Liam", "Noah",
+]
+LAST_NAMES = [
+    "Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Rodriguez", "Martinez",
+    "Tremblay", "Gagnon", "Roy", "Côté", "Bouchard", "Gauthier", "Morin", "Lavoie", "Fortin", "Gagné",
+    "Wong", "Li", "Singh", "Patel", "Nguyen", "Kim", "Chen", "O'Brien", "MacDonald", "Campbell",
+]
+PAGE_SIZE = 50
+SEED_BATCH_SIZE = 10000
+
+
+def make_employee(index: int) -> dict:
+    """Build a raw employee document"""
+    first_name = FIRST_NAMES[index % len(FIRST_NAMES)]
+    last_name = f"{LAST_NAMES[(index // len(FIRST_NAMES)) % len(LAST_NAMES)]}{index // 900 or ''}"
+    document = {
+        "first_name": first_name,
+        "last_name": last_name,
+        "email": f"employee{index}@example.com",
+        "employee_number": f"EMP-{index:06d}",
+        "status": "active",
+        "worker_category": "direct_employee",
+        "employment_type": "full_time",
+        "province_of_employment": "Ontario",
+        "pay_frequency": "biweekly",
+        "job_title": "Analyst",
+        "department_name": "Operations",
+        "annual_salary": 50000.0 + index % 40000,
+        "bank_account": {"institution_number": "001", "transit_number": "12345", "account_number": f"{index:09d}"},
+        "education": [
+            {"institution": "University of Toronto", "degree": "BSc", "field_of_study": "Economics",
+             "graduation_year": 2000 + index % 20},
+        ],
+        "work_experience": [
+            {"company": f"Company {index % 500}", "position": "Analyst", "description": "Reporting " * 20},
+            {"company": f"Company {index % 300}", "position": "Associate", "description": "Operations " * 20},
+        ],
+    }
+    document["search_tokens"] = build_search_tokens(document[field] for field in EMPLOYEE_SEARCH_FIELDS)
+    return document
+
+
+async def seed(employees: int) -> None:
+    """Reseed the scratch collection unless it already holds `employees` documents"""
+    collection = Employee.get_motor_collection()
+    if await collection.count_documents({}) == employees:
+        return
+    await collection.delete_many({})
+    for start in range(0, employees, SEED_BATCH_SIZE):
+        await collection.insert_many(
+            [make_employee(index) for index in range(start, min(start + SEED_BATCH_SIZE, employees))],
+            ordered=False
+        )
+
+
+async def timed_search(query: dict, sort=None) -> float:
+    """Run the endpoint's count and first page, returning milliseconds"""
+    started = time.perf_counter()
+    await Employee.find(query).count()
+    await Employee.find(query).sort(sort).limit(PAGE_SIZE).to_list()
+    return (time.perf_counter() - started) * 1000
+
+
+def report(label: str, samples: list) -> None:
+    """Print latency percentiles"""
+    samples = sorted(samples)
+    p95 = samples[max(int(len(samples) * 0.95) - 1, 0)]
+    print(f"{label:<8} p50 {statistics.median(samples):8.2f} ms  p95 {p95:8.2f} ms  "
+          f"max {samples[-1]:8.2f} ms")
+
+
+async def main() -> None:
+    employees = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    searches = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+
+    client = AsyncIOMotorClient(settings.MONGODB_URL)
+    await init_beanie(database=client[f"{settings.MONGODB_DB_NAME}_benchmark"], document_models=[Employee])
+    await seed(employees)
+
+    random.seed(42)
+    terms = []
+    for _ in range(searches):
+        index = random.randrange(employees)
+        document = make_employee(index)
+        terms.append(random.choice([
+            document["first_name"][:random.randint(1, 4)],
+            document["last_name"][:random.randint(2, 6)],
+            f"{document['first_name'][:3]} {document['last_name'][:2]}",
+            document["employee_number"][:random.randint(5, 10)],
+        ]))
+
+    service = EmployeeSearchService()
+    regex, prefix, text = [], [], []
+    for search in terms:
+        regex.append(await timed_search({"$or": [
+            {field: {"$regex": search, "$options": "i"}} for field in EMPLOYEE_SEARCH_FIELDS
+        ]}))
+        prefix.append(await timed_search(service.build_prefix_filter(search)))
+        text.append(await timed_search(service.build_text_filter(search), TEXT_SCORE_SORT))
+
+    print(f"employees={employees} searches={searches}")
+    report("regex", regex)
+    report("prefix", prefix)
+    report("text", text)
+    client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,85 @@
+"""
+XLSX Import Memory Benchmark
+
+Generates a timesheet workbook and measures the peak resident memory of
+the process while streaming it through the tabular reader, at checkpoints
+along the file. Peak memory should stay close to flat as the row count
+grows, well below the size of the workbook once loaded in full.
+
+Usage:
+    python benchmarks/xlsx_import_memory.py [rows]
+"""
+
+import os
+import sys
+import tempfile
+import time
+import resource
+from datetime import date, timedelta
+
+import xlsxwriter
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.utils.tabular_reader import iter_xlsx_rows  # noqa: E402
+
+
+HEADERS = [
+    "Employee ID", "Employee Number", "Employee Name", "Date", "Type",
+    "Hours", "Shift Start", "Shift End", "Break", "Department", "Rate", "Notes"
+]
+
+
+def write_workbook(path: str, rows: int) -> None:
+    """Write a timesheet workbook with the given number of data rows"""
+    workbook = xlsxwriter.Workbook(path, {"constant_memory": True})
+    worksheet = workbook.add_worksheet()
+    date_format = workbook.add_format({"num_format": "yyyy-mm-dd"})
+    worksheet.write_row(0, 0, HEADERS)
+
+    start = date(2025, 1, 6)
+    for index in range(rows):
+        row = index + 1
+        worksheet.write_row(row, 0, [
+            f"emp_{index % 500:04d}", f"EMP{index % 500:04d}", f"Employee {index % 500}"
+        ])
+        worksheet.write_datetime(row, 3, start + timedelta(days=index // 500), date_format)
+        worksheet.write_row(row, 4, [
+            "regular", 8, "09:00", "17:30", 30, "Operations", 25.5, "Imported from time clock"
+        ])
+
+    workbook.close()
+
+
+def peak_rss_mib() -> float:
+    """Peak resident set size of this process in MiB"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        return peak / 1024 / 1024
+    return peak / 1024
+
+
+def main() -> None:
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    checkpoints = {rows // 10, rows // 4, rows // 2, rows}
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "timesheet.xlsx")
+        write_workbook(path, rows)
+        print(f"rows={rows} file_size={os.path.getsize(path) / 1024 / 1024:.1f} MiB")
+
+        print(f"before read  peak_rss={peak_rss_mib():.1f} MiB")
+        started = time.perf_counter()
+        count = 0
+        with open(path, "rb") as file:
+            for _ in iter_xlsx_rows(file):
+                count += 1
+                if count in checkpoints:
+                    print(f"  {count:>8} rows  peak_rss={peak_rss_mib():.1f} MiB")
+        elapsed = time.perf_counter() - started
+
+        print(f"read {count} rows in {elapsed:.1f}s ({count / elapsed:,.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    main()
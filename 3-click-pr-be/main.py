@@ -12,6 +12,10 @@ from pathlib import Path
 
 from src.core.config import settings
 from src.database.connection import init_db, close_db
+from src.services.timesheet_row_parser import shutdown_parse_executor
+from src.services.employee_search_service import EmployeeSearchService
+from src.services.employee_designation_service import EmployeeDesignationService
+from src.services.timesheet_dedupe_service import TimesheetDedupeService
 from src.api.v1 import employees, payruns, settings_api, reports, dashboard, departments, designations, timesheets
 
 
@@ -22,11 +26,23 @@ async def lifespan(app: FastAPI):
     print("Starting 3-Click Payroll API...")
     await init_db()
     print("Database connected successfully")
+    deduped = await TimesheetDedupeService().ensure_unique_indexes()
+    if deduped["entries_removed"]:
+        print(f"Removed {deduped['entries_removed']} duplicate time entries")
+    if deduped["periods_merged"]:
+        print(f"Merged {deduped['periods_merged']} duplicate timesheet periods")
+    backfilled = await EmployeeSearchService().backfill_search_tokens()
+    if backfilled:
+        print(f"Built search tokens for {backfilled} employees")
+    linked = await EmployeeDesignationService().backfill_designation_ids_once()
+    if linked:
+        print(f"Linked {linked} employees to designations by job title")
     yield
     # Shutdown
     print("Shutting down 3-Click Payroll API...")
     await close_db()
     print("Database connection closed")
+    shutdown_parse_executor()
 
 
 # Initialize FastAPI application
@@ -47,6 +63,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
 
 
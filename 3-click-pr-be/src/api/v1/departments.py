@@ -4,15 +4,18 @@ Departments API Endpoints
 Endpoints for managing departments within the organization.
 """
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, Header, HTTPException, Response, status
 from typing import List, Optional
 from pydantic import BaseModel
 from datetime import datetime
 
 from src.schemas.organization import Department
 from src.schemas.employee import Employee
+from src.services.employee_head_count_service import EmployeeHeadCountService
+from src.utils.etag import claim_version, collection_etag, etag_headers, etag_matches, make_etag, version_of
 
 router = APIRouter()
+head_count_service = EmployeeHeadCountService()
 
 
 # Department Schemas
@@ -52,10 +55,17 @@ class DepartmentResponse(BaseModel):
         from_attributes = True
 
 
+def _department_etag(department: Department, employee_count: int) -> str:
+    """ETag of a department response, which includes its head count"""
+    return make_etag(str(department.id), version_of(department.updated_at), employee_count)
+
+
 # Department Endpoints
 @router.get("/", response_model=List[DepartmentResponse])
 async def get_departments(
-    is_active: Optional[bool] = None
+    response: Response,
+    is_active: Optional[bool] = None,
+    if_none_match: Optional[str] = Header(None)
 ):
     """Get all departments"""
     query = {}
@@ -64,12 +74,17 @@ async def get_departments(
 
     departments = await Department.find(query).to_list()
 
-    # Calculate total_employees for each department
-    result = []
-    for dept in departments:
-        # Count employees with this department_id
-        employee_count = await Employee.find({"department_id": str(dept.id)}).count()
+    # Count employees of all listed departments in one aggregation
+    counts_by_id = await head_count_service.count_by_department([str(dept.id) for dept in departments])
+    employee_counts = [counts_by_id[str(dept.id)] for dept in departments]
 
+    etag = collection_etag(departments, is_active, employee_counts)
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=etag_headers(etag))
+    response.headers.update(etag_headers(etag))
+
+    result = []
+    for dept, employee_count in zip(departments, employee_counts):
         result.append(DepartmentResponse(
             id=str(dept.id),
             name=dept.name,
@@ -87,7 +102,11 @@ async def get_departments(
 
 
 @router.get("/{department_id}", response_model=DepartmentResponse)
-async def get_department(department_id: str):
+async def get_department(
+    department_id: str,
+    response: Response,
+    if_none_match: Optional[str] = Header(None)
+):
     """Get a specific department by ID"""
     department = await Department.get(department_id)
 
@@ -100,6 +119,11 @@ async def get_department(department_id: str):
     # Count employees in this department
     employee_count = await Employee.find({"department_id": str(department.id)}).count()
 
+    etag = _department_etag(department, employee_count)
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=etag_headers(etag))
+    response.headers.update(etag_headers(etag))
+
     return DepartmentResponse(
         id=str(department.id),
         name=department.name,
@@ -163,8 +187,17 @@ async def create_department(department_data: DepartmentCreate):
 
 
 @router.put("/{department_id}", response_model=DepartmentResponse)
-async def update_department(department_id: str, department_data: DepartmentUpdate):
-    """Update an existing department"""
+async def update_department(
+    department_id: str,
+    department_data: DepartmentUpdate,
+    if_match: Optional[str] = Header(None)
+):
+    """
+    Update an existing department
+
+    With If-Match, the update is rejected with 412 if the department
+    changed since that ETag was read.
+    """
     department = await Department.get(department_id)
 
     if not department:
@@ -191,6 +224,14 @@ async def update_department(department_id: str, department_data: DepartmentUpdat
                 detail=f"Department with code '{department_data.code}' already exists"
             )
 
+    if if_match is not None:
+        employee_count = await Employee.find({"department_id": str(department.id)}).count()
+        if not await claim_version(department, if_match, _department_etag(department, employee_count)):
+            raise HTTPException(
+                status_code=status.HTTP_412_PRECONDITION_FAILED,
+                detail="Department was modified since it was read"
+            )
+
     # Update only provided fields
     update_dict = department_data.dict(exclude_unset=True)
     update_dict["updated_at"] = datetime.utcnow()
@@ -4,15 +4,18 @@ Designations API Endpoints
 Endpoints for managing designations within the organization.
 """
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, Header, HTTPException, Response, status
 from typing import List, Optional
 from pydantic import BaseModel
 from datetime import datetime
 
 from src.schemas.organization import Designation
 from src.schemas.employee import Employee
+from src.services.employee_head_count_service import EmployeeHeadCountService
+from src.utils.etag import claim_version, collection_etag, etag_headers, etag_matches, make_etag, version_of
 
 router = APIRouter()
+head_count_service = EmployeeHeadCountService()
 
 
 # Designation Schemas
@@ -55,10 +58,17 @@ class DesignationResponse(BaseModel):
         from_attributes = True
 
 
+def _designation_etag(designation: Designation, employee_count: int) -> str:
+    """ETag of a designation response, which includes its head count"""
+    return make_etag(str(designation.id), version_of(designation.updated_at), employee_count)
+
+
 # Designation Endpoints
 @router.get("/", response_model=List[DesignationResponse])
 async def get_designations(
-    is_active: Optional[bool] = None
+    response: Response,
+    is_active: Optional[bool] = None,
+    if_none_match: Optional[str] = Header(None)
 ):
     """Get all designations"""
     query = {}
@@ -67,12 +77,17 @@ async def get_designations(
 
     designations = await Designation.find(query).to_list()
 
-    # Calculate total_employees for each designation
-    result = []
-    for desig in designations:
-        # Count employees with this job_title (designation)
-        employee_count = await Employee.find({"job_title": desig.title}).count()
+    # Count employees of all listed designations in one aggregation
+    counts_by_id = await head_count_service.count_by_designation([str(desig.id) for desig in designations])
+    employee_counts = [counts_by_id[str(desig.id)] for desig in designations]
 
+    etag = collection_etag(designations, is_active, employee_counts)
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=etag_headers(etag))
+    response.headers.update(etag_headers(etag))
+
+    result = []
+    for desig, employee_count in zip(designations, employee_counts):
         result.append(DesignationResponse(
             id=str(desig.id),
             title=desig.title,
@@ -91,7 +106,11 @@ async def get_designations(
 
 
 @router.get("/{designation_id}", response_model=DesignationResponse)
-async def get_designation(designation_id: str):
+async def get_designation(
+    designation_id: str,
+    response: Response,
+    if_none_match: Optional[str] = Header(None)
+):
     """Get a specific designation by ID"""
     designation = await Designation.get(designation_id)
 
@@ -102,7 +121,12 @@ async def get_designation(designation_id: str):
         )
 
     # Count employees with this designation
-    employee_count = await Employee.find({"job_title": designation.title}).count()
+    employee_count = await Employee.find({"designation_id": str(designation.id)}).count()
+
+    etag = _designation_etag(designation, employee_count)
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=etag_headers(etag))
+    response.headers.update(etag_headers(etag))
 
     return DesignationResponse(
         id=str(designation.id),
@@ -170,8 +194,18 @@ async def create_designation(designation_data: DesignationCreate):
 
 
 @router.put("/{designation_id}", response_model=DesignationResponse)
-async def update_designation(designation_id: str, designation_data: DesignationUpdate):
-    """Update an existing designation"""
+async def update_designation(
+    designation_id: str,
+    designation_data: DesignationUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None)
+):
+    """
+    Update an existing designation
+
+    With If-Match, the update is rejected with 412 if the designation
+    changed since that ETag was read.
+    """
     designation = await Designation.get(designation_id)
 
     if not designation:
@@ -198,6 +232,16 @@ async def update_designation(designation_id: str, designation_data: DesignationU
                 detail=f"Designation with code '{designation_data.code}' already exists"
             )
 
+    if if_match is not None:
+        employee_count = await Employee.find({"designation_id": str(designation.id)}).count()
+        if not await claim_version(designation, if_match, _designation_etag(designation, employee_count)):
+            raise HTTPException(
+                status_code=status.HTTP_412_PRECONDITION_FAILED,
+                detail="Designation was modified since it was read"
+            )
+
+    previous_title = designation.title
+
     # Update only provided fields
     update_dict = designation_data.dict(exclude_unset=True)
     update_dict["updated_at"] = datetime.utcnow()
@@ -207,8 +251,17 @@ async def update_designation(designation_id: str, designation_data: DesignationU
 
     await designation.save()
 
+    # Employees keep their designation by ID; rename its denormalized name
+    # and bump updated_at so their ETags change
+    if designation.title != previous_title:
+        await Employee.get_motor_collection().update_many(
+            {"designation_id": str(designation.id)},
+            {"$set": {"designation_name": designation.title, "updated_at": update_dict["updated_at"]}}
+        )
+
     # Count employees with this designation
-    employee_count = await Employee.find({"job_title": designation.title}).count()
+    employee_count = await Employee.find({"designation_id": str(designation.id)}).count()
+    response.headers.update(etag_headers(_designation_etag(designation, employee_count)))
 
     return DesignationResponse(
         id=str(designation.id),
@@ -237,7 +290,7 @@ async def delete_designation(designation_id: str):
         )
 
     # TODO: Check if designation has employees and prevent deletion
-    # or cascade update employees to set job_title to None
+    # or cascade update employees to set designation_id to None
 
     await designation.delete()
     return None
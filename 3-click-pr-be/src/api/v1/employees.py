@@ -5,23 +5,46 @@ CRUD operations for employee management including
 creation, retrieval, update, deletion, and eligibility checks.
 """
 
-from fastapi import APIRouter, HTTPException, Query, status
+from fastapi import APIRouter, Header, HTTPException, Query, Response, status, UploadFile, File
+from fastapi.responses import StreamingResponse
 from typing import List, Optional
 from datetime import datetime
+from pathlib import Path
+import asyncio
+import csv
+from bson.errors import InvalidId
 
 from src.models.employee import (
     EmployeeCreate,
     EmployeeUpdate,
     EmployeeResponse,
     EmployeeListResponse,
-    EmployeeEligibilityResponse
+    EmployeeEligibilityResponse,
+    EmployeeBulkUpdateRequest,
+    EmployeeBulkUpdateResponse
 )
-from src.schemas.employee import Employee
+from src.schemas.employee import Employee, EmployeeImportJob, EmployeeImportStatus
 from src.services.worker_category_service import WorkerCategoryService
+from src.services.employee_search_service import EmployeeSearchService
+from src.services.employee_listing_service import EmployeeListingService
+from src.services.employee_import_service import EmployeeImportService, EMPLOYEE_HEADER_ALIASES
+from src.services.employee_bulk_update_service import EmployeeBulkUpdateService
+from src.services.employee_export_service import EmployeeExportService
+from src.utils.etag import claim_version, document_etag, etag_headers, etag_matches, get_document_etag
+from src.utils.pagination import InvalidCursorError
+from src.utils.tabular_reader import SUPPORTED_EXTENSIONS, TabularFileError, iter_csv_file_rows, iter_xlsx_rows
 
 
 router = APIRouter()
 worker_service = WorkerCategoryService()
+search_service = EmployeeSearchService()
+listing_service = EmployeeListingService()
+import_service = EmployeeImportService()
+bulk_update_service = EmployeeBulkUpdateService()
+export_service = EmployeeExportService()
+
+# Rows of an import returned per page
+IMPORT_ROWS_PAGE_SIZE = 100
 
 
 @router.post("/", response_model=EmployeeResponse, status_code=status.HTTP_201_CREATED)
@@ -70,70 +93,101 @@ async def create_employee(employee_data: EmployeeCreate):
         )
 
 
+def _build_employee_query(
+    status_filter: Optional[str],
+    department_id: Optional[str],
+    work_location_id: Optional[str],
+    worker_category: Optional[str]
+) -> dict:
+    """Build the employee filter shared by listing and export"""
+    query = {}
+
+    if status_filter:
+        query["status"] = status_filter
+
+    if department_id:
+        query["department_id"] = department_id
+
+    if work_location_id:
+        query["work_location_id"] = work_location_id
+
+    if worker_category:
+        query["worker_category"] = worker_category
+
+    return query
+
+
 @router.get("/", response_model=EmployeeListResponse)
 async def get_employees(
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(50, ge=1, le=100, description="Items per page"),
-    status: Optional[str] = Query(None, description="Filter by status"),
+    status_filter: Optional[str] = Query(None, alias="status", description="Filter by status"),
     department_id: Optional[str] = Query(None, description="Filter by department"),
     work_location_id: Optional[str] = Query(None, description="Filter by work location"),
     worker_category: Optional[str] = Query(None, description="Filter by worker category"),
-    search: Optional[str] = Query(None, description="Search by name or email")
+    search: Optional[str] = Query(None, description="Search by name, email or employee number (word prefixes)"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page (replaces page)")
 ):
     """
     Get all employees with pagination and filtering
 
     Supports filtering by status, department, location, worker category,
-    and searching by name or email.
+    and searching by word prefixes of name, email or employee number.
+
+    Employees are ordered by creation (ID). Pages can be read by number or
+    by passing the previous page's next_cursor as `cursor`, which reads
+    the page at the same cost at any depth (the total is a separate count).
+
+    When no employee matches every search prefix, employees matching any
+    whole word of the search are returned instead, ordered by relevance
+    and without next_cursor. This is not a fuzzy match: misspelled words
+    and text inside a word match nothing.
     """
     try:
-        # Build query
-        query = {}
+        after_id = None
+        if cursor:
+            try:
+                after_id = listing_service.decode_list_cursor(cursor)
+            except (InvalidCursorError, InvalidId):
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Invalid pagination cursor"
+                )
 
-        if status:
-            query["status"] = status
+        query = _build_employee_query(status_filter, department_id, work_location_id, worker_category)
 
-        if department_id:
-            query["department_id"] = department_id
+        skip = 0 if after_id else (page - 1) * page_size
 
-        if work_location_id:
-            query["work_location_id"] = work_location_id
+        # Search functionality: prefix match on the token index, falling
+        # back to whole-word text search when no employee matches
+        prefix_filter = None
+        if search:
+            prefix_filter = search_service.build_prefix_filter(search)
+            if prefix_filter is None:
+                return EmployeeListResponse(total=0, page=page, page_size=page_size, employees=[])
 
-        if worker_category:
-            query["worker_category"] = worker_category
+        listing = await listing_service.list_employees(
+            {**query, **(prefix_filter or {})}, page_size, skip, after_id
+        )
 
-        # Search functionality
-        if search:
-            query["$or"] = [
-                {"first_name": {"$regex": search, "$options": "i"}},
-                {"last_name": {"$regex": search, "$options": "i"}},
-                {"email": {"$regex": search, "$options": "i"}},
-                {"employee_number": {"$regex": search, "$options": "i"}}
-            ]
-
-        # Get total count
-        total = await Employee.find(query).count()
-
-        # Get paginated results
-        skip = (page - 1) * page_size
-        employees = await Employee.find(query).skip(skip).limit(page_size).to_list()
-
-        # Convert to response models
-        employee_responses = [
-            EmployeeResponse(
-                id=str(emp.id),
-                **emp.model_dump(exclude={"id"})
+        if search and not listing["total"]:
+            listing = await listing_service.list_employees(
+                {**query, **search_service.build_text_filter(search)},
+                page_size,
+                (page - 1) * page_size,
+                by_text_score=True
             )
-            for emp in employees
-        ]
 
         return EmployeeListResponse(
-            total=total,
+            total=listing["total"],
             page=page,
             page_size=page_size,
-            employees=employee_responses
+            employees=listing["employees"],
+            next_cursor=listing["next_cursor"]
         )
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -141,14 +195,253 @@ async def get_employees(
         )
 
 
+@router.get("/export")
+async def export_employees(
+    file_format: str = Query("csv", alias="format", pattern="^(csv|xlsx)$", description="csv or xlsx"),
+    status_filter: Optional[str] = Query(None, alias="status", description="Filter by status"),
+    department_id: Optional[str] = Query(None, description="Filter by department"),
+    work_location_id: Optional[str] = Query(None, description="Filter by work location"),
+    worker_category: Optional[str] = Query(None, description="Filter by worker category"),
+    search: Optional[str] = Query(None, description="Search by name, email or employee number (word prefixes)")
+):
+    """
+    Stream every matching employee as a CSV or XLSX file
+
+    Takes the same filters as GET /employees and writes employees in the
+    same order, straight from the database cursor. Columns use the
+    EmployeeCreate field names, so the file can be imported again.
+
+    Returns:
+        text/csv or XLSX attachment
+    """
+    query = _build_employee_query(status_filter, department_id, work_location_id, worker_category)
+    if search:
+        prefix_filter = search_service.build_prefix_filter(search)
+        if prefix_filter is None:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Search has no letters or digits")
+        query.update(prefix_filter)
+
+    documents = export_service.iter_employee_documents(query)
+    filename = f"employees_{datetime.utcnow().strftime('%Y%m%d')}.{file_format}"
+    headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
+
+    if file_format == "xlsx":
+        return StreamingResponse(
+            export_service.stream_xlsx(documents),
+            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            headers=headers
+        )
+
+    return StreamingResponse(export_service.stream_csv(documents), media_type="text/csv", headers=headers)
+
+
+def _serialize_import_job(job: EmployeeImportJob) -> dict:
+    """Serialize an employee import job"""
+    return {
+        "job_id": str(job.id),
+        "file_name": job.file_name,
+        "file_size": job.file_size,
+        "status": job.status.value,
+        "total_rows": job.total_rows,
+        "employees_created": job.employees_created,
+        "rows_failed": job.rows_failed,
+        "error_counts": job.error_counts,
+        "started_at": job.started_at.isoformat(),
+        "completed_at": job.completed_at.isoformat() if job.completed_at else None,
+        "processing_notes": job.processing_notes
+    }
+
+
+async def _get_import_job_or_404(job_id: str) -> EmployeeImportJob:
+    """Load an import job or raise 404"""
+    try:
+        job = await EmployeeImportJob.get(job_id)
+    except Exception:
+        job = None
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Import job with ID {job_id} not found"
+        )
+    return job
+
+
+@router.post("/import", response_model=dict, status_code=status.HTTP_201_CREATED)
+async def import_employees(file: UploadFile = File(...)):
+    """
+    Create employees in bulk from a CSV or XLSX file
+
+    Columns are the EmployeeCreate fields (first_name, last_name, email,
+    employee_number, ...). Headers are matched case-insensitively and
+    common alternatives such as "Surname" or "Province" are accepted;
+    province codes such as "ON" are accepted for the province.
+
+    Rows are read and validated in a worker thread, then checked for
+    duplicate employee numbers and emails (within the file and against
+    existing employees) and inserted in chunks. Invalid or conflicting
+    rows are skipped; the rest are created. A file that cannot be read
+    (such as a CSV that is not UTF-8) is rejected with 400; one that stops
+    reading part-way keeps the rows read so far.
+
+    The result of every row is kept on the import job; read it with
+    GET /employees/import/{job_id}/rows.
+
+    Returns:
+        Import job summary and the first rejected rows
+    """
+    extension = Path(file.filename or "").suffix.lower()
+    if extension not in SUPPORTED_EXTENSIONS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Only CSV or XLSX files are allowed"
+        )
+
+    # Rows are read and validated in a worker thread; the first chunk is
+    # read here, so a file that cannot be read is rejected before a job exists
+    try:
+        if extension == ".xlsx":
+            rows = await asyncio.to_thread(iter_xlsx_rows, file.file, EMPLOYEE_HEADER_ALIASES)
+        else:
+            rows = iter_csv_file_rows(file.file, EMPLOYEE_HEADER_ALIASES)
+        chunks = await import_service.open_employee_chunks(rows)
+    except (TabularFileError, UnicodeDecodeError, csv.Error) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Failed to read {extension.lstrip('.').upper()} file: {str(e)}"
+        )
+
+    job = EmployeeImportJob(file_name=file.filename, file_size=file.size or 0)
+    await job.insert()
+
+    try:
+        job = await import_service.run_import(job, chunks)
+    except Exception as e:
+        job.status = EmployeeImportStatus.FAILED
+        job.completed_at = datetime.utcnow()
+        job.processing_notes = f"Import stopped: {str(e)}"
+        await job.save()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error importing employees: {str(e)}"
+        )
+
+    rejected, next_cursor = await import_service.get_row_results(
+        str(job.id), IMPORT_ROWS_PAGE_SIZE, created=False
+    )
+
+    return {
+        "success": job.status != EmployeeImportStatus.FAILED,
+        **_serialize_import_job(job),
+        "rejected_rows": rejected,
+        "rejected_rows_next_cursor": next_cursor
+    }
+
+
+@router.get("/import/{job_id}", response_model=dict)
+async def get_employee_import(job_id: str):
+    """Get the summary of an employee import job"""
+    return _serialize_import_job(await _get_import_job_or_404(job_id))
+
+
+@router.get("/import/{job_id}/rows", response_model=dict)
+async def get_employee_import_rows(
+    job_id: str,
+    created: Optional[bool] = Query(None, description="Only created (true) or rejected (false) rows"),
+    limit: int = Query(IMPORT_ROWS_PAGE_SIZE, ge=1, le=1000),
+    cursor: Optional[str] = None
+):
+    """
+    Get the per-row results of an employee import job in file order
+
+    Args:
+        job_id: Import job ID
+        created: Only created (true) or rejected (false) rows
+        limit: Maximum rows to return
+        cursor: next_cursor from the previous page
+
+    Returns:
+        Row results and the cursor for the next page
+    """
+    await _get_import_job_or_404(job_id)
+
+    try:
+        rows, next_cursor = await import_service.get_row_results(job_id, limit, cursor, created)
+    except (InvalidCursorError, InvalidId):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+
+    return {"job_id": job_id, "rows": rows, "next_cursor": next_cursor}
+
+
+@router.patch("/bulk", response_model=EmployeeBulkUpdateResponse)
+async def bulk_update_employees(request: EmployeeBulkUpdateRequest):
+    """
+    Update many employees at once
+
+    Selects employees by employee_ids and/or filter conditions and applies
+    the same patch to all of them in a single update: `set` fields to a
+    value (e.g. department_id, pay_frequency) and `multiply` amounts by a
+    factor (e.g. annual_salary 1.03), rounded to cents. Setting a
+    department, work location or designation also updates its name on
+    the employees.
+
+    Every bulk update is recorded; see GET /employees/bulk/history.
+
+    Returns:
+        Audit record ID and the matched and modified employee counts
+    """
+    try:
+        audit = await bulk_update_service.apply(request)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error updating employees: {str(e)}"
+        )
+
+    return EmployeeBulkUpdateResponse(
+        audit_id=str(audit.id),
+        matched_count=audit.matched_count,
+        modified_count=audit.modified_count
+    )
+
+
+@router.get("/bulk/history", response_model=List[dict])
+async def get_bulk_update_history(
+    limit: int = Query(50, ge=1, le=500),
+    skip: int = Query(0, ge=0)
+):
+    """Get the audit records of bulk employee updates, newest first"""
+    records = await bulk_update_service.get_audit_records(limit, skip)
+    return [
+        {"id": str(record.id), **record.model_dump(exclude={"id", "revision_id"}, mode="json")}
+        for record in records
+    ]
+
+
 @router.get("/{employee_id}")
-async def get_employee(employee_id: str):
+async def get_employee(
+    employee_id: str,
+    response: Response,
+    if_none_match: Optional[str] = Header(None)
+):
     """
     Get employee by ID
 
-    Retrieves a single employee's complete information.
+    Retrieves a single employee's complete information. The response has
+    an ETag; with a matching If-None-Match the employee is not loaded and
+    304 is returned.
     """
     try:
+        if if_none_match:
+            # Only updated_at is read to revalidate a cached employee
+            etag = await get_document_etag(Employee, employee_id)
+            if etag and etag_matches(if_none_match, etag):
+                return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=etag_headers(etag))
+
         employee = await Employee.get(employee_id)
 
         if not employee:
@@ -157,6 +450,7 @@ async def get_employee(employee_id: str):
                 detail=f"Employee with ID {employee_id} not found"
             )
 
+        response.headers.update(etag_headers(document_etag(employee)))
         return employee
 
     except HTTPException:
@@ -169,12 +463,18 @@ async def get_employee(employee_id: str):
 
 
 @router.put("/{employee_id}")
-async def update_employee(employee_id: str, employee_data: EmployeeUpdate):
+async def update_employee(
+    employee_id: str,
+    employee_data: EmployeeUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None)
+):
     """
     Update employee
 
     Updates an existing employee's information. Only provided fields
-    will be updated.
+    will be updated. With If-Match, the update is rejected with 412 if
+    the employee changed since that ETag was read.
     """
     try:
         employee = await Employee.get(employee_id)
@@ -197,6 +497,12 @@ async def update_employee(employee_id: str, employee_data: EmployeeUpdate):
                     detail=f"Email {update_data['email']} already exists"
                 )
 
+        if not await claim_version(employee, if_match):
+            raise HTTPException(
+                status_code=status.HTTP_412_PRECONDITION_FAILED,
+                detail="Employee was modified since it was read"
+            )
+
         # Update employee
         for key, value in update_data.items():
             setattr(employee, key, value)
@@ -204,6 +510,7 @@ async def update_employee(employee_id: str, employee_data: EmployeeUpdate):
         employee.updated_at = datetime.utcnow()
         await employee.save()
 
+        response.headers.update(etag_headers(document_etag(employee)))
         return employee
 
     except HTTPException:
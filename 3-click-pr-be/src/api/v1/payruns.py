@@ -13,6 +13,7 @@ from beanie import PydanticObjectId
 import io
 import zipfile
 
+from ...core.config import settings
 from ...schemas.pay_run import PayRun, PayRunStatus, PayPeriodType
 from ...schemas.employee import Employee
 from ...schemas.organization import Organization
@@ -216,7 +217,8 @@ async def calculate_pay_run(
     pay_run_earnings = await timesheet_service.aggregate_pay_run_earnings(
         employee_ids=employee_ids,
         period_start_date=pay_run.period_start_date,
-        period_end_date=pay_run.period_end_date
+        period_end_date=pay_run.period_end_date,
+        use_period_rollups=settings.USE_TIMESHEET_PERIOD_ROLLUPS
     )
 
     # Prepare employee data for calculation
@@ -278,7 +280,7 @@ async def calculate_pay_run(
         all_time_entry_ids.extend(entry_ids)
 
     if all_time_entry_ids:
-        processed_count = await timesheet_service.mark_entries_as_processed(
+        await timesheet_service.mark_entries_as_processed(
             time_entry_ids=all_time_entry_ids,
             pay_run_id=str(pay_run.id)
         )
@@ -5,7 +5,7 @@ Endpoints for managing payroll settings, salary components,
 statutory settings, and organization configuration.
 """
 
-from fastapi import APIRouter, HTTPException, status, UploadFile, File
+from fastapi import APIRouter, Header, HTTPException, Response, status, UploadFile, File
 from fastapi.responses import FileResponse
 from typing import List, Optional
 from pydantic import BaseModel
@@ -23,6 +23,7 @@ from src.schemas.salary_component import (
     EmployeeComponentOverride
 )
 from src.services.component_resolution_service import ComponentResolutionService
+from src.utils.etag import claim_version, collection_etag, document_etag, etag_headers, etag_matches
 
 router = APIRouter()
 
@@ -259,8 +260,10 @@ class OrganizationResponse(BaseModel):
 
 @router.get("/salary-components", response_model=List[SalaryComponentResponse])
 async def get_salary_components(
+    response: Response,
     component_type: Optional[ComponentType] = None,
-    is_active: Optional[bool] = None
+    is_active: Optional[bool] = None,
+    if_none_match: Optional[str] = Header(None)
 ):
     """Get all salary components"""
     query = {}
@@ -271,6 +274,11 @@ async def get_salary_components(
 
     components = await SalaryComponent.find(query).sort("+display_order").to_list()
 
+    etag = collection_etag(components, component_type, is_active)
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=etag_headers(etag))
+    response.headers.update(etag_headers(etag))
+
     return [
         SalaryComponentResponse(
             id=str(comp.id),
@@ -300,7 +308,11 @@ async def get_salary_components(
 
 
 @router.get("/salary-components/{component_id}", response_model=SalaryComponentResponse)
-async def get_salary_component(component_id: str):
+async def get_salary_component(
+    component_id: str,
+    response: Response,
+    if_none_match: Optional[str] = Header(None)
+):
     """Get a specific salary component"""
     comp = await SalaryComponent.get(component_id)
 
@@ -310,6 +322,11 @@ async def get_salary_component(component_id: str):
             detail=f"Salary component with ID {component_id} not found"
         )
 
+    etag = document_etag(comp)
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=etag_headers(etag))
+    response.headers.update(etag_headers(etag))
+
     return SalaryComponentResponse(
         id=str(comp.id),
         name=comp.name,
@@ -369,6 +386,7 @@ async def create_salary_component(component_data: SalaryComponentCreate):
     )
 
     await component.insert()
+    ComponentResolutionService.invalidate_component_plans()
 
     return SalaryComponentResponse(
         id=str(component.id),
@@ -396,8 +414,18 @@ async def create_salary_component(component_data: SalaryComponentCreate):
 
 
 @router.put("/salary-components/{component_id}", response_model=SalaryComponentResponse)
-async def update_salary_component(component_id: str, component_data: SalaryComponentUpdate):
-    """Update a salary component"""
+async def update_salary_component(
+    component_id: str,
+    component_data: SalaryComponentUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None)
+):
+    """
+    Update a salary component
+
+    With If-Match, the update is rejected with 412 if the component
+    changed since that ETag was read.
+    """
     component = await SalaryComponent.get(component_id)
 
     if not component:
@@ -413,6 +441,12 @@ async def update_salary_component(component_id: str, component_data: SalaryCompo
             detail="Cannot modify statutory components"
         )
 
+    if not await claim_version(component, if_match):
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail="Salary component was modified since it was read"
+        )
+
     # Update only provided fields
     update_dict = component_data.dict(exclude_unset=True)
     update_dict["updated_at"] = datetime.utcnow()
@@ -421,6 +455,8 @@ async def update_salary_component(component_id: str, component_data: SalaryCompo
         setattr(component, field, value)
 
     await component.save()
+    ComponentResolutionService.invalidate_component_plans()
+    response.headers.update(etag_headers(document_etag(component)))
 
     return SalaryComponentResponse(
         id=str(component.id),
@@ -466,6 +502,7 @@ async def delete_salary_component(component_id: str):
         )
 
     await component.delete()
+    ComponentResolutionService.invalidate_component_plans()
     return None
 
 
@@ -528,6 +565,17 @@ async def remove_component_from_designation(designation_id: str, component_id: s
     return None
 
 
+@router.get("/component-plans/cache")
+async def get_component_plan_cache_stats():
+    """
+    Get component plan cache metrics
+
+    Returns the number of cached designation plans, hits, misses, hit rate
+    and invalidations of this process since it started.
+    """
+    return ComponentResolutionService.plan_cache.stats()
+
+
 # Employee Component Override Endpoints
 @router.get("/employees/{employee_id}/components")
 async def get_employee_components(employee_id: str):
@@ -604,7 +652,10 @@ async def update_statutory_settings():
 
 
 @router.get("/organization", response_model=OrganizationResponse)
-async def get_organization():
+async def get_organization(
+    response: Response,
+    if_none_match: Optional[str] = Header(None)
+):
     """Get organization settings"""
     # Get the first (and should be only) organization
     org = await Organization.find_one()
@@ -622,6 +673,11 @@ async def get_organization():
         )
         await org.insert()
 
+    etag = document_etag(org)
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=etag_headers(etag))
+    response.headers.update(etag_headers(etag))
+
     return OrganizationResponse(
         id=str(org.id),
         company_name=org.company_name,
@@ -660,8 +716,17 @@ async def get_organization():
 
 
 @router.put("/organization", response_model=OrganizationResponse)
-async def update_organization(org_data: OrganizationUpdate):
-    """Update organization settings"""
+async def update_organization(
+    org_data: OrganizationUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None)
+):
+    """
+    Update organization settings
+
+    With If-Match, the update is rejected with 412 if the settings
+    changed since that ETag was read.
+    """
     # Get the first (and should be only) organization
     org = await Organization.find_one()
 
@@ -671,6 +736,12 @@ async def update_organization(org_data: OrganizationUpdate):
             detail="Organization not found. Please create one first."
         )
 
+    if not await claim_version(org, if_match):
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail="Organization settings were modified since they were read"
+        )
+
     # Update only provided fields
     update_dict = org_data.dict(exclude_unset=True)
     update_dict["updated_at"] = datetime.utcnow()
@@ -679,6 +750,7 @@ async def update_organization(org_data: OrganizationUpdate):
         setattr(org, field, value)
 
     await org.save()
+    response.headers.update(etag_headers(document_etag(org)))
 
     return OrganizationResponse(
         id=str(org.id),
@@ -816,7 +888,9 @@ async def delete_organization_logo():
 # Work Location Endpoints
 @router.get("/work-locations", response_model=List[WorkLocationResponse])
 async def get_work_locations(
-    is_active: Optional[bool] = None
+    response: Response,
+    is_active: Optional[bool] = None,
+    if_none_match: Optional[str] = Header(None)
 ):
     """Get all work locations"""
     query = {}
@@ -825,6 +899,11 @@ async def get_work_locations(
 
     locations = await WorkLocation.find(query).to_list()
 
+    etag = collection_etag(locations, is_active)
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=etag_headers(etag))
+    response.headers.update(etag_headers(etag))
+
     return [
         WorkLocationResponse(
             id=str(location.id),
@@ -845,7 +924,11 @@ async def get_work_locations(
 
 
 @router.get("/work-locations/{location_id}", response_model=WorkLocationResponse)
-async def get_work_location(location_id: str):
+async def get_work_location(
+    location_id: str,
+    response: Response,
+    if_none_match: Optional[str] = Header(None)
+):
     """Get a specific work location by ID"""
     location = await WorkLocation.get(location_id)
 
@@ -855,6 +938,11 @@ async def get_work_location(location_id: str):
             detail=f"Work location with ID {location_id} not found"
         )
 
+    etag = document_etag(location)
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=etag_headers(etag))
+    response.headers.update(etag_headers(etag))
+
     return WorkLocationResponse(
         id=str(location.id),
         name=location.name,
@@ -908,8 +996,18 @@ async def create_work_location(location_data: WorkLocationCreate):
 
 
 @router.put("/work-locations/{location_id}", response_model=WorkLocationResponse)
-async def update_work_location(location_id: str, location_data: WorkLocationUpdate):
-    """Update an existing work location"""
+async def update_work_location(
+    location_id: str,
+    location_data: WorkLocationUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None)
+):
+    """
+    Update an existing work location
+
+    With If-Match, the update is rejected with 412 if the work location
+    changed since that ETag was read.
+    """
     location = await WorkLocation.get(location_id)
 
     if not location:
@@ -918,6 +1016,12 @@ async def update_work_location(location_id: str, location_data: WorkLocationUpda
             detail=f"Work location with ID {location_id} not found"
         )
 
+    if not await claim_version(location, if_match):
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail="Work location was modified since it was read"
+        )
+
     # Update only provided fields
     update_dict = location_data.dict(exclude_unset=True)
     update_dict["updated_at"] = datetime.utcnow()
@@ -926,6 +1030,7 @@ async def update_work_location(location_id: str, location_data: WorkLocationUpda
         setattr(location, field, value)
 
     await location.save()
+    response.headers.update(etag_headers(document_etag(location)))
 
     return WorkLocationResponse(
         id=str(location.id),
@@ -4,18 +4,42 @@ Timesheet API Endpoints
 Endpoints for managing employee time entries and timesheets.
 """
 
-from fastapi import APIRouter, HTTPException, status, Query, UploadFile, File
+from fastapi import APIRouter, HTTPException, status, Query, UploadFile, File, Response
+from fastapi.responses import StreamingResponse
 from typing import List, Optional
 from datetime import datetime, date, time
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from beanie import PydanticObjectId
-import csv
-import io
-
-from ...schemas.timesheet import TimeEntry, TimesheetPeriod, TimeEntryType, TimeEntryStatus, ShiftDetails, TimesheetFileUpload, FileUploadStatus
-from ...schemas.employee import Employee
+from bson.errors import InvalidId
+from pymongo import DESCENDING
+from pymongo.errors import DuplicateKeyError
+import asyncio
+import hashlib
+import json
+from pathlib import Path
+
+from ...core.config import settings
+from ...schemas.timesheet import TimeEntry, TimesheetPeriod, TimeEntryType, TimeEntryStatus, ShiftDetails, TimesheetFileUpload, FileUploadStatus, UploadErrorClass
+from ...schemas.employee import Employee, Province
+from ...services.timesheet_rollup_service import TimesheetRollupService, TimeEntryHoursView
+from ...services.overtime_rules_service import OvertimeRulesService, OvertimeTotals, WORKED_ENTRY_TYPES
+from ...services.timesheet_aggregation_service import TimesheetAggregationService
+from ...services.timesheet_import_service import TimesheetImportService
+from ...services.timesheet_archive_service import TimesheetArchiveService
+from ...services.timesheet_calendar_service import TimesheetCalendarService
+from ...services.statutory_holiday_service import StatutoryHolidayService, STATUTORY_HOLIDAY_RULES
+from ...services.timesheet_row_parser import ParsedRow, iter_csv_batches, iter_row_batches
+from ...utils.tabular_reader import SUPPORTED_EXTENSIONS, iter_xlsx_rows
+from ...utils.pagination import InvalidCursorError, decode_cursor, encode_cursor, seek_filter
 
 router = APIRouter()
+rollup_service = TimesheetRollupService()
+overtime_service = OvertimeRulesService()
+aggregation_service = TimesheetAggregationService()
+import_service = TimesheetImportService()
+archive_service = TimesheetArchiveService()
+calendar_service = TimesheetCalendarService()
+holiday_service = StatutoryHolidayService()
 
 
 # Request/Response Models
@@ -55,6 +79,31 @@ class UpdateTimeEntryRequest(BaseModel):
     status: Optional[TimeEntryStatus] = None
 
 
+class TimeEntryListView(BaseModel):
+    """Projection of the time entry fields returned by listings"""
+    id: PydanticObjectId = Field(alias="_id")
+    employee_id: str
+    employee_number: str
+    employee_name: str
+    work_date: date
+    entry_type: TimeEntryType
+    hours_worked: float
+    regular_hours: float = 0.0
+    overtime_hours: float = 0.0
+    double_time_hours: float = 0.0
+    shift_details: Optional[ShiftDetails] = None
+    hourly_rate: Optional[float] = None
+    overtime_rate: Optional[float] = None
+    department_id: Optional[str] = None
+    department_name: Optional[str] = None
+    status: TimeEntryStatus
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        populate_by_name = True
+
+
 class ApproveTimeEntriesRequest(BaseModel):
     """Request model for approving time entries"""
     time_entry_ids: List[str]
@@ -62,6 +111,15 @@ class ApproveTimeEntriesRequest(BaseModel):
     manager_notes: Optional[str] = None
 
 
+class GenerateHolidayEntriesRequest(BaseModel):
+    """Request model for generating statutory holiday entries"""
+    start_date: date
+    end_date: date
+    employee_ids: Optional[List[str]] = None  # Default: all eligible employees
+    hours: float = Field(8.0, gt=0, le=24)
+    dry_run: bool = False
+
+
 # ============================================================================
 # TIME ENTRY ENDPOINTS
 # ============================================================================
@@ -128,7 +186,15 @@ async def create_time_entry(request: CreateTimeEntryRequest):
         status=TimeEntryStatus.DRAFT
     )
 
-    await time_entry.insert()
+    try:
+        await time_entry.insert()
+    except DuplicateKeyError:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"A {request.entry_type.value} time entry already exists for this employee on {request.work_date.isoformat()}"
+        )
+    await rollup_service.record_entry_change(None, rollup_service.snapshot(time_entry))
+    calendar_service.invalidate([time_entry.work_date])
 
     return time_entry.dict()
 
@@ -192,6 +258,12 @@ async def create_bulk_time_entries(request: BulkTimeEntryRequest):
                 "hours_worked": time_entry.hours_worked
             })
 
+        except DuplicateKeyError:
+            errors.append({
+                "employee_id": entry_request.employee_id,
+                "work_date": str(entry_request.work_date),
+                "error": f"A {entry_request.entry_type.value} time entry already exists for this date"
+            })
         except Exception as e:
             errors.append({
                 "employee_id": entry_request.employee_id,
@@ -199,6 +271,8 @@ async def create_bulk_time_entries(request: BulkTimeEntryRequest):
                 "error": str(e)
             })
 
+    calendar_service.invalidate(date.fromisoformat(entry["work_date"]) for entry in created_entries)
+
     return {
         "total_requested": len(request.entries),
         "created": len(created_entries),
@@ -208,31 +282,14 @@ async def create_bulk_time_entries(request: BulkTimeEntryRequest):
     }
 
 
-@router.get("/entries", response_model=List[dict])
-async def get_time_entries(
-    employee_id: Optional[str] = None,
-    start_date: Optional[date] = None,
-    end_date: Optional[date] = None,
-    status: Optional[TimeEntryStatus] = None,
-    pay_run_id: Optional[str] = None,
-    limit: int = 100,
-    skip: int = 0
-):
-    """
-    Get time entries with optional filtering
-
-    Args:
-        employee_id: Filter by employee
-        start_date: Filter by work date >= start_date
-        end_date: Filter by work date <= end_date
-        status: Filter by status
-        pay_run_id: Filter by pay run
-        limit: Maximum results
-        skip: Skip results
-
-    Returns:
-        List of time entries
-    """
+def _build_entries_query(
+    employee_id: Optional[str],
+    start_date: Optional[date],
+    end_date: Optional[date],
+    entry_status: Optional[TimeEntryStatus],
+    pay_run_id: Optional[str]
+) -> dict:
+    """Build the time entry filter shared by listing and export"""
     query = {}
 
     if employee_id:
@@ -245,16 +302,18 @@ async def get_time_entries(
         if end_date:
             query["work_date"]["$lte"] = end_date
 
-    if status:
-        query["status"] = status
+    if entry_status:
+        query["status"] = entry_status
 
     if pay_run_id:
         query["pay_run_id"] = pay_run_id
 
-    entries = await TimeEntry.find(query).skip(skip).limit(limit).sort("-work_date").to_list()
+    return query
 
-    # Manually serialize to avoid PydanticObjectId serialization issues
-    return [{
+
+def _serialize_entry(entry: TimeEntryListView) -> dict:
+    """Serialize a projected time entry for the listing response"""
+    return {
         "id": str(entry.id),
         "employee_id": entry.employee_id,
         "employee_number": entry.employee_number,
@@ -278,7 +337,127 @@ async def get_time_entries(
         "status": entry.status.value,
         "created_at": entry.created_at.isoformat() if entry.created_at else None,
         "updated_at": entry.updated_at.isoformat() if entry.updated_at else None
-    } for entry in entries]
+    }
+
+
+async def _list_entries(
+    query: dict,
+    response: Response,
+    limit: int,
+    skip: int = 0,
+    cursor: Optional[str] = None
+) -> List[dict]:
+    """
+    Read one page of time entries, newest first by (work_date, id)
+
+    Sets the X-Next-Cursor header when more entries follow the page.
+    """
+    if cursor:
+        try:
+            last_work_date, last_id = decode_cursor(cursor, 2)
+            seek = seek_filter(
+                ["work_date", "_id"],
+                [date.fromisoformat(last_work_date), PydanticObjectId(last_id)]
+            )
+        except (InvalidCursorError, ValueError, InvalidId):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid pagination cursor"
+            )
+        query = {**query, **seek}
+        skip = 0
+
+    entries = await TimeEntry.find(query).sort(
+        [("work_date", DESCENDING), ("_id", DESCENDING)]
+    ).skip(skip).limit(limit + 1).project(TimeEntryListView).to_list()
+
+    if len(entries) > limit:
+        entries = entries[:limit]
+        last = entries[-1]
+        response.headers["X-Next-Cursor"] = encode_cursor(last.work_date.isoformat(), last.id)
+
+    return [_serialize_entry(entry) for entry in entries]
+
+
+@router.get("/entries", response_model=List[dict])
+async def get_time_entries(
+    response: Response,
+    employee_id: Optional[str] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    status: Optional[TimeEntryStatus] = None,
+    pay_run_id: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    skip: int = Query(0, ge=0),
+    cursor: Optional[str] = None
+):
+    """
+    Get time entries with optional filtering
+
+    Entries are ordered newest first by (work_date, id). When more results
+    exist, the X-Next-Cursor response header holds a cursor for the next
+    page; pass it back as `cursor` to continue. Cursor pages cost the same
+    at any depth, while `skip` gets slower the further it goes.
+
+    Args:
+        employee_id: Filter by employee
+        start_date: Filter by work date >= start_date
+        end_date: Filter by work date <= end_date
+        status: Filter by status
+        pay_run_id: Filter by pay run
+        limit: Maximum results
+        skip: Skip results (ignored when a cursor is given)
+        cursor: Cursor from a previous page's X-Next-Cursor header
+
+    Returns:
+        List of time entries
+    """
+    query = _build_entries_query(employee_id, start_date, end_date, status, pay_run_id)
+    return await _list_entries(query, response, limit, skip, cursor)
+
+
+@router.get("/entries/export")
+async def export_time_entries(
+    start_date: date,
+    end_date: date,
+    employee_id: Optional[str] = None,
+    status: Optional[TimeEntryStatus] = None,
+    pay_run_id: Optional[str] = None
+):
+    """
+    Stream every time entry in a date range as NDJSON
+
+    Entries are written one JSON object per line, in the same shape and
+    order as GET /entries, straight from the database cursor.
+
+    Args:
+        start_date: First work date to include
+        end_date: Last work date to include
+        employee_id: Filter by employee
+        status: Filter by status
+        pay_run_id: Filter by pay run
+
+    Returns:
+        application/x-ndjson stream of time entries
+    """
+    if end_date < start_date:
+        raise HTTPException(status_code=400, detail="end_date must be on or after start_date")
+
+    query = _build_entries_query(employee_id, start_date, end_date, status, pay_run_id)
+
+    async def generate():
+        entries = TimeEntry.find(query).sort(
+            [("work_date", DESCENDING), ("_id", DESCENDING)]
+        ).project(TimeEntryListView)
+        async for entry in entries:
+            yield json.dumps(_serialize_entry(entry)) + "\n"
+
+    filename = f"time_entries_{start_date.isoformat()}_{end_date.isoformat()}.ndjson"
+    return StreamingResponse(
+        generate(),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
 
 
 @router.get("/entries/{entry_id}", response_model=dict)
@@ -336,6 +515,8 @@ async def update_time_entry(entry_id: str, request: UpdateTimeEntryRequest):
             detail="Cannot update processed time entry"
         )
 
+    before = rollup_service.snapshot(entry)
+
     # Update fields
     if request.hours_worked is not None:
         entry.hours_worked = request.hours_worked
@@ -353,6 +534,8 @@ async def update_time_entry(entry_id: str, request: UpdateTimeEntryRequest):
     entry.updated_at = datetime.utcnow()
 
     await entry.save()
+    await rollup_service.record_entry_change(before, rollup_service.snapshot(entry))
+    calendar_service.invalidate([entry.work_date])
 
     return entry.dict()
 
@@ -368,38 +551,80 @@ async def approve_time_entries(request: ApproveTimeEntriesRequest):
     Returns:
         Summary of approved entries
     """
-    approved = []
     errors = []
+    object_ids = []
 
     for entry_id in request.time_entry_ids:
         try:
-            entry = await TimeEntry.get(PydanticObjectId(entry_id))
-            if not entry:
-                errors.append({"entry_id": entry_id, "error": "Not found"})
-                continue
-
-            if entry.status == TimeEntryStatus.PROCESSED:
-                errors.append({"entry_id": entry_id, "error": "Already processed"})
-                continue
-
-            entry.status = TimeEntryStatus.APPROVED
-            entry.approved_at = datetime.utcnow()
-            entry.approved_by = request.approved_by
-            if request.manager_notes:
-                entry.manager_notes = request.manager_notes
-            entry.updated_at = datetime.utcnow()
-
-            await entry.save()
-            approved.append(entry_id)
+            object_ids.append(PydanticObjectId(entry_id))
+        except Exception:
+            errors.append({"entry_id": entry_id, "error": "Not found"})
+
+    # Classify the requested entries with a single projected read
+    existing = await rollup_service.fetch_entries(object_ids)
+    entries_by_id = {str(entry.id): entry for entry in existing}
+
+    approvable = []
+    for entry_id in object_ids:
+        entry = entries_by_id.get(str(entry_id))
+        if entry is None:
+            errors.append({"entry_id": str(entry_id), "error": "Not found"})
+        elif entry.status == TimeEntryStatus.PROCESSED:
+            errors.append({"entry_id": str(entry_id), "error": "Already processed"})
+        else:
+            approvable.append(entry)
+    approvable_ids = [entry.id for entry in approvable]
+
+    matched_count = 0
+    modified_count = 0
+    approved = []
 
-        except Exception as e:
-            errors.append({"entry_id": entry_id, "error": str(e)})
+    if approvable_ids:
+        now = datetime.utcnow()
+        update_fields = {
+            "status": TimeEntryStatus.APPROVED.value,
+            "approved_at": now,
+            "approved_by": request.approved_by,
+            "updated_at": now
+        }
+        if request.manager_notes:
+            update_fields["manager_notes"] = request.manager_notes
+
+        # Status guard protects against entries processed since the read above
+        result = await TimeEntry.find({
+            "_id": {"$in": approvable_ids},
+            "status": {"$ne": TimeEntryStatus.PROCESSED.value}
+        }).update_many({"$set": update_fields})
+
+        matched_count = result.matched_count
+        modified_count = result.modified_count
+
+        # Report only the entries this update approved: an entry processed
+        # (or approved by another request) since the read above carries
+        # another status or approval time
+        approved_ids = set(await TimeEntry.get_motor_collection().distinct("_id", {
+            "_id": {"$in": approvable_ids},
+            "status": TimeEntryStatus.APPROVED.value,
+            "approved_at": now
+        }))
+        approved = [entry for entry in approvable if entry.id in approved_ids]
+        for entry in approvable:
+            if entry.id not in approved_ids:
+                errors.append({"entry_id": str(entry.id), "error": "Changed during approval"})
+
+        await rollup_service.apply_changes([
+            (entry, entry.model_copy(update={"status": TimeEntryStatus.APPROVED}))
+            for entry in approved
+        ])
+        calendar_service.invalidate(entry.work_date for entry in approved)
 
     return {
         "total_requested": len(request.time_entry_ids),
         "approved": len(approved),
         "failed": len(errors),
-        "approved_ids": approved,
+        "matched_count": matched_count,
+        "modified_count": modified_count,
+        "approved_ids": [str(entry.id) for entry in approved],
         "errors": errors
     }
 
@@ -433,6 +658,8 @@ async def delete_time_entry(entry_id: str):
         )
 
     await entry.delete()
+    await rollup_service.record_entry_change(rollup_service.snapshot(entry), None)
+    calendar_service.invalidate([entry.work_date])
 
     return None
 
@@ -450,7 +677,9 @@ async def get_employee_timesheet_summary(
     """
     Get summary of time entries for an employee over a date range
 
-    Useful for displaying timesheet totals
+    Useful for displaying timesheet totals. Totals and the status breakdown
+    are computed in the database; the entries themselves are paged through
+    GET /summary/{employee_id}/entries.
 
     Args:
         employee_id: Employee ID
@@ -460,37 +689,285 @@ async def get_employee_timesheet_summary(
     Returns:
         Summary with total hours and breakdown
     """
-    # Fetch time entries for the period
-    entries = await TimeEntry.find({
-        "employee_id": employee_id,
-        "work_date": {"$gte": start_date, "$lte": end_date}
-    }).to_list()
-
-    # Calculate totals
-    total_hours = sum(e.hours_worked for e in entries)
-    total_regular = sum(e.regular_hours for e in entries)
-    total_overtime = sum(e.overtime_hours for e in entries)
-    total_double_time = sum(e.double_time_hours for e in entries)
-
-    # Group by status
-    status_counts = {}
-    for entry in entries:
-        status_counts[entry.status] = status_counts.get(entry.status, 0) + 1
+    summary = await aggregation_service.summarize_employee_entries(
+        employee_id=employee_id,
+        period_start_date=start_date,
+        period_end_date=end_date
+    )
+    hours = summary["hours"]
 
     return {
         "employee_id": employee_id,
         "period_start": start_date,
         "period_end": end_date,
-        "total_entries": len(entries),
-        "total_hours_worked": round(total_hours, 2),
-        "total_regular_hours": round(total_regular, 2),
-        "total_overtime_hours": round(total_overtime, 2),
-        "total_double_time_hours": round(total_double_time, 2),
-        "status_breakdown": status_counts,
-        "entries": [e.dict() for e in entries]
+        "total_entries": summary["total_entries"],
+        "total_hours_worked": round(hours["total_hours"], 2),
+        "total_regular_hours": round(hours["regular_hours"], 2),
+        "total_overtime_hours": round(hours["overtime_hours"], 2),
+        "total_double_time_hours": round(hours["double_time_hours"], 2),
+        "status_breakdown": summary["status_breakdown"]
+    }
+
+
+@router.get("/summary/{employee_id}/entries", response_model=List[dict])
+async def get_employee_timesheet_summary_entries(
+    employee_id: str,
+    start_date: date,
+    end_date: date,
+    response: Response,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None
+):
+    """
+    Page through the time entries behind an employee's timesheet summary
+
+    Entries are ordered newest first. When more entries exist, the
+    X-Next-Cursor response header holds the cursor for the next page.
+
+    Args:
+        employee_id: Employee ID
+        start_date: Period start date
+        end_date: Period end date
+        limit: Maximum results
+        cursor: Cursor from a previous page's X-Next-Cursor header
+
+    Returns:
+        List of time entries
+    """
+    query = _build_entries_query(employee_id, start_date, end_date, None, None)
+    return await _list_entries(query, response, limit, cursor=cursor)
+
+
+# ============================================================================
+# WORK CALENDAR ENDPOINTS
+# ============================================================================
+
+@router.get("/calendar", response_model=dict)
+async def get_work_calendar(
+    year: int = Query(..., ge=2000, le=2100),
+    month: int = Query(..., ge=1, le=12)
+):
+    """
+    Get hours and entry counts per day and department for a month
+
+    Computed with one aggregation over the month's entries (rejected
+    entries excluded) and cached until an entry in that month changes.
+
+    Args:
+        year: Calendar year
+        month: Calendar month (1-12)
+
+    Returns:
+        Month calendar with one item per day, per-department breakdowns
+        and month totals
+    """
+    return await calendar_service.get_month_calendar(year, month)
+
+
+# ============================================================================
+# STATUTORY HOLIDAY ENDPOINTS
+# ============================================================================
+
+@router.get("/holidays", response_model=dict)
+async def get_statutory_holidays(
+    year: int = Query(..., ge=2000, le=2100),
+    province: Optional[str] = Query(None, description="Province code or name; all provinces if omitted")
+):
+    """
+    Get statutory holidays for a year
+
+    Args:
+        year: Calendar year
+        province: Optional province code ("ON") or name ("Ontario")
+
+    Returns:
+        Holidays per province code, each with date and name
+    """
+    if province is not None:
+        # get_province_code falls back to a default for unknown names
+        province_code = overtime_service.get_province_code(province)
+        if province.strip().lower() not in (province_code.lower(), Province[province_code].value.lower()):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown province: {province}"
+            )
+        provinces = [province_code]
+    else:
+        provinces = list(STATUTORY_HOLIDAY_RULES)
+
+    return {
+        "year": year,
+        "holidays": {
+            province_code: [
+                {"date": holiday.date.isoformat(), "name": holiday.name}
+                for holiday in holiday_service.get_holidays(province_code, year)
+            ]
+            for province_code in provinces
+        }
     }
 
 
+@router.post("/holidays/generate", response_model=dict)
+async def generate_statutory_holiday_entries(request: GenerateHolidayEntriesRequest):
+    """
+    Create draft holiday entries for eligible employees
+
+    Each active employee eligible for statutory holiday pay gets a
+    STAT_HOLIDAY entry for every holiday of their province of employment
+    in the range, inserted a batch of employees at a time. Holidays that
+    already have an entry are skipped.
+
+    Args:
+        request: Date range, optional employees, hours and dry_run
+
+    Returns:
+        Counts of entries built, created and skipped
+    """
+    if request.end_date < request.start_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="end_date must be on or after start_date"
+        )
+
+    result = await holiday_service.generate_holiday_entries(
+        start_date=request.start_date,
+        end_date=request.end_date,
+        employee_ids=request.employee_ids,
+        hours=request.hours,
+        dry_run=request.dry_run
+    )
+
+    if not request.dry_run:
+        calendar_service.invalidate(result.pop("work_dates"))
+
+    return result
+
+
+# ============================================================================
+# TIMESHEET PERIOD ROLLUP ENDPOINTS
+# ============================================================================
+
+@router.post("/periods/repair", response_model=dict)
+async def repair_timesheet_period_rollups(
+    start_date: date,
+    end_date: date,
+    employee_id: Optional[str] = None,
+    dry_run: bool = False
+):
+    """
+    Recompute timesheet period rollups from raw entries
+
+    Reports every period whose stored totals drifted from its approved
+    entries and, unless dry_run is set, rewrites them.
+
+    Args:
+        start_date: First work date to recompute
+        end_date: Last work date to recompute
+        employee_id: Optionally limit to one employee
+        dry_run: Report drift without writing
+
+    Returns:
+        Drift report
+    """
+    if end_date < start_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="end_date must be on or after start_date"
+        )
+
+    return await rollup_service.repair_rollups(
+        start_date=start_date,
+        end_date=end_date,
+        employee_ids=[employee_id] if employee_id else None,
+        dry_run=dry_run
+    )
+
+
+# ============================================================================
+# TIME ENTRY ARCHIVE ENDPOINTS
+# ============================================================================
+
+@router.post("/archive", response_model=dict)
+async def archive_processed_time_entries(
+    months: Optional[int] = Query(None, ge=1, description="Whole months to keep live (default TIMESHEET_ARCHIVE_AFTER_MONTHS)"),
+    dry_run: bool = False
+):
+    """
+    Archive processed time entries older than a number of whole months
+
+    Entries are moved into one archive bucket per employee and month and
+    removed from the live collection. Summaries, pay run hours and rollup
+    repairs keep including them. Safe to re-run after an interruption.
+
+    Args:
+        months: Whole months before the current month to keep live
+        dry_run: Only count the entries that would be archived
+
+    Returns:
+        Archive summary with the cutoff date
+    """
+    return await archive_service.archive_processed_entries(
+        months=months or settings.TIMESHEET_ARCHIVE_AFTER_MONTHS,
+        dry_run=dry_run
+    )
+
+
+@router.get("/archive/{employee_id}", response_model=List[dict])
+async def get_archived_time_entries(
+    employee_id: str,
+    start_date: date,
+    end_date: date
+):
+    """
+    Get an employee's archived time entries, one bucket per month
+
+    Args:
+        employee_id: Employee ID
+        start_date: First work date
+        end_date: Last work date
+
+    Returns:
+        Monthly buckets with their totals and entries in the date range
+    """
+    if end_date < start_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="end_date must be on or after start_date"
+        )
+
+    buckets = await archive_service.get_employee_buckets(employee_id, start_date, end_date)
+
+    return [
+        {
+            "month": bucket.month_start.strftime("%Y-%m"),
+            "employee_id": bucket.employee_id,
+            "employee_number": bucket.employee_number,
+            "employee_name": bucket.employee_name,
+            "entry_count": bucket.entry_count,
+            "total_hours_worked": bucket.total_hours_worked,
+            "total_regular_hours": bucket.total_regular_hours,
+            "total_overtime_hours": bucket.total_overtime_hours,
+            "total_double_time_hours": bucket.total_double_time_hours,
+            "entries": [
+                {
+                    "id": str(entry.entry_id),
+                    "work_date": entry.work_date.isoformat(),
+                    "entry_type": entry.entry_type.value,
+                    "hours_worked": entry.hours_worked,
+                    "regular_hours": entry.regular_hours,
+                    "overtime_hours": entry.overtime_hours,
+                    "double_time_hours": entry.double_time_hours,
+                    "hourly_rate": entry.hourly_rate,
+                    "pay_run_id": entry.pay_run_id
+                }
+                for entry in sorted(bucket.entries, key=lambda entry: entry.work_date)
+                if start_date <= entry.work_date <= end_date
+            ]
+        }
+        for bucket in buckets
+    ]
+
+
 # ============================================================================
 # FILE UPLOAD MANAGEMENT ENDPOINTS
 # ============================================================================
@@ -535,9 +1012,8 @@ async def get_file_uploads(
     } for upload in uploads]
 
 
-@router.get("/uploads/{upload_id}", response_model=dict)
-async def get_file_upload(upload_id: str):
-    """Get detailed information about a specific file upload"""
+async def _get_upload_or_404(upload_id: str) -> TimesheetFileUpload:
+    """Load a file upload record or raise 404"""
     try:
         upload = await TimesheetFileUpload.get(PydanticObjectId(upload_id))
     except Exception:
@@ -552,6 +1028,22 @@ async def get_file_upload(upload_id: str):
             detail=f"File upload {upload_id} not found"
         )
 
+    return upload
+
+
+@router.get("/uploads/{upload_id}", response_model=dict)
+async def get_file_upload(upload_id: str, error_limit: int = Query(50, ge=0, le=500)):
+    """
+    Get detailed information about a specific file upload
+
+    Returns the upload summary with error counts per class and the first
+    page of errors. Use errors_next_cursor with GET /uploads/{id}/errors
+    to read the rest.
+    """
+    upload = await _get_upload_or_404(upload_id)
+
+    errors, next_cursor = await _upload_errors_preview(upload, error_limit) if error_limit else ([], None)
+
     return {
         "id": str(upload.id),
         "file_name": upload.file_name,
@@ -561,315 +1053,773 @@ async def get_file_upload(upload_id: str):
         "total_rows": upload.total_rows,
         "entries_created": upload.entries_created,
         "entries_failed": upload.entries_failed,
-        "time_entry_ids": upload.time_entry_ids,
+        "duplicates_skipped": upload.duplicates_skipped,
+        "content_hash": upload.content_hash,
         "employee_ids": upload.employee_ids,
         "employee_count": upload.employee_count,
         "date_range": {
             "start": upload.date_range_start.isoformat() if upload.date_range_start else None,
             "end": upload.date_range_end.isoformat() if upload.date_range_end else None
         },
-        "errors": upload.errors,
+        "error_counts": _upload_error_counts(upload),
+        "errors": errors,
+        "errors_next_cursor": next_cursor,
         "processing_notes": upload.processing_notes
     }
 
 
-@router.delete("/uploads/{upload_id}", status_code=status.HTTP_204_NO_CONTENT)
+@router.get("/uploads/{upload_id}/errors", response_model=dict)
+async def get_file_upload_errors(
+    upload_id: str,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    error_class: Optional[UploadErrorClass] = None
+):
+    """
+    Page through the rows that failed in a file upload
+
+    Args:
+        upload_id: File upload ID
+        limit: Maximum errors to return
+        cursor: next_cursor from the previous page
+        error_class: Only return errors of this class
+
+    Returns:
+        Errors in file order and the cursor for the next page
+    """
+    upload = await _get_upload_or_404(upload_id)
+
+    # Uploads made before errors moved to their own collection keep them inline
+    if upload.errors:
+        errors = upload.errors
+        if error_class:
+            errors = [e for e in errors if e.get("error_class", UploadErrorClass.OTHER.value) == error_class.value]
+        try:
+            offset = int(cursor) if cursor else 0
+        except ValueError:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid pagination cursor")
+        page = errors[offset:offset + limit]
+        next_cursor = str(offset + limit) if offset + limit < len(errors) else None
+    else:
+        try:
+            page, next_cursor = await import_service.get_upload_errors(upload_id, limit, cursor, error_class)
+        except InvalidId:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid pagination cursor")
+
+    return {
+        "upload_id": upload_id,
+        "errors": page,
+        "next_cursor": next_cursor
+    }
+
+
+# Approved entries backed out of their rollups per batch when deleting an upload
+UPLOAD_DELETE_BATCH_SIZE = 1000
+
+
+@router.delete("/uploads/{upload_id}", response_model=dict)
 async def delete_file_upload(upload_id: str, delete_entries: bool = False):
     """
     Delete a file upload record
 
+    Processed entries are kept because they are linked to a pay run.
+
     Args:
         upload_id: File upload ID
         delete_entries: If True, also delete all associated time entries
-    """
-    try:
-        upload = await TimesheetFileUpload.get(PydanticObjectId(upload_id))
-    except Exception:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"File upload {upload_id} not found"
-        )
-
-    if not upload:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"File upload {upload_id} not found"
-        )
 
-    # Optionally delete associated time entries
-    if delete_entries and upload.time_entry_ids:
-        for entry_id in upload.time_entry_ids:
-            try:
-                entry = await TimeEntry.get(PydanticObjectId(entry_id))
-                if entry:
-                    await entry.delete()
-            except Exception:
-                # Continue even if some entries fail to delete
-                pass
+    Returns:
+        Counts of time entries requested and deleted
+    """
+    upload = await _get_upload_or_404(upload_id)
+
+    requested_count = 0
+    deleted_count = 0
+
+    if delete_entries:
+        # Entries are tagged with their upload; uploads made before that
+        # list their entry IDs instead
+        entry_filters = [{"upload_id": upload_id}]
+        for offset in range(0, len(upload.time_entry_ids), UPLOAD_DELETE_BATCH_SIZE):
+            entry_object_ids = []
+            for entry_id in upload.time_entry_ids[offset:offset + UPLOAD_DELETE_BATCH_SIZE]:
+                try:
+                    entry_object_ids.append(PydanticObjectId(entry_id))
+                except Exception:
+                    continue
+            entry_filters.append({"_id": {"$in": entry_object_ids}})
+
+        for entry_filter in entry_filters:
+            requested_count += await TimeEntry.find(entry_filter).count()
+
+            # Approved entries are counted in period rollups and must be
+            # backed out, a batch at a time
+            while True:
+                approved_entries = await TimeEntry.find({
+                    **entry_filter,
+                    "status": TimeEntryStatus.APPROVED.value
+                }).limit(UPLOAD_DELETE_BATCH_SIZE).project(TimeEntryHoursView).to_list()
+                if not approved_entries:
+                    break
+
+                result = await TimeEntry.find({
+                    "_id": {"$in": [entry.id for entry in approved_entries]},
+                    "status": TimeEntryStatus.APPROVED.value
+                }).delete()
+                deleted_count += result.deleted_count if result else 0
+                await rollup_service.apply_changes([(entry, None) for entry in approved_entries])
+
+            result = await TimeEntry.find({
+                **entry_filter,
+                "status": {"$ne": TimeEntryStatus.PROCESSED.value}
+            }).delete()
+            deleted_count += result.deleted_count if result else 0
+
+        calendar_service.invalidate_range(upload.date_range_start, upload.date_range_end)
 
     # Delete the upload record
+    await import_service.delete_upload_errors(str(upload.id))
     await upload.delete()
 
-    return None
+    return {
+        "file_upload_id": upload_id,
+        "requested_count": requested_count,
+        "deleted_count": deleted_count
+    }
 
 
 # ============================================================================
 # CSV UPLOAD ENDPOINT
 # ============================================================================
 
+# Bytes read at a time when hashing an uploaded file
+UPLOAD_HASH_CHUNK_SIZE = 1024 * 1024
+
+# Errors returned inline with an upload; the rest are paged from /uploads/{id}/errors
+UPLOAD_ERRORS_PREVIEW_SIZE = 100
+
+# Created entries and skipped duplicates returned inline with an upload;
+# the response counts all of them
+UPLOAD_ENTRIES_PREVIEW_SIZE = 100
+
+# Errors returned by a dry run, which has no stored errors to page through
+DRY_RUN_ERRORS_LIMIT = 5000
+
+# Alternative column headers accepted in uploaded timesheets
+TIMESHEET_HEADER_ALIASES = {
+    "employee": "employee_id",
+    "emp_id": "employee_id",
+    "employee_no": "employee_number",
+    "emp_no": "employee_number",
+    "name": "employee_name",
+    "date": "work_date",
+    "work_day": "work_date",
+    "type": "entry_type",
+    "hours": "hours_worked",
+    "total_hours": "hours_worked",
+    "regular": "regular_hours",
+    "overtime": "overtime_hours",
+    "start": "shift_start",
+    "start_time": "shift_start",
+    "end": "shift_end",
+    "end_time": "shift_end",
+    "break": "break_minutes",
+    "break_duration_minutes": "break_minutes",
+    "rate": "hourly_rate",
+}
+
+
+def _guard_rows(rows, errors: List[dict]):
+    """Yield rows, recording a read failure part-way through as an error"""
+    try:
+        yield from rows
+    except Exception as e:
+        errors.append({
+            "row": None,
+            "error": f"Stopped reading file: {str(e)}",
+            "error_class": UploadErrorClass.READ_FAILED,
+            "data": None
+        })
+
+
+async def _guard_batches(batches, errors: List[dict]):
+    """Yield parsed batches, recording a read failure part-way through as an error"""
+    try:
+        async for batch in batches:
+            yield batch
+    except Exception as e:
+        errors.append({
+            "row": None,
+            "error": f"Stopped reading file: {str(e)}",
+            "error_class": UploadErrorClass.READ_FAILED,
+            "data": None
+        })
+
+
+def _count_holiday_work(entries, employee_rules: dict) -> int:
+    """Count worked entries that fall on a statutory holiday of the employee's province"""
+    count = 0
+    for entry in entries:
+        entry_type = getattr(entry.entry_type, "value", entry.entry_type)
+        if entry_type not in WORKED_ENTRY_TYPES:
+            continue
+        province = employee_rules.get(entry.employee_id, {}).get("province")
+        if holiday_service.get_holiday(province, entry.work_date):
+            count += 1
+    return count
+
+
+def _parsed_row_data(row: ParsedRow) -> dict:
+    """Row values reported with an error for a row that parsed cleanly"""
+    return {
+        "employee_id": row.employee_id,
+        "work_date": row.work_date.isoformat(),
+        "entry_type": row.entry_type,
+        "hours_worked": row.hours_worked
+    }
+
+
+async def _hash_upload(file: UploadFile) -> tuple:
+    """Compute the SHA-256 and size of an uploaded file, reading it in chunks"""
+    digest = hashlib.sha256()
+    size = 0
+    while True:
+        chunk = await file.read(UPLOAD_HASH_CHUNK_SIZE)
+        if not chunk:
+            break
+        digest.update(chunk)
+        size += len(chunk)
+    await file.seek(0)
+    return digest.hexdigest(), size
+
+
+async def _upload_errors_preview(file_upload: TimesheetFileUpload, limit: int) -> tuple:
+    """
+    First page of an upload's errors and the cursor for the next page
+
+    Uploads made before errors moved to their own collection keep them inline.
+    """
+    if file_upload.errors:
+        return file_upload.errors[:limit], None
+    return await import_service.get_upload_errors(str(file_upload.id), limit)
+
+
+def _upload_error_counts(file_upload: TimesheetFileUpload) -> dict:
+    """Error counts per class, derived from inline errors on older uploads"""
+    if file_upload.error_counts or not file_upload.errors:
+        return file_upload.error_counts
+    return import_service.count_error_classes(file_upload.errors)
+
+
+async def _previous_upload_response(file_upload: TimesheetFileUpload) -> dict:
+    """Build the upload response for a file that was already processed"""
+    errors, next_cursor = await _upload_errors_preview(file_upload, UPLOAD_ERRORS_PREVIEW_SIZE)
+    uploaded_at = file_upload.uploaded_at.strftime("%Y-%m-%d %H:%M UTC")
+    return {
+        "success": True,
+        "already_uploaded": True,
+        "file_upload_id": str(file_upload.id),
+        "file_name": file_upload.file_name,
+        "total_rows": file_upload.total_rows,
+        "created": file_upload.entries_created,
+        "failed": file_upload.entries_failed,
+        "skipped_duplicates": file_upload.duplicates_skipped,
+        "status": file_upload.status.value,
+        "message": (
+            f"This file was already uploaded on {uploaded_at}. "
+            "Showing the results of that upload; upload again with force=true to reprocess it."
+        ),
+        "date_range": {
+            "start": file_upload.date_range_start.isoformat() if file_upload.date_range_start else None,
+            "end": file_upload.date_range_end.isoformat() if file_upload.date_range_end else None
+        },
+        "employee_count": file_upload.employee_count,
+        "entries": [],
+        "entries_truncated": file_upload.entries_created > 0,
+        "error_counts": _upload_error_counts(file_upload),
+        "errors": errors,
+        "errors_truncated": next_cursor is not None,
+        "duplicates": [],
+        "duplicates_truncated": file_upload.duplicates_skipped > 0
+    }
+
+
+def _new_upload_results() -> dict:
+    """Running counts of an upload's outcome, with a capped preview of each"""
+    return {
+        "created": 0,
+        "skipped_duplicates": 0,
+        "failed": 0,
+        "error_counts": {},
+        "entries": [],
+        "duplicates": [],
+        "errors": []
+    }
+
+
+def _extend_preview(preview: List[dict], items: List[dict], limit: int) -> None:
+    """Add items to a preview until it holds limit of them"""
+    preview.extend(items[:max(limit - len(preview), 0)])
+
+
+async def _record_batch_results(
+    results: dict,
+    errors: List[dict],
+    duplicates: List[dict],
+    upload_id: Optional[str],
+    error_limit: int
+) -> None:
+    """
+    Add a batch's errors and skipped duplicates to the upload results
+
+    Both are put in file order. The errors of a real upload are stored
+    right away, so only the previews stay in memory. errors is emptied in
+    place, as _guard_rows and _guard_batches append read failures to it.
+    """
+    errors.sort(key=lambda error: (error["row"] is None, error["row"] or 0))
+    duplicates.sort(key=lambda duplicate: duplicate["row"])
+
+    if upload_id:
+        error_counts = await import_service.store_upload_errors(upload_id, errors)
+    else:
+        error_counts = import_service.count_error_classes(errors)
+    for error_class, count in error_counts.items():
+        results["error_counts"][error_class] = results["error_counts"].get(error_class, 0) + count
+
+    results["failed"] += len(errors)
+    results["skipped_duplicates"] += len(duplicates)
+    _extend_preview(results["errors"], errors, error_limit)
+    _extend_preview(results["duplicates"], duplicates, UPLOAD_ENTRIES_PREVIEW_SIZE)
+    errors.clear()
+
+
+def _new_dry_run_summary() -> dict:
+    """Running totals of the entries a dry-run upload would create"""
+    return {
+        "would_create": 0,
+        "employee_ids": set(),
+        "date_range_start": None,
+        "date_range_end": None,
+        "regular": 0.0,
+        "overtime": 0.0,
+        "double_time": 0.0,
+        "entries_with_overtime": 0,
+        "holiday_work_entries": 0
+    }
+
+
+def _tally_dry_run_batch(
+    summary: dict,
+    batch_entries: List[tuple],
+    existing_keys: set,
+    skipped_duplicates: List[dict],
+    employee_rules: dict
+) -> None:
+    """
+    Add a dry-run batch to the summary
+
+    Entries whose key already exists are reported as the duplicates a real
+    upload would skip; the others are added to the counts and hour totals.
+    """
+    would_create = []
+    for row_number, row, entry in batch_entries:
+        if (entry.employee_id, entry.work_date, entry.entry_type) in existing_keys:
+            skipped_duplicates.append({
+                "row": row_number,
+                "employee_name": entry.employee_name,
+                "work_date": entry.work_date.isoformat(),
+                "already_exists": True
+            })
+        else:
+            would_create.append(entry)
+
+    for entry in would_create:
+        summary["employee_ids"].add(entry.employee_id)
+        if summary["date_range_start"] is None or entry.work_date < summary["date_range_start"]:
+            summary["date_range_start"] = entry.work_date
+        if summary["date_range_end"] is None or entry.work_date > summary["date_range_end"]:
+            summary["date_range_end"] = entry.work_date
+        summary["regular"] += entry.regular_hours
+        summary["overtime"] += entry.overtime_hours
+        summary["double_time"] += entry.double_time_hours
+        if entry.overtime_hours or entry.double_time_hours:
+            summary["entries_with_overtime"] += 1
+
+    summary["would_create"] += len(would_create)
+    summary["holiday_work_entries"] += _count_holiday_work(would_create, employee_rules)
+
+
+def _dry_run_report(
+    file_name: str,
+    total_rows: int,
+    summary: dict,
+    results: dict,
+    previous_upload: Optional[TimesheetFileUpload]
+) -> dict:
+    """
+    Build the validation report of a dry-run upload
+
+    Counts and hour totals cover the entries that would be created (see
+    _tally_dry_run_batch).
+    """
+    return {
+        "success": True,
+        "dry_run": True,
+        "valid": results["failed"] == 0,
+        "file_name": file_name,
+        "total_rows": total_rows,
+        "would_create": summary["would_create"],
+        "failed": results["failed"],
+        "skipped_duplicates": results["skipped_duplicates"],
+        "date_range": {
+            "start": summary["date_range_start"].isoformat() if summary["date_range_start"] else None,
+            "end": summary["date_range_end"].isoformat() if summary["date_range_end"] else None
+        },
+        "employee_count": len(summary["employee_ids"]),
+        "hours": {
+            "regular": round(summary["regular"], 2),
+            "overtime": round(summary["overtime"], 2),
+            "double_time": round(summary["double_time"], 2)
+        },
+        "entries_with_overtime": summary["entries_with_overtime"],
+        "holiday_work_entries": summary["holiday_work_entries"],
+        "previous_upload_id": str(previous_upload.id) if previous_upload else None,
+        "error_counts": results["error_counts"],
+        "errors": results["errors"],
+        "errors_truncated": results["failed"] > len(results["errors"]),
+        "duplicates": results["duplicates"],
+        "duplicates_truncated": results["skipped_duplicates"] > len(results["duplicates"])
+    }
+
+
 @router.post("/upload", response_model=dict, status_code=status.HTTP_201_CREATED)
-async def upload_timesheet_csv(file: UploadFile = File(...)):
+async def upload_timesheet_csv(
+    response: Response,
+    file: UploadFile = File(...),
+    force: bool = False,
+    dry_run: bool = False
+):
     """
-    Upload and process a CSV timesheet file
+    Upload and process a CSV or XLSX timesheet file
 
-    Expected CSV format:
+    Expected columns:
     employee_id,employee_number,employee_name,work_date,entry_type,hours_worked,
     regular_hours,overtime_hours,shift_start,shift_end,break_minutes,department,
     job_title,hourly_rate,notes
 
+    Headers are matched case-insensitively and common alternatives such as
+    "Employee ID" or "Date" are accepted. XLSX workbooks are streamed from
+    the first worksheet in read-only mode.
+
+    Regular, overtime and double-time hours are recomputed from hours_worked
+    using the employee's provincial overtime rules; hours already stored for
+    the same employee and week count towards the limits. Within a week,
+    entries are classified in work date order, then file order within a
+    day. Batches are classified as they are read, so when a later batch
+    holds an earlier date of a week already classified, that week's
+    entries are classified again in date order once every batch is stored;
+    the split does not depend on how the file is sorted. A dry run does
+    not reclassify: its hour totals are the same in any order, but
+    entries_with_overtime follows file order for such weeks. Worked entries
+    falling on a statutory holiday of the employee's province are counted
+    in holiday_work_entries.
+
+    Rows are parsed and validated without touching the database, off the
+    event loop: CSV files are streamed in chunks, parsed in parallel worker
+    processes when large and in a thread otherwise, and XLSX rows are read
+    in a worker thread. Each parsed batch's employees
+    are then loaded with a single query, and its entries are classified
+    and inserted before the next batch is read, so memory does not grow
+    with the number of rows.
+
+    Rows matching an existing entry for the same employee, work date and
+    entry type are reported as skipped duplicates.
+
+    Created entries are tagged with the upload's ID. The response counts
+    created entries, skipped duplicates and errors, and lists only the
+    first of each; failed rows are stored batch by batch and paged from
+    GET /uploads/{id}/errors.
+
+    The SHA-256 of the file is stored on the upload record. If the same
+    file was processed before with a completed or partially completed
+    status, the latest such upload's results are returned with status 200
+    and nothing is parsed, unless force is set. Failed uploads are retried.
+
+    With dry_run, the file goes through the same parsing, employee,
+    duplicate and overtime checks but nothing is written: no upload record
+    is created and existing entries are found with a key lookup instead of
+    the unique index. A validation report is returned (see
+    _dry_run_report).
+
     Args:
-        file: CSV file upload
+        file: CSV or XLSX file upload
+        force: Process the file even if it was uploaded before
+        dry_run: Validate the file without writing anything
 
     Returns:
-        Summary of created entries and errors including file upload record
+        Summary of created entries and errors including file upload record,
+        or the validation report for a dry run
     """
     # Validate file type
-    if not file.filename.endswith('.csv'):
+    extension = Path(file.filename or "").suffix.lower()
+    if extension not in SUPPORTED_EXTENSIONS:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Only CSV files are allowed"
+            detail="Only CSV or XLSX files are allowed"
         )
 
-    # Read file content
+    content_hash, file_size = await _hash_upload(file)
+
+    # Return the latest results if this exact file was already processed
+    # successfully; a file whose uploads all failed is processed again
+    previous_upload = None
+    if not force or dry_run:
+        previous_upload = await TimesheetFileUpload.find(
+            {
+                "content_hash": content_hash,
+                "status": {"$in": [
+                    FileUploadStatus.COMPLETED.value,
+                    FileUploadStatus.PARTIALLY_COMPLETED.value
+                ]}
+            }
+        ).sort("-uploaded_at").first_or_none()
+
+        if previous_upload and not dry_run:
+            response.status_code = status.HTTP_200_OK
+            return await _previous_upload_response(previous_upload)
+
+    # Open the file; rows are parsed and validated in batches below
+    read_errors = []
     try:
-        content = await file.read()
-        decoded_content = content.decode('utf-8')
-        file_size = len(content)
+        if extension == ".xlsx":
+            # Opening the workbook and reading its rows block, so both run in a thread
+            rows = await asyncio.to_thread(iter_xlsx_rows, file.file, TIMESHEET_HEADER_ALIASES)
+            batches = iter_row_batches(_guard_rows(rows, read_errors))
+        else:
+            batches = iter_csv_batches(file.file, TIMESHEET_HEADER_ALIASES, size=file_size)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Failed to read CSV file: {str(e)}"
+            detail=f"Failed to read {extension.lstrip('.').upper()} file: {str(e)}"
         )
 
     # Create file upload record
-    file_upload = TimesheetFileUpload(
-        file_name=file.filename,
-        file_size=file_size,
-        status=FileUploadStatus.PROCESSING,
-        uploaded_at=datetime.utcnow()
-    )
-    await file_upload.insert()
-
-    # Parse CSV
-    csv_reader = csv.DictReader(io.StringIO(decoded_content))
+    upload_id = None
+    if not dry_run:
+        file_upload = TimesheetFileUpload(
+            file_name=file.filename,
+            file_size=file_size,
+            content_hash=content_hash,
+            status=FileUploadStatus.PROCESSING,
+            uploaded_at=datetime.utcnow()
+        )
+        await file_upload.insert()
+        upload_id = str(file_upload.id)
 
-    created_entries = []
-    errors = []
-    skipped_duplicates = []
-    row_number = 1  # Start at 1 (header is row 0)
+    # Errors of the current batch; they are stored and counted once it is done
+    errors = read_errors
+    error_limit = DRY_RUN_ERRORS_LIMIT if dry_run else UPLOAD_ERRORS_PREVIEW_SIZE
+    results = _new_upload_results()
+    total_rows = 0
 
-    # Track metadata
+    # Only running keys and totals are kept across batches; each batch's
+    # entries are classified and written before the next batch is read
     employee_ids_set = set()
-    work_dates = []
+    date_range_start = None
+    date_range_end = None
+    seen_keys = set()
+    employee_rules = {}
+    employees = {}
+    overtime_totals = OvertimeTotals()
+    holiday_work_entries = 0
+    dry_run_summary = _new_dry_run_summary()
+
+    async for batch in _guard_batches(batches, errors):
+        total_rows += batch.row_count
+        batch_duplicates = []
+
+        for row_error in batch.errors:
+            errors.append({
+                "row": batch.first_row + row_error.index,
+                "error": row_error.error,
+                "error_class": row_error.error_class,
+                "data": row_error.data
+            })
 
-    for row in csv_reader:
-        row_number += 1
-        try:
-            # Parse required fields
-            employee_id = row.get('employee_id', '').strip()
-            work_date_str = row.get('work_date', '').strip()
+        # Load the batch's employees not seen in earlier batches in one query
+        unseen_ids = {row.employee_id for row in batch.rows} - employees.keys()
+        if unseen_ids:
+            employees.update(await import_service.fetch_employees(unseen_ids))
 
-            if not employee_id or not work_date_str:
-                errors.append({
-                    "row": row_number,
-                    "error": "Missing required field: employee_id or work_date",
-                    "data": row
-                })
-                continue
-
-            # Verify employee exists
+        batch_entries = []
+        for row in batch.rows:
+            row_number = batch.first_row + row.index
             try:
-                employee = await Employee.get(PydanticObjectId(employee_id))
+                employee = employees.get(row.employee_id)
+                if not employee:
+                    errors.append({
+                        "row": row_number,
+                        "error": f"Employee {row.employee_id} not found",
+                        "error_class": UploadErrorClass.EMPLOYEE_NOT_FOUND,
+                        "data": _parsed_row_data(row)
+                    })
+                    continue
+
+                if date_range_start is None or row.work_date < date_range_start:
+                    date_range_start = row.work_date
+                if date_range_end is None or row.work_date > date_range_end:
+                    date_range_end = row.work_date
+
+                # Skip repeats within the file; entries already in the database
+                # are rejected by the unique index when inserted
+                entry_key = (str(employee.id), row.work_date, row.entry_type)
+                if entry_key in seen_keys:
+                    batch_duplicates.append({
+                        "row": row_number,
+                        "employee_name": f"{employee.first_name} {employee.last_name}",
+                        "work_date": row.work_date.isoformat()
+                    })
+                    continue
+
+                if dry_run:
+                    time_entry = import_service.build_dry_run_entry(row, employee)
+                else:
+                    time_entry = import_service.build_time_entry(row, employee, upload_id)
+
+                batch_entries.append((row_number, row, time_entry))
+                seen_keys.add(entry_key)
+                employee_rules[str(employee.id)] = {
+                    "province": employee.province_of_employment,
+                    "worker_category": employee.worker_category
+                }
+
             except Exception as e:
-                print(f"DEBUG: Row {row_number} - Error getting employee {employee_id}: {str(e)}")
                 errors.append({
                     "row": row_number,
-                    "error": f"Employee {employee_id} not found: {str(e)}",
-                    "data": row
+                    "error": str(e),
+                    "error_class": UploadErrorClass.OTHER,
+                    "data": _parsed_row_data(row)
                 })
-                continue
 
-            if not employee:
-                errors.append({
-                    "row": row_number,
-                    "error": f"Employee {employee_id} not found",
-                    "data": row
-                })
-                continue
+        # Find entries that already exist and add the hours stored for the
+        # batch's employee weeks to the overtime totals
+        stored_keys = await import_service.find_existing_entry_keys(
+            ((time_entry.employee_id, row.work_date, row.entry_type) for _, row, time_entry in batch_entries),
+            overtime_totals
+        )
 
-            # Get employee name early for error messages
-            employee_name = f"{employee.first_name} {employee.last_name}"
+        # Compute regular/overtime/double-time splits, continuing the weekly
+        # totals of stored entries and earlier batches
+        overtime_service.apply(
+            (
+                time_entry for _, row, time_entry in batch_entries
+                if (time_entry.employee_id, row.work_date, row.entry_type) not in stored_keys
+            ),
+            employee_rules,
+            overtime_totals
+        )
 
-            # Parse date
-            try:
-                work_date = datetime.strptime(work_date_str, '%Y-%m-%d').date()
-                work_dates.append(work_date)
-            except ValueError:
-                errors.append({
-                    "row": row_number,
-                    "error": f"Invalid date format: {work_date_str}. Expected YYYY-MM-DD",
-                    "data": row
-                })
-                continue
+        if dry_run:
+            _tally_dry_run_batch(dry_run_summary, batch_entries, stored_keys, batch_duplicates, employee_rules)
+            await _record_batch_results(results, errors, batch_duplicates, upload_id, error_limit)
+            continue
 
-            # Check if entry already exists for this employee and date
-            existing_entry = await TimeEntry.find_one({
-                "employee_id": str(employee.id),
-                "work_date": work_date
-            })
+        # Insert in bulk; the unique index rejects entries that already exist
+        insert_result = await import_service.insert_entries(
+            [time_entry for _, _, time_entry in batch_entries]
+        )
+        duplicate_positions = set(insert_result["duplicates"])
 
-            if existing_entry:
-                skipped_duplicates.append({
+        for position, (row_number, row, time_entry) in enumerate(batch_entries):
+            if position in duplicate_positions:
+                batch_duplicates.append({
                     "row": row_number,
-                    "employee_name": employee_name,
-                    "work_date": work_date_str
+                    "employee_name": time_entry.employee_name,
+                    "work_date": time_entry.work_date.isoformat()
                 })
-                continue
-
-            # Parse entry type
-            entry_type_str = row.get('entry_type', 'regular').strip().lower()
-            try:
-                entry_type = TimeEntryType(entry_type_str)
-            except ValueError:
-                entry_type = TimeEntryType.REGULAR
-
-            # Parse hours
-            try:
-                hours_worked = float(row.get('hours_worked', 0) or 0)
-                regular_hours = float(row.get('regular_hours', 0) or 0)
-                overtime_hours = float(row.get('overtime_hours', 0) or 0)
-            except ValueError:
+            elif position in insert_result["failed"]:
                 errors.append({
                     "row": row_number,
-                    "error": "Invalid hours format",
-                    "data": row
+                    "error": insert_result["failed"][position],
+                    "error_class": UploadErrorClass.WRITE_FAILED,
+                    "data": _parsed_row_data(row)
                 })
-                continue
-
-            # Parse shift details
-            shift_details = None
-            shift_start_str = row.get('shift_start', '').strip()
-            shift_end_str = row.get('shift_end', '').strip()
-
-            if shift_start_str and shift_end_str:
-                try:
-                    # Validate time format (HH:MM) but store as string
-                    datetime.strptime(shift_start_str, '%H:%M')
-                    datetime.strptime(shift_end_str, '%H:%M')
-                    break_minutes = int(row.get('break_minutes', 0) or 0)
-
-                    shift_details = ShiftDetails(
-                        shift_start=shift_start_str,  # Store as string
-                        shift_end=shift_end_str,      # Store as string
-                        break_duration_minutes=break_minutes,
-                        notes=row.get('notes', '').strip() or None
-                    )
-                except Exception:
-                    # If shift parsing fails, just skip shift details
-                    pass
-
-            # Parse hourly rate
-            hourly_rate = None
-            hourly_rate_str = row.get('hourly_rate', '').strip()
-            if hourly_rate_str:
-                try:
-                    hourly_rate = float(hourly_rate_str)
-                except ValueError:
-                    pass
-
-            # Use employee's hourly rate if not provided
-            if not hourly_rate:
-                hourly_rate = employee.hourly_rate or 0.0
-
-            # Create time entry
-            time_entry = TimeEntry(
-                employee_id=str(employee.id),
-                employee_number=row.get('employee_number', '').strip() or employee.employee_number,
-                employee_name=row.get('employee_name', '').strip() or f"{employee.first_name} {employee.last_name}",
-                work_date=work_date,
-                entry_type=entry_type,
-                hours_worked=hours_worked,
-                regular_hours=regular_hours,
-                overtime_hours=overtime_hours,
-                double_time_hours=0.0,
-                shift_details=shift_details,
-                hourly_rate=hourly_rate,
-                overtime_rate=hourly_rate * 1.5,
-                department_id=employee.department_id,
-                department_name=row.get('department', '').strip() or employee.department_name,
-                employee_notes=row.get('notes', '').strip() or None,
-                status=TimeEntryStatus.DRAFT,
-                created_at=datetime.utcnow(),
-                updated_at=datetime.utcnow()
-            )
-
-            await time_entry.insert()
-
-            # Track metadata
-            employee_ids_set.add(str(employee.id))
-
-            created_entries.append({
-                "id": str(time_entry.id),
-                "employee_id": time_entry.employee_id,
-                "employee_number": time_entry.employee_number,
-                "employee_name": time_entry.employee_name,
-                "work_date": time_entry.work_date.isoformat(),
-                "entry_type": time_entry.entry_type.value,
-                "hours_worked": time_entry.hours_worked
-            })
+            else:
+                # Track metadata
+                employee_ids_set.add(time_entry.employee_id)
+
+                results["created"] += 1
+                _extend_preview(results["entries"], [{
+                    "id": str(time_entry.id),
+                    "employee_id": time_entry.employee_id,
+                    "employee_number": time_entry.employee_number,
+                    "employee_name": time_entry.employee_name,
+                    "work_date": time_entry.work_date.isoformat(),
+                    "entry_type": time_entry.entry_type.value,
+                    "hours_worked": time_entry.hours_worked
+                }], UPLOAD_ENTRIES_PREVIEW_SIZE)
+
+        inserted_entries = [batch_entries[position][2] for position in insert_result["inserted"]]
+        calendar_service.invalidate(time_entry.work_date for time_entry in inserted_entries)
+        holiday_work_entries += _count_holiday_work(inserted_entries, employee_rules)
+
+        # Failed rows go to their own collection; the record keeps the counts
+        await _record_batch_results(results, errors, batch_duplicates, upload_id, error_limit)
+
+    # A read failure ending the file is recorded after the last batch
+    await _record_batch_results(results, errors, [], upload_id, error_limit)
+
+    if dry_run:
+        response.status_code = status.HTTP_200_OK
+        return _dry_run_report(file.filename, total_rows, dry_run_summary, results, previous_upload)
+
+    # Weeks whose dates came out of order across batches were classified in
+    # file order; classify their stored entries again by work date
+    reclassified = await import_service.reclassify_upload_weeks(
+        upload_id, overtime_totals.unordered_weeks, employee_rules, overtime_service
+    )
+    calendar_service.invalidate(reclassified["work_dates"])
 
-        except Exception as e:
-            errors.append({
-                "row": row_number,
-                "error": str(e),
-                "data": row
-            })
+    created_count = results["created"]
+    failed_count = results["failed"]
+    duplicate_count = results["skipped_duplicates"]
 
     # Update file upload record with results
-    file_upload.total_rows = row_number - 1  # Exclude header
-    file_upload.entries_created = len(created_entries)
-    file_upload.entries_failed = len(errors)
-    file_upload.time_entry_ids = [entry["id"] for entry in created_entries]
+    file_upload.error_counts = results["error_counts"]
+    file_upload.total_rows = total_rows
+    file_upload.entries_created = created_count
+    file_upload.entries_failed = failed_count
+    file_upload.duplicates_skipped = duplicate_count
     file_upload.employee_ids = list(employee_ids_set)
     file_upload.employee_count = len(employee_ids_set)
-    file_upload.errors = errors if errors else []
+    file_upload.errors = []
 
     # Set date range if we have work dates
-    if work_dates:
-        file_upload.date_range_start = min(work_dates)
-        file_upload.date_range_end = max(work_dates)
+    if date_range_start is not None:
+        file_upload.date_range_start = date_range_start
+        file_upload.date_range_end = date_range_end
 
     # Determine final status and set processing notes
-    if len(skipped_duplicates) > 0 and len(created_entries) == 0 and len(errors) == 0:
+    if duplicate_count > 0 and created_count == 0 and failed_count == 0:
         file_upload.status = FileUploadStatus.FAILED
-        file_upload.processing_notes = f"All {len(skipped_duplicates)} entries already exist in the database. No new entries were created."
-    elif len(errors) == 0 and len(skipped_duplicates) == 0:
+        file_upload.processing_notes = f"All {duplicate_count} entries already exist in the database. No new entries were created."
+    elif failed_count == 0 and duplicate_count == 0:
         file_upload.status = FileUploadStatus.COMPLETED
-    elif len(created_entries) == 0:
+    elif created_count == 0:
         file_upload.status = FileUploadStatus.FAILED
     else:
         file_upload.status = FileUploadStatus.PARTIALLY_COMPLETED
-        if len(skipped_duplicates) > 0:
-            file_upload.processing_notes = f"Skipped {len(skipped_duplicates)} duplicate entries."
+        if duplicate_count > 0:
+            file_upload.processing_notes = f"Skipped {duplicate_count} duplicate entries."
 
     file_upload.updated_at = datetime.utcnow()
     await file_upload.save()
 
     # Build response message
-    if len(skipped_duplicates) > 0 and len(created_entries) == 0 and len(errors) == 0:
-        response_message = f"This file has already been uploaded. All {len(skipped_duplicates)} entries already exist in the database."
-    elif len(skipped_duplicates) > 0:
-        response_message = f"Upload partially completed. {len(created_entries)} new entries created, {len(skipped_duplicates)} duplicates skipped."
+    if duplicate_count > 0 and created_count == 0 and failed_count == 0:
+        response_message = f"This file has already been uploaded. All {duplicate_count} entries already exist in the database."
+    elif duplicate_count > 0:
+        response_message = f"Upload partially completed. {created_count} new entries created, {duplicate_count} duplicates skipped."
     else:
         response_message = None
 
@@ -880,7 +1830,7 @@ async def upload_timesheet_csv(file: UploadFile = File(...)):
         "total_rows": file_upload.total_rows,
         "created": file_upload.entries_created,
         "failed": file_upload.entries_failed,
-        "skipped_duplicates": len(skipped_duplicates),
+        "skipped_duplicates": duplicate_count,
         "status": file_upload.status.value,
         "message": response_message,
         "date_range": {
@@ -888,7 +1838,12 @@ async def upload_timesheet_csv(file: UploadFile = File(...)):
             "end": file_upload.date_range_end.isoformat() if file_upload.date_range_end else None
         },
         "employee_count": file_upload.employee_count,
-        "entries": created_entries,
-        "errors": errors,
-        "duplicates": skipped_duplicates
+        "holiday_work_entries": holiday_work_entries,
+        "entries": results["entries"],
+        "entries_truncated": created_count > len(results["entries"]),
+        "error_counts": file_upload.error_counts,
+        "errors": results["errors"],
+        "errors_truncated": failed_count > len(results["errors"]),
+        "duplicates": results["duplicates"],
+        "duplicates_truncated": duplicate_count > len(results["duplicates"])
     }
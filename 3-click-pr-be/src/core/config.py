@@ -32,6 +32,16 @@ class Settings(BaseSettings):
     # API Settings
     API_V1_PREFIX: str = "/api/v1"
 
+    # Timesheets
+    USE_TIMESHEET_PERIOD_ROLLUPS: bool = False  # Read pay-run hours from TimesheetPeriod rollups
+    TIMESHEET_PARSE_WORKERS: int = 0  # Upload parse processes; 0 = one per CPU, 1 = parse in-process
+    TIMESHEET_PARALLEL_PARSE_MIN_BYTES: int = 4 * 1024 * 1024  # Smaller CSV files are parsed in-process
+    TIMESHEET_ARCHIVE_AFTER_MONTHS: int = 12  # Processed entries older than this many whole months are archived
+    TIMESHEET_CALENDAR_CACHE_TTL_SECONDS: int = 300  # Longest a cached month calendar is served
+
+    # Salary components
+    COMPONENT_PLAN_CACHE_TTL_SECONDS: int = 300  # Longest a cached designation component plan is served
+
     class Config:
         env_file = ".env"
         case_sensitive = True
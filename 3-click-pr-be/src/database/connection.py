@@ -10,7 +10,7 @@ from beanie import init_beanie
 from typing import Optional
 
 from src.core.config import settings
-from src.schemas.employee import Employee
+from src.schemas.employee import Employee, EmployeeImportJob, EmployeeImportRow, EmployeeBulkUpdate
 from src.schemas.pay_run import PayRun
 from src.schemas.salary_component import (
     SalaryComponent,
@@ -19,7 +19,8 @@ from src.schemas.salary_component import (
 )
 from src.schemas.organization import Organization, Department, WorkLocation, Designation
 from src.schemas.statutory_setting import StatutorySetting
-from src.schemas.timesheet import TimeEntry, TimesheetPeriod, TimesheetFileUpload
+from src.schemas.data_migration import DataMigration
+from src.schemas.timesheet import TimeEntry, TimesheetPeriod, TimesheetFileUpload, TimesheetUploadError, TimeEntryArchiveBucket
 
 
 # Global database client
@@ -49,6 +50,9 @@ async def init_db():
             database=database,
             document_models=[
                 Employee,
+                EmployeeImportJob,
+                EmployeeImportRow,
+                EmployeeBulkUpdate,
                 PayRun,
                 SalaryComponent,
                 EmployeeComponentOverride,
@@ -60,7 +64,10 @@ async def init_db():
                 StatutorySetting,
                 TimeEntry,
                 TimesheetPeriod,
-                TimesheetFileUpload
+                TimesheetFileUpload,
+                TimesheetUploadError,
+                TimeEntryArchiveBucket,
+                DataMigration
             ]
         )
 
@@ -4,7 +4,7 @@ Employee Pydantic Models
 Request and response models for Employee API endpoints.
 """
 
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
 from typing import Optional, List
 from datetime import date
 
@@ -36,6 +36,8 @@ class EmployeeCreate(EmployeeBase):
     manager_id: Optional[str] = None
     manager_name: Optional[str] = None
     work_location_id: Optional[str] = None
+    designation_id: Optional[str] = None
+    designation_name: Optional[str] = None
     hire_date: Optional[date] = None
     annual_salary: Optional[float] = None
     hourly_rate: Optional[float] = None
@@ -118,6 +120,7 @@ class EmployeeListResponse(BaseModel):
     page: int
     page_size: int
     employees: List[EmployeeResponse]
+    next_cursor: Optional[str] = None
 
 
 class EmployeeEligibilityResponse(BaseModel):
@@ -134,3 +137,74 @@ class EmployeeEligibilityResponse(BaseModel):
     statutory_holidays_eligible: bool
     overtime_eligible: bool
     tax_slip_type: str
+
+
+class EmployeeBulkFilter(BaseModel):
+    """Employees selected by a bulk update (all given conditions must match)"""
+    status: Optional[str] = None
+    department_id: Optional[str] = None
+    work_location_id: Optional[str] = None
+    designation_id: Optional[str] = None
+    worker_category: Optional[WorkerCategory] = None
+    employment_type: Optional[EmploymentType] = None
+    pay_frequency: Optional[PayFrequency] = None
+    province_of_employment: Optional[Province] = None
+
+    class Config:
+        extra = "forbid"
+
+
+class EmployeeBulkSet(BaseModel):
+    """Fields a bulk update sets to the same value for every selected employee"""
+    worker_category: Optional[WorkerCategory] = None
+    employment_type: Optional[EmploymentType] = None
+    job_title: Optional[str] = None
+    department_id: Optional[str] = None
+    manager_id: Optional[str] = None
+    manager_name: Optional[str] = None
+    work_location_id: Optional[str] = None
+    designation_id: Optional[str] = None
+    province_of_employment: Optional[Province] = None
+    annual_salary: Optional[float] = None
+    hourly_rate: Optional[float] = None
+    pay_frequency: Optional[PayFrequency] = None
+    statutory: Optional[StatutoryComponents] = None
+    status: Optional[str] = None
+
+    class Config:
+        extra = "forbid"
+
+
+class EmployeeBulkMultiply(BaseModel):
+    """Amounts a bulk update multiplies by a factor (rounded to cents)"""
+    annual_salary: Optional[float] = Field(None, gt=0)
+    hourly_rate: Optional[float] = Field(None, gt=0)
+
+    class Config:
+        extra = "forbid"
+
+
+class EmployeeBulkUpdateRequest(BaseModel):
+    """Bulk Employee Update Request - employee_ids or filter, plus a patch"""
+    employee_ids: Optional[List[str]] = None
+    filter: Optional[EmployeeBulkFilter] = None
+    set: EmployeeBulkSet = Field(default_factory=EmployeeBulkSet)
+    multiply: EmployeeBulkMultiply = Field(default_factory=EmployeeBulkMultiply)
+    performed_by: Optional[str] = None
+    reason: Optional[str] = None
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "filter": {"department_id": "65a1b2c3d4e5f6a7b8c9d0e1", "status": "active"},
+                "multiply": {"annual_salary": 1.03},
+                "reason": "2026 annual raise"
+            }
+        }
+
+
+class EmployeeBulkUpdateResponse(BaseModel):
+    """Bulk Employee Update Response"""
+    audit_id: str
+    matched_count: int
+    modified_count: int
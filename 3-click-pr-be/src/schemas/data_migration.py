@@ -0,0 +1,35 @@
+"""
+Data Migration MongoDB Schema
+
+Records one-off data migrations that have completed, so startup can skip
+them instead of running them on every boot.
+"""
+
+from beanie import Document, Indexed
+from pydantic import Field
+from typing import Optional, Dict, Any
+from datetime import datetime
+
+
+class DataMigration(Document):
+    """
+    Data Migration Document Model
+
+    One document per completed migration, keyed by its name.
+    """
+
+    name: Indexed(str, unique=True)
+    completed_at: datetime = Field(default_factory=datetime.utcnow)
+    result: Optional[Dict[str, Any]] = None  # Summary returned by the migration
+
+    class Settings:
+        name = "data_migrations"
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "name": "employee_designation_ids",
+                "completed_at": "2025-11-30T10:30:00",
+                "result": {"employees_linked": 42}
+            }
+        }
@@ -6,11 +6,18 @@ Canadian payroll fields including statutory components, compensation,
 and personal information.
 """
 
-from beanie import Document, Indexed
+from beanie import Document, Indexed, Insert, Replace, Save, before_event
 from pydantic import BaseModel, EmailStr, Field
-from typing import Optional, List
+from typing import Optional, List, Dict, Any
 from datetime import datetime, date
 from enum import Enum
+from pymongo import IndexModel, TEXT
+
+from src.utils.search_tokens import build_search_tokens
+
+
+# Fields matched by the employee directory search
+EMPLOYEE_SEARCH_FIELDS = ("first_name", "last_name", "email", "employee_number")
 
 
 class Province(str, Enum):
@@ -218,6 +225,14 @@ class Employee(Document):
     created_by: Optional[str] = None
     updated_by: Optional[str] = None
 
+    # Prefix tokens of the searchable fields, maintained on write (not returned by the API)
+    search_tokens: List[str] = Field(default_factory=list, exclude=True)
+
+    @before_event(Insert, Replace, Save)
+    def update_search_tokens(self):
+        """Rebuild search_tokens from the searchable fields"""
+        self.search_tokens = build_search_tokens(getattr(self, field) for field in EMPLOYEE_SEARCH_FIELDS)
+
     class Settings:
         name = "employees"
         indexes = [
@@ -228,7 +243,15 @@ class Employee(Document):
             "status",
             "worker_category",
             "department_id",
-            "work_location_id"
+            "work_location_id",
+            "designation_id",
+            "search_tokens",
+            # Whole-word fallback when no employee matches every prefix
+            IndexModel(
+                [(field, TEXT) for field in EMPLOYEE_SEARCH_FIELDS],
+                name="employee_text_search",
+                default_language="none"
+            ),
         ]
 
     class Config:
@@ -248,3 +271,98 @@ class Employee(Document):
                 "status": "active"
             }
         }
+
+
+class EmployeeImportStatus(str, Enum):
+    """Status of a bulk employee import"""
+    PROCESSING = "processing"
+    COMPLETED = "completed"
+    PARTIALLY_COMPLETED = "partially_completed"
+    FAILED = "failed"
+
+
+class EmployeeImportErrorClass(str, Enum):
+    """Category of a row that failed to import"""
+    INVALID_ROW = "invalid_row"
+    DUPLICATE_IN_FILE = "duplicate_in_file"
+    EMPLOYEE_NUMBER_EXISTS = "employee_number_exists"
+    EMAIL_EXISTS = "email_exists"
+    WRITE_FAILED = "write_failed"
+    READ_FAILED = "read_failed"
+
+
+class EmployeeImportJob(Document):
+    """
+    Employee Import Job Document
+
+    Tracks a bulk employee import from a CSV or XLSX file. The result of
+    each row is stored in employee_import_rows.
+    """
+
+    file_name: str
+    file_size: int = 0
+    status: EmployeeImportStatus = EmployeeImportStatus.PROCESSING
+    total_rows: int = 0
+    employees_created: int = 0
+    rows_failed: int = 0
+    error_counts: Dict[str, int] = {}  # Failed rows per error class
+    uploaded_by: Optional[str] = None
+    started_at: datetime = Field(default_factory=datetime.utcnow)
+    completed_at: Optional[datetime] = None
+    processing_notes: Optional[str] = None
+
+    class Settings:
+        name = "employee_import_jobs"
+        indexes = [
+            "started_at",
+            "status",
+        ]
+
+
+class EmployeeImportRow(Document):
+    """
+    Employee Import Row Document
+
+    Result of one row of an employee import: the created employee, or the
+    reason the row was rejected.
+    """
+
+    job_id: str
+    row: Optional[int] = None  # Row number in the file, None if not row-specific
+    created: bool = False
+    employee_id: Optional[str] = None
+    employee_number: Optional[str] = None
+    email: Optional[str] = None
+    error_class: Optional[EmployeeImportErrorClass] = None
+    error: Optional[str] = None
+
+    class Settings:
+        name = "employee_import_rows"
+        indexes = [
+            IndexModel([("job_id", 1), ("_id", 1)]),
+        ]
+
+
+class EmployeeBulkUpdate(Document):
+    """
+    Employee Bulk Update Document
+
+    Audit record of a PATCH /employees/bulk: which employees were selected,
+    the patch applied and how many employees it changed.
+    """
+
+    employee_ids: Optional[List[str]] = None
+    filter: Optional[Dict[str, Any]] = None
+    set_fields: Dict[str, Any] = {}
+    multiply_fields: Dict[str, float] = {}
+    matched_count: int = 0
+    modified_count: int = 0
+    reason: Optional[str] = None
+    performed_by: Optional[str] = None
+    performed_at: datetime = Field(default_factory=datetime.utcnow)
+
+    class Settings:
+        name = "employee_bulk_updates"
+        indexes = [
+            "performed_at",
+        ]
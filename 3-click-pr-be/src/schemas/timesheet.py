@@ -8,9 +8,10 @@ Stores employee time entries for payroll calculation including:
 - Approval status
 """
 
-from beanie import Document
+from beanie import Document, PydanticObjectId
+from pymongo import IndexModel
 from pydantic import BaseModel, Field, field_serializer
-from typing import Optional, List
+from typing import Optional, List, Dict
 from datetime import datetime, date, time
 from enum import Enum
 
@@ -91,6 +92,9 @@ class TimeEntry(Document):
     pay_run_id: Optional[str] = None  # Set when included in pay run
     processed_at: Optional[datetime] = None
 
+    # File upload that created the entry, if any
+    upload_id: Optional[str] = None
+
     # Metadata
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
@@ -108,8 +112,12 @@ class TimeEntry(Document):
             "work_date",
             "status",
             "pay_run_id",
+            "upload_id",
             ("employee_id", "work_date"),
             ("status", "work_date"),
+            # Keyset pagination over (work_date, _id), newest first
+            IndexModel([("work_date", -1), ("_id", -1)]),
+            IndexModel([("employee_id", 1), ("work_date", -1), ("_id", -1)]),
         ]
 
     class Config:
@@ -129,6 +137,16 @@ class TimeEntry(Document):
         }
 
 
+# One entry per employee, work date and entry type. Not in
+# TimeEntry.Settings.indexes: entries created before it existed may hold
+# duplicates, which would stop init_beanie, so TimesheetDedupeService builds
+# it at startup once they are removed.
+TIME_ENTRY_UNIQUE_INDEX = IndexModel(
+    [("employee_id", 1), ("work_date", 1), ("entry_type", 1)],
+    unique=True
+)
+
+
 class TimesheetPeriod(Document):
     """
     Timesheet Period Document
@@ -155,6 +173,13 @@ class TimesheetPeriod(Document):
     total_regular_hours: float = 0.0
     total_overtime_hours: float = 0.0
     total_double_time_hours: float = 0.0
+    total_vacation_hours: float = 0.0
+    total_sick_leave_hours: float = 0.0
+    total_stat_holiday_hours: float = 0.0
+    total_unpaid_hours: float = 0.0
+
+    # Hourly rate of the last entry added with one
+    hourly_rate: Optional[float] = None
 
     # Calculated earnings (for display, not used in final calculation)
     estimated_gross_pay: Optional[float] = None
@@ -181,6 +206,7 @@ class TimesheetPeriod(Document):
             "period_end_date",
             "status",
             "pay_run_id",
+            "time_entry_ids",
             ("employee_id", "period_start_date"),
         ]
 
@@ -200,6 +226,15 @@ class TimesheetPeriod(Document):
         }
 
 
+# One period per employee, start date and pay frequency. Built at startup
+# by TimesheetDedupeService, like TIME_ENTRY_UNIQUE_INDEX, once duplicate
+# periods created before it existed are merged.
+TIMESHEET_PERIOD_UNIQUE_INDEX = IndexModel(
+    [("employee_id", 1), ("period_start_date", 1), ("pay_frequency", 1)],
+    unique=True
+)
+
+
 class FileUploadStatus(str, Enum):
     """Status of file upload"""
     PROCESSING = "processing"
@@ -220,6 +255,7 @@ class TimesheetFileUpload(Document):
     file_name: str
     file_size: int  # Size in bytes
     file_path: Optional[str] = None  # Path if file is stored
+    content_hash: Optional[str] = None  # SHA-256 of the file content
 
     # Upload information
     uploaded_at: datetime = Field(default_factory=datetime.utcnow)
@@ -230,12 +266,15 @@ class TimesheetFileUpload(Document):
     total_rows: int = 0  # Total data rows (excluding header)
     entries_created: int = 0  # Successfully created entries
     entries_failed: int = 0  # Failed entries
+    duplicates_skipped: int = 0  # Rows matching existing entries
 
-    # Time entry references
-    time_entry_ids: List[str] = []  # IDs of created time entries
+    # Time entry references; entries now carry upload_id instead, so this
+    # is only set on uploads made before
+    time_entry_ids: List[str] = []
 
     # Error tracking
-    errors: Optional[List[dict]] = []  # List of errors with row numbers
+    error_counts: Dict[str, int] = {}  # Failed rows per error class
+    errors: Optional[List[dict]] = []  # Legacy inline errors; rows now go to timesheet_upload_errors
 
     # Date range of entries in file
     date_range_start: Optional[date] = None
@@ -259,6 +298,7 @@ class TimesheetFileUpload(Document):
             "status",
             "uploaded_by",
             ("uploaded_at", "status"),
+            [("content_hash", 1), ("uploaded_at", -1)],
         ]
 
     class Config:
@@ -276,3 +316,112 @@ class TimesheetFileUpload(Document):
                 "date_range_end": "2025-11-30"
             }
         }
+
+
+class UploadErrorClass(str, Enum):
+    """Category of a row that failed to import"""
+    MISSING_FIELD = "missing_field"
+    EMPLOYEE_NOT_FOUND = "employee_not_found"
+    INVALID_DATE = "invalid_date"
+    INVALID_HOURS = "invalid_hours"
+    WRITE_FAILED = "write_failed"
+    READ_FAILED = "read_failed"
+    OTHER = "other"
+
+
+class TimesheetUploadError(Document):
+    """
+    Timesheet Upload Error Document
+
+    One failed row of a timesheet file upload. Kept outside the upload
+    record so a badly formatted file cannot outgrow the 16 MB document limit.
+    """
+
+    upload_id: str
+    row: Optional[int] = None  # Row number in the file, None if not row-specific
+    error_class: UploadErrorClass = UploadErrorClass.OTHER
+    error: str
+    data: Optional[dict] = None  # Raw row values
+
+    class Settings:
+        name = "timesheet_upload_errors"
+        indexes = [
+            IndexModel([("upload_id", 1), ("_id", 1)]),
+        ]
+
+
+class ArchivedTimeEntry(BaseModel):
+    """
+    A processed time entry kept in a monthly archive bucket
+
+    Holds the TimeEntry fields except the employee fields, which are stored
+    once on the bucket, and status, which is always PROCESSED.
+    """
+
+    entry_id: PydanticObjectId  # _id of the original time entry
+    work_date: date
+    entry_type: TimeEntryType = TimeEntryType.REGULAR
+
+    hours_worked: float = 0.0
+    regular_hours: float = 0.0
+    overtime_hours: float = 0.0
+    double_time_hours: float = 0.0
+    shift_details: Optional[ShiftDetails] = None
+
+    hourly_rate: Optional[float] = None
+    overtime_rate: Optional[float] = None
+
+    department_id: Optional[str] = None
+    department_name: Optional[str] = None
+    project_code: Optional[str] = None
+    location_id: Optional[str] = None
+
+    submitted_at: Optional[datetime] = None
+    submitted_by: Optional[str] = None
+    approved_at: Optional[datetime] = None
+    approved_by: Optional[str] = None
+    pay_run_id: Optional[str] = None
+    processed_at: Optional[datetime] = None
+
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    created_by: Optional[str] = None
+    updated_by: Optional[str] = None
+
+    employee_notes: Optional[str] = None
+    manager_notes: Optional[str] = None
+
+
+class TimeEntryArchiveBucket(Document):
+    """
+    Time Entry Archive Bucket Document
+
+    All archived (processed) time entries of one employee for one calendar
+    month, with running totals. Old entries move here so the time_entries
+    collection and its indexes only hold recent data.
+    """
+
+    employee_id: str
+    employee_number: str
+    employee_name: str
+    month_start: date  # First day of the month
+
+    entries: List[ArchivedTimeEntry] = []
+
+    # Totals over entries
+    entry_count: int = 0
+    total_hours_worked: float = 0.0
+    total_regular_hours: float = 0.0
+    total_overtime_hours: float = 0.0
+    total_double_time_hours: float = 0.0
+
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+    class Settings:
+        name = "time_entry_archive"
+        indexes = [
+            IndexModel([("employee_id", 1), ("month_start", 1)], unique=True),
+            "month_start",
+            "entries.entry_id",
+        ]
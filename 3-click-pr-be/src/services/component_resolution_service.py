@@ -3,11 +3,23 @@ Component Resolution Service
 
 Handles the logic for resolving which salary components apply to an employee
 based on their designation and individual overrides.
+
+What applies to a designation is compiled once into an immutable component
+plan and cached in-process. Resolving an employee then only applies their
+overrides to the plan of their designation. Mapping and component changes
+made through this service and the settings API invalidate the plans they
+affect; a TTL bounds how stale a plan can be when they are changed by
+another process. Overrides are not part of plans and are always read
+fresh, so override changes need no invalidation.
 """
 
-from typing import List, Dict, Optional
+from typing import List, Dict, Iterable, Mapping, NamedTuple, Optional, Tuple
+from collections import defaultdict
+from types import MappingProxyType
+import time
 from beanie import PydanticObjectId
 
+from src.core.config import settings
 from src.schemas.salary_component import (
     SalaryComponent,
     DesignationComponentMapping,
@@ -57,16 +69,110 @@ class ResolvedComponent:
         }
 
 
+class PlanEntry(NamedTuple):
+    """A component that applies at designation level, with its effective values"""
+    component: SalaryComponent
+    default_value: Optional[float]
+    percentage: Optional[float]
+    is_mandatory: bool
+    source: str
+
+
+class ComponentPlan(NamedTuple):
+    """
+    Compiled components of a designation (or of employees without one).
+
+    The component documents in a plan are shared by every resolution that
+    uses it and must not be modified.
+    """
+    designation_id: Optional[str]
+    # Components that apply without overrides, in display order
+    entries: Tuple[PlanEntry, ...]
+    # All active components by ID, for overrides of components not in entries
+    components: Mapping[str, SalaryComponent]
+    # Position of each active component as loaded, to order ties in display_order
+    positions: Mapping[str, int]
+
+
+class ComponentPlanCache:
+    """
+    In-process cache of component plans per designation and component type.
+
+    Every invalidation bumps a generation number; a plan is only cached if
+    no invalidation affecting it happened while it was being compiled.
+    """
+
+    def __init__(self):
+        self._plans: Dict[Tuple[Optional[str], Optional[str]], Tuple[float, ComponentPlan]] = {}
+        self._generation = 0
+        self._designation_generations: Dict[Optional[str], int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, key: Tuple[Optional[str], Optional[str]]) -> Optional[ComponentPlan]:
+        """Get a cached plan by (designation ID, component type), counting hits and misses"""
+        cached = self._plans.get(key)
+        if cached and cached[0] > time.monotonic():
+            self.hits += 1
+            return cached[1]
+        self.misses += 1
+        return None
+
+    def generation(self, designation_id: Optional[str]) -> Tuple[int, int]:
+        """Current generation of the plans of a designation"""
+        return self._generation, self._designation_generations.get(designation_id, 0)
+
+    def put(
+        self,
+        key: Tuple[Optional[str], Optional[str]],
+        plan: ComponentPlan,
+        generation: Tuple[int, int]
+    ) -> None:
+        """Cache a plan compiled at the given generation, unless it was invalidated since"""
+        if self.generation(key[0]) == generation:
+            self._plans[key] = (time.monotonic() + settings.COMPONENT_PLAN_CACHE_TTL_SECONDS, plan)
+
+    def invalidate_designation(self, designation_id: str) -> None:
+        """Drop the plans of a designation"""
+        self._designation_generations[designation_id] = self._designation_generations.get(designation_id, 0) + 1
+        self.invalidations += 1
+        for key in [key for key in self._plans if key[0] == designation_id]:
+            del self._plans[key]
+
+    def invalidate_all(self) -> None:
+        """Drop all plans"""
+        self._generation += 1
+        self.invalidations += 1
+        self._plans.clear()
+
+    def stats(self) -> Dict[str, float]:
+        """Cache size, hit and miss counts and hit rate"""
+        lookups = self.hits + self.misses
+        return {
+            "plans": len(self._plans),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "invalidations": self.invalidations
+        }
+
+
 class ComponentResolutionService:
     """Service for resolving salary components for employees"""
 
+    # Compiled plans shared by every resolution in this process
+    plan_cache = ComponentPlanCache()
+
     @staticmethod
-    async def get_components_for_employee(
-        employee_id: str,
-        component_type: Optional[ComponentType] = None
+    def resolve_components(
+        components: List[SalaryComponent],
+        designation_id: Optional[str],
+        override_map: Dict[str, EmployeeComponentOverride],
+        designation_map: Dict[str, DesignationComponentMapping]
     ) -> List[ResolvedComponent]:
         """
-        Get all applicable salary components for an employee
+        Resolve the components that apply, from already loaded documents
 
         Resolution priority:
         1. Employee-specific overrides (highest priority)
@@ -74,49 +180,17 @@ class ComponentResolutionService:
         3. Global components (applies_to_all_designations=True)
 
         Args:
-            employee_id: Employee ID
-            component_type: Optional filter by component type
+            components: Active salary components
+            designation_id: Designation ID (None if no designation)
+            override_map: Employee overrides by component ID
+            designation_map: Active designation mappings by component ID
 
         Returns:
-            List of resolved components with final values
+            List of resolved components with final values, by display order
         """
-        # Get employee
-        employee = await Employee.get(employee_id)
-        if not employee:
-            raise ValueError(f"Employee {employee_id} not found")
-
-        designation_id = employee.designation_id
-
-        # Get employee overrides
-        override_filter = {"employee_id": employee_id}
-        if component_type:
-            override_filter["component_type"] = component_type
-
-        overrides = await EmployeeComponentOverride.find(override_filter).to_list()
-        override_map = {o.component_id: o for o in overrides}
-
-        # Get designation mappings if employee has a designation
-        designation_mappings = []
-        if designation_id:
-            mapping_filter = {"designation_id": designation_id, "is_active": True}
-            if component_type:
-                mapping_filter["component_type"] = component_type
-
-            designation_mappings = await DesignationComponentMapping.find(mapping_filter).to_list()
-
-        designation_component_ids = {m.component_id for m in designation_mappings}
-        designation_map = {m.component_id: m for m in designation_mappings}
-
-        # Get all active components
-        component_filter = {"is_active": True}
-        if component_type:
-            component_filter["component_type"] = component_type
-
-        all_components = await SalaryComponent.find(component_filter).to_list()
-
         resolved_components = []
 
-        for component in all_components:
+        for component in components:
             component_id = str(component.id)
 
             # Check if component is disabled by employee override
@@ -141,7 +215,7 @@ class ComponentResolutionService:
                         percentage = override.override_values.percentage or percentage
 
             # Priority 2: Designation mapping
-            elif component_id in designation_component_ids:
+            elif component_id in designation_map:
                 mapping = designation_map[component_id]
                 applies = True
                 is_mandatory = mapping.is_mandatory
@@ -177,28 +251,120 @@ class ComponentResolutionService:
         return resolved_components
 
     @staticmethod
-    async def get_components_for_designation(
-        designation_id: str,
-        component_type: Optional[ComponentType] = None
+    def compile_plan(
+        components: List[SalaryComponent],
+        designation_id: Optional[str],
+        designation_map: Dict[str, DesignationComponentMapping]
+    ) -> ComponentPlan:
+        """
+        Compile what applies to a designation before any employee overrides
+
+        Args:
+            components: Active salary components
+            designation_id: Designation ID (None for employees without one)
+            designation_map: Active designation mappings by component ID
+
+        Returns:
+            Component plan
+        """
+        resolved = ComponentResolutionService.resolve_components(components, designation_id, {}, designation_map)
+
+        return ComponentPlan(
+            designation_id=designation_id,
+            entries=tuple(
+                PlanEntry(rc.component, rc.default_value, rc.percentage, rc.is_mandatory, rc.source)
+                for rc in resolved
+            ),
+            components=MappingProxyType({str(component.id): component for component in components}),
+            positions=MappingProxyType({str(component.id): index for index, component in enumerate(components)})
+        )
+
+    @staticmethod
+    def apply_overrides(
+        plan: ComponentPlan,
+        override_map: Dict[str, EmployeeComponentOverride]
     ) -> List[ResolvedComponent]:
         """
-        Get all applicable salary components for a designation
+        Resolve an employee's components from their designation's plan
+
+        Only the overridden components are resolved again; the result is the
+        same as resolve_components over all components.
 
         Args:
-            designation_id: Designation ID
+            plan: Plan of the employee's designation
+            override_map: Employee overrides by component ID
+
+        Returns:
+            List of resolved components with final values, by display order
+        """
+        resolved = {
+            str(entry.component.id): ResolvedComponent(*entry)
+            for entry in plan.entries
+        }
+        if not override_map:
+            return list(resolved.values())
+
+        for component_id, override in override_map.items():
+            component = plan.components.get(component_id)
+            if component is None:
+                # Overrides of inactive components have no effect
+                continue
+            resolved.pop(component_id, None)
+            for rc in ComponentResolutionService.resolve_components(
+                [component], plan.designation_id, {component_id: override}, {}
+            ):
+                resolved[component_id] = rc
+
+        return sorted(
+            resolved.values(),
+            key=lambda rc: (rc.component.display_order, plan.positions[str(rc.component.id)])
+        )
+
+    @staticmethod
+    async def get_component_plans(
+        designation_ids: Iterable[Optional[str]],
+        component_type: Optional[ComponentType] = None
+    ) -> Dict[Optional[str], ComponentPlan]:
+        """
+        Get the component plans of designations, compiling those not cached
+
+        Plans that are not cached are compiled together from one query for
+        their mappings and one for the active components.
+
+        Args:
+            designation_ids: Designation IDs (None for employees without one)
             component_type: Optional filter by component type
 
         Returns:
-            List of resolved components with designation-specific values
+            Dictionary of designation ID -> component plan
         """
-        # Get designation mappings
-        mapping_filter = {"designation_id": designation_id, "is_active": True}
-        if component_type:
-            mapping_filter["component_type"] = component_type
+        cache = ComponentResolutionService.plan_cache
+        type_key = component_type.value if component_type else None
+
+        plans = {}
+        missing = []
+        for designation_id in dict.fromkeys(designation_ids):
+            plan = cache.get((designation_id, type_key))
+            if plan:
+                plans[designation_id] = plan
+            else:
+                missing.append(designation_id)
+
+        if not missing:
+            return plans
+
+        generations = {designation_id: cache.generation(designation_id) for designation_id in missing}
+
+        # Get the mappings of all missing designations
+        designation_maps = defaultdict(dict)
+        mapped_ids = [designation_id for designation_id in missing if designation_id]
+        if mapped_ids:
+            mapping_filter = {"designation_id": {"$in": mapped_ids}, "is_active": True}
+            if component_type:
+                mapping_filter["component_type"] = component_type
 
-        designation_mappings = await DesignationComponentMapping.find(mapping_filter).to_list()
-        designation_component_ids = {m.component_id for m in designation_mappings}
-        designation_map = {m.component_id: m for m in designation_mappings}
+            for mapping in await DesignationComponentMapping.find(mapping_filter).to_list():
+                designation_maps[mapping.designation_id][mapping.component_id] = mapping
 
         # Get all active components
         component_filter = {"is_active": True}
@@ -207,48 +373,124 @@ class ComponentResolutionService:
 
         all_components = await SalaryComponent.find(component_filter).to_list()
 
-        resolved_components = []
+        for designation_id in missing:
+            plan = ComponentResolutionService.compile_plan(
+                all_components, designation_id, designation_maps.get(designation_id, {})
+            )
+            cache.put((designation_id, type_key), plan, generations[designation_id])
+            plans[designation_id] = plan
 
-        for component in all_components:
-            component_id = str(component.id)
+        return plans
 
-            applies = False
-            is_mandatory = False
-            default_value = component.default_value
-            percentage = component.percentage
-            source = "component"
+    @staticmethod
+    async def get_components_for_employee(
+        employee_id: str,
+        component_type: Optional[ComponentType] = None
+    ) -> List[ResolvedComponent]:
+        """
+        Get all applicable salary components for an employee
 
-            # Priority 1: Designation mapping
-            if component_id in designation_component_ids:
-                mapping = designation_map[component_id]
-                applies = True
-                is_mandatory = mapping.is_mandatory
-                source = "designation"
-                default_value = mapping.default_value or default_value
-                percentage = mapping.percentage or percentage
+        Args:
+            employee_id: Employee ID
+            component_type: Optional filter by component type
 
-            # Priority 2: Global component
-            elif component.applies_to_all_designations:
-                if not component.applicable_designations:
-                    applies = True
-                elif designation_id in component.applicable_designations:
-                    applies = True
+        Returns:
+            List of resolved components with final values
+        """
+        # Get employee
+        employee = await Employee.get(employee_id)
+        if not employee:
+            raise ValueError(f"Employee {employee_id} not found")
 
-            if applies:
-                resolved_components.append(
-                    ResolvedComponent(
-                        component=component,
-                        default_value=default_value,
-                        percentage=percentage,
-                        is_mandatory=is_mandatory,
-                        source=source
-                    )
-                )
+        designation_id = employee.designation_id or None
 
-        # Sort by display_order
-        resolved_components.sort(key=lambda rc: rc.component.display_order)
+        # Get employee overrides
+        override_filter = {"employee_id": employee_id}
+        if component_type:
+            override_filter["component_type"] = component_type
 
-        return resolved_components
+        overrides = await EmployeeComponentOverride.find(override_filter).to_list()
+        override_map = {o.component_id: o for o in overrides}
+
+        plans = await ComponentResolutionService.get_component_plans([designation_id], component_type)
+
+        return ComponentResolutionService.apply_overrides(plans[designation_id], override_map)
+
+    @staticmethod
+    async def get_components_for_employees(
+        employees: List[Employee],
+        component_type: Optional[ComponentType] = None
+    ) -> Dict[str, List[ResolvedComponent]]:
+        """
+        Get the applicable salary components of many employees at once
+
+        Overrides are loaded with one query for all the employees, and the
+        plans of their designations with at most two more, so a whole pay
+        run is resolved with three queries (one when the plans are cached).
+
+        Args:
+            employees: Employees (already loaded)
+            component_type: Optional filter by component type
+
+        Returns:
+            Dictionary of employee ID -> resolved components
+        """
+        employee_ids = [str(employee.id) for employee in employees]
+
+        # Get the overrides of all employees
+        override_filter = {"employee_id": {"$in": employee_ids}}
+        if component_type:
+            override_filter["component_type"] = component_type
+
+        override_maps = defaultdict(dict)
+        for override in await EmployeeComponentOverride.find(override_filter).to_list():
+            override_maps[override.employee_id][override.component_id] = override
+
+        plans = await ComponentResolutionService.get_component_plans(
+            [employee.designation_id or None for employee in employees], component_type
+        )
+
+        return {
+            str(employee.id): ComponentResolutionService.apply_overrides(
+                plans[employee.designation_id or None],
+                override_maps.get(str(employee.id), {})
+            )
+            for employee in employees
+        }
+
+    @staticmethod
+    async def get_components_for_designation(
+        designation_id: str,
+        component_type: Optional[ComponentType] = None
+    ) -> List[ResolvedComponent]:
+        """
+        Get all applicable salary components for a designation
+
+        Args:
+            designation_id: Designation ID
+            component_type: Optional filter by component type
+
+        Returns:
+            List of resolved components with designation-specific values
+        """
+        plans = await ComponentResolutionService.get_component_plans([designation_id], component_type)
+
+        # No employee overrides at designation level
+        return ComponentResolutionService.apply_overrides(plans[designation_id], {})
+
+    @staticmethod
+    def invalidate_component_plans(designation_id: Optional[str] = None) -> None:
+        """
+        Drop cached component plans after mappings or components change
+
+        Args:
+            designation_id: Designation whose mappings changed, or None when
+                a salary component changed (which affects every plan)
+        """
+        if designation_id is None:
+            ComponentResolutionService.plan_cache.invalidate_all()
+        else:
+            ComponentResolutionService.plan_cache.invalidate_designation(designation_id)
 
     @staticmethod
     async def assign_component_to_designation(
@@ -286,6 +528,7 @@ class ComponentResolutionService:
             existing.percentage = percentage
             existing.is_active = True
             await existing.save()
+            ComponentResolutionService.invalidate_component_plans(designation_id)
             return existing
 
         # Get component details
@@ -313,6 +556,7 @@ class ComponentResolutionService:
         )
 
         await mapping.insert()
+        ComponentResolutionService.invalidate_component_plans(designation_id)
         return mapping
 
     @staticmethod
@@ -337,6 +581,7 @@ class ComponentResolutionService:
 
         if mapping:
             await mapping.delete()
+            ComponentResolutionService.invalidate_component_plans(designation_id)
             return True
 
         return False
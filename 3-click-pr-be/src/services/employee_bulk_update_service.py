@@ -0,0 +1,187 @@
+"""
+Employee Bulk Update Service
+
+Applies one field-level patch to many employees with a single
+update_many: set fields to a value (department, pay frequency, ...) and
+multiply amounts by a factor (annual raises). Every bulk update is
+recorded in employee_bulk_updates.
+
+The patch is an update pipeline rather than $set/$mul so that multiplied
+amounts are rounded to cents on the server. Setting a department, work
+location or designation also sets its denormalized name.
+"""
+
+from typing import Any, Dict, List, Tuple
+from datetime import datetime
+
+from beanie import PydanticObjectId
+from bson.errors import InvalidId
+
+from src.models.employee import EmployeeBulkUpdateRequest
+from src.schemas.employee import Employee, EmployeeBulkUpdate
+from src.schemas.organization import Department, Designation, WorkLocation
+
+
+# Reference ID field -> (document, name attribute, denormalized name field)
+REFERENCE_NAME_FIELDS = {
+    "department_id": (Department, "name", "department_name"),
+    "work_location_id": (WorkLocation, "name", "work_location_name"),
+    "designation_id": (Designation, "title", "designation_name"),
+}
+
+
+class EmployeeBulkUpdateService:
+    """Service for bulk employee updates"""
+
+    def __init__(self):
+        pass
+
+    def build_filter(self, request: EmployeeBulkUpdateRequest) -> Dict[str, Any]:
+        """
+        Build the filter selecting the employees of a bulk update.
+
+        Args:
+            request: Bulk update request
+
+        Returns:
+            MongoDB filter
+
+        Raises:
+            ValueError: If neither employee IDs nor filter conditions are
+                given, or an employee ID is invalid
+        """
+        query = {}
+
+        if request.filter:
+            query.update(request.filter.model_dump(exclude_none=True, mode="json"))
+
+        if request.employee_ids is not None:
+            try:
+                query["_id"] = {"$in": [PydanticObjectId(employee_id) for employee_id in request.employee_ids]}
+            except (InvalidId, TypeError):
+                raise ValueError("Invalid employee ID")
+
+        if not query:
+            raise ValueError("Select employees with employee_ids or at least one filter condition")
+
+        return query
+
+    def get_patch(self, request: EmployeeBulkUpdateRequest) -> Tuple[Dict[str, Any], Dict[str, float]]:
+        """
+        Get the fields to set and to multiply.
+
+        Returns:
+            Tuple of (set fields, multiply factors)
+
+        Raises:
+            ValueError: If the patch is empty or sets and multiplies the same field
+        """
+        set_fields = request.set.model_dump(exclude_unset=True, mode="json")
+        multiply_fields = request.multiply.model_dump(exclude_none=True)
+
+        if not set_fields and not multiply_fields:
+            raise ValueError("Nothing to update: give fields in set or multiply")
+
+        both = set(set_fields) & set(multiply_fields)
+        if both:
+            raise ValueError(f"Fields both set and multiplied: {', '.join(sorted(both))}")
+
+        return set_fields, multiply_fields
+
+    async def resolve_reference_names(self, set_fields: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Add the denormalized names of the departments, work locations and
+        designations being set.
+
+        Args:
+            set_fields: Fields to set
+
+        Returns:
+            Fields to set including the names
+
+        Raises:
+            ValueError: If a referenced document does not exist
+        """
+        resolved = dict(set_fields)
+
+        for id_field, (document_class, name_attribute, name_field) in REFERENCE_NAME_FIELDS.items():
+            if id_field not in set_fields:
+                continue
+            reference_id = set_fields[id_field]
+            if reference_id is None:
+                resolved[name_field] = None
+                continue
+            try:
+                document = await document_class.get(reference_id)
+            except Exception:
+                document = None
+            if not document:
+                raise ValueError(f"{id_field} {reference_id} not found")
+            resolved[name_field] = getattr(document, name_attribute)
+
+        return resolved
+
+    def build_update_pipeline(
+        self,
+        set_fields: Dict[str, Any],
+        multiply_fields: Dict[str, float],
+        now: datetime
+    ) -> List[Dict[str, Any]]:
+        """
+        Build the update pipeline applying a patch.
+
+        Args:
+            set_fields: Fields to set to a value
+            multiply_fields: Amount fields to multiply by a factor
+            now: Time stored in updated_at
+
+        Returns:
+            Update pipeline (a single $set stage)
+        """
+        stage = {field: {"$literal": value} for field, value in set_fields.items()}
+        for field, factor in multiply_fields.items():
+            # Employees without the amount keep null
+            stage[field] = {"$round": [{"$multiply": [f"${field}", factor]}, 2]}
+        stage["updated_at"] = now
+
+        return [{"$set": stage}]
+
+    async def apply(self, request: EmployeeBulkUpdateRequest) -> EmployeeBulkUpdate:
+        """
+        Apply a bulk update and record it.
+
+        Args:
+            request: Bulk update request
+
+        Returns:
+            The inserted audit record, with the matched and modified counts
+
+        Raises:
+            ValueError: If the request is invalid
+        """
+        query = self.build_filter(request)
+        set_fields, multiply_fields = self.get_patch(request)
+        set_fields = await self.resolve_reference_names(set_fields)
+
+        now = datetime.utcnow()
+        result = await Employee.get_motor_collection().update_many(
+            query, self.build_update_pipeline(set_fields, multiply_fields, now)
+        )
+
+        audit = EmployeeBulkUpdate(
+            employee_ids=request.employee_ids,
+            filter=request.filter.model_dump(exclude_none=True, mode="json") if request.filter else None,
+            set_fields=set_fields,
+            multiply_fields=multiply_fields,
+            matched_count=result.matched_count,
+            modified_count=result.modified_count,
+            reason=request.reason,
+            performed_by=request.performed_by,
+            performed_at=now
+        )
+        await audit.insert()
+        return audit
+
+    async def get_audit_records(self, limit: int, skip: int = 0) -> List[EmployeeBulkUpdate]:
+        """Get bulk update audit records, newest first"""
+        return await EmployeeBulkUpdate.find().sort("-performed_at").skip(skip).limit(limit).to_list()
@@ -0,0 +1,100 @@
+"""
+Employee Designation Service
+
+Links employees to designations by ID. Employees used to refer to their
+designation only by job_title, the designation's title at the time, so
+head counts matched on free text and lost employees when a designation
+was renamed. Employees without a designation_id whose job_title is the
+title of a designation are given that designation's ID and name.
+
+The backfill is a one-off migration: once it has run, a DataMigration
+marker is stored and later startups skip it. Otherwise every boot would
+re-link employees whose designation was deliberately cleared but whose
+job title still matches a designation.
+"""
+
+from typing import List, Optional, Sequence
+from datetime import datetime
+
+from pymongo import UpdateMany
+from pymongo.errors import DuplicateKeyError
+
+from src.schemas.data_migration import DataMigration
+from src.schemas.employee import Employee
+from src.schemas.organization import Designation
+
+
+# Name of the DataMigration marker recorded once the backfill has run
+DESIGNATION_BACKFILL_MIGRATION = "employee_designation_ids"
+
+
+class EmployeeDesignationService:
+    """Service for linking employees to designations"""
+
+    def __init__(self):
+        pass
+
+    def build_backfill_operations(
+        self,
+        designations: Sequence[Designation],
+        now: Optional[datetime] = None
+    ) -> List[UpdateMany]:
+        """
+        Build the updates assigning designations to employees by job title.
+
+        Args:
+            designations: All designations
+            now: Time stored in updated_at, so the employees' ETags change
+
+        Returns:
+            One update per designation, for employees without a designation_id
+        """
+        now = now or datetime.utcnow()
+        return [
+            UpdateMany(
+                {"designation_id": None, "job_title": designation.title},
+                {"$set": {
+                    "designation_id": str(designation.id),
+                    "designation_name": designation.title,
+                    "updated_at": now
+                }}
+            )
+            for designation in designations
+        ]
+
+    async def backfill_designation_ids(self) -> int:
+        """
+        Assign designation IDs to employees that only have a matching job title.
+
+        Returns:
+            Number of employees updated
+        """
+        designations = await Designation.find().to_list()
+        operations = self.build_backfill_operations(designations)
+        if not operations:
+            return 0
+
+        result = await Employee.get_motor_collection().bulk_write(operations, ordered=False)
+        return result.modified_count
+
+    async def backfill_designation_ids_once(self) -> Optional[int]:
+        """
+        Run the designation backfill unless it has already completed.
+
+        Returns:
+            Number of employees updated, or None if the backfill had
+            already run
+        """
+        if await DataMigration.find_one({"name": DESIGNATION_BACKFILL_MIGRATION}):
+            return None
+
+        linked = await self.backfill_designation_ids()
+        try:
+            await DataMigration(
+                name=DESIGNATION_BACKFILL_MIGRATION,
+                result={"employees_linked": linked}
+            ).insert()
+        except DuplicateKeyError:
+            # Another instance finished the same backfill first
+            pass
+        return linked
@@ -0,0 +1,204 @@
+"""
+Employee Export Service
+
+Streams employees as CSV or XLSX straight from a MongoDB cursor. Documents
+are read in batches as raw dictionaries limited to the exported fields,
+without building Employee models, so memory stays flat however many
+employees are exported.
+
+CSV is written and sent a chunk of rows at a time; text starting with a
+formula character is prefixed with an apostrophe so spreadsheet programs
+open it as text. XLSX is written with xlsxwriter in constant_memory mode,
+which flushes each row to a temporary file as it is written, a batch of
+rows at a time in a worker thread; the finished workbook is then streamed
+from that file.
+
+Columns use the EmployeeCreate field names, so an exported file can be
+imported again with POST /employees/import.
+"""
+
+from typing import Any, AsyncIterable, AsyncIterator, Dict, List, Sequence
+from datetime import datetime
+import asyncio
+import csv
+import io
+import os
+import tempfile
+
+import xlsxwriter
+
+from src.schemas.employee import Employee
+from src.utils.tabular_reader import FORMULA_PREFIXES, cell_to_text
+
+
+# Exported fields, in column order
+EMPLOYEE_EXPORT_FIELDS = (
+    "employee_number", "first_name", "last_name", "email", "phone",
+    "worker_category", "employment_type", "job_title",
+    "department_id", "department_name", "designation_id", "designation_name",
+    "work_location_id", "work_location_name", "manager_id", "manager_name",
+    "province_of_employment", "hire_date", "termination_date",
+    "annual_salary", "hourly_rate", "pay_frequency", "status",
+)
+
+# Documents fetched per cursor batch
+EXPORT_BATCH_SIZE = 2000
+
+# CSV rows sent per response chunk
+EXPORT_CSV_CHUNK_ROWS = 1000
+
+# Bytes read per response chunk when streaming a finished workbook
+EXPORT_FILE_CHUNK_SIZE = 256 * 1024
+
+# XLSX rows handed to the writer thread at a time
+EXPORT_XLSX_BATCH_ROWS = 2000
+
+
+class EmployeeExportService:
+    """Service for streaming employee exports"""
+
+    def __init__(self):
+        pass
+
+    async def iter_employee_documents(
+        self,
+        query: Dict[str, Any],
+        batch_size: int = EXPORT_BATCH_SIZE
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Iterate over the exported fields of matching employees, in _id order.
+
+        Args:
+            query: Employee filter
+            batch_size: Documents fetched per cursor batch
+
+        Returns:
+            Async iterator of raw documents
+        """
+        cursor = Employee.get_motor_collection().find(
+            query,
+            projection={"_id": 0, **{field: 1 for field in EMPLOYEE_EXPORT_FIELDS}},
+            batch_size=batch_size
+        ).sort("_id", 1)
+
+        async for document in cursor:
+            yield document
+
+    def export_row(self, document: Dict[str, Any]) -> List[Any]:
+        """Values of a document in EMPLOYEE_EXPORT_FIELDS order (None when missing)"""
+        return [document.get(field) for field in EMPLOYEE_EXPORT_FIELDS]
+
+    def csv_cell(self, value: Any) -> str:
+        """CSV text of a value; text that would be read as a formula is prefixed with '"""
+        text = cell_to_text(value)
+        if isinstance(value, str) and text.startswith(FORMULA_PREFIXES):
+            return "'" + text
+        return text
+
+    def write_xlsx_rows(
+        self,
+        worksheet: Any,
+        first_row: int,
+        rows: Sequence[List[Any]],
+        date_format: Any
+    ) -> None:
+        """Write rows of export values to a worksheet, starting at first_row"""
+        for row_index, values in enumerate(rows, first_row):
+            for column, value in enumerate(values):
+                if value is None:
+                    continue
+                if isinstance(value, datetime):
+                    worksheet.write_datetime(row_index, column, value, date_format)
+                else:
+                    worksheet.write(row_index, column, value)
+
+    async def stream_csv(
+        self,
+        documents: AsyncIterable[Dict[str, Any]],
+        rows_per_chunk: int = EXPORT_CSV_CHUNK_ROWS
+    ) -> AsyncIterator[str]:
+        """
+        Write documents as CSV, yielding the text a chunk of rows at a time.
+
+        Dates are written as YYYY-MM-DD, like the import expects. Text
+        starting with =, +, - or @ is written with a leading apostrophe.
+
+        Args:
+            documents: Raw employee documents
+            rows_per_chunk: Rows per yielded chunk
+
+        Returns:
+            Async iterator of CSV text chunks, starting with the header
+        """
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(EMPLOYEE_EXPORT_FIELDS)
+        rows = 0
+
+        async for document in documents:
+            writer.writerow([self.csv_cell(value) for value in self.export_row(document)])
+            rows += 1
+            if rows % rows_per_chunk == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+
+        if buffer.tell():
+            yield buffer.getvalue()
+
+    async def stream_xlsx(
+        self,
+        documents: AsyncIterable[Dict[str, Any]],
+        chunk_size: int = EXPORT_FILE_CHUNK_SIZE,
+        batch_rows: int = EXPORT_XLSX_BATCH_ROWS
+    ) -> AsyncIterator[bytes]:
+        """
+        Write documents to a constant_memory workbook and stream the file.
+
+        Documents are read on the event loop and written, batch_rows at a
+        time, in a worker thread, as is closing (zipping) the workbook.
+
+        Args:
+            documents: Raw employee documents
+            chunk_size: Bytes per yielded chunk
+            batch_rows: Rows written per worker thread call
+
+        Returns:
+            Async iterator of XLSX file chunks
+        """
+        handle, path = tempfile.mkstemp(suffix=".xlsx")
+        os.close(handle)
+
+        try:
+            # Text cells are written as text, never as formulas or links
+            workbook = xlsxwriter.Workbook(path, {
+                "constant_memory": True,
+                "strings_to_formulas": False,
+                "strings_to_urls": False,
+            })
+            worksheet = workbook.add_worksheet("Employees")
+            date_format = workbook.add_format({"num_format": "yyyy-mm-dd"})
+            worksheet.write_row(0, 0, EMPLOYEE_EXPORT_FIELDS)
+
+            row_index = 1
+            batch = []
+            async for document in documents:
+                batch.append(self.export_row(document))
+                if len(batch) == batch_rows:
+                    await asyncio.to_thread(self.write_xlsx_rows, worksheet, row_index, batch, date_format)
+                    row_index += len(batch)
+                    batch = []
+
+            if batch:
+                await asyncio.to_thread(self.write_xlsx_rows, worksheet, row_index, batch, date_format)
+
+            await asyncio.to_thread(workbook.close)
+
+            with open(path, "rb") as file:
+                while True:
+                    chunk = file.read(chunk_size)
+                    if not chunk:
+                        break
+                    yield chunk
+        finally:
+            os.remove(path)
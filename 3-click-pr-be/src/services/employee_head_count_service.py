@@ -0,0 +1,65 @@
+"""
+Employee Head Count Service
+
+Counts employees per department or designation (or any other reference
+field) with one $group aggregation instead of a count query for each.
+The $match on the indexed reference field lets MongoDB read the counts
+from the index.
+"""
+
+from typing import Any, Dict, List, Sequence
+
+from src.schemas.employee import Employee
+
+
+class EmployeeHeadCountService:
+    """Service for counting employees per reference"""
+
+    def __init__(self):
+        pass
+
+    def build_count_pipeline(self, field: str, values: Sequence[str]) -> List[Dict[str, Any]]:
+        """
+        Build the aggregation counting employees per value of a field.
+
+        Args:
+            field: Employee field holding the reference (e.g. department_id)
+            values: Values to count
+
+        Returns:
+            Aggregation pipeline
+        """
+        return [
+            {"$match": {field: {"$in": list(values)}}},
+            {"$group": {"_id": f"${field}", "count": {"$sum": 1}}}
+        ]
+
+    async def count_by(self, field: str, values: Sequence[str]) -> Dict[str, int]:
+        """
+        Count employees per value of a field.
+
+        Args:
+            field: Employee field holding the reference (e.g. department_id)
+            values: Values to count
+
+        Returns:
+            Dictionary of value -> employee count, with 0 for values no
+            employee has
+        """
+        counts = {value: 0 for value in values}
+        if not counts:
+            return counts
+
+        cursor = Employee.get_motor_collection().aggregate(self.build_count_pipeline(field, counts))
+        async for group in cursor:
+            counts[group["_id"]] = group["count"]
+
+        return counts
+
+    async def count_by_department(self, department_ids: Sequence[str]) -> Dict[str, int]:
+        """Count employees per department ID"""
+        return await self.count_by("department_id", department_ids)
+
+    async def count_by_designation(self, designation_ids: Sequence[str]) -> Dict[str, int]:
+        """Count employees per designation ID"""
+        return await self.count_by("designation_id", designation_ids)
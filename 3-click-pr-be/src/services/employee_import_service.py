@@ -0,0 +1,460 @@
+"""
+Employee Import Service
+
+Creates employees in bulk from the rows of a CSV or XLSX file.
+
+Rows are read and validated with EmployeeCreate in a worker thread, a
+chunk at a time, so reading a large workbook does not block the event
+loop. Each chunk is then imported: its employee numbers and emails are
+checked against
+the database with one $in query, and the new employees are inserted with
+insert_many(ordered=False). The unique indexes still reject an employee
+created by someone else between the check and the insert; such rows are
+reported like any other conflict.
+
+The result of every row is stored in employee_import_rows under the
+import job, one chunk at a time, so memory stays bounded by the chunk size.
+"""
+
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
+from datetime import datetime
+import asyncio
+
+from beanie import PydanticObjectId
+from pydantic import BaseModel, ValidationError
+from pymongo.errors import BulkWriteError
+
+from src.models.employee import EmployeeCreate
+from src.schemas.employee import (
+    Employee, EmployeeImportErrorClass, EmployeeImportJob, EmployeeImportRow,
+    EmployeeImportStatus, Province,
+)
+from src.utils.pagination import decode_cursor, encode_cursor
+from src.utils.tabular_reader import FORMULA_PREFIXES
+
+
+# Rows checked and inserted per chunk
+EMPLOYEE_IMPORT_CHUNK_SIZE = 1000
+
+# MongoDB error code for a unique index violation
+DUPLICATE_KEY_ERROR = 11000
+
+# Alternative column headers (normalized) accepted for EmployeeCreate fields
+EMPLOYEE_HEADER_ALIASES = {
+    "employee_no": "employee_number",
+    "emp_no": "employee_number",
+    "first": "first_name",
+    "given_name": "first_name",
+    "last": "last_name",
+    "surname": "last_name",
+    "family_name": "last_name",
+    "email_address": "email",
+    "e_mail": "email",
+    "phone_number": "phone",
+    "title": "job_title",
+    "position": "job_title",
+    "department": "department_name",
+    "manager": "manager_name",
+    "province": "province_of_employment",
+    "salary": "annual_salary",
+    "rate": "hourly_rate",
+    "start_date": "hire_date",
+    "date_of_hire": "hire_date",
+}
+
+
+class EmployeeRowChunk(NamedTuple):
+    """Rows of a file read and validated together"""
+    row_count: int
+    valid: List[Tuple[int, EmployeeCreate]]
+    invalid: List[Dict[str, Any]]
+
+
+class EmployeeUniqueKeysView(BaseModel):
+    """Projection of the unique employee fields"""
+    employee_number: str
+    email: str
+
+
+class EmployeeImportService:
+    """Service for bulk employee imports"""
+
+    def __init__(self):
+        pass
+
+    def parse_employee_row(self, row: Dict[str, str]) -> EmployeeCreate:
+        """
+        Validate a file row as an employee.
+
+        Blank cells are treated as missing, province codes ("ON") are
+        accepted for province_of_employment and the apostrophe exports put
+        before text starting with a formula character is removed.
+
+        Args:
+            row: Row values keyed by canonical column name
+
+        Returns:
+            Validated employee data
+
+        Raises:
+            ValidationError: If the row is not a valid EmployeeCreate
+        """
+        values = {key: value for key, value in row.items() if key and value != ""}
+        for key, value in values.items():
+            if value[:1] == "'" and value[1:].startswith(FORMULA_PREFIXES):
+                values[key] = value[1:]
+
+        province = values.get("province_of_employment")
+        if province and province.upper() in Province.__members__:
+            values["province_of_employment"] = Province[province.upper()].value
+
+        return EmployeeCreate(**values)
+
+    def format_validation_error(self, error: ValidationError) -> str:
+        """Summarize a validation error as "field: message" pairs"""
+        return "; ".join(
+            f"{'.'.join(str(part) for part in detail['loc'])}: {detail['msg']}"
+            for detail in error.errors()
+        )
+
+    async def find_existing_keys(
+        self,
+        employee_numbers: List[str],
+        emails: List[str]
+    ) -> Tuple[Set[str], Set[str]]:
+        """
+        Find which employee numbers and emails are already taken.
+
+        Args:
+            employee_numbers: Employee numbers to check
+            emails: Emails to check
+
+        Returns:
+            Tuple of (taken employee numbers, taken emails)
+        """
+        if not employee_numbers and not emails:
+            return set(), set()
+
+        found = await Employee.find({
+            "$or": [
+                {"employee_number": {"$in": employee_numbers}},
+                {"email": {"$in": emails}}
+            ]
+        }).project(EmployeeUniqueKeysView).to_list()
+
+        return {employee.employee_number for employee in found}, {employee.email for employee in found}
+
+    def classify_chunk(
+        self,
+        pending: List[Tuple[int, EmployeeCreate]],
+        seen_numbers: Set[str],
+        seen_emails: Set[str],
+        taken_numbers: Set[str],
+        taken_emails: Set[str]
+    ) -> Tuple[List[Tuple[int, EmployeeCreate]], List[Dict[str, Any]]]:
+        """
+        Split a chunk of valid rows into rows to insert and conflicting rows.
+
+        Args:
+            pending: (row number, employee data) of the chunk's valid rows
+            seen_numbers: Employee numbers of earlier rows of the file (updated)
+            seen_emails: Emails of earlier rows of the file (updated)
+            taken_numbers: Employee numbers already in the database
+            taken_emails: Emails already in the database
+
+        Returns:
+            Tuple of (rows to insert, row results of the rejected rows)
+        """
+        accepted = []
+        rejected = []
+
+        for row, data in pending:
+            email = str(data.email)
+            if data.employee_number in seen_numbers or email in seen_emails:
+                error_class = EmployeeImportErrorClass.DUPLICATE_IN_FILE
+                error = "Employee number or email repeats an earlier row"
+            elif data.employee_number in taken_numbers:
+                error_class = EmployeeImportErrorClass.EMPLOYEE_NUMBER_EXISTS
+                error = f"Employee number {data.employee_number} already exists"
+            elif email in taken_emails:
+                error_class = EmployeeImportErrorClass.EMAIL_EXISTS
+                error = f"Email {email} already exists"
+            else:
+                error_class = None
+
+            seen_numbers.add(data.employee_number)
+            seen_emails.add(email)
+
+            if error_class is None:
+                accepted.append((row, data))
+            else:
+                rejected.append(self.row_result(row, data, error_class=error_class, error=error))
+
+        return accepted, rejected
+
+    def row_result(
+        self,
+        row: Optional[int],
+        data: Optional[EmployeeCreate] = None,
+        employee_id: Optional[str] = None,
+        error_class: Optional[EmployeeImportErrorClass] = None,
+        error: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Build the stored result of one row"""
+        return {
+            "row": row,
+            "created": employee_id is not None,
+            "employee_id": employee_id,
+            "employee_number": data.employee_number if data else None,
+            "email": str(data.email) if data else None,
+            "error_class": error_class,
+            "error": error
+        }
+
+    def classify_write_error(self, write_error: Dict[str, Any]) -> Tuple[EmployeeImportErrorClass, str]:
+        """Map an insert_many write error to an import error class and message"""
+        if write_error.get("code") == DUPLICATE_KEY_ERROR:
+            if "email" in (write_error.get("keyPattern") or {}):
+                return EmployeeImportErrorClass.EMAIL_EXISTS, "Email already exists"
+            return EmployeeImportErrorClass.EMPLOYEE_NUMBER_EXISTS, "Employee number already exists"
+        return EmployeeImportErrorClass.WRITE_FAILED, write_error.get("errmsg", "Write failed")
+
+    async def insert_employees(self, accepted: List[Tuple[int, EmployeeCreate]]) -> List[Dict[str, Any]]:
+        """
+        Insert the accepted rows of a chunk with one unordered insert_many.
+
+        Each employee is given its ID before the insert so created employees
+        can be reported without reading them back.
+
+        Returns:
+            Row results of the accepted rows
+        """
+        employees = []
+        for _, data in accepted:
+            employee = Employee(**data.model_dump())
+            employee.id = PydanticObjectId()
+            # insert_many does not run the document's before_event hooks
+            employee.update_search_tokens()
+            employees.append(employee)
+
+        write_errors = {}
+        try:
+            await Employee.insert_many(employees, ordered=False)
+        except BulkWriteError as e:
+            write_errors = {error["index"]: error for error in e.details.get("writeErrors", [])}
+        except Exception as e:
+            write_errors = {index: {"errmsg": str(e)} for index in range(len(employees))}
+
+        results = []
+        for index, ((row, data), employee) in enumerate(zip(accepted, employees)):
+            if index in write_errors:
+                error_class, error = self.classify_write_error(write_errors[index])
+                results.append(self.row_result(row, data, error_class=error_class, error=error))
+            else:
+                results.append(self.row_result(row, data, employee_id=str(employee.id)))
+
+        return results
+
+    async def import_chunk(
+        self,
+        pending: List[Tuple[int, EmployeeCreate]],
+        seen_numbers: Set[str],
+        seen_emails: Set[str]
+    ) -> List[Dict[str, Any]]:
+        """Check a chunk of valid rows for conflicts and insert the rest"""
+        taken_numbers, taken_emails = await self.find_existing_keys(
+            [data.employee_number for _, data in pending],
+            [str(data.email) for _, data in pending]
+        )
+        accepted, rejected = self.classify_chunk(
+            pending, seen_numbers, seen_emails, taken_numbers, taken_emails
+        )
+        inserted = await self.insert_employees(accepted) if accepted else []
+        return rejected + inserted
+
+    async def store_row_results(self, job_id: str, results: List[Dict[str, Any]]) -> None:
+        """Store row results under an import job"""
+        if results:
+            await EmployeeImportRow.insert_many([EmployeeImportRow(job_id=job_id, **result) for result in results])
+
+    def parse_employee_chunks(
+        self,
+        rows: Iterable[Dict[str, str]],
+        chunk_size: int = EMPLOYEE_IMPORT_CHUNK_SIZE
+    ) -> Iterator[EmployeeRowChunk]:
+        """
+        Validate the rows of a file, a chunk at a time.
+
+        A chunk is complete once it holds chunk_size valid or chunk_size
+        invalid rows. If the file stops reading part-way, the rows read so
+        far are yielded with a read_failed result; if not even the first
+        row can be read, the error is raised.
+
+        Args:
+            rows: Data rows keyed by canonical column name, in file order
+            chunk_size: Valid rows per chunk
+
+        Returns:
+            Iterator of EmployeeRowChunk
+        """
+        row_count = 0
+        valid: List[Tuple[int, EmployeeCreate]] = []
+        invalid: List[Dict[str, Any]] = []
+        # Row 1 is the header
+        row_number = 1
+
+        try:
+            for row in rows:
+                row_number += 1
+                row_count += 1
+                try:
+                    valid.append((row_number, self.parse_employee_row(row)))
+                except ValidationError as e:
+                    invalid.append(self.row_result(
+                        row_number,
+                        error_class=EmployeeImportErrorClass.INVALID_ROW,
+                        error=self.format_validation_error(e)
+                    ))
+
+                if len(valid) >= chunk_size or len(invalid) >= chunk_size:
+                    yield EmployeeRowChunk(row_count, valid, invalid)
+                    row_count, valid, invalid = 0, [], []
+        except Exception as e:
+            if row_number == 1:
+                raise
+            invalid.append(self.row_result(
+                None,
+                error_class=EmployeeImportErrorClass.READ_FAILED,
+                error=f"Stopped reading file: {str(e)}"
+            ))
+
+        if row_count or invalid:
+            yield EmployeeRowChunk(row_count, valid, invalid)
+
+    async def open_employee_chunks(
+        self,
+        rows: Iterable[Dict[str, str]],
+        chunk_size: int = EMPLOYEE_IMPORT_CHUNK_SIZE
+    ) -> AsyncIterator[EmployeeRowChunk]:
+        """
+        Read and validate the rows of a file in a worker thread.
+
+        The first chunk is read before returning, so a file that cannot be
+        read at all (for example a CSV that is not UTF-8) raises here,
+        before an import job is created. Later chunks are read as the
+        iterator is consumed.
+
+        Args:
+            rows: Data rows keyed by canonical column name, in file order
+            chunk_size: Valid rows per chunk
+
+        Returns:
+            Async iterator of EmployeeRowChunk
+        """
+        chunks = self.parse_employee_chunks(rows, chunk_size)
+        first = await asyncio.to_thread(next, chunks, None)
+
+        async def generate() -> AsyncIterator[EmployeeRowChunk]:
+            chunk = first
+            while chunk is not None:
+                yield chunk
+                chunk = await asyncio.to_thread(next, chunks, None)
+
+        return generate()
+
+    async def run_import(
+        self,
+        job: EmployeeImportJob,
+        chunks: AsyncIterator[EmployeeRowChunk]
+    ) -> EmployeeImportJob:
+        """
+        Import the rows of a file under an import job.
+
+        Args:
+            job: Inserted import job (updated with the results)
+            chunks: Validated rows from open_employee_chunks()
+
+        Returns:
+            The completed job
+        """
+        job_id = str(job.id)
+        seen_numbers: Set[str] = set()
+        seen_emails: Set[str] = set()
+
+        async for chunk in chunks:
+            job.total_rows += chunk.row_count
+            results = list(chunk.invalid)
+            if chunk.valid:
+                results.extend(await self.import_chunk(chunk.valid, seen_numbers, seen_emails))
+
+            for result in results:
+                if result["created"]:
+                    job.employees_created += 1
+                else:
+                    job.rows_failed += 1
+                    error_class = result["error_class"].value
+                    job.error_counts[error_class] = job.error_counts.get(error_class, 0) + 1
+            # Stored in file order, which is the order rows are read back in
+            results.sort(key=lambda result: (result["row"] is None, result["row"] or 0))
+            await self.store_row_results(job_id, results)
+
+        job.status = self.get_job_status(job.employees_created, job.rows_failed)
+        job.completed_at = datetime.utcnow()
+        await job.save()
+        return job
+
+    def get_job_status(self, created: int, failed: int) -> EmployeeImportStatus:
+        """Final status of an import from its created and failed row counts"""
+        if not failed:
+            return EmployeeImportStatus.COMPLETED
+        if created:
+            return EmployeeImportStatus.PARTIALLY_COMPLETED
+        return EmployeeImportStatus.FAILED
+
+    async def get_row_results(
+        self,
+        job_id: str,
+        limit: int,
+        cursor: Optional[str] = None,
+        created: Optional[bool] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Read one page of an import's row results in file order.
+
+        Args:
+            job_id: Import job ID
+            limit: Maximum results to return
+            cursor: Cursor returned with the previous page
+            created: Only return created (True) or rejected (False) rows
+
+        Returns:
+            Tuple of (row results, cursor for the next page or None)
+
+        Raises:
+            InvalidCursorError, bson.errors.InvalidId: If the cursor is malformed
+        """
+        query: Dict[str, Any] = {"job_id": job_id}
+        if created is not None:
+            query["created"] = created
+        if cursor:
+            query["_id"] = {"$gt": PydanticObjectId(decode_cursor(cursor, 1)[0])}
+
+        documents = await EmployeeImportRow.find(query).sort("_id").limit(limit + 1).to_list()
+
+        next_cursor = None
+        if len(documents) > limit:
+            documents = documents[:limit]
+            next_cursor = encode_cursor(documents[-1].id)
+
+        return [
+            {
+                "row": document.row,
+                "created": document.created,
+                "employee_id": document.employee_id,
+                "employee_number": document.employee_number,
+                "email": document.email,
+                "error_class": document.error_class.value if document.error_class else None,
+                "error": document.error
+            }
+            for document in documents
+        ], next_cursor
@@ -0,0 +1,157 @@
+"""
+Employee Listing Service
+
+Reads one page of the employee directory and the total number of matching
+employees in a single aggregation: the filter runs once and a $facet
+splits its result into a $count and the page, which only projects the
+fields of EmployeeResponse.
+
+Pages are ordered by _id. Besides page numbers (skip), a page can start
+after the last employee of the previous one (keyset pagination). Keyset
+pages seek on _id in the top-level $match and read only the page, so
+reading one costs the same at any depth; their total is a separate count
+of the filter. Text search results are ordered by relevance instead and
+only support page numbers.
+"""
+
+from typing import Any, Dict, List, Optional
+import asyncio
+
+from beanie import PydanticObjectId
+
+from src.models.employee import EmployeeResponse
+from src.schemas.employee import Employee
+from src.utils.pagination import decode_cursor, encode_cursor
+
+
+# Fields read for each employee of a page
+EMPLOYEE_LIST_FIELDS = tuple(field for field in EmployeeResponse.model_fields if field != "id")
+
+
+class EmployeeListingService:
+    """Service for paginated employee listings"""
+
+    def __init__(self):
+        pass
+
+    def decode_list_cursor(self, cursor: str) -> PydanticObjectId:
+        """
+        Decode a listing cursor into the ID of the employee it follows.
+
+        Raises:
+            InvalidCursorError: If the cursor is malformed
+            bson.errors.InvalidId: If the cursor does not hold an ObjectId
+        """
+        return PydanticObjectId(decode_cursor(cursor, 1)[0])
+
+    def build_list_pipeline(
+        self,
+        query: Dict[str, Any],
+        limit: int,
+        skip: int = 0,
+        after_id: Optional[PydanticObjectId] = None,
+        by_text_score: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        Build the aggregation returning one page of employees.
+
+        Args:
+            query: Employee filter (may contain a $text clause)
+            limit: Employees to return (one more is read to detect a next page)
+            skip: Employees to skip
+            after_id: Return employees after this ID (keyset pagination)
+            by_text_score: Order by text relevance instead of _id
+
+        Returns:
+            With after_id, a pipeline producing the page's employees; the
+            total is counted separately. Otherwise a pipeline producing one
+            document {"total": [{"count": n}], "employees": [...]}
+        """
+        sort = {"score": {"$meta": "textScore"}, "_id": 1} if by_text_score else {"_id": 1}
+
+        page = []
+        if skip:
+            page.append({"$skip": skip})
+        page += [
+            {"$limit": limit + 1},
+            {
+                "$project": {
+                    "_id": 0,
+                    "id": {"$toString": "$_id"},
+                    **{field: 1 for field in EMPLOYEE_LIST_FIELDS}
+                }
+            }
+        ]
+
+        if after_id is not None:
+            # Seek before sorting so only the page is read from the _id index
+            return [{"$match": {**query, "_id": {"$gt": after_id}}}, {"$sort": sort}] + page
+
+        return [
+            {"$match": query},
+            {"$sort": sort},
+            {
+                "$facet": {
+                    "total": [{"$count": "count"}],
+                    "employees": page
+                }
+            }
+        ]
+
+    def parse_list_result(
+        self,
+        result: List[Dict[str, Any]],
+        limit: int,
+        with_cursor: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Parse the output of build_list_pipeline().
+
+        Args:
+            result: Aggregation output
+            limit: Page size the pipeline was built with
+            with_cursor: Whether to return a cursor when a next page exists
+
+        Returns:
+            {"total", "employees": EmployeeResponse list, "next_cursor"}
+        """
+        facets = result[0] if result else {}
+        total = facets.get("total") or [{"count": 0}]
+        documents = facets.get("employees") or []
+
+        employees = [EmployeeResponse(**document) for document in documents[:limit]]
+        next_cursor = None
+        if with_cursor and len(documents) > limit:
+            next_cursor = encode_cursor(employees[-1].id)
+
+        return {"total": total[0]["count"], "employees": employees, "next_cursor": next_cursor}
+
+    async def list_employees(
+        self,
+        query: Dict[str, Any],
+        limit: int,
+        skip: int = 0,
+        after_id: Optional[PydanticObjectId] = None,
+        by_text_score: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Read the total and one page of employees.
+
+        Page numbers read both in one round trip. Keyset pages read the page
+        and count the filter concurrently.
+
+        See build_list_pipeline() for the arguments and parse_list_result()
+        for the result. No cursor is returned for text score order.
+        """
+        pipeline = self.build_list_pipeline(query, limit, skip, after_id, by_text_score)
+
+        if after_id is not None:
+            documents, total = await asyncio.gather(
+                Employee.aggregate(pipeline).to_list(),
+                Employee.find(query).count()
+            )
+            result = [{"total": [{"count": total}], "employees": documents}]
+        else:
+            result = await Employee.aggregate(pipeline).to_list()
+
+        return self.parse_list_result(result, limit, with_cursor=not by_text_score)
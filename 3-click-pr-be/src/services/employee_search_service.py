@@ -0,0 +1,110 @@
+"""
+Employee Search Service
+
+Builds the filters for the employee directory search and backfills the
+prefix tokens it relies on.
+
+A search matches employees whose first name, last name, email or employee
+number contain a word starting with each search term ("jo sm" matches
+"John Smith"), looked up on the multikey search_tokens index. When no
+employee matches every prefix, the search falls back to a whole-word
+match on the text index: employees having any complete word of the
+search ("john smyth" finds every John) are ranked by text score. The
+fallback is not fuzzy; a misspelled word or part of a word matches
+nothing on its own.
+"""
+
+from typing import Any, Dict, List, Optional
+
+from beanie import PydanticObjectId
+from beanie.odm.bulk import BulkWriter
+from pydantic import BaseModel, Field
+
+from src.schemas.employee import Employee, EMPLOYEE_SEARCH_FIELDS
+from src.utils.search_tokens import build_search_terms, build_search_tokens
+
+
+# Employees updated per backfill batch
+SEARCH_BACKFILL_BATCH_SIZE = 1000
+
+# Sort by text relevance, best match first
+TEXT_SCORE_SORT = ("score", {"$meta": "textScore"})
+
+
+class EmployeeSearchFieldsView(BaseModel):
+    """Projection of the fields the search tokens are built from"""
+
+    id: PydanticObjectId = Field(alias="_id")
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    email: Optional[str] = None
+    employee_number: Optional[str] = None
+
+    class Config:
+        populate_by_name = True
+
+
+class EmployeeSearchService:
+    """Service for indexed employee search"""
+
+    def __init__(self):
+        pass
+
+    def build_prefix_filter(self, search: str) -> Optional[Dict[str, Any]]:
+        """
+        Build the filter matching employees with a word starting with every search term.
+
+        Args:
+            search: Text typed by the user
+
+        Returns:
+            MongoDB filter, or None if the search has no letters or digits
+        """
+        terms = build_search_terms(search)
+        if not terms:
+            return None
+        return {"search_tokens": {"$all": terms}}
+
+    def build_text_filter(self, search: str) -> Dict[str, Any]:
+        """
+        Build the text index filter matching employees with any whole word of the search.
+
+        Args:
+            search: Text typed by the user
+
+        Returns:
+            MongoDB filter (sort with TEXT_SCORE_SORT for relevance order)
+        """
+        # Quotes and leading dashes are phrase and negation syntax in $text
+        return {"$text": {"$search": search.replace('"', " ").replace("-", " ")}}
+
+    async def backfill_search_tokens(self, batch_size: int = SEARCH_BACKFILL_BATCH_SIZE) -> int:
+        """
+        Build search tokens for employees stored without them.
+
+        Args:
+            batch_size: Employees updated per batch
+
+        Returns:
+            Number of employees updated
+        """
+        updated = 0
+
+        while True:
+            employees: List[EmployeeSearchFieldsView] = await Employee.find(
+                {"search_tokens": {"$exists": False}}
+            ).limit(batch_size).project(EmployeeSearchFieldsView).to_list()
+            if not employees:
+                break
+
+            async with BulkWriter(ordered=False) as bulk_writer:
+                for employee in employees:
+                    await Employee.find_one({"_id": employee.id}).update({
+                        "$set": {"search_tokens": build_search_tokens(
+                            getattr(employee, field) for field in EMPLOYEE_SEARCH_FIELDS
+                        )}
+                    }, bulk_writer=bulk_writer)
+
+            updated += len(employees)
+
+        return updated
@@ -0,0 +1,232 @@
+"""
+Overtime Rules Service
+
+Splits worked hours into regular, overtime and double-time according to
+the provincial thresholds in OVERTIME_RULES.
+
+Entries are grouped by employee and ISO week and scanned once in date
+order, so a batch is classified in O(n log n):
+- Daily thresholds apply first (hours past "daily" are overtime, and in BC
+  hours past "doubleTimeDaily" are double-time)
+- Weekly thresholds then convert remaining regular hours past "weekly"
+  into overtime; daily overtime hours do not count towards the weekly limit
+
+An upload processed in batches passes the same OvertimeTotals to every
+batch, so daily and weekly limits carry over from earlier batches. Hours
+already stored for an employee's week are loaded into the totals first
+(see TimesheetImportService.find_existing_entry_keys) and count as worked
+before the uploaded entries.
+
+Across batches, entries are classified in file order. When a later batch
+holds an earlier work date of a week already classified, the week is
+recorded in OvertimeTotals.unordered_weeks; the upload then classifies
+those weeks again in date order once every batch is stored (see
+TimesheetImportService.reclassify_upload_weeks), so the split does not
+depend on how the file is sorted.
+"""
+
+from typing import Dict, Any, Iterable, Optional, Set, Tuple
+from datetime import date
+
+from .worker_category_service import OVERTIME_RULES, WorkerCategoryService
+from ..schemas.employee import Province
+from ..schemas.timesheet import TimeEntryType
+
+
+# Entry types whose hours are time actually worked
+WORKED_ENTRY_TYPES = {
+    TimeEntryType.REGULAR.value,
+    TimeEntryType.OVERTIME.value,
+    TimeEntryType.DOUBLE_TIME.value,
+}
+
+# Province used when an employee's province is missing or unknown
+DEFAULT_PROVINCE = "ON"
+
+
+class OvertimeTotals:
+    """Hours already classified per employee day and ISO week"""
+
+    def __init__(self):
+        # (employee_id, work_date) -> hours worked
+        self.day_hours: Dict[Tuple[str, date], float] = {}
+        # (employee_id, iso_year, iso_week) -> regular hours
+        self.week_regular: Dict[Tuple[str, int, int], float] = {}
+        # Weeks whose stored entries have been added
+        self.stored_weeks: Set[Tuple[str, int, int]] = set()
+        # (employee_id, iso_year, iso_week) -> latest work date classified
+        self.week_last_date: Dict[Tuple[str, int, int], date] = {}
+        # Weeks where a batch classified a date before one of an earlier batch
+        self.unordered_weeks: Set[Tuple[str, int, int]] = set()
+
+    def add_stored(self, employee_id: str, work_date: date, hours_worked: float, regular_hours: float):
+        """Count the hours of a stored worked entry as already classified"""
+        week_key = (employee_id, *work_date.isocalendar()[:2])
+        day_key = (employee_id, work_date)
+        self.day_hours[day_key] = self.day_hours.get(day_key, 0.0) + hours_worked
+        self.week_regular[week_key] = self.week_regular.get(week_key, 0.0) + regular_hours
+
+
+class OvertimeRulesService:
+    """Service for applying provincial overtime rules to time entries"""
+
+    def __init__(self):
+        self.worker_service = WorkerCategoryService()
+
+    def get_province_code(self, province: Optional[str]) -> str:
+        """
+        Normalize a province name or code to its two-letter code.
+
+        Args:
+            province: Province code ("BC") or name ("British Columbia")
+
+        Returns:
+            Two-letter province code, DEFAULT_PROVINCE if unrecognized
+        """
+        if province is None:
+            return DEFAULT_PROVINCE
+
+        value = str(getattr(province, "value", province)).strip()
+
+        if value.upper() in OVERTIME_RULES:
+            return value.upper()
+
+        for member in Province:
+            if member.value.lower() == value.lower():
+                return member.name
+
+        return DEFAULT_PROVINCE
+
+    def split_day_hours(
+        self,
+        hours: float,
+        hours_before: float,
+        rules: Dict[str, Any]
+    ) -> Tuple[float, float, float]:
+        """
+        Split hours worked on a day by the daily thresholds.
+
+        Args:
+            hours: Hours of this entry
+            hours_before: Hours already worked earlier that day
+            rules: Provincial overtime rules
+
+        Returns:
+            Tuple of (regular_hours, overtime_hours, double_time_hours)
+        """
+        start = hours_before
+        end = hours_before + hours
+
+        daily = rules.get("daily")
+        double_time_daily = rules.get("doubleTimeDaily")
+
+        if daily is None:
+            return hours, 0.0, 0.0
+
+        def overlap(band_start: float, band_end: Optional[float]) -> float:
+            upper = end if band_end is None else min(end, band_end)
+            return max(0.0, upper - max(start, band_start))
+
+        regular = overlap(0.0, daily)
+        overtime = overlap(daily, double_time_daily)
+        double_time = overlap(double_time_daily, None) if double_time_daily is not None else 0.0
+
+        return regular, overtime, double_time
+
+    def apply(
+        self,
+        entries: Iterable[Any],
+        employees: Dict[str, Dict[str, Any]],
+        totals: Optional[OvertimeTotals] = None
+    ) -> Dict[str, int]:
+        """
+        Compute and write hour splits for a batch of time entries.
+
+        Entries are updated in place: regular_hours, overtime_hours and
+        double_time_hours are overwritten for worked entry types, and
+        overtime_rate is set from the provincial multiplier. Other entry
+        types (vacation, sick leave, ...) are left untouched.
+
+        Daily and weekly totals start from totals and are added to it.
+        Without totals, only the entries passed in are considered. Entries
+        of a later batch count as worked after those of earlier batches;
+        weeks where that is not date order are added to
+        totals.unordered_weeks.
+
+        Args:
+            entries: Objects with employee_id, work_date, entry_type and
+                hours_worked attributes (e.g. TimeEntry documents)
+            employees: Mapping of employee_id to {"province", "worker_category"}
+            totals: Hours classified by earlier batches, updated in place
+
+        Returns:
+            Counts of entries classified and entries with overtime or double-time
+        """
+        worked = []
+        for index, entry in enumerate(entries):
+            entry_type = getattr(entry.entry_type, "value", entry.entry_type)
+            if entry_type in WORKED_ENTRY_TYPES:
+                iso_year, iso_week, _ = entry.work_date.isocalendar()
+                worked.append(((entry.employee_id, iso_year, iso_week, entry.work_date, index), entry))
+
+        worked.sort(key=lambda item: item[0])
+
+        if totals is None:
+            totals = OvertimeTotals()
+
+        stats = {"entries_classified": 0, "entries_with_overtime": 0}
+
+        current_employee = None
+        rules = None
+        overtime_eligible = True
+
+        for (employee_id, iso_year, iso_week, work_date, _), entry in worked:
+            if current_employee != employee_id:
+                current_employee = employee_id
+
+                employee = employees.get(employee_id, {})
+                rules = OVERTIME_RULES[self.get_province_code(employee.get("province"))]
+                overtime_eligible = self.worker_service.is_overtime_eligible(employee)
+
+            week_key = (employee_id, iso_year, iso_week)
+            day_key = (employee_id, work_date)
+
+            # Entries of a batch are in date order, so an earlier date can
+            # only come from a week an earlier batch classified
+            last_date = totals.week_last_date.get(week_key)
+            if last_date is not None and work_date < last_date:
+                totals.unordered_weeks.add(week_key)
+            else:
+                totals.week_last_date[week_key] = work_date
+
+            week_regular = totals.week_regular.get(week_key, 0.0)
+            day_hours = totals.day_hours.get(day_key, 0.0)
+
+            hours = max(0.0, entry.hours_worked or 0.0)
+
+            if overtime_eligible:
+                regular, overtime, double_time = self.split_day_hours(hours, day_hours, rules)
+
+                weekly = rules.get("weekly")
+                if weekly is not None:
+                    weekly_capacity = max(0.0, weekly - week_regular)
+                    if regular > weekly_capacity:
+                        overtime += regular - weekly_capacity
+                        regular = weekly_capacity
+            else:
+                regular, overtime, double_time = hours, 0.0, 0.0
+
+            totals.day_hours[day_key] = day_hours + hours
+            totals.week_regular[week_key] = week_regular + regular
+
+            entry.regular_hours = round(regular, 2)
+            entry.overtime_hours = round(overtime, 2)
+            entry.double_time_hours = round(double_time, 2)
+            if getattr(entry, "hourly_rate", None):
+                entry.overtime_rate = round(entry.hourly_rate * rules["rate"], 4)
+
+            stats["entries_classified"] += 1
+            if overtime or double_time:
+                stats["entries_with_overtime"] += 1
+
+        return stats
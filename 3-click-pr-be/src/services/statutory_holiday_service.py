@@ -0,0 +1,372 @@
+"""
+Statutory Holiday Service
+
+Generates the general (statutory) holidays of every province and territory
+in OVERTIME_RULES from the rules in STATUTORY_HOLIDAY_RULES:
+- fixed dates (Canada Day, Christmas Day, ...)
+- nth weekday of a month (Family Day, Labour Day, Thanksgiving, ...)
+- the Monday before a date (Victoria Day / National Patriots' Day)
+- dates relative to Easter Sunday (Good Friday)
+
+A calendar is computed once per (province, year) and cached as an
+immutable tuple. Holiday time entries for a whole workforce are built
+while streaming the eligible employees and inserted in bulk a batch of
+employees at a time; the unique (employee, date, entry type) index skips
+holidays that already have an entry.
+"""
+
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+
+from beanie import PydanticObjectId
+from pydantic import BaseModel, Field
+
+from ..schemas.employee import Employee, Province
+from ..schemas.timesheet import TimeEntry, TimeEntryStatus, TimeEntryType
+from .overtime_rules_service import OvertimeRulesService
+from .timesheet_import_service import TimesheetImportService
+from .worker_category_service import WorkerCategoryService
+
+
+MONDAY = 0
+
+# Hours recorded on a generated holiday entry unless given
+DEFAULT_HOLIDAY_HOURS = 8.0
+
+# Employees whose holiday entries are built and inserted together
+HOLIDAY_EMPLOYEE_BATCH_SIZE = 100
+
+NEW_YEARS_DAY = {"name": "New Year's Day", "rule": "fixed", "month": 1, "day": 1}
+FAMILY_DAY = {"name": "Family Day", "rule": "nth_weekday", "month": 2, "weekday": MONDAY, "n": 3}
+GOOD_FRIDAY = {"name": "Good Friday", "rule": "easter", "offset": -2}
+VICTORIA_DAY = {"name": "Victoria Day", "rule": "weekday_before", "month": 5, "day": 25, "weekday": MONDAY}
+CANADA_DAY = {"name": "Canada Day", "rule": "fixed", "month": 7, "day": 1, "sunday_to_monday": True}
+CIVIC_HOLIDAY = {"name": "Civic Holiday", "rule": "nth_weekday", "month": 8, "weekday": MONDAY, "n": 1}
+LABOUR_DAY = {"name": "Labour Day", "rule": "nth_weekday", "month": 9, "weekday": MONDAY, "n": 1}
+TRUTH_AND_RECONCILIATION_DAY = {"name": "National Day for Truth and Reconciliation", "rule": "fixed", "month": 9, "day": 30}
+THANKSGIVING = {"name": "Thanksgiving Day", "rule": "nth_weekday", "month": 10, "weekday": MONDAY, "n": 2}
+REMEMBRANCE_DAY = {"name": "Remembrance Day", "rule": "fixed", "month": 11, "day": 11}
+CHRISTMAS_DAY = {"name": "Christmas Day", "rule": "fixed", "month": 12, "day": 25}
+BOXING_DAY = {"name": "Boxing Day", "rule": "fixed", "month": 12, "day": 26}
+INDIGENOUS_PEOPLES_DAY = {"name": "National Indigenous Peoples Day", "rule": "fixed", "month": 6, "day": 21}
+
+
+def variant(holiday: Dict[str, Any], **changes) -> Dict[str, Any]:
+    """Copy of a holiday rule with a provincial name or start year"""
+    return {**holiday, **changes}
+
+
+# General holidays under each province's employment standards legislation
+STATUTORY_HOLIDAY_RULES = {
+    "AB": [
+        NEW_YEARS_DAY, FAMILY_DAY, GOOD_FRIDAY, VICTORIA_DAY, CANADA_DAY,
+        LABOUR_DAY, THANKSGIVING, REMEMBRANCE_DAY, CHRISTMAS_DAY,
+    ],
+    "BC": [
+        NEW_YEARS_DAY, FAMILY_DAY, GOOD_FRIDAY, VICTORIA_DAY, CANADA_DAY,
+        variant(CIVIC_HOLIDAY, name="British Columbia Day"), LABOUR_DAY,
+        variant(TRUTH_AND_RECONCILIATION_DAY, since=2023),
+        THANKSGIVING, REMEMBRANCE_DAY, CHRISTMAS_DAY,
+    ],
+    "MB": [
+        NEW_YEARS_DAY, variant(FAMILY_DAY, name="Louis Riel Day"), GOOD_FRIDAY, VICTORIA_DAY,
+        CANADA_DAY, LABOUR_DAY,
+        variant(TRUTH_AND_RECONCILIATION_DAY, since=2023),
+        THANKSGIVING, CHRISTMAS_DAY,
+    ],
+    "NB": [
+        NEW_YEARS_DAY, FAMILY_DAY, GOOD_FRIDAY, CANADA_DAY,
+        variant(CIVIC_HOLIDAY, name="New Brunswick Day"), LABOUR_DAY, REMEMBRANCE_DAY, CHRISTMAS_DAY,
+    ],
+    "NL": [
+        NEW_YEARS_DAY, GOOD_FRIDAY, variant(CANADA_DAY, name="Memorial Day / Canada Day"),
+        LABOUR_DAY, REMEMBRANCE_DAY, CHRISTMAS_DAY,
+    ],
+    "NS": [
+        NEW_YEARS_DAY, variant(FAMILY_DAY, name="Heritage Day"), GOOD_FRIDAY, CANADA_DAY,
+        LABOUR_DAY, CHRISTMAS_DAY,
+    ],
+    "NT": [
+        NEW_YEARS_DAY, GOOD_FRIDAY, VICTORIA_DAY, INDIGENOUS_PEOPLES_DAY, CANADA_DAY,
+        CIVIC_HOLIDAY, LABOUR_DAY,
+        variant(TRUTH_AND_RECONCILIATION_DAY, since=2022),
+        THANKSGIVING, REMEMBRANCE_DAY, CHRISTMAS_DAY,
+    ],
+    "NU": [
+        NEW_YEARS_DAY, GOOD_FRIDAY, VICTORIA_DAY, CANADA_DAY,
+        {"name": "Nunavut Day", "rule": "fixed", "month": 7, "day": 9},
+        CIVIC_HOLIDAY, LABOUR_DAY, THANKSGIVING, REMEMBRANCE_DAY, CHRISTMAS_DAY,
+    ],
+    "ON": [
+        NEW_YEARS_DAY, FAMILY_DAY, GOOD_FRIDAY, VICTORIA_DAY, CANADA_DAY,
+        LABOUR_DAY, THANKSGIVING, CHRISTMAS_DAY, BOXING_DAY,
+    ],
+    "PE": [
+        NEW_YEARS_DAY, variant(FAMILY_DAY, name="Islander Day"), GOOD_FRIDAY, CANADA_DAY,
+        LABOUR_DAY,
+        variant(TRUTH_AND_RECONCILIATION_DAY, since=2022),
+        REMEMBRANCE_DAY, CHRISTMAS_DAY,
+    ],
+    "QC": [
+        NEW_YEARS_DAY, GOOD_FRIDAY, variant(VICTORIA_DAY, name="National Patriots' Day"),
+        {"name": "Saint-Jean-Baptiste Day", "rule": "fixed", "month": 6, "day": 24},
+        CANADA_DAY, LABOUR_DAY, THANKSGIVING, CHRISTMAS_DAY,
+    ],
+    "SK": [
+        NEW_YEARS_DAY, FAMILY_DAY, GOOD_FRIDAY, VICTORIA_DAY, CANADA_DAY,
+        variant(CIVIC_HOLIDAY, name="Saskatchewan Day"), LABOUR_DAY, THANKSGIVING,
+        REMEMBRANCE_DAY, CHRISTMAS_DAY,
+    ],
+    "YT": [
+        NEW_YEARS_DAY, GOOD_FRIDAY, VICTORIA_DAY, INDIGENOUS_PEOPLES_DAY, CANADA_DAY,
+        variant(CIVIC_HOLIDAY, name="Discovery Day", n=3), LABOUR_DAY,
+        variant(TRUTH_AND_RECONCILIATION_DAY, since=2023),
+        THANKSGIVING, REMEMBRANCE_DAY, CHRISTMAS_DAY,
+    ],
+}
+
+
+class Holiday(NamedTuple):
+    """A statutory holiday"""
+    date: date
+    name: str
+
+
+class HolidayEmployeeView(BaseModel):
+    """Projection of the employee fields needed to generate holiday entries"""
+    id: PydanticObjectId = Field(alias="_id")
+    first_name: str
+    last_name: str
+    employee_number: str
+    hourly_rate: Optional[float] = None
+    department_id: Optional[str] = None
+    department_name: Optional[str] = None
+    province_of_employment: Province = Province.ON
+    hire_date: Optional[date] = None
+    termination_date: Optional[date] = None
+
+    class Config:
+        populate_by_name = True
+
+
+def easter_sunday(year: int) -> date:
+    """Date of Easter Sunday (Gregorian calendar, anonymous algorithm)"""
+    a = year % 19
+    b, c = divmod(year, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return date(year, month, day + 1)
+
+
+def nth_weekday(year: int, month: int, weekday: int, n: int) -> date:
+    """The nth given weekday of a month"""
+    first = date(year, month, 1)
+    return first + timedelta(days=(weekday - first.weekday()) % 7 + (n - 1) * 7)
+
+
+def resolve_holiday(rule: Dict[str, Any], year: int) -> date:
+    """Date of a holiday rule in a year"""
+    if rule["rule"] == "fixed":
+        day = date(year, rule["month"], rule["day"])
+        if rule.get("sunday_to_monday") and day.weekday() == 6:
+            day += timedelta(days=1)
+        return day
+
+    if rule["rule"] == "nth_weekday":
+        return nth_weekday(year, rule["month"], rule["weekday"], rule["n"])
+
+    if rule["rule"] == "weekday_before":
+        before = date(year, rule["month"], rule["day"]) - timedelta(days=1)
+        return before - timedelta(days=(before.weekday() - rule["weekday"]) % 7)
+
+    if rule["rule"] == "easter":
+        return easter_sunday(year) + timedelta(days=rule["offset"])
+
+    raise ValueError(f"Unknown holiday rule: {rule['rule']}")
+
+
+@lru_cache(maxsize=None)
+def get_holiday_calendar(province_code: str, year: int) -> Tuple[Holiday, ...]:
+    """
+    Statutory holidays of a province in a year, in date order.
+
+    Cached per (province, year); the result is immutable.
+    """
+    holidays = [
+        Holiday(resolve_holiday(rule, year), rule["name"])
+        for rule in STATUTORY_HOLIDAY_RULES[province_code]
+        if year >= rule.get("since", year)
+    ]
+    return tuple(sorted(holidays))
+
+
+class StatutoryHolidayService:
+    """Service for statutory holiday calendars and holiday time entries"""
+
+    def __init__(self):
+        pass
+
+    def get_holidays(self, province: Optional[str], year: int) -> Tuple[Holiday, ...]:
+        """
+        Get the statutory holidays of a province in a year.
+
+        Args:
+            province: Province code ("ON") or name ("Ontario")
+            year: Calendar year
+
+        Returns:
+            Holidays in date order
+        """
+        return get_holiday_calendar(OvertimeRulesService().get_province_code(province), year)
+
+    def get_holidays_between(self, province: Optional[str], start_date: date, end_date: date) -> List[Holiday]:
+        """Get the statutory holidays of a province within a date range (inclusive)"""
+        return [
+            holiday
+            for year in range(start_date.year, end_date.year + 1)
+            for holiday in self.get_holidays(province, year)
+            if start_date <= holiday.date <= end_date
+        ]
+
+    def get_holiday(self, province: Optional[str], day: date) -> Optional[Holiday]:
+        """Get the statutory holiday on a date, or None if it is not one"""
+        for holiday in self.get_holidays(province, day.year):
+            if holiday.date == day:
+                return holiday
+        return None
+
+    def build_holiday_entries(
+        self,
+        employees: Iterable[HolidayEmployeeView],
+        start_date: date,
+        end_date: date,
+        hours: float = DEFAULT_HOLIDAY_HOURS
+    ) -> List[TimeEntry]:
+        """
+        Build draft STAT_HOLIDAY entries for employees' provincial holidays.
+
+        Employees get an entry for each holiday in the range that falls
+        within their employment (hire date to termination date).
+
+        Args:
+            employees: Eligible employees
+            start_date: First date to consider
+            end_date: Last date to consider
+            hours: Hours recorded on each entry
+
+        Returns:
+            Unsaved TimeEntry documents
+        """
+        overtime_service = OvertimeRulesService()
+        holidays_by_province = {}
+        entries = []
+        now = datetime.utcnow()
+
+        for employee in employees:
+            province = overtime_service.get_province_code(employee.province_of_employment)
+            if province not in holidays_by_province:
+                holidays_by_province[province] = self.get_holidays_between(province, start_date, end_date)
+
+            for holiday in holidays_by_province[province]:
+                if employee.hire_date and holiday.date < employee.hire_date:
+                    continue
+                if employee.termination_date and holiday.date > employee.termination_date:
+                    continue
+
+                entries.append(TimeEntry(
+                    employee_id=str(employee.id),
+                    employee_number=employee.employee_number,
+                    employee_name=f"{employee.first_name} {employee.last_name}",
+                    work_date=holiday.date,
+                    entry_type=TimeEntryType.STAT_HOLIDAY,
+                    hours_worked=hours,
+                    hourly_rate=employee.hourly_rate,
+                    department_id=employee.department_id,
+                    department_name=employee.department_name,
+                    employee_notes=holiday.name,
+                    status=TimeEntryStatus.DRAFT,
+                    created_at=now,
+                    updated_at=now
+                ))
+
+        return entries
+
+    async def generate_holiday_entries(
+        self,
+        start_date: date,
+        end_date: date,
+        employee_ids: Optional[List[str]] = None,
+        hours: float = DEFAULT_HOLIDAY_HOURS,
+        dry_run: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Create holiday entries for every eligible employee.
+
+        Eligible employees are active employees of a category
+        WorkerCategoryService.statutory_holiday_eligible_categories()
+        lists, streamed from one projected query. Their entries are built
+        and inserted a batch of employees at a time, so memory does not
+        grow with the workforce.
+
+        Args:
+            start_date: First date to consider
+            end_date: Last date to consider
+            employee_ids: Optional subset of employees
+            hours: Hours recorded on each entry
+            dry_run: If True, only count the entries that would be built
+
+        Returns:
+            Summary with employees, entries built, created and skipped
+        """
+        query = {
+            "status": "active",
+            "worker_category": {"$in": WorkerCategoryService().statutory_holiday_eligible_categories()}
+        }
+        if employee_ids is not None:
+            object_ids = []
+            for employee_id in employee_ids:
+                try:
+                    object_ids.append(PydanticObjectId(employee_id))
+                except Exception:
+                    continue
+            query["_id"] = {"$in": object_ids}
+
+        import_service = TimesheetImportService()
+        summary = {"employee_count": 0, "entries_built": 0, "dry_run": dry_run}
+        if not dry_run:
+            summary.update({"created": 0, "skipped_existing": 0, "failed": 0})
+        work_dates = set()
+
+        async def insert_batch(employees: List[HolidayEmployeeView]) -> None:
+            entries = self.build_holiday_entries(employees, start_date, end_date, hours)
+            summary["employee_count"] += len(employees)
+            summary["entries_built"] += len(entries)
+            if dry_run or not entries:
+                return
+
+            result = await import_service.insert_entries(entries)
+            summary["created"] += len(result["inserted"])
+            summary["skipped_existing"] += len(result["duplicates"])
+            summary["failed"] += len(result["failed"])
+            work_dates.update(entries[position].work_date for position in result["inserted"])
+
+        batch = []
+        async for employee in Employee.find(query).project(HolidayEmployeeView):
+            batch.append(employee)
+            if len(batch) >= HOLIDAY_EMPLOYEE_BATCH_SIZE:
+                await insert_batch(batch)
+                batch = []
+        if batch:
+            await insert_batch(batch)
+
+        if not dry_run:
+            summary["work_dates"] = sorted(work_dates)
+        return summary
+
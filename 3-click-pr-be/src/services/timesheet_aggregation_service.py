@@ -3,6 +3,9 @@ Timesheet Aggregation Service
 
 Aggregates approved time entries into earnings items for payroll calculation.
 Bridges the gap between time tracking and payroll processing.
+
+Server-side rollups also cover entries moved to the time entry archive, so
+historical summaries and pay runs read the same hours after archiving.
 """
 
 from typing import List, Dict, Any, Optional, Tuple
@@ -11,6 +14,17 @@ from beanie import PydanticObjectId
 
 from ..schemas.timesheet import TimeEntry, TimeEntryStatus, TimeEntryType
 from ..schemas.employee import Employee
+from .timesheet_rollup_service import TimesheetRollupService
+from .timesheet_archive_service import TimesheetArchiveService
+
+
+# Entry types whose hours are also reported in their own bucket
+ENTRY_TYPE_HOURS_KEYS = {
+    TimeEntryType.VACATION.value: "vacation_hours",
+    TimeEntryType.SICK_LEAVE.value: "sick_leave_hours",
+    TimeEntryType.STAT_HOLIDAY.value: "stat_holiday_hours",
+    TimeEntryType.UNPAID.value: "unpaid_hours",
+}
 
 
 class TimesheetAggregationService:
@@ -81,16 +95,7 @@ class TimesheetAggregationService:
                 "unpaid_hours": float
             }
         """
-        aggregated = {
-            "total_hours": 0.0,
-            "regular_hours": 0.0,
-            "overtime_hours": 0.0,
-            "double_time_hours": 0.0,
-            "vacation_hours": 0.0,
-            "sick_leave_hours": 0.0,
-            "stat_holiday_hours": 0.0,
-            "unpaid_hours": 0.0
-        }
+        aggregated = self._empty_hours()
 
         for entry in time_entries:
             aggregated["total_hours"] += entry.hours_worked
@@ -99,17 +104,247 @@ class TimesheetAggregationService:
             aggregated["double_time_hours"] += entry.double_time_hours
 
             # Aggregate by entry type
-            if entry.entry_type == TimeEntryType.VACATION:
-                aggregated["vacation_hours"] += entry.hours_worked
-            elif entry.entry_type == TimeEntryType.SICK_LEAVE:
-                aggregated["sick_leave_hours"] += entry.hours_worked
-            elif entry.entry_type == TimeEntryType.STAT_HOLIDAY:
-                aggregated["stat_holiday_hours"] += entry.hours_worked
-            elif entry.entry_type == TimeEntryType.UNPAID:
-                aggregated["unpaid_hours"] += entry.hours_worked
+            type_key = ENTRY_TYPE_HOURS_KEYS.get(entry.entry_type.value)
+            if type_key:
+                aggregated[type_key] += entry.hours_worked
 
         return aggregated
 
+    def build_hours_pipeline(self) -> List[Dict[str, Any]]:
+        """
+        Build the aggregation stages that roll time entries up into hour buckets.
+
+        The $match on (status, work_date) is supplied by the find query so
+        it can use the compound index; these stages group what survives it
+        by employee and entry type, so only numbers cross the wire.
+
+        Returns:
+            Aggregation pipeline stages
+        """
+        return [
+            {
+                "$group": {
+                    "_id": {
+                        "employee_id": "$employee_id",
+                        "entry_type": "$entry_type"
+                    },
+                    "hours_worked": {"$sum": "$hours_worked"},
+                    "regular_hours": {"$sum": "$regular_hours"},
+                    "overtime_hours": {"$sum": "$overtime_hours"},
+                    "double_time_hours": {"$sum": "$double_time_hours"},
+                    "hourly_rate": {"$first": "$hourly_rate"},
+                    "entry_ids": {"$push": "$_id"}
+                }
+            }
+        ]
+
+    def fold_hour_buckets(
+        self,
+        buckets: List[Dict[str, Any]]
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Fold (employee, entry_type) buckets into per-employee hour summaries.
+
+        Args:
+            buckets: Documents produced by build_hours_pipeline()
+
+        Returns:
+            Dictionary mapping employee_id to:
+            {
+                "hours": aggregated hours (same shape as aggregate_hours),
+                "time_entry_ids": list of time entry IDs,
+                "hourly_rate": first hourly rate seen on an entry, or None
+            }
+        """
+        rollup = {}
+
+        for bucket in buckets:
+            employee_id = bucket["_id"]["employee_id"]
+            entry_type = bucket["_id"]["entry_type"]
+
+            if employee_id not in rollup:
+                rollup[employee_id] = {
+                    "hours": self._empty_hours(),
+                    "time_entry_ids": [],
+                    "hourly_rate": None
+                }
+
+            employee_rollup = rollup[employee_id]
+            hours = employee_rollup["hours"]
+            hours["total_hours"] += bucket.get("hours_worked") or 0.0
+            hours["regular_hours"] += bucket.get("regular_hours") or 0.0
+            hours["overtime_hours"] += bucket.get("overtime_hours") or 0.0
+            hours["double_time_hours"] += bucket.get("double_time_hours") or 0.0
+
+            type_key = ENTRY_TYPE_HOURS_KEYS.get(entry_type)
+            if type_key:
+                hours[type_key] += bucket.get("hours_worked") or 0.0
+
+            if employee_rollup["hourly_rate"] is None and bucket.get("hourly_rate"):
+                employee_rollup["hourly_rate"] = bucket["hourly_rate"]
+
+            employee_rollup["time_entry_ids"].extend(
+                str(entry_id) for entry_id in bucket.get("entry_ids", [])
+            )
+
+        return rollup
+
+    async def aggregate_approved_hours(
+        self,
+        employee_ids: List[str],
+        period_start_date: date,
+        period_end_date: date
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Roll up approved hours for employees server-side.
+
+        Args:
+            employee_ids: List of employee IDs
+            period_start_date: Start of pay period
+            period_end_date: End of pay period
+
+        Returns:
+            Per-employee hour summaries (see fold_hour_buckets)
+        """
+        buckets = await TimeEntry.find({
+            "status": {"$in": [TimeEntryStatus.APPROVED.value, TimeEntryStatus.PROCESSED.value]},
+            "work_date": {"$gte": period_start_date, "$lte": period_end_date},
+            "employee_id": {"$in": employee_ids}
+        }).aggregate(self.build_hours_pipeline()).to_list()
+
+        # Archived entries are all processed
+        buckets += await TimesheetArchiveService().aggregate_archived_entries(
+            period_start_date, period_end_date,
+            stages=self.build_hours_pipeline(),
+            employee_ids=employee_ids
+        )
+
+        return self.fold_hour_buckets(buckets)
+
+    def build_summary_pipeline(self) -> List[Dict[str, Any]]:
+        """
+        Build the aggregation stages for a single employee's timesheet summary.
+
+        Entries are grouped by (entry_type, status), which is enough to
+        derive both the hour totals and the status breakdown. Sorting by
+        work_date first makes each bucket's hourly_rate its earliest entry's.
+
+        Returns:
+            Aggregation pipeline stages
+        """
+        return [
+            {"$sort": {"work_date": 1}},
+            {
+                "$group": {
+                    "_id": {
+                        "entry_type": "$entry_type",
+                        "status": "$status"
+                    },
+                    "entry_count": {"$sum": 1},
+                    "hours_worked": {"$sum": "$hours_worked"},
+                    "regular_hours": {"$sum": "$regular_hours"},
+                    "overtime_hours": {"$sum": "$overtime_hours"},
+                    "double_time_hours": {"$sum": "$double_time_hours"},
+                    "first_work_date": {"$first": "$work_date"},
+                    "hourly_rate": {"$first": "$hourly_rate"}
+                }
+            }
+        ]
+
+    def fold_summary_buckets(
+        self,
+        buckets: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """
+        Fold (entry_type, status) buckets into a timesheet summary.
+
+        Args:
+            buckets: Documents produced by build_summary_pipeline()
+
+        Returns:
+            {
+                "hours": aggregated hours (same shape as aggregate_hours),
+                "status_breakdown": entry count per status,
+                "total_entries": int,
+                "hourly_rate": hourly rate of the earliest entry, or None
+            }
+        """
+        hours = self._empty_hours()
+        status_breakdown = {}
+        total_entries = 0
+        earliest = None
+
+        for bucket in buckets:
+            entry_type = bucket["_id"]["entry_type"]
+            entry_status = bucket["_id"]["status"]
+            count = bucket.get("entry_count", 0)
+
+            hours["total_hours"] += bucket.get("hours_worked") or 0.0
+            hours["regular_hours"] += bucket.get("regular_hours") or 0.0
+            hours["overtime_hours"] += bucket.get("overtime_hours") or 0.0
+            hours["double_time_hours"] += bucket.get("double_time_hours") or 0.0
+
+            type_key = ENTRY_TYPE_HOURS_KEYS.get(entry_type)
+            if type_key:
+                hours[type_key] += bucket.get("hours_worked") or 0.0
+
+            status_breakdown[entry_status] = status_breakdown.get(entry_status, 0) + count
+            total_entries += count
+
+            first_work_date = bucket.get("first_work_date")
+            if first_work_date is not None and (earliest is None or first_work_date < earliest["first_work_date"]):
+                earliest = bucket
+
+        return {
+            "hours": hours,
+            "status_breakdown": status_breakdown,
+            "total_entries": total_entries,
+            "hourly_rate": earliest.get("hourly_rate") if earliest else None
+        }
+
+    async def summarize_employee_entries(
+        self,
+        employee_id: str,
+        period_start_date: date,
+        period_end_date: date
+    ) -> Dict[str, Any]:
+        """
+        Summarize all of an employee's time entries in a date range server-side.
+
+        Args:
+            employee_id: Employee ID
+            period_start_date: Start of period
+            period_end_date: End of period
+
+        Returns:
+            Summary of hours and status counts (see fold_summary_buckets)
+        """
+        buckets = await TimeEntry.find({
+            "employee_id": employee_id,
+            "work_date": {"$gte": period_start_date, "$lte": period_end_date}
+        }).aggregate(self.build_summary_pipeline()).to_list()
+
+        buckets += await TimesheetArchiveService().aggregate_archived_entries(
+            period_start_date, period_end_date,
+            stages=self.build_summary_pipeline(),
+            employee_ids=[employee_id]
+        )
+
+        return self.fold_summary_buckets(buckets)
+
+    def _empty_hours(self) -> Dict[str, float]:
+        """Zeroed hours dictionary"""
+        return {
+            "total_hours": 0.0,
+            "regular_hours": 0.0,
+            "overtime_hours": 0.0,
+            "double_time_hours": 0.0,
+            "vacation_hours": 0.0,
+            "sick_leave_hours": 0.0,
+            "stat_holiday_hours": 0.0,
+            "unpaid_hours": 0.0
+        }
+
     def calculate_earnings_from_hours(
         self,
         hours: Dict[str, float],
@@ -256,25 +491,24 @@ class TimesheetAggregationService:
         if not employee:
             return None, []
 
-        # Fetch approved time entries
-        entries_by_employee = await self.get_approved_time_entries(
+        # Roll up approved hours
+        rollup = await self.aggregate_approved_hours(
             employee_ids=[employee_id],
             period_start_date=period_start_date,
             period_end_date=period_end_date
         )
 
-        time_entries = entries_by_employee.get(employee_id, [])
+        employee_rollup = rollup.get(employee_id)
 
-        if not time_entries:
+        if not employee_rollup:
             return None, []
 
-        # Aggregate hours
-        hours = self.aggregate_hours(time_entries)
+        hours = employee_rollup["hours"]
 
         # Get hourly rate from employee or first time entry
         hourly_rate = employee.hourly_rate or 0.0
-        if hourly_rate == 0.0 and time_entries:
-            hourly_rate = time_entries[0].hourly_rate or 0.0
+        if hourly_rate == 0.0:
+            hourly_rate = employee_rollup["hourly_rate"] or 0.0
 
         # Calculate earnings
         earnings = self.calculate_earnings_from_hours(
@@ -303,7 +537,8 @@ class TimesheetAggregationService:
         self,
         employee_ids: List[str],
         period_start_date: date,
-        period_end_date: date
+        period_end_date: date,
+        use_period_rollups: bool = False
     ) -> Dict[str, Dict[str, Any]]:
         """
         Aggregate earnings for all employees in a pay run.
@@ -312,30 +547,44 @@ class TimesheetAggregationService:
             employee_ids: List of employee IDs
             period_start_date: Start of pay period
             period_end_date: End of pay period
+            use_period_rollups: Read hours from TimesheetPeriod rollups where a
+                period matches the pay run dates exactly
 
         Returns:
             Dictionary mapping employee_id to:
             {
                 "employee": employee_dict,
                 "earnings": earnings_list,
-                "time_entries": list of time entry IDs,
+                "time_entry_ids": list of time entry IDs,
                 "summary": aggregated hours summary
             }
         """
         pay_run_data = {}
 
-        # Fetch all approved entries
-        entries_by_employee = await self.get_approved_time_entries(
-            employee_ids=employee_ids,
-            period_start_date=period_start_date,
-            period_end_date=period_end_date
-        )
+        rollup = {}
+
+        # Read maintained period rollups first when enabled
+        if use_period_rollups:
+            rollup = await TimesheetRollupService().get_period_rollups(
+                employee_ids=employee_ids,
+                period_start_date=period_start_date,
+                period_end_date=period_end_date
+            )
+
+        # Roll up remaining approved hours in one aggregation
+        remaining_ids = [emp_id for emp_id in employee_ids if emp_id not in rollup]
+        if remaining_ids:
+            rollup.update(await self.aggregate_approved_hours(
+                employee_ids=remaining_ids,
+                period_start_date=period_start_date,
+                period_end_date=period_end_date
+            ))
 
         # Process each employee
         for employee_id in employee_ids:
-            time_entries = entries_by_employee.get(employee_id, [])
+            employee_rollup = rollup.get(employee_id)
 
-            if not time_entries:
+            if not employee_rollup:
                 continue
 
             # Fetch employee
@@ -347,13 +596,12 @@ class TimesheetAggregationService:
             if not employee:
                 continue
 
-            # Aggregate hours
-            hours = self.aggregate_hours(time_entries)
+            hours = employee_rollup["hours"]
 
             # Get hourly rate
             hourly_rate = employee.hourly_rate or 0.0
-            if hourly_rate == 0.0 and time_entries:
-                hourly_rate = time_entries[0].hourly_rate or 0.0
+            if hourly_rate == 0.0:
+                hourly_rate = employee_rollup["hourly_rate"] or 0.0
 
             # Calculate earnings
             earnings = self.calculate_earnings_from_hours(
@@ -381,7 +629,7 @@ class TimesheetAggregationService:
             pay_run_data[employee_id] = {
                 "employee": employee_dict,
                 "earnings": earnings,
-                "time_entry_ids": [str(entry.id) for entry in time_entries],
+                "time_entry_ids": employee_rollup["time_entry_ids"],
                 "summary": hours
             }
 
@@ -391,33 +639,47 @@ class TimesheetAggregationService:
         self,
         time_entry_ids: List[str],
         pay_run_id: str
-    ) -> int:
+    ) -> Dict[str, int]:
         """
         Mark time entries as processed and link to pay run.
 
+        Applied as a single update_many; only APPROVED entries are
+        transitioned, so entries already processed are left untouched.
+
         Args:
             time_entry_ids: List of time entry IDs
             pay_run_id: Pay run ID that processed these entries
 
         Returns:
-            Number of entries updated
+            Dictionary with "matched_count" and "modified_count"
         """
-        updated_count = 0
-
+        object_ids = []
         for entry_id in time_entry_ids:
             try:
-                entry = await TimeEntry.get(PydanticObjectId(entry_id))
-                if entry:
-                    entry.status = TimeEntryStatus.PROCESSED
-                    entry.pay_run_id = pay_run_id
-                    entry.processed_at = datetime.utcnow()
-                    entry.updated_at = datetime.utcnow()
-                    await entry.save()
-                    updated_count += 1
+                object_ids.append(PydanticObjectId(entry_id))
             except Exception:
                 continue
 
-        return updated_count
+        if not object_ids:
+            return {"matched_count": 0, "modified_count": 0}
+
+        now = datetime.utcnow()
+        result = await TimeEntry.find({
+            "_id": {"$in": object_ids},
+            "status": TimeEntryStatus.APPROVED.value
+        }).update_many({
+            "$set": {
+                "status": TimeEntryStatus.PROCESSED.value,
+                "pay_run_id": pay_run_id,
+                "processed_at": now,
+                "updated_at": now
+            }
+        })
+
+        return {
+            "matched_count": result.matched_count,
+            "modified_count": result.modified_count
+        }
 
     async def get_employee_timesheet_summary(
         self,
@@ -433,8 +695,12 @@ class TimesheetAggregationService:
             period_start_date: Start of period
             period_end_date: End of period
 
+        Hours and status counts are computed with a single $group; the
+        entries themselves are not returned (page them through
+        GET /timesheets/summary/{employee_id}/entries).
+
         Returns:
-            Summary with hours, earnings, and entries
+            Summary with hours, earnings, and status breakdown
         """
         # Fetch employee
         try:
@@ -451,19 +717,18 @@ class TimesheetAggregationService:
                 "employee_id": employee_id
             }
 
-        # Fetch time entries
-        entries = await TimeEntry.find({
-            "employee_id": employee_id,
-            "work_date": {"$gte": period_start_date, "$lte": period_end_date}
-        }).sort("work_date").to_list()
-
-        # Aggregate hours
-        hours = self.aggregate_hours(entries)
+        # Aggregate hours and status counts server-side
+        summary = await self.summarize_employee_entries(
+            employee_id=employee_id,
+            period_start_date=period_start_date,
+            period_end_date=period_end_date
+        )
+        hours = summary["hours"]
 
         # Calculate earnings
         hourly_rate = employee.hourly_rate or 0.0
-        if hourly_rate == 0.0 and entries:
-            hourly_rate = entries[0].hourly_rate or 0.0
+        if hourly_rate == 0.0:
+            hourly_rate = summary["hourly_rate"] or 0.0
 
         earnings = self.calculate_earnings_from_hours(
             hours=hours,
@@ -473,12 +738,6 @@ class TimesheetAggregationService:
         # Calculate total earnings
         total_gross = sum(item["amount"] for item in earnings)
 
-        # Group by status
-        status_counts = {}
-        for entry in entries:
-            status = entry.status.value
-            status_counts[status] = status_counts.get(status, 0) + 1
-
         return {
             "employee_id": employee_id,
             "employee_number": employee.employee_number,
@@ -488,7 +747,6 @@ class TimesheetAggregationService:
             "hours_summary": hours,
             "earnings": earnings,
             "total_gross_earnings": round(total_gross, 2),
-            "total_entries": len(entries),
-            "status_breakdown": status_counts,
-            "time_entries": [entry.dict() for entry in entries]
+            "total_entries": summary["total_entries"],
+            "status_breakdown": summary["status_breakdown"]
         }
@@ -0,0 +1,285 @@
+"""
+Timesheet Archive Service
+
+Moves PROCESSED time entries older than a number of whole months out of
+time_entries into one TimeEntryArchiveBucket per employee and month, and
+reads them back for historical summaries.
+
+Archiving runs in batches: each batch is appended to its buckets with
+$push/$inc upserts and then deleted from time_entries. Entries already
+present in a bucket (from a run interrupted between the two steps) are
+not pushed again, so a run can simply be repeated.
+
+Read paths unwind the buckets into documents shaped like time entries, so
+the aggregation stages written for time_entries run unchanged on the
+archive.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Type
+from datetime import date, datetime, time
+
+from beanie import PydanticObjectId
+from beanie.odm.bulk import BulkWriter
+from pydantic import BaseModel
+
+from ..schemas.timesheet import (
+    TimeEntry, TimeEntryStatus, ArchivedTimeEntry, TimeEntryArchiveBucket,
+)
+
+
+# Time entries moved per batch
+ARCHIVE_BATCH_SIZE = 5000
+
+# Bucket total field -> TimeEntry hours field
+BUCKET_TOTAL_FIELDS = {
+    "total_hours_worked": "hours_worked",
+    "total_regular_hours": "regular_hours",
+    "total_overtime_hours": "overtime_hours",
+    "total_double_time_hours": "double_time_hours",
+}
+
+
+def month_start(day: date) -> date:
+    """First day of the month containing day"""
+    return day.replace(day=1)
+
+
+def as_datetime(day: date) -> datetime:
+    """Date as stored by MongoDB, for use in raw aggregation stages"""
+    return datetime.combine(day, time.min)
+
+
+class TimesheetArchiveService:
+    """Service for archiving processed time entries into monthly buckets"""
+
+    def __init__(self):
+        pass
+
+    def get_archive_cutoff(self, months: int, today: Optional[date] = None) -> date:
+        """
+        Get the first work date that is kept in time_entries.
+
+        Args:
+            months: Whole months to keep before the current month
+            today: Reference date (defaults to today)
+
+        Returns:
+            First day of the month `months` months before today's month
+        """
+        today = today or date.today()
+        month_index = today.year * 12 + today.month - 1 - months
+        return date(month_index // 12, month_index % 12 + 1, 1)
+
+    def build_bucket_updates(self, entries: Sequence[TimeEntry]) -> Dict[Tuple[str, date], Dict[str, Any]]:
+        """
+        Group entries into per-(employee, month) bucket updates.
+
+        Args:
+            entries: Processed time entries to archive
+
+        Returns:
+            Dictionary keyed by (employee_id, month_start) with the
+            employee's number and name, the archived entries and the
+            amounts to add to the bucket totals
+        """
+        updates = {}
+
+        for entry in entries:
+            key = (entry.employee_id, month_start(entry.work_date))
+            if key not in updates:
+                updates[key] = {
+                    "employee_number": entry.employee_number,
+                    "employee_name": entry.employee_name,
+                    "entries": [],
+                    "inc": {"entry_count": 0, **{field: 0.0 for field in BUCKET_TOTAL_FIELDS}}
+                }
+
+            update = updates[key]
+            update["entries"].append(ArchivedTimeEntry(
+                entry_id=entry.id,
+                **entry.dict(exclude={"id", "revision_id", "employee_id", "employee_number",
+                                      "employee_name", "status", "rejection_reason"})
+            ))
+            update["inc"]["entry_count"] += 1
+            for total_field, entry_field in BUCKET_TOTAL_FIELDS.items():
+                update["inc"][total_field] += getattr(entry, entry_field) or 0.0
+
+        return updates
+
+    async def find_archived_ids(self, entry_ids: List[PydanticObjectId]) -> set:
+        """Find which of the given time entry IDs are already in a bucket"""
+        found = await TimeEntryArchiveBucket.find(
+            {"entries.entry_id": {"$in": entry_ids}}
+        ).aggregate([
+            {"$unwind": "$entries"},
+            {"$match": {"entries.entry_id": {"$in": entry_ids}}},
+            {"$project": {"_id": "$entries.entry_id"}}
+        ]).to_list()
+
+        return {document["_id"] for document in found}
+
+    async def archive_processed_entries(
+        self,
+        months: int,
+        batch_size: int = ARCHIVE_BATCH_SIZE,
+        dry_run: bool = False,
+        today: Optional[date] = None
+    ) -> Dict[str, Any]:
+        """
+        Move processed entries older than the cutoff into archive buckets.
+
+        Args:
+            months: Whole months of processed entries to keep live
+            batch_size: Entries moved per batch
+            dry_run: If True, only count the entries that would be archived
+            today: Reference date for the cutoff (defaults to today)
+
+        Returns:
+            Summary with the cutoff, entries archived and buckets written
+        """
+        cutoff = self.get_archive_cutoff(months, today)
+        match = {
+            "status": TimeEntryStatus.PROCESSED.value,
+            "work_date": {"$lt": cutoff}
+        }
+
+        if dry_run:
+            return {
+                "cutoff": cutoff,
+                "dry_run": True,
+                "entries_to_archive": await TimeEntry.find(match).count()
+            }
+
+        entries_archived = 0
+        buckets_written = 0
+
+        while True:
+            entries = await TimeEntry.find(match).sort("_id").limit(batch_size).to_list()
+            if not entries:
+                break
+
+            entry_ids = [entry.id for entry in entries]
+            already_archived = await self.find_archived_ids(entry_ids)
+            updates = self.build_bucket_updates(
+                [entry for entry in entries if entry.id not in already_archived]
+            )
+
+            now = datetime.utcnow()
+            if updates:
+                async with BulkWriter(ordered=False) as bulk_writer:
+                    for (employee_id, bucket_month), update in updates.items():
+                        await TimeEntryArchiveBucket.find_one({
+                            "employee_id": employee_id,
+                            "month_start": bucket_month
+                        }).update({
+                            "$push": {"entries": {"$each": [entry.dict() for entry in update["entries"]]}},
+                            "$inc": update["inc"],
+                            "$set": {"updated_at": now},
+                            "$setOnInsert": {
+                                "employee_number": update["employee_number"],
+                                "employee_name": update["employee_name"],
+                                "created_at": now
+                            }
+                        }, bulk_writer=bulk_writer, upsert=True)
+
+            await TimeEntry.find({
+                "_id": {"$in": entry_ids},
+                "status": TimeEntryStatus.PROCESSED.value
+            }).delete()
+
+            entries_archived += len(entries)
+            buckets_written += len(updates)
+
+        return {
+            "cutoff": cutoff,
+            "dry_run": False,
+            "entries_archived": entries_archived,
+            "buckets_written": buckets_written
+        }
+
+    def build_archived_entries_pipeline(
+        self,
+        start_date: date,
+        end_date: date
+    ) -> List[Dict[str, Any]]:
+        """
+        Build the stages that unwind buckets into time-entry-shaped documents.
+
+        Each document has the archived entry's fields plus _id (the original
+        entry ID), the bucket's employee fields and status PROCESSED.
+
+        Args:
+            start_date: First work date to include
+            end_date: Last work date to include
+
+        Returns:
+            Aggregation pipeline stages
+        """
+        return [
+            {"$unwind": "$entries"},
+            {
+                "$match": {
+                    "entries.work_date": {"$gte": as_datetime(start_date), "$lte": as_datetime(end_date)}
+                }
+            },
+            {
+                "$replaceRoot": {
+                    "newRoot": {
+                        "$mergeObjects": [
+                            "$entries",
+                            {
+                                "_id": "$entries.entry_id",
+                                "employee_id": "$employee_id",
+                                "employee_number": "$employee_number",
+                                "employee_name": "$employee_name",
+                                "status": TimeEntryStatus.PROCESSED.value
+                            }
+                        ]
+                    }
+                }
+            },
+            {"$project": {"entry_id": 0}}
+        ]
+
+    async def aggregate_archived_entries(
+        self,
+        start_date: date,
+        end_date: date,
+        stages: Optional[List[Dict[str, Any]]] = None,
+        employee_ids: Optional[List[str]] = None,
+        projection_model: Optional[Type[BaseModel]] = None
+    ) -> List[Any]:
+        """
+        Run aggregation stages over archived entries in a date range.
+
+        Args:
+            start_date: First work date to include
+            end_date: Last work date to include
+            stages: Stages to run on the time-entry-shaped documents
+            employee_ids: Optional subset of employees
+            projection_model: Optional model to parse the results into
+
+        Returns:
+            Aggregation results
+        """
+        bucket_filter = {"month_start": {"$gte": month_start(start_date), "$lte": end_date}}
+        if employee_ids is not None:
+            bucket_filter["employee_id"] = {"$in": employee_ids}
+
+        pipeline = self.build_archived_entries_pipeline(start_date, end_date) + (stages or [])
+
+        return await TimeEntryArchiveBucket.find(bucket_filter).aggregate(
+            pipeline, projection_model=projection_model
+        ).to_list()
+
+    async def get_employee_buckets(
+        self,
+        employee_id: str,
+        start_date: date,
+        end_date: date
+    ) -> List[TimeEntryArchiveBucket]:
+        """Get an employee's archive buckets for the months overlapping a date range"""
+        return await TimeEntryArchiveBucket.find({
+            "employee_id": employee_id,
+            "month_start": {"$gte": month_start(start_date), "$lte": end_date}
+        }).sort("month_start").to_list()
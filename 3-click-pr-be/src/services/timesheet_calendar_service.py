@@ -0,0 +1,225 @@
+"""
+Timesheet Calendar Service
+
+Builds the organization-wide work calendar of a month: hours and entry
+counts per day and department, computed with one aggregation over the
+month's time entries (plus any archived ones).
+
+Results are cached in-process per month. Endpoints that change entries
+invalidate the months they touch; a TTL bounds how stale a month can be
+when entries are changed by another process.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from datetime import date, timedelta
+import calendar
+import time
+
+from ..core.config import settings
+from ..schemas.timesheet import TimeEntry, TimeEntryStatus
+from .timesheet_archive_service import TimesheetArchiveService
+
+
+# Department key used for entries without a department
+UNASSIGNED_DEPARTMENT = "unassigned"
+
+CALENDAR_HOURS_FIELDS = ("hours_worked", "regular_hours", "overtime_hours", "double_time_hours")
+
+
+class TimesheetCalendarService:
+    """
+    Service for month calendars of hours per day and department.
+
+    Each month carries a generation number that every invalidation bumps;
+    a result is only cached if its month was not invalidated while it was
+    being computed.
+    """
+
+    def __init__(self):
+        self._cache: Dict[Tuple[int, int], Tuple[float, Dict[str, Any]]] = {}
+        self._generations: Dict[Tuple[int, int], int] = {}
+
+    def build_calendar_pipeline(self) -> List[Dict[str, Any]]:
+        """
+        Build the aggregation stages that group a month's entries by day and department.
+
+        The work_date range is supplied by the find query.
+
+        Returns:
+            Aggregation pipeline stages
+        """
+        return [
+            {"$match": {"status": {"$ne": TimeEntryStatus.REJECTED.value}}},
+            {
+                "$group": {
+                    "_id": {
+                        "work_date": "$work_date",
+                        "department_id": "$department_id"
+                    },
+                    "department_name": {"$max": "$department_name"},
+                    "entry_count": {"$sum": 1},
+                    "employee_ids": {"$addToSet": "$employee_id"},
+                    **{field: {"$sum": f"${field}"} for field in CALENDAR_HOURS_FIELDS}
+                }
+            },
+            {
+                "$project": {
+                    "department_name": 1,
+                    "entry_count": 1,
+                    "employee_count": {"$size": "$employee_ids"},
+                    **{field: 1 for field in CALENDAR_HOURS_FIELDS}
+                }
+            }
+        ]
+
+    def fold_calendar_buckets(
+        self,
+        buckets: List[Dict[str, Any]],
+        year: int,
+        month: int
+    ) -> Dict[str, Any]:
+        """
+        Fold (day, department) buckets into a month calendar.
+
+        Args:
+            buckets: Documents produced by build_calendar_pipeline()
+            year: Calendar year
+            month: Calendar month (1-12)
+
+        Returns:
+            {
+                "year", "month",
+                "days": one item per day of the month with its totals and
+                    a "departments" list,
+                "departments": month totals per department,
+                "totals": month totals
+            }
+        """
+        def empty_totals() -> Dict[str, Any]:
+            return {"entry_count": 0, **{field: 0.0 for field in CALENDAR_HOURS_FIELDS}}
+
+        def add(totals: Dict[str, Any], bucket: Dict[str, Any]) -> None:
+            totals["entry_count"] += bucket.get("entry_count", 0)
+            for field in CALENDAR_HOURS_FIELDS:
+                totals[field] += bucket.get(field) or 0.0
+
+        days_in_month = calendar.monthrange(year, month)[1]
+        first_day = date(year, month, 1)
+        days = {
+            first_day + timedelta(days=offset): {"totals": empty_totals(), "departments": {}}
+            for offset in range(days_in_month)
+        }
+        departments = {}
+        totals = empty_totals()
+
+        for bucket in buckets:
+            work_date = bucket["_id"]["work_date"]
+            work_date = work_date.date() if hasattr(work_date, "date") else work_date
+            day = days.get(work_date)
+            if day is None:
+                continue
+
+            department_id = bucket["_id"].get("department_id") or UNASSIGNED_DEPARTMENT
+            department_name = bucket.get("department_name")
+
+            # Live and archived entries of a day arrive as separate buckets
+            day_department = day["departments"].setdefault(department_id, {
+                "department_id": department_id,
+                "department_name": department_name,
+                "employee_count": 0,
+                **empty_totals()
+            })
+            add(day_department, bucket)
+            day_department["employee_count"] += bucket.get("employee_count", 0)
+            day_department["department_name"] = day_department["department_name"] or department_name
+
+            month_department = departments.setdefault(department_id, {
+                "department_id": department_id,
+                "department_name": department_name,
+                **empty_totals()
+            })
+            add(month_department, bucket)
+            month_department["department_name"] = month_department["department_name"] or department_name
+
+            add(day["totals"], bucket)
+            add(totals, bucket)
+
+        return {
+            "year": year,
+            "month": month,
+            "days": [
+                {
+                    "date": work_date.isoformat(),
+                    **day["totals"],
+                    "departments": sorted(day["departments"].values(), key=lambda item: item["department_id"])
+                }
+                for work_date, day in days.items()
+            ],
+            "departments": sorted(departments.values(), key=lambda item: item["department_id"]),
+            "totals": totals
+        }
+
+    async def compute_month_calendar(self, year: int, month: int) -> Dict[str, Any]:
+        """Aggregate a month calendar from live and archived entries"""
+        start_date = date(year, month, 1)
+        end_date = date(year, month, calendar.monthrange(year, month)[1])
+
+        buckets = await TimeEntry.find({
+            "work_date": {"$gte": start_date, "$lte": end_date}
+        }).aggregate(self.build_calendar_pipeline()).to_list()
+
+        buckets += await TimesheetArchiveService().aggregate_archived_entries(
+            start_date, end_date, stages=self.build_calendar_pipeline()
+        )
+
+        return self.fold_calendar_buckets(buckets, year, month)
+
+    async def get_month_calendar(self, year: int, month: int) -> Dict[str, Any]:
+        """
+        Get a month calendar, from the cache when possible.
+
+        Args:
+            year: Calendar year
+            month: Calendar month (1-12)
+
+        Returns:
+            Month calendar (see fold_calendar_buckets) with "cached" set
+            when it was served from the cache
+        """
+        key = (year, month)
+        cached = self._cache.get(key)
+        if cached and cached[0] > time.monotonic():
+            return {**cached[1], "cached": True}
+
+        generation = self._generations.get(key, 0)
+        result = await self.compute_month_calendar(year, month)
+
+        if self._generations.get(key, 0) == generation:
+            self._cache[key] = (time.monotonic() + settings.TIMESHEET_CALENDAR_CACHE_TTL_SECONDS, result)
+
+        return {**result, "cached": False}
+
+    def invalidate(self, work_dates: Iterable[Optional[date]]) -> None:
+        """
+        Drop the cached months containing the given work dates.
+
+        Args:
+            work_dates: Work dates of changed entries (None is ignored)
+        """
+        for work_date in work_dates:
+            if work_date is None:
+                continue
+            key = (work_date.year, work_date.month)
+            self._generations[key] = self._generations.get(key, 0) + 1
+            self._cache.pop(key, None)
+
+    def invalidate_range(self, start_date: Optional[date], end_date: Optional[date]) -> None:
+        """Drop the cached months overlapping a date range"""
+        if start_date is None or end_date is None:
+            return
+        months = []
+        current = start_date.replace(day=1)
+        while current <= end_date:
+            months.append(current)
+            current = (current + timedelta(days=32)).replace(day=1)
+        self.invalidate(months)
@@ -0,0 +1,219 @@
+"""
+Timesheet Dedupe Service
+
+Builds the unique time entry and timesheet period indexes at startup,
+removing the duplicates that would stop them first.
+
+Entries created before the index existed were only checked with a
+find_one per row, so a database may hold several entries for one
+employee, work date and entry type. Building the index inside init_beanie
+would fail on those and the app would not start. Instead, each duplicate
+group keeps its processed entries (they belong to a pay run) or, if none
+is processed, its oldest entry; the other entries are deleted and removed
+from their period rollups. The index is then built. If it still cannot be
+built (a group with two processed entries), a warning is printed and the
+app runs without it until the data is fixed.
+
+Periods were likewise created without a unique (employee_id,
+period_start_date, pay_frequency) constraint. Duplicate periods are merged
+into the one already in a pay run, or the oldest: it takes every entry ID
+of the group, the others are deleted, and its totals are recomputed from
+the entries by TimesheetRollupService.repair_rollups(). Groups in two
+different pay runs are left alone and the index is not built.
+
+Once an index exists its pass is skipped, so this is safe to run on every
+startup.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+from datetime import date, datetime
+
+from beanie import PydanticObjectId
+from pymongo import IndexModel
+from pymongo.errors import OperationFailure
+
+from ..schemas.timesheet import (
+    TimeEntry, TimeEntryStatus, TimesheetPeriod,
+    TIME_ENTRY_UNIQUE_INDEX, TIMESHEET_PERIOD_UNIQUE_INDEX,
+)
+from .timesheet_rollup_service import TimesheetRollupService
+
+
+# Duplicate entries deleted per batch
+DEDUPE_BATCH_SIZE = 1000
+
+
+class TimesheetDedupeService:
+    """Service for removing duplicate timesheet documents and building the unique indexes"""
+
+    def __init__(self):
+        self.rollup_service = TimesheetRollupService()
+
+    def build_duplicate_pipeline(self, index: IndexModel, fields: List[str]) -> List[Dict[str, Any]]:
+        """
+        Build the aggregation finding documents that share the keys of a unique index.
+
+        Args:
+            index: Unique index
+            fields: Document fields to collect for each duplicate
+
+        Returns:
+            Aggregation pipeline yielding one group per duplicated key, its
+            documents oldest first
+        """
+        keys = list(index.document["key"])
+        return [
+            {"$sort": {"created_at": 1, "_id": 1}},
+            {"$group": {
+                "_id": {key: f"${key}" for key in keys},
+                "count": {"$sum": 1},
+                "documents": {"$push": {field: f"${field}" for field in ["_id"] + fields}}
+            }},
+            {"$match": {"count": {"$gt": 1}}}
+        ]
+
+    def select_duplicate_entries(self, documents: List[Dict[str, Any]]) -> List[PydanticObjectId]:
+        """
+        Pick the entries of a duplicate group to delete.
+
+        Args:
+            documents: Entries sharing one key, oldest first
+
+        Returns:
+            IDs of every entry but the processed ones, or but the oldest if
+            none is processed
+        """
+        processed = [d for d in documents if d.get("status") == TimeEntryStatus.PROCESSED.value]
+        if processed:
+            return [d["_id"] for d in documents if d.get("status") != TimeEntryStatus.PROCESSED.value]
+        return [d["_id"] for d in documents[1:]]
+
+    async def remove_duplicate_entries(self, batch_size: int = DEDUPE_BATCH_SIZE) -> int:
+        """
+        Delete duplicate time entries and take them out of their rollups.
+
+        Args:
+            batch_size: Entries deleted per batch
+
+        Returns:
+            Number of entries deleted
+        """
+        cursor = TimeEntry.get_motor_collection().aggregate(
+            self.build_duplicate_pipeline(TIME_ENTRY_UNIQUE_INDEX, ["status"]),
+            allowDiskUse=True
+        )
+        duplicate_ids = []
+        async for group in cursor:
+            duplicate_ids.extend(self.select_duplicate_entries(group["documents"]))
+
+        removed = 0
+        for start in range(0, len(duplicate_ids), batch_size):
+            batch = duplicate_ids[start:start + batch_size]
+            entries = await self.rollup_service.fetch_entries(batch)
+            result = await TimeEntry.get_motor_collection().delete_many({"_id": {"$in": batch}})
+            await self.rollup_service.apply_changes([(entry, None) for entry in entries])
+            removed += result.deleted_count
+
+        return removed
+
+    def select_period_merge(self, documents: List[Dict[str, Any]]) -> Optional[Tuple[Any, List[Any], List[str]]]:
+        """
+        Pick the period of a duplicate group the others are merged into.
+
+        Args:
+            documents: Periods sharing one key, oldest first
+
+        Returns:
+            (kept period ID, IDs of the periods to delete, every entry ID of
+            the group), or None if the periods belong to different pay runs
+        """
+        pay_run_ids = {d["pay_run_id"] for d in documents if d.get("pay_run_id")}
+        if len(pay_run_ids) > 1:
+            return None
+
+        kept = next((d for d in documents if d.get("pay_run_id")), documents[0])
+        entry_ids = sorted({entry_id for d in documents for entry_id in d.get("time_entry_ids") or []})
+        return kept["_id"], [d["_id"] for d in documents if d is not kept], entry_ids
+
+    async def merge_duplicate_periods(self) -> int:
+        """
+        Merge duplicate periods into one and recompute its totals.
+
+        Returns:
+            Number of periods deleted
+        """
+        collection = TimesheetPeriod.get_motor_collection()
+        cursor = collection.aggregate(
+            self.build_duplicate_pipeline(
+                TIMESHEET_PERIOD_UNIQUE_INDEX, ["pay_run_id", "time_entry_ids", "period_end_date"]
+            ),
+            allowDiskUse=True
+        )
+
+        removed = 0
+        async for group in cursor:
+            merge = self.select_period_merge(group["documents"])
+            if merge is None:
+                continue
+            kept_id, deleted_ids, entry_ids = merge
+
+            await collection.update_one(
+                {"_id": kept_id},
+                {"$addToSet": {"time_entry_ids": {"$each": entry_ids}}}
+            )
+            result = await collection.delete_many({"_id": {"$in": deleted_ids}})
+            removed += result.deleted_count
+
+            # The kept period's totals only count the entries it held before
+            await self.rollup_service.repair_rollups(
+                as_date(group["_id"]["period_start_date"]),
+                max(as_date(d["period_end_date"]) for d in group["documents"]),
+                employee_ids=[group["_id"]["employee_id"]]
+            )
+
+        return removed
+
+    async def has_index(self, document_class, index: IndexModel) -> bool:
+        """Check whether a document's collection already has an index, by name"""
+        indexes = await document_class.get_motor_collection().index_information()
+        return index.document["name"] in indexes
+
+    async def build_index(self, document_class, index: IndexModel) -> bool:
+        """
+        Build an index, reporting instead of raising when it cannot be built.
+
+        Returns:
+            True if the index was built
+        """
+        try:
+            await document_class.get_motor_collection().create_indexes([index])
+        except OperationFailure as e:
+            print(f"Warning: could not build index {index.document['name']} "
+                  f"on {document_class.__name__}: {e}")
+            return False
+        return True
+
+    async def ensure_unique_indexes(self) -> Dict[str, Any]:
+        """
+        Remove duplicates and build the unique timesheet indexes that are missing.
+
+        Returns:
+            Summary with the duplicates removed and whether each index exists
+        """
+        summary = {"entries_removed": 0, "time_entry_index": True, "periods_merged": 0, "period_index": True}
+
+        if not await self.has_index(TimeEntry, TIME_ENTRY_UNIQUE_INDEX):
+            summary["entries_removed"] = await self.remove_duplicate_entries()
+            summary["time_entry_index"] = await self.build_index(TimeEntry, TIME_ENTRY_UNIQUE_INDEX)
+
+        # Entries removed above are already out of the periods merged here
+        if not await self.has_index(TimesheetPeriod, TIMESHEET_PERIOD_UNIQUE_INDEX):
+            summary["periods_merged"] = await self.merge_duplicate_periods()
+            summary["period_index"] = await self.build_index(TimesheetPeriod, TIMESHEET_PERIOD_UNIQUE_INDEX)
+
+        return summary
+
+
+def as_date(value) -> date:
+    """Date of a value read from MongoDB, which stores dates as datetimes"""
+    return value.date() if isinstance(value, datetime) else value
@@ -0,0 +1,558 @@
+"""
+Timesheet Import Service
+
+Writes parsed timesheet rows, and the rows that failed, to the database.
+
+Entries are inserted in chunks with insert_many(ordered=False) and the
+unique (employee_id, work_date, entry_type) index, built at startup by
+TimesheetDedupeService, decides what is a duplicate: the database rejects
+those rows with a duplicate-key error and keeps inserting the rest. No per-row lookup is needed, and two uploads of
+the same file running at the same time cannot both create an entry.
+
+Rows that fail are stored one document each in timesheet_upload_errors;
+the upload record keeps only a count per error class.
+
+Dry-run uploads build lightweight entries instead of documents and look up
+existing entries with one key query per chunk of employees, so a file can
+be validated without writing anything. The same query loads the hours
+already stored for the uploaded weeks, so overtime limits count them.
+
+Overtime is classified batch by batch as the file is read. Weeks whose
+dates arrived out of order across batches are classified again once the
+upload's entries are stored (reclassify_upload_weeks), so the split
+follows work dates rather than the order of the file.
+"""
+
+from typing import Dict, Any, Iterable, List, Optional, Sequence, Tuple
+from datetime import date, datetime, timedelta
+
+from beanie import PydanticObjectId
+from bson.errors import InvalidId
+from pydantic import BaseModel, Field
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+from ..schemas.employee import Employee, Province, WorkerCategory
+from ..schemas.timesheet import (
+    TimeEntry, TimeEntryStatus, TimeEntryType, ShiftDetails,
+    TimesheetUploadError, UploadErrorClass,
+)
+from .overtime_rules_service import OvertimeRulesService, OvertimeTotals, WORKED_ENTRY_TYPES
+from .timesheet_row_parser import ParsedRow
+
+
+# MongoDB error code for a unique index violation
+DUPLICATE_KEY_ERROR = 11000
+
+# Entries sent to the database per insert_many call
+INSERT_CHUNK_SIZE = 1000
+
+# Employees per existing-entry lookup
+EXISTING_KEYS_CHUNK_SIZE = 1000
+
+
+class EmployeeImportView(BaseModel):
+    """Projection of the employee fields used to build imported time entries"""
+    id: PydanticObjectId = Field(alias="_id")
+    first_name: str
+    last_name: str
+    employee_number: str
+    hourly_rate: Optional[float] = None
+    department_id: Optional[str] = None
+    department_name: Optional[str] = None
+    province_of_employment: Province = Province.ON
+    worker_category: WorkerCategory = WorkerCategory.DIRECT_EMPLOYEE
+
+    class Config:
+        populate_by_name = True
+
+
+class TimeEntryKeyView(BaseModel):
+    """Projection of the unique time entry index fields and the hours overtime rules count"""
+    employee_id: str
+    work_date: date
+    entry_type: TimeEntryType
+    hours_worked: float = 0.0
+    regular_hours: float = 0.0
+
+
+class TimeEntryOvertimeView(BaseModel):
+    """Projection of the time entry fields overtime rules read and write"""
+    id: PydanticObjectId = Field(alias="_id")
+    employee_id: str
+    work_date: date
+    entry_type: TimeEntryType
+    hours_worked: float = 0.0
+    regular_hours: float = 0.0
+    overtime_hours: float = 0.0
+    double_time_hours: float = 0.0
+    upload_id: Optional[str] = None
+
+    class Config:
+        populate_by_name = True
+
+
+class DryRunEntry:
+    """
+    Hours of a validated row, without building a TimeEntry document.
+
+    Has the attributes OvertimeRulesService.apply reads and writes.
+    """
+
+    __slots__ = (
+        "employee_id", "employee_name", "work_date", "entry_type", "hours_worked", "hourly_rate",
+        "regular_hours", "overtime_hours", "double_time_hours", "overtime_rate",
+    )
+
+    def __init__(self, employee_id: str, employee_name: str, work_date: date,
+                 entry_type: str, hours_worked: float, hourly_rate: float):
+        self.employee_id = employee_id
+        self.employee_name = employee_name
+        self.work_date = work_date
+        self.entry_type = entry_type
+        self.hours_worked = hours_worked
+        self.hourly_rate = hourly_rate
+        self.regular_hours = 0.0
+        self.overtime_hours = 0.0
+        self.double_time_hours = 0.0
+        self.overtime_rate = None
+
+
+class TimesheetImportService:
+    """Service for bulk-inserting imported time entries"""
+
+    def __init__(self):
+        pass
+
+    async def fetch_employees(
+        self,
+        employee_ids: Iterable[str]
+    ) -> Dict[str, Optional[EmployeeImportView]]:
+        """
+        Load the employees referenced by imported rows with one query.
+
+        Args:
+            employee_ids: Employee IDs as they appear in the file
+
+        Returns:
+            Mapping of each requested ID to its employee, or None if the ID
+            is malformed or no such employee exists
+        """
+        found = {employee_id: None for employee_id in employee_ids}
+
+        object_ids = []
+        for employee_id in found:
+            try:
+                object_ids.append(PydanticObjectId(employee_id))
+            except (InvalidId, TypeError):
+                continue
+
+        if object_ids:
+            employees = await Employee.find(
+                {"_id": {"$in": object_ids}}
+            ).project(EmployeeImportView).to_list()
+            for employee in employees:
+                found[str(employee.id)] = employee
+
+        return found
+
+    def build_time_entry(
+        self,
+        row: ParsedRow,
+        employee: EmployeeImportView,
+        upload_id: Optional[str] = None
+    ) -> TimeEntry:
+        """
+        Build a draft time entry from a parsed row.
+
+        Blank employee number, name and department fall back to the
+        employee record, and a missing hourly rate to the employee's rate.
+
+        Args:
+            row: Parsed timesheet row
+            employee: Employee the row belongs to
+            upload_id: File upload the row came from
+
+        Returns:
+            Unsaved TimeEntry
+        """
+        shift_details = None
+        if row.shift_start and row.shift_end:
+            shift_details = ShiftDetails(
+                shift_start=row.shift_start,
+                shift_end=row.shift_end,
+                break_duration_minutes=row.break_minutes,
+                notes=row.notes
+            )
+
+        hourly_rate = row.hourly_rate or employee.hourly_rate or 0.0
+        now = datetime.utcnow()
+
+        return TimeEntry(
+            employee_id=str(employee.id),
+            employee_number=row.employee_number or employee.employee_number,
+            employee_name=row.employee_name or f"{employee.first_name} {employee.last_name}",
+            work_date=row.work_date,
+            entry_type=TimeEntryType(row.entry_type),
+            hours_worked=row.hours_worked,
+            regular_hours=row.regular_hours,
+            overtime_hours=row.overtime_hours,
+            double_time_hours=0.0,
+            shift_details=shift_details,
+            hourly_rate=hourly_rate,
+            overtime_rate=hourly_rate * 1.5,
+            department_id=employee.department_id,
+            department_name=row.department or employee.department_name,
+            employee_notes=row.notes,
+            status=TimeEntryStatus.DRAFT,
+            upload_id=upload_id,
+            created_at=now,
+            updated_at=now
+        )
+
+    def build_dry_run_entry(self, row: ParsedRow, employee: EmployeeImportView) -> DryRunEntry:
+        """
+        Build the entry a row would create, for validation only.
+
+        Args:
+            row: Parsed timesheet row
+            employee: Employee the row belongs to
+
+        Returns:
+            DryRunEntry with the same hours and rate as build_time_entry
+        """
+        return DryRunEntry(
+            str(employee.id),
+            row.employee_name or f"{employee.first_name} {employee.last_name}",
+            row.work_date, row.entry_type,
+            row.hours_worked, row.hourly_rate or employee.hourly_rate or 0.0
+        )
+
+    async def find_existing_entry_keys(
+        self,
+        keys: Iterable[Tuple[str, date, str]],
+        totals: Optional[OvertimeTotals] = None,
+        chunk_size: int = EXISTING_KEYS_CHUNK_SIZE
+    ) -> set:
+        """
+        Find which (employee_id, work_date, entry_type) keys already have an entry.
+
+        Runs one query per chunk of employees over the keys' date range,
+        reading only the indexed key fields and hours.
+
+        With totals, the range is widened to whole ISO weeks and the hours
+        stored for each employee week not yet in totals.stored_weeks are
+        added to it, so overtime limits count hours entered before the
+        upload.
+
+        Args:
+            keys: Keys of the entries an upload would create
+            totals: Overtime totals to add stored hours to
+            chunk_size: Employees per query
+
+        Returns:
+            Set of the given keys that exist in the database
+        """
+        keys = set(keys)
+        if not keys:
+            return set()
+
+        employee_ids = sorted({employee_id for employee_id, _, _ in keys})
+        start = min(work_date for _, work_date, _ in keys)
+        end = max(work_date for _, work_date, _ in keys)
+
+        new_weeks = set()
+        if totals is not None:
+            start -= timedelta(days=start.weekday())
+            end += timedelta(days=6 - end.weekday())
+            new_weeks = {
+                (employee_id, *work_date.isocalendar()[:2]) for employee_id, work_date, _ in keys
+            } - totals.stored_weeks
+
+        date_range = {"$gte": start, "$lte": end}
+
+        existing = set()
+        for offset in range(0, len(employee_ids), chunk_size):
+            found = await TimeEntry.find({
+                "employee_id": {"$in": employee_ids[offset:offset + chunk_size]},
+                "work_date": date_range
+            }).project(TimeEntryKeyView).to_list()
+
+            for entry in found:
+                key = (entry.employee_id, entry.work_date, entry.entry_type.value)
+                if key in keys:
+                    existing.add(key)
+
+                week_key = (entry.employee_id, *entry.work_date.isocalendar()[:2])
+                if week_key in new_weeks and entry.entry_type.value in WORKED_ENTRY_TYPES:
+                    totals.add_stored(entry.employee_id, entry.work_date, entry.hours_worked, entry.regular_hours)
+
+        if totals is not None:
+            totals.stored_weeks |= new_weeks
+
+        return existing
+
+    async def reclassify_upload_weeks(
+        self,
+        upload_id: str,
+        weeks: Iterable[Tuple[str, int, int]],
+        employees: Dict[str, Dict[str, Any]],
+        overtime_service: OvertimeRulesService,
+        chunk_size: int = EXISTING_KEYS_CHUNK_SIZE
+    ) -> Dict[str, Any]:
+        """
+        Classify an upload's entries of the given weeks again, in work date order.
+
+        An upload classifies its entries batch by batch in file order, so
+        when a later batch holds an earlier date of a week, overtime falls
+        on other entries than it would for the same file sorted by date.
+        The weeks (OvertimeTotals.unordered_weeks) are read back with one
+        query per chunk of employees. Entries of other uploads count as
+        worked first, as they did during the upload; the upload's entries
+        follow by work date, in file order within a day.
+
+        Args:
+            upload_id: Upload whose entries are reclassified
+            weeks: (employee_id, iso_year, iso_week) keys
+            employees: Mapping of employee_id to {"province", "worker_category"}
+            overtime_service: Service applying the overtime rules
+            chunk_size: Employees per query
+
+        Returns:
+            {"entries_reclassified": count, "work_dates": set of changed dates}
+        """
+        result = {"entries_reclassified": 0, "work_dates": set()}
+        weeks = set(weeks)
+        if not weeks:
+            return result
+
+        employee_ids = sorted({employee_id for employee_id, _, _ in weeks})
+        week_starts = [date.fromisocalendar(iso_year, iso_week, 1) for _, iso_year, iso_week in weeks]
+        date_range = {"$gte": min(week_starts), "$lte": max(week_starts) + timedelta(days=6)}
+
+        for offset in range(0, len(employee_ids), chunk_size):
+            found = await TimeEntry.find({
+                "employee_id": {"$in": employee_ids[offset:offset + chunk_size]},
+                "work_date": date_range
+            }).project(TimeEntryOvertimeView).to_list()
+
+            totals = OvertimeTotals()
+            uploaded = []
+            for entry in found:
+                week_key = (entry.employee_id, *entry.work_date.isocalendar()[:2])
+                if week_key not in weeks:
+                    continue
+                if entry.upload_id == upload_id:
+                    uploaded.append(entry)
+                elif entry.entry_type.value in WORKED_ENTRY_TYPES:
+                    totals.add_stored(entry.employee_id, entry.work_date, entry.hours_worked, entry.regular_hours)
+
+            # IDs were assigned in file order when the entries were inserted
+            uploaded.sort(key=lambda entry: (entry.work_date, entry.id))
+            previous = {
+                entry.id: (entry.regular_hours, entry.overtime_hours, entry.double_time_hours)
+                for entry in uploaded
+            }
+            overtime_service.apply(uploaded, employees, totals)
+
+            now = datetime.utcnow()
+            operations = []
+            for entry in uploaded:
+                if (entry.regular_hours, entry.overtime_hours, entry.double_time_hours) == previous[entry.id]:
+                    continue
+                operations.append(UpdateOne({"_id": entry.id}, {"$set": {
+                    "regular_hours": entry.regular_hours,
+                    "overtime_hours": entry.overtime_hours,
+                    "double_time_hours": entry.double_time_hours,
+                    "updated_at": now
+                }}))
+                result["work_dates"].add(entry.work_date)
+
+            if operations:
+                await TimeEntry.get_motor_collection().bulk_write(operations, ordered=False)
+                result["entries_reclassified"] += len(operations)
+
+        return result
+
+    def classify_write_errors(
+        self,
+        write_errors: List[Dict[str, Any]],
+        offset: int = 0
+    ) -> Dict[str, Any]:
+        """
+        Split the write errors of an unordered insert into duplicates and failures.
+
+        Args:
+            write_errors: BulkWriteError.details["writeErrors"]
+            offset: Position of the chunk's first entry in the whole batch
+
+        Returns:
+            {"duplicates": [positions], "failed": {position: message}}
+        """
+        duplicates = []
+        failed = {}
+
+        for error in write_errors:
+            position = offset + error["index"]
+            if error.get("code") == DUPLICATE_KEY_ERROR:
+                duplicates.append(position)
+            else:
+                failed[position] = error.get("errmsg", "Write failed")
+
+        return {"duplicates": duplicates, "failed": failed}
+
+    async def insert_entries(
+        self,
+        entries: Sequence[TimeEntry],
+        chunk_size: int = INSERT_CHUNK_SIZE
+    ) -> Dict[str, Any]:
+        """
+        Insert time entries, skipping those that already exist.
+
+        Each entry is given its ID before the insert so inserted entries can
+        be reported without reading them back.
+
+        Args:
+            entries: Time entries to insert
+            chunk_size: Entries per insert_many call
+
+        Returns:
+            {
+                "inserted": [positions],
+                "duplicates": [positions],
+                "failed": {position: message}
+            }
+            where positions index into entries
+        """
+        result = {"inserted": [], "duplicates": [], "failed": {}}
+
+        for offset in range(0, len(entries), chunk_size):
+            chunk = entries[offset:offset + chunk_size]
+            for entry in chunk:
+                if entry.id is None:
+                    entry.id = PydanticObjectId()
+
+            rejected = {"duplicates": [], "failed": {}}
+            try:
+                await TimeEntry.insert_many(list(chunk), ordered=False)
+            except BulkWriteError as e:
+                rejected = self.classify_write_errors(e.details.get("writeErrors", []), offset)
+            except Exception as e:
+                rejected["failed"] = {offset + index: str(e) for index in range(len(chunk))}
+
+            result["duplicates"].extend(rejected["duplicates"])
+            result["failed"].update(rejected["failed"])
+
+            skipped = set(rejected["duplicates"]) | set(rejected["failed"])
+            result["inserted"].extend(
+                position for position in range(offset, offset + len(chunk))
+                if position not in skipped
+            )
+
+        return result
+
+    def count_error_classes(self, errors: List[Dict[str, Any]]) -> Dict[str, int]:
+        """
+        Count upload errors per error class.
+
+        Args:
+            errors: Error dictionaries with an optional "error_class" key
+
+        Returns:
+            Mapping of error class to number of errors
+        """
+        counts = {}
+        for error in errors:
+            error_class = error.get("error_class") or UploadErrorClass.OTHER.value
+            error_class = getattr(error_class, "value", error_class)
+            counts[error_class] = counts.get(error_class, 0) + 1
+        return counts
+
+    async def store_upload_errors(
+        self,
+        upload_id: str,
+        errors: List[Dict[str, Any]],
+        chunk_size: int = INSERT_CHUNK_SIZE
+    ) -> Dict[str, int]:
+        """
+        Store the failed rows of an upload in the error collection.
+
+        Args:
+            upload_id: File upload ID
+            errors: Error dictionaries ({"row", "error", "error_class", "data"})
+            chunk_size: Errors per insert_many call
+
+        Returns:
+            Mapping of error class to number of errors
+        """
+        documents = [
+            TimesheetUploadError(
+                upload_id=upload_id,
+                row=error.get("row"),
+                error_class=error.get("error_class") or UploadErrorClass.OTHER,
+                error=str(error.get("error", "")),
+                data=error.get("data")
+            )
+            for error in errors
+        ]
+
+        for offset in range(0, len(documents), chunk_size):
+            await TimesheetUploadError.insert_many(documents[offset:offset + chunk_size])
+
+        return self.count_error_classes(errors)
+
+    async def get_upload_errors(
+        self,
+        upload_id: str,
+        limit: int,
+        after: Optional[str] = None,
+        error_class: Optional[UploadErrorClass] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Read one page of an upload's errors in file order.
+
+        Args:
+            upload_id: File upload ID
+            limit: Maximum errors to return
+            after: ID of the last error on the previous page
+            error_class: Only return errors of this class
+
+        Returns:
+            Tuple of (errors, ID to pass as after for the next page or None)
+        """
+        query = {"upload_id": upload_id}
+        if error_class:
+            query["error_class"] = error_class
+        if after:
+            query["_id"] = {"$gt": PydanticObjectId(after)}
+
+        documents = await TimesheetUploadError.find(query).sort("_id").limit(limit + 1).to_list()
+
+        next_after = None
+        if len(documents) > limit:
+            documents = documents[:limit]
+            next_after = str(documents[-1].id)
+
+        return [
+            {
+                "id": str(document.id),
+                "row": document.row,
+                "error_class": document.error_class.value,
+                "error": document.error,
+                "data": document.data
+            }
+            for document in documents
+        ], next_after
+
+    async def delete_upload_errors(self, upload_id: str) -> int:
+        """
+        Delete every stored error of an upload.
+
+        Args:
+            upload_id: File upload ID
+
+        Returns:
+            Number of errors deleted
+        """
+        result = await TimesheetUploadError.find({"upload_id": upload_id}).delete()
+        return result.deleted_count if result else 0
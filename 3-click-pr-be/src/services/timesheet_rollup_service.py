@@ -0,0 +1,621 @@
+"""
+Timesheet Rollup Service
+
+Keeps TimesheetPeriod totals in step with their time entries so pay runs
+can read one small document per employee instead of every raw entry.
+Only payable entries (APPROVED or PROCESSED) contribute to a rollup.
+
+A new entry goes to the period of the employee's current pay frequency.
+An entry already in a rollup stays in the period holding it (found by its
+time_entry_ids) while its work date falls inside that period, so changing
+an employee's pay frequency does not move hours out of periods that were
+built under the old one.
+"""
+
+from typing import List, Dict, Any, Optional, Tuple, Iterable
+from datetime import date, datetime, timedelta
+import calendar
+
+from beanie import PydanticObjectId
+from beanie.odm.bulk import BulkWriter
+from pydantic import BaseModel, Field
+
+from ..schemas.timesheet import TimeEntry, TimesheetPeriod, TimeEntryStatus, TimeEntryType
+from ..schemas.employee import Employee, PayFrequency
+from .timesheet_archive_service import TimesheetArchiveService
+
+
+# Statuses whose hours count towards pay
+PAYABLE_STATUSES = [TimeEntryStatus.APPROVED, TimeEntryStatus.PROCESSED]
+
+# Biweekly periods are 14-day windows counted from this Monday
+BIWEEKLY_ANCHOR = date(2025, 1, 6)
+
+# TimesheetPeriod rollup field -> TimeEntry hours field
+ROLLUP_HOURS_FIELDS = {
+    "total_hours_worked": "hours_worked",
+    "total_regular_hours": "regular_hours",
+    "total_overtime_hours": "overtime_hours",
+    "total_double_time_hours": "double_time_hours",
+}
+
+# TimesheetPeriod rollup field for entry types tracked in their own bucket
+ROLLUP_ENTRY_TYPE_FIELDS = {
+    TimeEntryType.VACATION.value: "total_vacation_hours",
+    TimeEntryType.SICK_LEAVE.value: "total_sick_leave_hours",
+    TimeEntryType.STAT_HOLIDAY.value: "total_stat_holiday_hours",
+    TimeEntryType.UNPAID.value: "total_unpaid_hours",
+}
+
+ROLLUP_FIELDS = list(ROLLUP_HOURS_FIELDS) + list(ROLLUP_ENTRY_TYPE_FIELDS.values())
+
+
+class TimeEntryHoursView(BaseModel):
+    """Projection of a time entry down to the fields a rollup needs"""
+    id: PydanticObjectId = Field(alias="_id")
+    employee_id: str
+    employee_number: str
+    employee_name: str
+    work_date: date
+    entry_type: TimeEntryType = TimeEntryType.REGULAR
+    status: TimeEntryStatus = TimeEntryStatus.DRAFT
+    hours_worked: float = 0.0
+    regular_hours: float = 0.0
+    overtime_hours: float = 0.0
+    double_time_hours: float = 0.0
+    hourly_rate: Optional[float] = None
+
+    class Config:
+        populate_by_name = True
+
+
+class HeldPeriodView(BaseModel):
+    """Projection of a period down to the fields identifying it and its entries"""
+    employee_id: str
+    period_start_date: date
+    period_end_date: date
+    pay_frequency: str
+    time_entry_ids: List[str] = []
+
+
+class EmployeePayFrequencyView(BaseModel):
+    """Projection of an employee down to their pay frequency"""
+    id: PydanticObjectId = Field(alias="_id")
+    pay_frequency: PayFrequency = PayFrequency.BIWEEKLY
+
+
+class TimesheetRollupService:
+    """
+    Service for maintaining TimesheetPeriod rollups.
+
+    Entry changes are turned into per-(employee, period) deltas and applied
+    with atomic $inc upserts; repair_rollups() recomputes them from raw
+    entries and reports any drift.
+    """
+
+    def __init__(self):
+        pass
+
+    def get_period_bounds(
+        self,
+        work_date: date,
+        pay_frequency: str
+    ) -> Tuple[date, date]:
+        """
+        Get the pay period containing a work date.
+
+        Args:
+            work_date: Date worked
+            pay_frequency: weekly, biweekly, semi_monthly or monthly
+
+        Returns:
+            Tuple of (period_start_date, period_end_date), both inclusive
+        """
+        frequency = str(getattr(pay_frequency, "value", pay_frequency)).lower().replace("-", "_")
+
+        if frequency == PayFrequency.WEEKLY.value:
+            start = work_date - timedelta(days=work_date.weekday())
+            return start, start + timedelta(days=6)
+
+        if frequency == PayFrequency.SEMI_MONTHLY.value:
+            if work_date.day <= 15:
+                return work_date.replace(day=1), work_date.replace(day=15)
+            last_day = calendar.monthrange(work_date.year, work_date.month)[1]
+            return work_date.replace(day=16), work_date.replace(day=last_day)
+
+        if frequency == PayFrequency.MONTHLY.value:
+            last_day = calendar.monthrange(work_date.year, work_date.month)[1]
+            return work_date.replace(day=1), work_date.replace(day=last_day)
+
+        # Biweekly (default)
+        offset = (work_date - BIWEEKLY_ANCHOR).days // 14
+        start = BIWEEKLY_ANCHOR + timedelta(days=offset * 14)
+        return start, start + timedelta(days=13)
+
+    def entry_contribution(self, entry: TimeEntryHoursView) -> Dict[str, float]:
+        """
+        Get the amounts an entry adds to its period rollup.
+
+        Args:
+            entry: Time entry (or projection of one)
+
+        Returns:
+            Dictionary of rollup field -> hours; empty if the entry is not payable
+        """
+        if entry.status not in PAYABLE_STATUSES:
+            return {}
+
+        contribution = {
+            rollup_field: getattr(entry, entry_field) or 0.0
+            for rollup_field, entry_field in ROLLUP_HOURS_FIELDS.items()
+        }
+
+        type_field = ROLLUP_ENTRY_TYPE_FIELDS.get(entry.entry_type.value)
+        if type_field:
+            contribution[type_field] = entry.hours_worked or 0.0
+
+        return contribution
+
+    def build_deltas(
+        self,
+        changes: Iterable[Tuple[Optional[TimeEntryHoursView], Optional[TimeEntryHoursView]]],
+        pay_frequencies: Dict[str, str],
+        held_periods: Optional[Dict[str, Tuple[date, date, str]]] = None
+    ) -> Dict[Tuple[str, date, str], Dict[str, Any]]:
+        """
+        Turn (before, after) entry pairs into per-period rollup deltas.
+
+        A created entry is (None, entry), a deleted one (entry, None).
+
+        Args:
+            changes: Iterable of (before, after) snapshots
+            pay_frequencies: Mapping of employee_id to current pay frequency
+            held_periods: Mapping of entry ID to the (start, end, pay_frequency)
+                of the period holding it (see get_held_periods). When given,
+                hours are only removed from the period holding the entry,
+                and none are removed for an entry no period holds
+
+        Returns:
+            Dictionary keyed by (employee_id, period_start_date, pay_frequency)
+            with "inc", "add_ids", "remove_ids", "hourly_rate" and period metadata
+        """
+        deltas = {}
+
+        def delta_for(entry: TimeEntryHoursView, held: Optional[Tuple[date, date, str]]) -> Dict[str, Any]:
+            if held is not None:
+                period_start, period_end, pay_frequency = held
+            else:
+                pay_frequency = pay_frequencies.get(entry.employee_id, PayFrequency.BIWEEKLY.value)
+                pay_frequency = str(getattr(pay_frequency, "value", pay_frequency))
+                period_start, period_end = self.get_period_bounds(entry.work_date, pay_frequency)
+            key = (entry.employee_id, period_start, pay_frequency)
+            if key not in deltas:
+                deltas[key] = {
+                    "employee_id": entry.employee_id,
+                    "employee_number": entry.employee_number,
+                    "employee_name": entry.employee_name,
+                    "period_start_date": period_start,
+                    "period_end_date": period_end,
+                    "pay_frequency": pay_frequency,
+                    "inc": {},
+                    "add_ids": set(),
+                    "remove_ids": set(),
+                    "hourly_rate": None
+                }
+            return deltas[key]
+
+        def held_period(entry: TimeEntryHoursView) -> Optional[Tuple[date, date, str]]:
+            return held_periods.get(str(entry.id)) if held_periods is not None else None
+
+        for before, after in changes:
+            if before is not None:
+                removed = self.entry_contribution(before)
+                held = held_period(before)
+                if removed and (held is not None or held_periods is None):
+                    delta = delta_for(before, held)
+                    for field, hours in removed.items():
+                        delta["inc"][field] = delta["inc"].get(field, 0.0) - hours
+                    delta["remove_ids"].add(str(before.id))
+
+            if after is not None:
+                added = self.entry_contribution(after)
+                if added:
+                    # Entries stay in their period while their date falls inside it
+                    held = held_period(after)
+                    if held is not None and not held[0] <= after.work_date <= held[1]:
+                        held = None
+                    delta = delta_for(after, held)
+                    for field, hours in added.items():
+                        delta["inc"][field] = delta["inc"].get(field, 0.0) + hours
+                    delta["remove_ids"].discard(str(after.id))
+                    delta["add_ids"].add(str(after.id))
+                    if after.hourly_rate:
+                        delta["hourly_rate"] = after.hourly_rate
+
+        # Drop deltas that cancel out completely
+        return {
+            key: delta for key, delta in deltas.items()
+            if any(delta["inc"].values()) or delta["add_ids"] or delta["remove_ids"]
+        }
+
+    def snapshot(self, entry: TimeEntry) -> TimeEntryHoursView:
+        """Capture the rollup-relevant state of a loaded time entry"""
+        return TimeEntryHoursView(
+            id=entry.id,
+            employee_id=entry.employee_id,
+            employee_number=entry.employee_number,
+            employee_name=entry.employee_name,
+            work_date=entry.work_date,
+            entry_type=entry.entry_type,
+            status=entry.status,
+            hours_worked=entry.hours_worked,
+            regular_hours=entry.regular_hours,
+            overtime_hours=entry.overtime_hours,
+            double_time_hours=entry.double_time_hours,
+            hourly_rate=entry.hourly_rate
+        )
+
+    async def get_pay_frequencies(self, employee_ids: Iterable[str]) -> Dict[str, str]:
+        """
+        Fetch pay frequencies for a set of employees in one projected read.
+
+        Args:
+            employee_ids: Employee IDs
+
+        Returns:
+            Dictionary mapping employee_id to pay frequency value
+        """
+        object_ids = []
+        for employee_id in set(employee_ids):
+            try:
+                object_ids.append(PydanticObjectId(employee_id))
+            except Exception:
+                continue
+
+        if not object_ids:
+            return {}
+
+        employees = await Employee.find(
+            {"_id": {"$in": object_ids}}
+        ).project(EmployeePayFrequencyView).to_list()
+
+        return {str(emp.id): emp.pay_frequency.value for emp in employees}
+
+    def held_periods_of(self, periods: Iterable[HeldPeriodView]) -> Dict[str, Tuple[date, date, str]]:
+        """Map each entry ID of periods to the (start, end, pay_frequency) of its period"""
+        return {
+            entry_id: (period.period_start_date, period.period_end_date, period.pay_frequency)
+            for period in periods
+            for entry_id in period.time_entry_ids
+        }
+
+    async def get_held_periods(self, entry_ids: Iterable[str]) -> Dict[str, Tuple[date, date, str]]:
+        """
+        Find the periods holding entries, in one projected read.
+
+        Args:
+            entry_ids: Time entry IDs
+
+        Returns:
+            Dictionary mapping entry ID to (period_start_date, period_end_date,
+            pay_frequency) for entries some period holds
+        """
+        entry_ids = set(entry_ids)
+        if not entry_ids:
+            return {}
+
+        periods = await TimesheetPeriod.find(
+            {"time_entry_ids": {"$in": sorted(entry_ids)}}
+        ).project(HeldPeriodView).to_list()
+
+        held = self.held_periods_of(periods)
+        return {entry_id: held[entry_id] for entry_id in entry_ids if entry_id in held}
+
+    async def fetch_entries(self, object_ids: List[PydanticObjectId]) -> List[TimeEntryHoursView]:
+        """Fetch rollup projections of time entries by id"""
+        if not object_ids:
+            return []
+
+        return await TimeEntry.find(
+            {"_id": {"$in": object_ids}}
+        ).project(TimeEntryHoursView).to_list()
+
+    async def apply_changes(
+        self,
+        changes: List[Tuple[Optional[TimeEntryHoursView], Optional[TimeEntryHoursView]]]
+    ) -> int:
+        """
+        Apply entry changes to period rollups with atomic $inc upserts.
+
+        Args:
+            changes: List of (before, after) snapshots
+
+        Returns:
+            Number of period documents touched
+        """
+        # Changes between non-payable states never touch a rollup
+        changes = [
+            (before, after) for before, after in changes
+            if (before is not None and before.status in PAYABLE_STATUSES)
+            or (after is not None and after.status in PAYABLE_STATUSES)
+        ]
+
+        employee_ids = {
+            entry.employee_id
+            for pair in changes
+            for entry in pair
+            if entry is not None
+        }
+        if not employee_ids:
+            return 0
+
+        pay_frequencies = await self.get_pay_frequencies(employee_ids)
+        held_periods = await self.get_held_periods(
+            str(entry.id) for pair in changes for entry in pair if entry is not None
+        )
+        deltas = self.build_deltas(changes, pay_frequencies, held_periods)
+
+        if not deltas:
+            return 0
+
+        now = datetime.utcnow()
+
+        async with BulkWriter(ordered=False) as bulk_writer:
+            for delta in deltas.values():
+                update = {"$set": {"updated_at": now}}
+                if delta["hourly_rate"] is not None:
+                    update["$set"]["hourly_rate"] = delta["hourly_rate"]
+                if delta["inc"]:
+                    update["$inc"] = delta["inc"]
+                if delta["add_ids"]:
+                    update["$addToSet"] = {"time_entry_ids": {"$each": sorted(delta["add_ids"])}}
+
+                period_filter = {
+                    "employee_id": delta["employee_id"],
+                    "period_start_date": delta["period_start_date"],
+                    "pay_frequency": delta["pay_frequency"]
+                }
+
+                if delta["remove_ids"]:
+                    # $pull and $addToSet on the same array must be separate updates
+                    pull = {"$pull": {"time_entry_ids": {"$in": sorted(delta["remove_ids"])}}}
+                    if delta["add_ids"]:
+                        await TimesheetPeriod.find_one(period_filter).update(pull, bulk_writer=bulk_writer)
+                    else:
+                        update.update(pull)
+
+                # Only periods gaining hours may be created
+                upsert = bool(delta["add_ids"])
+                if upsert:
+                    update["$setOnInsert"] = {
+                        "employee_number": delta["employee_number"],
+                        "employee_name": delta["employee_name"],
+                        "period_end_date": delta["period_end_date"],
+                        "status": TimeEntryStatus.DRAFT.value,
+                        "created_at": now
+                    }
+
+                await TimesheetPeriod.find_one(period_filter).update(
+                    update, bulk_writer=bulk_writer, upsert=upsert
+                )
+
+        return len(deltas)
+
+    async def record_entry_change(
+        self,
+        before: Optional[TimeEntryHoursView],
+        after: Optional[TimeEntryHoursView]
+    ) -> int:
+        """Apply a single entry change to its period rollup"""
+        return await self.apply_changes([(before, after)])
+
+    async def get_period_rollups(
+        self,
+        employee_ids: List[str],
+        period_start_date: date,
+        period_end_date: date
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Read rollups for periods that exactly match a pay run's dates.
+
+        Employees without an exactly matching period document are left out,
+        so callers can fall back to aggregating raw entries for them.
+
+        Args:
+            employee_ids: Employee IDs
+            period_start_date: Pay run period start
+            period_end_date: Pay run period end
+
+        Returns:
+            Dictionary mapping employee_id to the same shape as
+            TimesheetAggregationService.fold_hour_buckets()
+        """
+        periods = await TimesheetPeriod.find({
+            "employee_id": {"$in": employee_ids},
+            "period_start_date": period_start_date,
+            "period_end_date": period_end_date
+        }).to_list()
+
+        rollups = {}
+        for period in periods:
+            if not period.time_entry_ids:
+                continue
+            rollups[period.employee_id] = {
+                "hours": {
+                    "total_hours": period.total_hours_worked,
+                    "regular_hours": period.total_regular_hours,
+                    "overtime_hours": period.total_overtime_hours,
+                    "double_time_hours": period.total_double_time_hours,
+                    "vacation_hours": period.total_vacation_hours,
+                    "sick_leave_hours": period.total_sick_leave_hours,
+                    "stat_holiday_hours": period.total_stat_holiday_hours,
+                    "unpaid_hours": period.total_unpaid_hours
+                },
+                "time_entry_ids": list(period.time_entry_ids),
+                "hourly_rate": period.hourly_rate
+            }
+
+        return rollups
+
+    async def repair_rollups(
+        self,
+        start_date: date,
+        end_date: date,
+        employee_ids: Optional[List[str]] = None,
+        dry_run: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Recompute rollups from raw entries and report drift.
+
+        Args:
+            start_date: First work date to recompute
+            end_date: Last work date to recompute
+            employee_ids: Optional subset of employees
+            dry_run: If True, only report drift without writing
+
+        Returns:
+            Summary with periods checked, drift details and periods repaired
+        """
+        match = {
+            "status": {"$in": [s.value for s in PAYABLE_STATUSES]},
+            "work_date": {"$gte": start_date, "$lte": end_date}
+        }
+        if employee_ids:
+            match["employee_id"] = {"$in": employee_ids}
+
+        entries = await TimeEntry.find(match).project(TimeEntryHoursView).to_list()
+
+        # Archived entries still count towards their periods
+        entries += await TimesheetArchiveService().aggregate_archived_entries(
+            start_date, end_date,
+            employee_ids=employee_ids or None,
+            projection_model=TimeEntryHoursView
+        )
+        pay_frequencies = await self.get_pay_frequencies(entry.employee_id for entry in entries)
+
+        # Stored state for the same employees and date range
+        stored_query = {
+            "period_start_date": {"$lte": end_date},
+            "period_end_date": {"$gte": start_date}
+        }
+        if employee_ids:
+            stored_query["employee_id"] = {"$in": employee_ids}
+        stored_periods = await TimesheetPeriod.find(stored_query).to_list()
+        stored = {(p.employee_id, p.period_start_date, p.pay_frequency): p for p in stored_periods}
+
+        # Expected state: every payable entry added to an empty rollup, in
+        # the period already holding it where there is one
+        expected = self.build_deltas(
+            ((None, entry) for entry in entries),
+            pay_frequencies,
+            self.held_periods_of(stored_periods)
+        )
+
+        drift = []
+        for key in set(expected) | set(stored):
+            expected_delta = expected.get(key)
+            period = stored.get(key)
+
+            # Periods straddling the range edges cannot be fully recomputed
+            if period and (period.period_start_date < start_date or period.period_end_date > end_date):
+                continue
+            if expected_delta and (
+                expected_delta["period_start_date"] < start_date
+                or expected_delta["period_end_date"] > end_date
+            ):
+                continue
+
+            expected_totals = expected_delta["inc"] if expected_delta else {}
+            for field in ROLLUP_FIELDS:
+                actual_value = round(expected_totals.get(field, 0.0), 2)
+                stored_value = round(getattr(period, field, 0.0) if period else 0.0, 2)
+                if actual_value != stored_value:
+                    drift.append({
+                        "employee_id": key[0],
+                        "period_start_date": key[1].isoformat(),
+                        "pay_frequency": key[2],
+                        "field": field,
+                        "stored": stored_value,
+                        "actual": actual_value
+                    })
+
+            expected_ids = sorted(expected_delta["add_ids"]) if expected_delta else []
+            stored_ids = sorted(period.time_entry_ids) if period else []
+            if expected_ids != stored_ids:
+                drift.append({
+                    "employee_id": key[0],
+                    "period_start_date": key[1].isoformat(),
+                    "pay_frequency": key[2],
+                    "field": "time_entry_ids",
+                    "stored": len(stored_ids),
+                    "actual": len(expected_ids)
+                })
+
+            # Rollups written before rates were stored have none
+            expected_rate = expected_delta["hourly_rate"] if expected_delta else None
+            stored_rate = period.hourly_rate if period else None
+            if expected_rate is not None and stored_rate is None:
+                drift.append({
+                    "employee_id": key[0],
+                    "period_start_date": key[1].isoformat(),
+                    "pay_frequency": key[2],
+                    "field": "hourly_rate",
+                    "stored": stored_rate,
+                    "actual": expected_rate
+                })
+
+        drifted_keys = {
+            (d["employee_id"], date.fromisoformat(d["period_start_date"]), d["pay_frequency"])
+            for d in drift
+        }
+
+        if drifted_keys and not dry_run:
+            now = datetime.utcnow()
+            async with BulkWriter(ordered=False) as bulk_writer:
+                for key in drifted_keys:
+                    expected_delta = expected.get(key)
+                    period = stored.get(key)
+
+                    totals = {field: 0.0 for field in ROLLUP_FIELDS}
+                    entry_ids = []
+                    if expected_delta:
+                        totals.update(expected_delta["inc"])
+                        entry_ids = sorted(expected_delta["add_ids"])
+                        if expected_delta["hourly_rate"] is not None:
+                            totals["hourly_rate"] = expected_delta["hourly_rate"]
+
+                    if period:
+                        await TimesheetPeriod.find_one({"_id": period.id}).update(
+                            {"$set": {**totals, "time_entry_ids": entry_ids, "updated_at": now}},
+                            bulk_writer=bulk_writer
+                        )
+                    else:
+                        await TimesheetPeriod.find_one({
+                            "employee_id": expected_delta["employee_id"],
+                            "period_start_date": expected_delta["period_start_date"],
+                            "pay_frequency": expected_delta["pay_frequency"]
+                        }).update(
+                            {
+                                "$set": {**totals, "time_entry_ids": entry_ids, "updated_at": now},
+                                "$setOnInsert": {
+                                    "employee_number": expected_delta["employee_number"],
+                                    "employee_name": expected_delta["employee_name"],
+                                    "period_end_date": expected_delta["period_end_date"],
+                                    "status": TimeEntryStatus.DRAFT.value,
+                                    "created_at": now
+                                }
+                            },
+                            bulk_writer=bulk_writer,
+                            upsert=True
+                        )
+
+        return {
+            "start_date": start_date.isoformat(),
+            "end_date": end_date.isoformat(),
+            "entries_scanned": len(entries),
+            "periods_checked": len(set(expected) | set(stored)),
+            "periods_drifted": len(drifted_keys),
+            "periods_repaired": 0 if dry_run else len(drifted_keys),
+            "dry_run": dry_run,
+            "drift": drift
+        }
@@ -0,0 +1,416 @@
+"""
+Timesheet Row Parser
+
+Parses and validates the rows of an uploaded timesheet without touching
+the database, so the work can run in a process pool.
+
+A row parser is compiled once per file from its column layout: column
+positions are resolved up front and dates and times are matched with
+precompiled patterns, so each row costs a few list lookups and numeric
+conversions. CSV files are streamed in chunks split on record boundaries;
+chunks of large files are parsed in parallel worker processes, which
+return compact batches of ParsedRow and RowError tuples to the async
+writer, and chunks of small files are parsed in a thread.
+"""
+
+from typing import Any, AsyncIterator, BinaryIO, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+import asyncio
+import csv
+import io
+import multiprocessing
+import os
+import re
+
+from ..core.config import settings
+from ..schemas.timesheet import TimeEntryType, UploadErrorClass
+from ..utils.tabular_reader import build_header_map, iter_csv_file_chunks, split_csv_header
+
+
+# Characters of CSV text handed to a worker at a time
+CSV_CHUNK_SIZE = 1024 * 1024
+
+# Rows per batch when parsing in-process (XLSX and small CSV files)
+ROW_BATCH_SIZE = 5000
+
+DATE_PATTERN = re.compile(r"^(\d{4})-(\d{1,2})-(\d{1,2})$")
+TIME_PATTERN = re.compile(r"^(\d{1,2}):(\d{1,2})$")
+
+ENTRY_TYPE_VALUES = frozenset(entry_type.value for entry_type in TimeEntryType)
+
+# Columns read from a timesheet row
+PARSED_COLUMNS = (
+    "employee_id", "employee_number", "employee_name", "work_date", "entry_type",
+    "hours_worked", "regular_hours", "overtime_hours", "shift_start", "shift_end",
+    "break_minutes", "department", "hourly_rate", "notes",
+)
+
+
+class ParsedRow(NamedTuple):
+    """A validated timesheet row; index counts data rows from 0 within its batch"""
+    index: int
+    employee_id: str
+    work_date: date
+    entry_type: str
+    hours_worked: float
+    regular_hours: float
+    overtime_hours: float
+    shift_start: Optional[str]
+    shift_end: Optional[str]
+    break_minutes: int
+    hourly_rate: Optional[float]
+    employee_number: str
+    employee_name: str
+    department: str
+    notes: Optional[str]
+
+
+class RowError(NamedTuple):
+    """A timesheet row that failed validation"""
+    index: int
+    error: str
+    error_class: str
+    data: Dict[str, str]
+
+
+class ParsedBatch(NamedTuple):
+    """Parsed rows of one chunk; first_row is the file row number of index 0"""
+    first_row: int
+    rows: List[ParsedRow]
+    errors: List[RowError]
+    row_count: int
+
+
+def parse_date(text: str) -> Optional[date]:
+    """Parse a YYYY-MM-DD date, returning None if invalid"""
+    match = DATE_PATTERN.match(text)
+    if not match:
+        return None
+    try:
+        return date(int(match.group(1)), int(match.group(2)), int(match.group(3)))
+    except ValueError:
+        return None
+
+
+def is_valid_time(text: str) -> bool:
+    """Check an HH:MM time of day"""
+    match = TIME_PATTERN.match(text)
+    return bool(match) and int(match.group(1)) < 24 and int(match.group(2)) < 60
+
+
+def compile_row_parser(columns: List[str]) -> Callable[[List[str], int], Any]:
+    """
+    Compile a row parser for a file's column layout.
+
+    Args:
+        columns: Canonical column name per position (see build_header_map)
+
+    Returns:
+        Function taking (stripped cell values, row index) and returning a
+        ParsedRow, a RowError, or None for a blank row
+    """
+    positions = {}
+    for position, column in enumerate(columns):
+        if column and column not in positions:
+            positions[column] = position
+
+    width = len(columns)
+    # Columns missing from the file read from a padding cell holding ""
+    (
+        employee_id_at, employee_number_at, employee_name_at, work_date_at, entry_type_at,
+        hours_worked_at, regular_hours_at, overtime_hours_at, shift_start_at, shift_end_at,
+        break_minutes_at, department_at, hourly_rate_at, notes_at,
+    ) = (positions.get(column, width) for column in PARSED_COLUMNS)
+    padding = [""] * (width + 1)
+    data_columns = list(positions.items())
+
+    def row_data(values: List[str]) -> Dict[str, str]:
+        return {column: values[position] for column, position in data_columns}
+
+    def parse(values: List[str], index: int):
+        if not any(values):
+            return None
+        if len(values) <= width:
+            values = values + padding[len(values):]
+
+        employee_id = values[employee_id_at]
+        work_date_text = values[work_date_at]
+        if not employee_id or not work_date_text:
+            return RowError(
+                index, "Missing required field: employee_id or work_date",
+                UploadErrorClass.MISSING_FIELD.value, row_data(values)
+            )
+
+        work_date = parse_date(work_date_text)
+        if work_date is None:
+            return RowError(
+                index, f"Invalid date format: {work_date_text}. Expected YYYY-MM-DD",
+                UploadErrorClass.INVALID_DATE.value, row_data(values)
+            )
+
+        entry_type = values[entry_type_at].lower()
+        if entry_type not in ENTRY_TYPE_VALUES:
+            entry_type = TimeEntryType.REGULAR.value
+
+        try:
+            hours_worked = float(values[hours_worked_at] or 0)
+            regular_hours = float(values[regular_hours_at] or 0)
+            overtime_hours = float(values[overtime_hours_at] or 0)
+        except ValueError:
+            return RowError(
+                index, "Invalid hours format",
+                UploadErrorClass.INVALID_HOURS.value, row_data(values)
+            )
+
+        notes = values[notes_at] or None
+
+        # Shift details are kept only when both times and the break are valid
+        shift_start = values[shift_start_at]
+        shift_end = values[shift_end_at]
+        break_minutes = 0
+        if shift_start and shift_end and is_valid_time(shift_start) and is_valid_time(shift_end):
+            try:
+                break_minutes = int(values[break_minutes_at] or 0)
+            except ValueError:
+                shift_start = shift_end = None
+        else:
+            shift_start = shift_end = None
+
+        hourly_rate = None
+        if values[hourly_rate_at]:
+            try:
+                hourly_rate = float(values[hourly_rate_at])
+            except ValueError:
+                pass
+
+        return ParsedRow(
+            index, employee_id, work_date, entry_type,
+            hours_worked, regular_hours, overtime_hours,
+            shift_start, shift_end, break_minutes, hourly_rate,
+            values[employee_number_at], values[employee_name_at],
+            values[department_at], notes,
+        )
+
+    return parse
+
+
+def parse_records(records: Iterable[List[str]], columns: List[str]) -> Tuple[List[ParsedRow], List[RowError], int]:
+    """
+    Parse data records with a parser compiled for columns.
+
+    Args:
+        records: Data records as lists of cell strings
+        columns: Canonical column name per position
+
+    Returns:
+        Tuple of (parsed rows, row errors, number of non-blank rows)
+    """
+    parse = compile_row_parser(columns)
+    rows = []
+    errors = []
+    index = 0
+
+    for record in records:
+        result = parse([cell.strip() for cell in record], index)
+        if result is None:
+            continue
+        if type(result) is ParsedRow:
+            rows.append(result)
+        else:
+            errors.append(result)
+        index += 1
+
+    return rows, errors, index
+
+
+def parse_csv_chunk(text: str, columns: List[str]) -> Tuple[List[ParsedRow], List[RowError], int]:
+    """Parse a chunk of CSV data records"""
+    return parse_records(csv.reader(io.StringIO(text)), columns)
+
+
+def parse_csv_chunk_packed(text: str, columns: List[str]) -> Tuple[List[tuple], List[RowError], int]:
+    """
+    Parse a chunk of CSV data records for transfer from a worker process.
+
+    Rows are sent as plain tuples with work_date as an ordinal, which
+    pickles several times faster than NamedTuples holding date objects.
+    """
+    rows, errors, row_count = parse_csv_chunk(text, columns)
+    packed = [(row[0], row[1], row[2].toordinal()) + row[3:] for row in rows]
+    return packed, errors, row_count
+
+
+def unpack_rows(packed: List[tuple]) -> List[ParsedRow]:
+    """Rebuild ParsedRow tuples sent by parse_csv_chunk_packed"""
+    from_ordinal = date.fromordinal
+    return [ParsedRow(row[0], row[1], from_ordinal(row[2]), *row[3:]) for row in packed]
+
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+
+def get_parse_worker_count() -> int:
+    """Number of parse worker processes (TIMESHEET_PARSE_WORKERS, 0 = one per CPU)"""
+    return settings.TIMESHEET_PARSE_WORKERS or os.cpu_count() or 1
+
+
+def get_parse_executor() -> ProcessPoolExecutor:
+    """Process pool shared by timesheet uploads, created on first use"""
+    global _executor
+    if _executor is None:
+        # Spawned workers do not inherit the parent's database connections
+        _executor = ProcessPoolExecutor(
+            max_workers=get_parse_worker_count(),
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _executor
+
+
+def shutdown_parse_executor() -> None:
+    """Stop the worker processes, if they were started"""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(cancel_futures=True)
+        _executor = None
+
+
+async def iter_csv_batches(
+    file: BinaryIO,
+    aliases: Optional[Dict[str, str]] = None,
+    parallel: Optional[bool] = None,
+    size: Optional[int] = None
+) -> AsyncIterator[ParsedBatch]:
+    """
+    Parse a UTF-8 CSV file into batches of rows, in file order.
+
+    The file is read in chunks of whole records in a worker thread, so it
+    is never held in memory at once. Files of at least
+    TIMESHEET_PARALLEL_PARSE_MIN_BYTES are parsed in the process pool with
+    a bounded number of chunks in flight; smaller files are parsed in a
+    thread, where a pool round trip would cost more than it saves.
+
+    Args:
+        file: Binary file object positioned at the start of the CSV
+        aliases: Mapping of normalized alternative headers to canonical names
+        parallel: Force or disable the process pool (default: by size)
+        size: File size in bytes (default: measured by seeking)
+
+    Returns:
+        Async iterator of ParsedBatch
+    """
+    if parallel is None:
+        if size is None:
+            size = file.seek(0, io.SEEK_END)
+            file.seek(0)
+        parallel = (
+            settings.TIMESHEET_PARSE_WORKERS != 1
+            and size >= settings.TIMESHEET_PARALLEL_PARSE_MIN_BYTES
+        )
+
+    chunks = iter_csv_file_chunks(file, CSV_CHUNK_SIZE)
+    headers, first_chunk = split_csv_header(await asyncio.to_thread(next, chunks, ""))
+    columns = build_header_map(headers, aliases)
+
+    async def read_chunks() -> AsyncIterator[str]:
+        if first_chunk:
+            yield first_chunk
+        while True:
+            chunk = await asyncio.to_thread(next, chunks, None)
+            if chunk is None:
+                return
+            yield chunk
+
+    first_row = 2  # Row 1 is the header
+    if not parallel:
+        async for chunk in read_chunks():
+            rows, errors, row_count = await asyncio.to_thread(parse_csv_chunk, chunk, columns)
+            yield ParsedBatch(first_row, rows, errors, row_count)
+            first_row += row_count
+        return
+
+    loop = asyncio.get_running_loop()
+    executor = get_parse_executor()
+    in_flight = get_parse_worker_count() * 2
+    pending = []
+
+    async for chunk in read_chunks():
+        pending.append(loop.run_in_executor(executor, parse_csv_chunk_packed, chunk, columns))
+        if len(pending) < in_flight:
+            continue
+
+        packed, errors, row_count = await pending.pop(0)
+        yield ParsedBatch(first_row, unpack_rows(packed), errors, row_count)
+        first_row += row_count
+
+    while pending:
+        packed, errors, row_count = await pending.pop(0)
+        yield ParsedBatch(first_row, unpack_rows(packed), errors, row_count)
+        first_row += row_count
+
+
+def parse_row_batches(
+    rows: Iterable[Dict[str, str]],
+    batch_size: int = ROW_BATCH_SIZE
+) -> Iterator[ParsedBatch]:
+    """
+    Parse already-split rows (e.g. from an XLSX reader) in batches.
+
+    Args:
+        rows: Row dictionaries keyed by canonical column names
+        batch_size: Rows per batch
+
+    Returns:
+        Iterator of ParsedBatch
+    """
+    first_row = 2  # Row 1 is the header
+    parse = None
+    batch_rows, batch_errors, index = [], [], 0
+
+    for row in rows:
+        if parse is None:
+            parse = compile_row_parser(list(row.keys()))
+
+        result = parse(list(row.values()), index)
+        if result is None:
+            continue
+        if type(result) is ParsedRow:
+            batch_rows.append(result)
+        else:
+            batch_errors.append(result)
+        index += 1
+
+        if index == batch_size:
+            yield ParsedBatch(first_row, batch_rows, batch_errors, index)
+            first_row += index
+            batch_rows, batch_errors, index = [], [], 0
+
+    if index:
+        yield ParsedBatch(first_row, batch_rows, batch_errors, index)
+
+
+async def iter_row_batches(
+    rows: Iterable[Dict[str, str]],
+    batch_size: int = ROW_BATCH_SIZE
+) -> AsyncIterator[ParsedBatch]:
+    """
+    Parse already-split rows in batches, off the event loop.
+
+    Each batch is read and parsed in a worker thread, so a reader that
+    blocks (such as openpyxl decompressing a worksheet) does not stall
+    other requests. The next batch is only read once the caller asks for
+    it, so at most one batch is held at a time.
+
+    Args:
+        rows: Row dictionaries keyed by canonical column names
+        batch_size: Rows per batch
+
+    Returns:
+        Async iterator of ParsedBatch
+    """
+    batches = parse_row_batches(rows, batch_size)
+    while True:
+        batch = await asyncio.to_thread(next, batches, None)
+        if batch is None:
+            return
+        yield batch
@@ -14,7 +14,7 @@ Version: 1.0.0
 Compliance: CRA T4127 (2025), Provincial Employment Standards
 """
 
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from datetime import datetime, date
 from enum import Enum
 
@@ -177,10 +177,14 @@ class WorkerCategoryService:
         worker_category = employee.get('workerCategory', employee.get('worker_category'))
         return worker_category != WorkerCategory.AGENT_WORKER.value
 
+    def statutory_holiday_eligible_categories(self) -> List[str]:
+        """Worker categories eligible for statutory holiday pay (Direct Employees only)"""
+        return [WorkerCategory.DIRECT_EMPLOYEE.value]
+
     def is_statutory_holiday_eligible(self, employee: Dict[str, Any]) -> bool:
         """Determine if a worker is eligible for statutory holiday pay"""
         worker_category = employee.get('workerCategory', employee.get('worker_category'))
-        return worker_category == WorkerCategory.DIRECT_EMPLOYEE.value
+        return worker_category in self.statutory_holiday_eligible_categories()
 
     def is_overtime_eligible(self, employee: Dict[str, Any]) -> bool:
         """Determine if a worker is eligible for overtime pay"""
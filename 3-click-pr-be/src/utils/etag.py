@@ -0,0 +1,159 @@
+"""
+Entity Tag Helpers
+
+ETags for conditional requests. A tag is derived from document IDs and
+updated_at, which every write sets, so it can be compared without
+building or serializing the response body. Writes that bypass the
+document (update_many, bulk_write on the motor collection) must set
+updated_at as well, or clients keep a stale copy. updated_at is read at
+millisecond precision, the precision MongoDB stores, so the tag of a
+document just saved matches the tag of the same document read back.
+
+GET responses carry the tag with Cache-Control: no-cache, so browsers
+revalidate with If-None-Match and get 304 when nothing changed. Updates
+sent with If-Match only apply to the version the client last read.
+"""
+
+from typing import Any, Dict, Iterable, Optional, Type
+from datetime import datetime
+import hashlib
+import json
+
+from beanie import Document, PydanticObjectId
+from bson.errors import InvalidId
+
+
+def version_of(updated_at: Optional[datetime]) -> Optional[int]:
+    """Version number of a document: updated_at in epoch milliseconds"""
+    if updated_at is None:
+        return None
+    elapsed = updated_at - datetime(1970, 1, 1)
+    return (elapsed.days * 86400 + elapsed.seconds) * 1000 + elapsed.microseconds // 1000
+
+
+def make_etag(*parts: Any) -> str:
+    """
+    Build a strong ETag from JSON-serializable parts.
+
+    Args:
+        parts: Values identifying one version of a response
+
+    Returns:
+        Quoted entity tag
+    """
+    payload = json.dumps(parts, separators=(",", ":"), default=str)
+    return '"' + hashlib.sha1(payload.encode("utf-8")).hexdigest() + '"'
+
+
+def document_etag(document: Any) -> str:
+    """ETag of a single document, from its ID and updated_at"""
+    return make_etag(str(document.id), version_of(document.updated_at))
+
+
+async def get_document_etag(document_class: Type[Document], document_id: str) -> Optional[str]:
+    """
+    Get the ETag of a stored document, reading only its updated_at.
+
+    Args:
+        document_class: Document class
+        document_id: Document ID
+
+    Returns:
+        Quoted entity tag, or None if the ID is invalid or not found
+    """
+    try:
+        object_id = PydanticObjectId(document_id)
+    except (InvalidId, TypeError):
+        return None
+
+    raw = await document_class.get_motor_collection().find_one(
+        {"_id": object_id}, projection={"updated_at": 1}
+    )
+    if raw is None:
+        return None
+    return make_etag(str(raw["_id"]), version_of(raw.get("updated_at")))
+
+
+def collection_etag(documents: Iterable[Any], *context: Any) -> str:
+    """
+    ETag of a list of documents.
+
+    Args:
+        documents: Documents in response order
+        context: Anything else the response depends on (filters, counts)
+
+    Returns:
+        Quoted entity tag
+    """
+    versions = [[str(document.id), version_of(document.updated_at)] for document in documents]
+    return make_etag(versions, *context)
+
+
+def etag_matches(header: Optional[str], etag: str) -> bool:
+    """
+    Check an If-None-Match or If-Match header against an ETag.
+
+    Weak (W/) tags compare by their opaque value; "*" matches any tag.
+
+    Args:
+        header: Header value, a comma separated list of tags (or None)
+        etag: Current ETag
+
+    Returns:
+        True if the header lists the tag
+    """
+    if not header:
+        return False
+
+    for tag in header.split(","):
+        tag = tag.strip()
+        if tag == "*":
+            return True
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag == etag:
+            return True
+
+    return False
+
+
+def etag_headers(etag: str) -> Dict[str, str]:
+    """Headers sent with a tagged response"""
+    return {"ETag": etag, "Cache-Control": "no-cache"}
+
+
+async def claim_version(document: Document, if_match: Optional[str], etag: Optional[str] = None) -> bool:
+    """
+    Take the version of a document an update was based on.
+
+    Without If-Match any version may be updated. With it, the tag must
+    match the loaded document and updated_at is moved on atomically while
+    still unchanged in the database, so of two updates based on the same
+    version only the first gets through.
+
+    Args:
+        document: Document about to be updated
+        if_match: If-Match header value (or None)
+        etag: Current ETag of the resource, if it is not just the
+            document's (defaults to document_etag(document))
+
+    Returns:
+        True if the update may proceed
+    """
+    if if_match is None:
+        return True
+
+    if not etag_matches(if_match, etag or document_etag(document)):
+        return False
+
+    claimed_at = datetime.utcnow()
+    result = await type(document).get_motor_collection().update_one(
+        {"_id": document.id, "updated_at": document.updated_at},
+        {"$set": {"updated_at": claimed_at}}
+    )
+    if result.matched_count == 0:
+        return False
+
+    document.updated_at = claimed_at
+    return True
+
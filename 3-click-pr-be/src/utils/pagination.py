@@ -0,0 +1,82 @@
+"""
+Keyset Pagination Helpers
+
+Opaque cursors for keyset ("seek") pagination. A cursor records the sort
+key of the last item on a page; the next page is read with a range filter
+on that key instead of skipping over earlier results, so every page costs
+the same regardless of depth.
+"""
+
+from typing import Any, List
+import base64
+import binascii
+import json
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded"""
+    pass
+
+
+def encode_cursor(*values: Any) -> str:
+    """
+    Encode sort key values into an opaque URL-safe cursor.
+
+    Args:
+        values: Sort key of the last item on the page (converted with str())
+
+    Returns:
+        Cursor string
+    """
+    payload = json.dumps([str(value) for value in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> List[str]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Args:
+        cursor: Cursor string
+        size: Expected number of sort key values
+
+    Returns:
+        Sort key values as strings
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (binascii.Error, ValueError, UnicodeError):
+        raise InvalidCursorError("Invalid pagination cursor")
+
+    if not isinstance(values, list) or len(values) != size or not all(isinstance(v, str) for v in values):
+        raise InvalidCursorError("Invalid pagination cursor")
+
+    return values
+
+
+def seek_filter(fields: List[str], values: List[Any], descending: bool = True) -> dict:
+    """
+    Build the filter selecting items after a cursor in a compound sort.
+
+    For fields (a, b) sorted descending this is
+    {"$or": [{a: {"$lt": va}}, {a: va, b: {"$lt": vb}}]}.
+
+    Args:
+        fields: Sort fields, most significant first
+        values: Cursor values for those fields
+        descending: Whether all fields are sorted descending
+
+    Returns:
+        MongoDB filter
+    """
+    operator = "$lt" if descending else "$gt"
+    clauses = []
+    for position, field in enumerate(fields):
+        clause = {fields[i]: values[i] for i in range(position)}
+        clause[field] = {operator: values[position]}
+        clauses.append(clause)
+    return {"$or": clauses}
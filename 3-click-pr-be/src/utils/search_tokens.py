@@ -0,0 +1,81 @@
+"""
+Search Token Helpers
+
+Normalized prefix tokens (edge n-grams) for indexed prefix search. A
+document stores every prefix of every word of its searchable fields, so a
+search term matches with an exact lookup on a multikey index instead of an
+unanchored regular expression over each field.
+
+Text is normalized by folding accents and case ("Zoë" -> "zoe") and split
+into runs of letters and digits. A value made of several words also gets
+its words joined ("EMP-001" -> "emp001"), so it matches with or without
+the punctuation.
+"""
+
+from typing import Iterable, List, Optional
+import re
+import unicodedata
+
+
+# Longest prefix stored; longer search terms are cut to this length
+SEARCH_TOKEN_MAX_LENGTH = 16
+
+# Search terms used per query
+SEARCH_MAX_TERMS = 8
+
+WORD_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def normalize_search_text(text: str) -> str:
+    """Fold accents and case"""
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(char for char in decomposed if not unicodedata.combining(char)).casefold()
+
+
+def split_search_words(text: str) -> List[str]:
+    """Split text into normalized words of letters and digits"""
+    return WORD_PATTERN.findall(normalize_search_text(text))
+
+
+def edge_ngrams(word: str, max_length: int = SEARCH_TOKEN_MAX_LENGTH) -> List[str]:
+    """Prefixes of a word, from its first character up to max_length characters"""
+    return [word[:length] for length in range(1, min(len(word), max_length) + 1)]
+
+
+def build_search_tokens(values: Iterable[Optional[str]]) -> List[str]:
+    """
+    Build the prefix tokens stored for a document's searchable values.
+
+    Args:
+        values: Searchable field values (None is ignored)
+
+    Returns:
+        Sorted unique tokens
+    """
+    tokens = set()
+    for value in values:
+        if not value:
+            continue
+        words = split_search_words(str(value))
+        if len(words) > 1:
+            words.append("".join(words))
+        for word in words:
+            tokens.update(edge_ngrams(word))
+    return sorted(tokens)
+
+
+def build_search_terms(search: str) -> List[str]:
+    """
+    Split a search string into the tokens every match must contain.
+
+    Args:
+        search: Text typed by the user
+
+    Returns:
+        Unique normalized terms cut to SEARCH_TOKEN_MAX_LENGTH, at most
+        SEARCH_MAX_TERMS, longest (most selective) first since MongoDB
+        scans the index for the first term of an $all; empty if the
+        search has no letters or digits
+    """
+    terms = {word[:SEARCH_TOKEN_MAX_LENGTH] for word in split_search_words(search)}
+    return sorted(terms, key=lambda term: (-len(term), term))[:SEARCH_MAX_TERMS]
@@ -0,0 +1,261 @@
+"""
+Tabular File Reader
+
+Streams rows from CSV and XLSX uploads as dictionaries keyed by canonical
+column names, so both formats feed the same ingestion code.
+
+XLSX files are read with openpyxl's read-only mode, which parses the sheet
+lazily and keeps memory flat regardless of the number of rows. Cell values
+are converted to the strings a CSV would contain (dates as YYYY-MM-DD,
+times as HH:MM).
+"""
+
+from typing import Dict, Iterator, Optional, Any, BinaryIO, List, Tuple
+from datetime import datetime, date, time
+import csv
+import io
+
+from openpyxl import load_workbook
+
+
+SUPPORTED_EXTENSIONS = (".csv", ".xlsx")
+
+# Leading characters that make a spreadsheet treat CSV text as a formula
+FORMULA_PREFIXES = ("=", "+", "-", "@")
+
+
+class TabularFileError(Exception):
+    """Raised when an uploaded file cannot be opened or read"""
+    pass
+
+
+def normalize_header(header: Any) -> str:
+    """Normalize a column header to snake_case"""
+    if header is None:
+        return ""
+    text = str(header).strip().lower()
+    for separator in (" ", "-", "/", "."):
+        text = text.replace(separator, "_")
+    while "__" in text:
+        text = text.replace("__", "_")
+    return text.strip("_")
+
+
+def build_header_map(headers: List[Any], aliases: Optional[Dict[str, str]] = None) -> List[str]:
+    """
+    Map raw headers to canonical column names.
+
+    Args:
+        headers: Header row as read from the file
+        aliases: Mapping of normalized alternative names to canonical names
+
+    Returns:
+        Canonical column name for each position ("" for blank headers)
+    """
+    aliases = aliases or {}
+    canonical = []
+    for header in headers:
+        name = normalize_header(header)
+        canonical.append(aliases.get(name, name))
+    return canonical
+
+
+def cell_to_text(value: Any) -> str:
+    """Convert a spreadsheet cell value to the text a CSV would contain"""
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        if value.time() == time.min:
+            return value.date().isoformat()
+        return value.isoformat(sep=" ")
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, time):
+        return value.strftime("%H:%M")
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value).strip()
+
+
+def _rows_to_dicts(rows: Iterator[List[Any]], aliases: Optional[Dict[str, str]]) -> Iterator[Dict[str, str]]:
+    """Turn a header row plus data rows into canonical dictionaries"""
+    try:
+        headers = next(rows)
+    except StopIteration:
+        return
+
+    columns = build_header_map(list(headers), aliases)
+
+    yield from map_rows(rows, columns)
+
+
+def map_rows(rows: Iterator[List[Any]], columns: List[str]) -> Iterator[Dict[str, str]]:
+    """
+    Key data rows by canonical column names.
+
+    Blank rows are skipped, the first of repeated columns wins and missing
+    trailing cells become "".
+
+    Args:
+        rows: Data rows as lists of cell values
+        columns: Canonical column name per position (see build_header_map)
+
+    Returns:
+        Iterator of row dictionaries
+    """
+    for values in rows:
+        texts = [cell_to_text(value) for value in values]
+        if not any(texts):
+            continue
+
+        row = {}
+        for column, text in zip(columns, texts):
+            if column and column not in row:
+                row[column] = text
+        for column in columns:
+            if column and column not in row:
+                row[column] = ""
+        yield row
+
+
+def iter_csv_rows(text: str, aliases: Optional[Dict[str, str]] = None) -> Iterator[Dict[str, str]]:
+    """
+    Iterate over the data rows of CSV text.
+
+    Args:
+        text: Decoded CSV content
+        aliases: Mapping of normalized alternative headers to canonical names
+
+    Returns:
+        Iterator of row dictionaries
+    """
+    return _rows_to_dicts(iter(csv.reader(io.StringIO(text))), aliases)
+
+
+def iter_csv_file_rows(file: BinaryIO, aliases: Optional[Dict[str, str]] = None) -> Iterator[Dict[str, str]]:
+    """
+    Stream the data rows of a UTF-8 CSV file without reading it into memory.
+
+    Args:
+        file: Binary file object positioned at the start of the CSV
+        aliases: Mapping of normalized alternative headers to canonical names
+
+    Returns:
+        Iterator of row dictionaries
+    """
+    def generate() -> Iterator[Dict[str, str]]:
+        text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+        try:
+            yield from _rows_to_dicts(iter(csv.reader(text)), aliases)
+        finally:
+            # Leave the underlying file open for its owner
+            text.detach()
+
+    return generate()
+
+
+def iter_csv_file_chunks(file: BinaryIO, chunk_size: int) -> Iterator[str]:
+    """
+    Stream a UTF-8 CSV file as chunks of whole records.
+
+    Reads about chunk_size characters at a time and holds back a trailing
+    partial record for the next chunk, so at most one chunk (plus a record
+    longer than a chunk) is in memory. Chunks end on a line break outside
+    any quoted field, so each chunk can be parsed on its own: a line break
+    is inside quotes exactly when an odd number of quote characters
+    precede it, which holds for escaped ("") quotes as well. The first
+    chunk starts with the header row (see split_csv_header).
+
+    Args:
+        file: Binary file object positioned at the start of the CSV
+        chunk_size: Approximate number of characters per chunk
+
+    Returns:
+        Iterator of chunks of CSV text
+    """
+    text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+    try:
+        pending = ""
+        while True:
+            data = text.read(chunk_size)
+            if not data:
+                break
+            pending += data
+            boundary = _last_record_boundary(pending)
+            if boundary:
+                yield pending[:boundary]
+                pending = pending[boundary:]
+        if pending:
+            yield pending
+    finally:
+        # Leave the underlying file open for its owner
+        text.detach()
+
+
+def split_csv_header(text: str) -> Tuple[List[Any], str]:
+    """
+    Split the header row off the first chunk of a CSV file.
+
+    Returns:
+        Tuple of (header cells, remaining data records)
+    """
+    header_end = _record_boundary(text, 0, 0)
+    headers = next(csv.reader(io.StringIO(text[:header_end])), [])
+    return headers, text[header_end:]
+
+
+def _last_record_boundary(text: str) -> int:
+    """Index just past the last record-ending line break, 0 if there is none"""
+    boundary = 0
+    quotes = 0
+    position = 0
+    while True:
+        newline = text.find("\n", position)
+        if newline == -1:
+            return boundary
+        quotes += text.count('"', position, newline)
+        if quotes % 2 == 0:
+            boundary = newline + 1
+        position = newline + 1
+
+
+def _record_boundary(text: str, start: int, position: int) -> int:
+    """Index just past the first record-ending line break at or after position"""
+    quotes = text.count('"', start, position)
+    while True:
+        newline = text.find("\n", position)
+        if newline == -1:
+            return len(text)
+        quotes += text.count('"', position, newline)
+        if quotes % 2 == 0:
+            return newline + 1
+        position = newline + 1
+
+
+def iter_xlsx_rows(file: BinaryIO, aliases: Optional[Dict[str, str]] = None) -> Iterator[Dict[str, str]]:
+    """
+    Stream the data rows of the first worksheet of an XLSX workbook.
+
+    Args:
+        file: Binary file object positioned at the start of the workbook
+        aliases: Mapping of normalized alternative headers to canonical names
+
+    Returns:
+        Iterator of row dictionaries
+
+    Raises:
+        TabularFileError: If the workbook cannot be opened
+    """
+    try:
+        workbook = load_workbook(file, read_only=True, data_only=True)
+    except Exception as e:
+        raise TabularFileError(str(e))
+
+    def generate() -> Iterator[Dict[str, str]]:
+        try:
+            worksheet = workbook.worksheets[0]
+            yield from _rows_to_dicts(worksheet.iter_rows(values_only=True), aliases)
+        finally:
+            workbook.close()
+
+    return generate()
@@ -0,0 +1,94 @@
+"""
+Shared test fixtures
+
+Stand-ins for the motor collection behind a Beanie document, for tests
+of services that query the collection directly (aggregations, bulk
+writes, conditional updates) without a MongoDB server.
+"""
+
+import pytest
+from types import SimpleNamespace
+
+
+class FakeCursor:
+    """Async cursor over fixed results"""
+
+    def __init__(self, results):
+        self.results = iter(results)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self.results)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+class FakeCollection:
+    """
+    Motor collection recording the calls made on it.
+
+    aggregate() returns a cursor over results, bulk_write() reports
+    modified_count, and update_one() given a filter on updated_at only
+    matches the stored updated_at, which it then replaces.
+    create_indexes() adds the indexes to index_information(), or raises
+    index_error if given.
+    """
+
+    def __init__(self, results=(), modified_count=0, updated_at=None, indexes=(), index_error=None):
+        self.results = list(results)
+        self.modified_count = modified_count
+        self.stored_updated_at = updated_at
+        self.indexes = {name: {} for name in indexes}
+        self.index_error = index_error
+        self.pipelines = []
+        self.operations = []
+        self.deleted = []
+        self.updates = []
+
+    def aggregate(self, pipeline, **kwargs):
+        self.pipelines.append(pipeline)
+        return FakeCursor(self.results)
+
+    async def bulk_write(self, operations, ordered=True):
+        self.operations.append(list(operations))
+        return SimpleNamespace(modified_count=self.modified_count)
+
+    async def delete_many(self, query):
+        self.deleted.append(query)
+        return SimpleNamespace(deleted_count=len(query["_id"]["$in"]))
+
+    async def index_information(self):
+        return dict(self.indexes)
+
+    async def create_indexes(self, indexes):
+        if self.index_error:
+            raise self.index_error
+        for index in indexes:
+            self.indexes[index.document["name"]] = {}
+
+    async def update_one(self, query, update):
+        self.updates.append((query, update))
+        matched = "updated_at" not in query or query["updated_at"] == self.stored_updated_at
+        if matched and "updated_at" in query:
+            self.stored_updated_at = update["$set"]["updated_at"]
+        return SimpleNamespace(matched_count=int(matched))
+
+
+@pytest.fixture
+def fake_collection(monkeypatch):
+    """
+    Install a FakeCollection as a document class's motor collection.
+
+    Returns:
+        Function taking (document_class, **FakeCollection arguments) and
+        returning the installed collection
+    """
+    def install(document_class, **kwargs):
+        collection = FakeCollection(**kwargs)
+        monkeypatch.setattr(document_class, "get_motor_collection", classmethod(lambda cls: collection))
+        return collection
+
+    return install
@@ -0,0 +1,217 @@
+"""
+Tests for Component Resolution Service
+
+Tests resolution priority of salary components, batch resolution for
+many employees and the cache of compiled designation plans.
+"""
+
+import asyncio
+import random
+import pytest
+from types import SimpleNamespace
+from src.schemas.salary_component import (
+    SalaryComponent,
+    DesignationComponentMapping,
+    EmployeeComponentOverride
+)
+from src.services.component_resolution_service import ComponentPlanCache, ComponentResolutionService
+
+
+def make_component(component_id, display_order, applicable_designations=None, applies_to_all=True):
+    """Build a salary component with the fields resolution reads"""
+    return SimpleNamespace(
+        id=component_id,
+        name=component_id,
+        default_value=100.0,
+        percentage=None,
+        display_order=display_order,
+        applies_to_all_designations=applies_to_all,
+        applicable_designations=applicable_designations or []
+    )
+
+
+def summary(resolved):
+    """Comparable values of resolved components"""
+    return [(rc.component.id, rc.default_value, rc.percentage, rc.is_mandatory, rc.source) for rc in resolved]
+
+
+class FakeQueries:
+    """Stands in for find() of the resolution documents, recording filters"""
+
+    def __init__(self, monkeypatch, components, overrides, mappings):
+        self.filters = []
+        monkeypatch.setattr(ComponentResolutionService, "plan_cache", ComponentPlanCache())
+        self.patch(monkeypatch, SalaryComponent, components)
+        self.patch(monkeypatch, EmployeeComponentOverride, overrides)
+        self.patch(monkeypatch, DesignationComponentMapping, mappings)
+
+    def patch(self, monkeypatch, document_class, results):
+        def find(query):
+            self.filters.append((document_class.__name__, query))
+            return SimpleNamespace(to_list=lambda: asyncio.sleep(0, result=results))
+
+        monkeypatch.setattr(document_class, "find", find)
+
+
+class TestResolution:
+    """Test which components apply to an employee"""
+
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.components = [
+            make_component("basic", 1),
+            make_component("bonus", 3, applies_to_all=False),
+            make_component("shift", 2, applicable_designations=["night"]),
+        ]
+
+    def test_priority(self):
+        """Test that overrides beat mappings and mappings beat global components"""
+        overrides = {"basic": SimpleNamespace(
+            is_enabled=True, override_values=SimpleNamespace(default_value=250.0, percentage=None)
+        )}
+        mappings = {"bonus": SimpleNamespace(is_mandatory=True, default_value=None, percentage=10.0)}
+
+        resolved = ComponentResolutionService.resolve_components(self.components, "day", overrides, mappings)
+
+        assert [(rc.component.id, rc.source) for rc in resolved] == [("basic", "employee"), ("bonus", "designation")]
+        assert resolved[0].default_value == 250.0
+        assert resolved[1].percentage == 10.0 and resolved[1].is_mandatory
+
+    def test_disabled_override_and_restrictions(self):
+        """Test that disabled components are dropped and restricted ones need the designation"""
+        overrides = {"basic": SimpleNamespace(is_enabled=False, override_values=None)}
+
+        resolved = ComponentResolutionService.resolve_components(self.components, "night", overrides, {})
+
+        assert [rc.component.id for rc in resolved] == ["shift"]
+
+
+class TestBatchResolution:
+    """Test resolving components for many employees at once"""
+
+    def test_three_queries_for_all_employees(self, monkeypatch):
+        """Test that overrides, mappings and components are each loaded once"""
+        components = [make_component("basic", 1), make_component("bonus", 2, applies_to_all=False)]
+        queries = FakeQueries(
+            monkeypatch,
+            components,
+            overrides=[SimpleNamespace(employee_id="e2", component_id="basic", is_enabled=False, override_values=None)],
+            mappings=[SimpleNamespace(
+                designation_id="mgr", component_id="bonus", is_mandatory=False, default_value=500.0, percentage=None
+            )]
+        )
+        employees = [
+            SimpleNamespace(id=f"e{index}", designation_id="mgr" if index % 2 else None)
+            for index in range(1000)
+        ]
+
+        resolved = asyncio.run(ComponentResolutionService.get_components_for_employees(employees))
+
+        assert len(queries.filters) == 3
+        assert queries.filters[0] == (
+            "EmployeeComponentOverride", {"employee_id": {"$in": [f"e{index}" for index in range(1000)]}}
+        )
+        assert queries.filters[1] == (
+            "DesignationComponentMapping", {"designation_id": {"$in": ["mgr"]}, "is_active": True}
+        )
+        assert [rc.component.id for rc in resolved["e0"]] == ["basic"]
+        assert [rc.component.id for rc in resolved["e1"]] == ["basic", "bonus"]
+        assert resolved["e1"][1].default_value == 500.0
+        assert resolved["e2"] == []
+
+    def test_no_designations(self, monkeypatch):
+        """Test that mappings are not queried when no employee has a designation"""
+        queries = FakeQueries(monkeypatch, [make_component("basic", 1)], overrides=[], mappings=[])
+
+        resolved = asyncio.run(ComponentResolutionService.get_components_for_employees(
+            [SimpleNamespace(id="e1", designation_id=None)]
+        ))
+
+        assert [name for name, _ in queries.filters] == ["EmployeeComponentOverride", "SalaryComponent"]
+        assert [rc.component.id for rc in resolved["e1"]] == ["basic"]
+
+
+class TestComponentPlans:
+    """Test compiled designation plans and their cache"""
+
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.components = [
+            make_component("basic", 1),
+            make_component("bonus", 2, applies_to_all=False),
+            make_component("shift", 2, applicable_designations=["night"]),
+        ]
+        self.mappings = [SimpleNamespace(
+            designation_id="mgr", component_id="bonus", is_mandatory=True, default_value=500.0, percentage=None
+        )]
+
+    def test_overrides_applied_to_plan(self):
+        """Test that plan plus override delta equals resolving every component"""
+        random.seed(7)
+        components = [
+            make_component(f"c{index}", random.randint(1, 4), applies_to_all=random.random() < 0.6,
+                           applicable_designations=random.choice([[], ["mgr"], ["night"]]))
+            for index in range(20)
+        ]
+        mappings = {
+            f"c{index}": SimpleNamespace(is_mandatory=True, default_value=10.0 * index, percentage=None)
+            for index in range(0, 20, 3)
+        }
+        plan = ComponentResolutionService.compile_plan(components, "mgr", mappings)
+
+        for _ in range(50):
+            overrides = {
+                f"c{index}": SimpleNamespace(
+                    is_enabled=random.random() < 0.5,
+                    override_values=SimpleNamespace(default_value=random.choice([None, 99.0]), percentage=None)
+                )
+                for index in random.sample(range(25), 4)
+            }
+            expected = ComponentResolutionService.resolve_components(components, "mgr", overrides, mappings)
+            actual = ComponentResolutionService.apply_overrides(plan, overrides)
+
+            assert summary(actual) == summary(expected)
+
+    def test_cached_plans_skip_queries(self, monkeypatch):
+        """Test that a cached plan leaves only the employees' overrides to query"""
+        queries = FakeQueries(monkeypatch, self.components, overrides=[], mappings=self.mappings)
+        employees = [SimpleNamespace(id="e1", designation_id="mgr"), SimpleNamespace(id="e2", designation_id=None)]
+
+        first = asyncio.run(ComponentResolutionService.get_components_for_employees(employees))
+        second = asyncio.run(ComponentResolutionService.get_components_for_employees(employees))
+
+        assert len(queries.filters) == 4
+        assert [name for name, _ in queries.filters[3:]] == ["EmployeeComponentOverride"]
+        assert summary(second["e1"]) == summary(first["e1"])
+        assert ComponentResolutionService.plan_cache.stats() == {
+            "plans": 2, "hits": 2, "misses": 2, "hit_rate": 0.5, "invalidations": 0
+        }
+
+    def test_precise_invalidation(self, monkeypatch):
+        """Test that mapping changes drop one designation and component changes drop all"""
+        FakeQueries(monkeypatch, self.components, overrides=[], mappings=self.mappings)
+        cache = ComponentResolutionService.plan_cache
+        asyncio.run(ComponentResolutionService.get_component_plans(["mgr", "night"]))
+
+        ComponentResolutionService.invalidate_component_plans("mgr")
+        assert cache.get(("mgr", None)) is None
+        assert cache.get(("night", None)) is not None
+
+        ComponentResolutionService.invalidate_component_plans()
+        assert cache.get(("night", None)) is None
+        assert cache.stats()["invalidations"] == 2
+
+    def test_plan_invalidated_while_compiling_not_cached(self):
+        """Test that a plan compiled before an invalidation is not cached"""
+        cache = ComponentPlanCache()
+        generation = cache.generation("mgr")
+        plan = ComponentResolutionService.compile_plan(self.components, "mgr", {})
+
+        cache.invalidate_designation("mgr")
+        cache.put(("mgr", None), plan, generation)
+
+        assert cache.get(("mgr", None)) is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,112 @@
+"""
+Tests for Employee Bulk Update Service
+
+Tests employee selection, patch validation and the update pipeline of
+bulk employee updates.
+"""
+
+import asyncio
+import pytest
+from datetime import datetime
+from types import SimpleNamespace
+from beanie import PydanticObjectId
+from src.models.employee import EmployeeBulkUpdateRequest
+from src.schemas.organization import Department
+from src.services.employee_bulk_update_service import EmployeeBulkUpdateService
+
+
+class TestBulkUpdateRequest:
+    """Test selection and patch validation"""
+
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.service = EmployeeBulkUpdateService()
+
+    def test_filter_and_ids_combined(self):
+        """Test that filter conditions and IDs must all match"""
+        employee_id = PydanticObjectId()
+        request = EmployeeBulkUpdateRequest(
+            employee_ids=[str(employee_id)],
+            filter={"status": "active", "pay_frequency": "monthly"},
+            multiply={"annual_salary": 1.03}
+        )
+
+        assert self.service.build_filter(request) == {
+            "status": "active",
+            "pay_frequency": "monthly",
+            "_id": {"$in": [employee_id]}
+        }
+
+    def test_selection_required(self):
+        """Test that a patch without selection is rejected instead of updating everyone"""
+        with pytest.raises(ValueError):
+            self.service.build_filter(EmployeeBulkUpdateRequest(filter={}, set={"status": "inactive"}))
+        with pytest.raises(ValueError):
+            self.service.build_filter(EmployeeBulkUpdateRequest(employee_ids=["nope"], set={"status": "inactive"}))
+
+    def test_patch_validation(self):
+        """Test that empty and conflicting patches are rejected and unset fields left alone"""
+        with pytest.raises(ValueError):
+            self.service.get_patch(EmployeeBulkUpdateRequest(employee_ids=[]))
+        with pytest.raises(ValueError):
+            self.service.get_patch(EmployeeBulkUpdateRequest(
+                employee_ids=[], set={"annual_salary": 50000}, multiply={"annual_salary": 1.1}
+            ))
+
+        set_fields, multiply_fields = self.service.get_patch(EmployeeBulkUpdateRequest(
+            employee_ids=[], set={"manager_id": None, "pay_frequency": "monthly"}
+        ))
+        assert set_fields == {"manager_id": None, "pay_frequency": "monthly"}
+        assert multiply_fields == {}
+
+    def test_unknown_fields_rejected(self):
+        """Test that only the bulk-updatable fields are accepted"""
+        with pytest.raises(ValueError):
+            EmployeeBulkUpdateRequest(employee_ids=[], set={"email": "all@example.com"})
+        with pytest.raises(ValueError):
+            EmployeeBulkUpdateRequest(employee_ids=[], multiply={"annual_salary": 0})
+
+
+class TestBulkUpdatePipeline:
+    """Test the update applied to the selected employees"""
+
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.service = EmployeeBulkUpdateService()
+
+    def test_pipeline_sets_and_rounds(self):
+        """Test that values are set literally and multiplied amounts rounded to cents"""
+        now = datetime(2026, 1, 1)
+        pipeline = self.service.build_update_pipeline(
+            {"status": "$inactive"}, {"annual_salary": 1.03}, now
+        )
+
+        assert pipeline == [{
+            "$set": {
+                "status": {"$literal": "$inactive"},
+                "annual_salary": {"$round": [{"$multiply": ["$annual_salary", 1.03]}, 2]},
+                "updated_at": now
+            }
+        }]
+
+    def test_reference_names_resolved(self, monkeypatch):
+        """Test that setting a department also sets its name"""
+        async def fake_get(department_id):
+            return SimpleNamespace(name="Operations") if department_id == "ops" else None
+
+        monkeypatch.setattr(Department, "get", fake_get)
+
+        resolved = asyncio.run(self.service.resolve_reference_names({"department_id": "ops", "designation_id": None}))
+
+        assert resolved == {
+            "department_id": "ops",
+            "department_name": "Operations",
+            "designation_id": None,
+            "designation_name": None
+        }
+        with pytest.raises(ValueError):
+            asyncio.run(self.service.resolve_reference_names({"department_id": "missing"}))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,96 @@
+"""
+Tests for Employee Designation Service
+
+Tests the backfill linking employees to designations by job title, that
+it runs only once, and designation head counts.
+"""
+
+import asyncio
+import pytest
+from datetime import datetime
+from types import SimpleNamespace
+from pymongo import UpdateMany
+from src.schemas.employee import Employee
+from src.schemas.organization import Designation
+from src.services import employee_designation_service
+from src.services.employee_designation_service import EmployeeDesignationService
+from src.services.employee_head_count_service import EmployeeHeadCountService
+
+
+class TestDesignationBackfill:
+    """Test linking employees to designations"""
+
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.service = EmployeeDesignationService()
+        self.designations = [
+            SimpleNamespace(id="65a1b2c3d4e5f6a7b8c9d0e1", title="Analyst"),
+            SimpleNamespace(id="65a1b2c3d4e5f6a7b8c9d0e2", title="Manager")
+        ]
+
+    def test_backfill_operations(self):
+        """Test that only employees without a designation are matched, by exact title, and updated_at is bumped"""
+        now = datetime(2025, 1, 6, 12, 0)
+        operations = self.service.build_backfill_operations(self.designations, now)
+
+        assert operations[0] == UpdateMany(
+            {"designation_id": None, "job_title": "Analyst"},
+            {"$set": {"designation_id": "65a1b2c3d4e5f6a7b8c9d0e1", "designation_name": "Analyst", "updated_at": now}}
+        )
+        assert len(operations) == 2
+
+    def test_backfill_in_one_bulk_write(self, monkeypatch, fake_collection):
+        """Test that all designations are backfilled with one bulk write"""
+        collection = fake_collection(Employee, modified_count=7)
+        monkeypatch.setattr(Designation, "find", lambda *args: SimpleNamespace(
+            to_list=lambda: asyncio.sleep(0, result=self.designations)
+        ))
+
+        assert asyncio.run(self.service.backfill_designation_ids()) == 7
+        assert len(collection.operations) == 1
+        assert len(collection.operations[0]) == 2
+
+    def test_backfill_runs_once(self, monkeypatch):
+        """Test that the backfill records a marker and is skipped once it exists"""
+        markers = []
+
+        class FakeMigration:
+            """DataMigration stand-in keeping inserted markers in a list"""
+
+            def __init__(self, **fields):
+                self.fields = fields
+
+            @staticmethod
+            def find_one(query):
+                found = next((m for m in markers if m.fields["name"] == query["name"]), None)
+                return asyncio.sleep(0, result=found)
+
+            async def insert(self):
+                markers.append(self)
+
+        runs = []
+
+        async def backfill():
+            runs.append(1)
+            return 3
+
+        monkeypatch.setattr(employee_designation_service, "DataMigration", FakeMigration)
+        monkeypatch.setattr(self.service, "backfill_designation_ids", backfill)
+
+        assert asyncio.run(self.service.backfill_designation_ids_once()) == 3
+        assert asyncio.run(self.service.backfill_designation_ids_once()) is None
+        assert len(runs) == 1
+        assert markers[0].fields == {"name": "employee_designation_ids", "result": {"employees_linked": 3}}
+
+    def test_counts_keyed_on_designation_id(self, fake_collection):
+        """Test that designation head counts group on designation_id, not job_title"""
+        collection = fake_collection(Employee)
+
+        counts = asyncio.run(EmployeeHeadCountService().count_by_designation(["a"]))
+
+        assert counts == {"a": 0}
+        assert collection.pipelines[0][0] == {"$match": {"designation_id": {"$in": ["a"]}}}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,101 @@
+"""
+Tests for Employee Export Service
+
+Tests the CSV and XLSX writers of the employee export and that exported
+files can be imported again.
+"""
+
+import asyncio
+import io
+import pytest
+from datetime import datetime
+from openpyxl import load_workbook
+from src.services.employee_export_service import EmployeeExportService, EMPLOYEE_EXPORT_FIELDS
+from src.services.employee_import_service import EmployeeImportService, EMPLOYEE_HEADER_ALIASES
+from src.utils.tabular_reader import iter_csv_rows
+
+
+def make_document(index):
+    """Build a raw employee document as stored in MongoDB"""
+    return {
+        "employee_number": f"EMP{index:03d}",
+        "first_name": "Jane",
+        "last_name": "O'Neil, Jr.",
+        "email": f"jane{index}@example.com",
+        "worker_category": "direct_employee",
+        "province_of_employment": "Ontario",
+        "hire_date": datetime(2024, 3, 1),
+        "annual_salary": 85000.0,
+        "hourly_rate": 41.25,
+        "pay_frequency": "biweekly",
+        "status": "active",
+        "job_title": "=SUM(A1:A2)"
+    }
+
+
+async def documents(count):
+    """Async source of raw documents"""
+    for index in range(count):
+        yield make_document(index)
+
+
+async def collect(stream):
+    """Read an async stream into a list of chunks"""
+    return [chunk async for chunk in stream]
+
+
+class TestEmployeeExport:
+    """Test export writers"""
+
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.service = EmployeeExportService()
+
+    def test_csv_chunks_and_values(self):
+        """Test that CSV is sent in row chunks with dates and amounts as the import expects"""
+        chunks = asyncio.run(collect(self.service.stream_csv(documents(5), rows_per_chunk=2)))
+        text = "".join(chunks)
+        rows = list(iter_csv_rows(text))
+
+        assert len(chunks) == 3
+        assert text.splitlines()[0] == ",".join(EMPLOYEE_EXPORT_FIELDS)
+        assert len(rows) == 5
+        assert rows[0]["hire_date"] == "2024-03-01"
+        assert rows[0]["annual_salary"] == "85000"
+        assert rows[0]["last_name"] == "O'Neil, Jr."
+        assert rows[0]["phone"] == ""
+        assert rows[0]["job_title"] == "'=SUM(A1:A2)"
+
+    def test_csv_round_trips_through_import(self):
+        """Test that exported rows validate as EmployeeCreate"""
+        text = "".join(asyncio.run(collect(self.service.stream_csv(documents(2)))))
+        import_service = EmployeeImportService()
+
+        employees = [
+            import_service.parse_employee_row(row)
+            for row in iter_csv_rows(text, EMPLOYEE_HEADER_ALIASES)
+        ]
+
+        assert [employee.employee_number for employee in employees] == ["EMP000", "EMP001"]
+        assert employees[0].hire_date.isoformat() == "2024-03-01"
+        assert employees[0].hourly_rate == 41.25
+        assert employees[0].job_title == "=SUM(A1:A2)"
+
+    def test_xlsx_workbook(self):
+        """Test that the streamed workbook has typed cells and no formulas"""
+        data = b"".join(asyncio.run(collect(self.service.stream_xlsx(documents(3), chunk_size=1024, batch_rows=2))))
+        worksheet = load_workbook(io.BytesIO(data)).active
+        rows = list(worksheet.iter_rows(values_only=True))
+        header = list(rows[0])
+
+        assert header == list(EMPLOYEE_EXPORT_FIELDS)
+        assert len(rows) == 4
+        first = dict(zip(header, rows[1]))
+        assert first["hire_date"] == datetime(2024, 3, 1)
+        assert first["annual_salary"] == 85000
+        assert first["job_title"] == "=SUM(A1:A2)"
+        assert first["phone"] is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,45 @@
+"""
+Tests for Employee Head Count Service
+
+Tests the aggregation that counts employees per department.
+"""
+
+import asyncio
+import pytest
+from src.schemas.employee import Employee
+from src.services.employee_head_count_service import EmployeeHeadCountService
+
+
+class TestHeadCounts:
+    """Test employee counts per department"""
+
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.service = EmployeeHeadCountService()
+
+    def test_count_pipeline(self):
+        """Test that employees are matched on the indexed field and grouped by it"""
+        assert self.service.build_count_pipeline("department_id", ["a", "b"]) == [
+            {"$match": {"department_id": {"$in": ["a", "b"]}}},
+            {"$group": {"_id": "$department_id", "count": {"$sum": 1}}}
+        ]
+
+    def test_counts_in_one_aggregation(self, fake_collection):
+        """Test that all departments are counted with one query, empty ones as 0"""
+        collection = fake_collection(Employee, results=[{"_id": "a", "count": 12}, {"_id": "c", "count": 1}])
+
+        counts = asyncio.run(self.service.count_by_department(["a", "b", "c"]))
+
+        assert counts == {"a": 12, "b": 0, "c": 1}
+        assert len(collection.pipelines) == 1
+
+    def test_no_departments(self, fake_collection):
+        """Test that nothing is queried when there is nothing to count"""
+        collection = fake_collection(Employee)
+
+        assert asyncio.run(self.service.count_by_department([])) == {}
+        assert collection.pipelines == []
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
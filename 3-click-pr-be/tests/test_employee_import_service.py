@@ -0,0 +1,160 @@
+"""
+Tests for Employee Import Service
+
+Tests row validation, duplicate classification and the chunked import loop
+of bulk employee imports.
+"""
+
+import asyncio
+import pytest
+from types import SimpleNamespace
+from pydantic import ValidationError
+from src.schemas.employee import EmployeeImportErrorClass, EmployeeImportStatus
+from src.services.employee_import_service import EmployeeImportService
+
+
+def make_row(number, email=None, **values):
+    """Build a file row"""
+    return {
+        "employee_number": number,
+        "first_name": "Jane",
+        "last_name": "Doe",
+        "email": email or f"{number.lower()}@example.com",
+        "annual_salary": "",
+        **values
+    }
+
+
+class TestRowValidation:
+    """Test parsing rows into EmployeeCreate"""
+
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.service = EmployeeImportService()
+
+    def test_blank_cells_and_province_codes(self):
+        """Test that blank cells are missing values and province codes are accepted"""
+        data = self.service.parse_employee_row(make_row("EMP1", province_of_employment="qc", job_title=""))
+
+        assert data.annual_salary is None
+        assert data.job_title is None
+        assert data.province_of_employment.value == "Quebec"
+
+    def test_invalid_row_message(self):
+        """Test that validation errors name the failing fields"""
+        with pytest.raises(ValidationError) as error:
+            self.service.parse_employee_row(make_row("EMP1", email="not-an-email", annual_salary="lots"))
+
+        message = self.service.format_validation_error(error.value)
+        assert "email:" in message
+        assert "annual_salary:" in message
+
+
+class TestDuplicateClassification:
+    """Test uniqueness checks within the file and against the database"""
+
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.service = EmployeeImportService()
+
+    def test_classify_chunk(self):
+        """Test that repeats and taken keys are rejected and the rest accepted"""
+        pending = [
+            (2, self.service.parse_employee_row(make_row("EMP1"))),
+            (3, self.service.parse_employee_row(make_row("EMP1", email="other@example.com"))),
+            (4, self.service.parse_employee_row(make_row("EMP2"))),
+            (5, self.service.parse_employee_row(make_row("EMP3", email="taken@example.com"))),
+            (6, self.service.parse_employee_row(make_row("EMP4"))),
+        ]
+        seen_numbers, seen_emails = set(), {"emp4@example.com"}
+
+        accepted, rejected = self.service.classify_chunk(
+            pending, seen_numbers, seen_emails, {"EMP2"}, {"taken@example.com"}
+        )
+
+        assert [row for row, _ in accepted] == [2]
+        assert [(result["row"], result["error_class"]) for result in rejected] == [
+            (3, EmployeeImportErrorClass.DUPLICATE_IN_FILE),
+            (4, EmployeeImportErrorClass.EMPLOYEE_NUMBER_EXISTS),
+            (5, EmployeeImportErrorClass.EMAIL_EXISTS),
+            (6, EmployeeImportErrorClass.DUPLICATE_IN_FILE),
+        ]
+        assert {"EMP1", "EMP2", "EMP3", "EMP4"} <= seen_numbers
+
+    def test_classify_write_error(self):
+        """Test that unique index violations from a concurrent insert are reported as conflicts"""
+        assert self.service.classify_write_error({"code": 11000, "keyPattern": {"email": 1}})[0] == \
+            EmployeeImportErrorClass.EMAIL_EXISTS
+        assert self.service.classify_write_error({"code": 11000, "keyPattern": {"employee_number": 1}})[0] == \
+            EmployeeImportErrorClass.EMPLOYEE_NUMBER_EXISTS
+        assert self.service.classify_write_error({"code": 2, "errmsg": "bad"}) == \
+            (EmployeeImportErrorClass.WRITE_FAILED, "bad")
+
+
+class TestImportLoop:
+    """Test the chunked import of a file"""
+
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.service = EmployeeImportService()
+        self.chunks = []
+        self.stored = []
+
+        async def fake_import_chunk(pending, seen_numbers, seen_emails):
+            self.chunks.append([row for row, _ in pending])
+            return [self.service.row_result(row, data, employee_id=f"id-{row}") for row, data in pending]
+
+        async def fake_store(job_id, results):
+            self.stored.append([result["row"] for result in results])
+
+        self.service.import_chunk = fake_import_chunk
+        self.service.store_row_results = fake_store
+        self.job = SimpleNamespace(
+            id="job", total_rows=0, employees_created=0, rows_failed=0, error_counts={},
+            status=EmployeeImportStatus.PROCESSING, completed_at=None,
+            save=lambda: asyncio.sleep(0)
+        )
+
+    async def import_rows(self, rows, **kwargs):
+        """Run an import of rows the way the endpoint does"""
+        chunks = await self.service.open_employee_chunks(rows, **kwargs)
+        return await self.service.run_import(self.job, chunks)
+
+    def test_rows_imported_in_chunks(self):
+        """Test that valid rows are imported in chunks and every row gets a result"""
+        rows = [make_row(f"EMP{index}") for index in range(5)]
+        rows.insert(2, make_row("BAD", email="nope"))
+
+        job = asyncio.run(self.import_rows(iter(rows), chunk_size=2))
+
+        assert self.chunks == [[2, 3], [5, 6], [7]]
+        assert sorted(row for stored in self.stored for row in stored) == [2, 3, 4, 5, 6, 7]
+        assert (job.total_rows, job.employees_created, job.rows_failed) == (6, 5, 1)
+        assert job.error_counts == {"invalid_row": 1}
+        assert job.status == EmployeeImportStatus.PARTIALLY_COMPLETED
+
+    def test_read_failure_recorded(self):
+        """Test that a file that stops reading keeps the rows read so far"""
+        def rows():
+            yield make_row("EMP1")
+            raise ValueError("truncated")
+
+        job = asyncio.run(self.import_rows(rows()))
+
+        assert self.stored == [[2, None]]
+        assert job.error_counts == {"read_failed": 1}
+        assert job.employees_created == 1
+
+    def test_unreadable_file_raises(self):
+        """Test that a file failing before its first row raises before anything is imported"""
+        def rows():
+            raise UnicodeDecodeError("utf-8", b"\xff", 0, 1, "invalid start byte")
+            yield
+
+        with pytest.raises(UnicodeDecodeError):
+            asyncio.run(self.service.open_employee_chunks(rows()))
+        assert self.chunks == []
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,90 @@
+"""
+Tests for Employee Listing Service
+
+Tests the one-aggregation employee listing: the $facet pipeline, the
+projected fields and keyset cursors.
+"""
+
+import pytest
+from beanie import PydanticObjectId
+from src.services.employee_listing_service import EmployeeListingService, EMPLOYEE_LIST_FIELDS
+from src.utils.pagination import InvalidCursorError
+
+
+def make_document(object_id):
+    """Build a projected employee document"""
+    return {
+        "id": str(object_id),
+        "first_name": "Jane",
+        "last_name": "Doe",
+        "email": "jane.doe@example.com",
+        "employee_number": f"EMP-{str(object_id)[-4:]}",
+        "pay_frequency": "biweekly",
+        "status": "active"
+    }
+
+
+class TestEmployeeListing:
+    """Test the listing pipeline and its result"""
+
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.service = EmployeeListingService()
+
+    def test_pipeline_counts_and_pages_in_one_facet(self):
+        """Test that the filter runs once and the page only projects response fields"""
+        pipeline = self.service.build_list_pipeline({"status": "active"}, 50, skip=100)
+
+        assert pipeline[0] == {"$match": {"status": "active"}}
+        assert pipeline[1] == {"$sort": {"_id": 1}}
+        facet = pipeline[2]["$facet"]
+        assert facet["total"] == [{"$count": "count"}]
+        assert facet["employees"][:2] == [{"$skip": 100}, {"$limit": 51}]
+
+        projection = facet["employees"][-1]["$project"]
+        assert projection["id"] == {"$toString": "$_id"}
+        assert "employee_number" in EMPLOYEE_LIST_FIELDS
+        for heavy_field in ("education", "work_experience", "bank_account", "search_tokens"):
+            assert heavy_field not in projection
+
+    def test_keyset_page_seeks_before_sorting(self):
+        """Test that a cursor seeks on _id in the first stage and reads only the page"""
+        after_id = PydanticObjectId()
+        pipeline = self.service.build_list_pipeline({"status": "active"}, 20, after_id=after_id)
+
+        assert pipeline[0] == {"$match": {"status": "active", "_id": {"$gt": after_id}}}
+        assert pipeline[1] == {"$sort": {"_id": 1}}
+        assert pipeline[2] == {"$limit": 21}
+        assert not any("$facet" in stage for stage in pipeline)
+
+    def test_text_score_order(self):
+        """Test that text search results are ordered by relevance"""
+        pipeline = self.service.build_list_pipeline({"$text": {"$search": "jane"}}, 20, by_text_score=True)
+
+        assert pipeline[1] == {"$sort": {"score": {"$meta": "textScore"}, "_id": 1}}
+
+    def test_parse_result_with_next_page(self):
+        """Test that the extra document becomes a cursor to the last returned employee"""
+        ids = [PydanticObjectId() for _ in range(3)]
+        result = [{"total": [{"count": 7}], "employees": [make_document(object_id) for object_id in ids]}]
+
+        listing = self.service.parse_list_result(result, 2)
+
+        assert listing["total"] == 7
+        assert [employee.id for employee in listing["employees"]] == [str(ids[0]), str(ids[1])]
+        assert self.service.decode_list_cursor(listing["next_cursor"]) == ids[1]
+
+    def test_parse_empty_result(self):
+        """Test that an empty match has no total entry and no cursor"""
+        listing = self.service.parse_list_result([{"total": [], "employees": []}], 50)
+
+        assert listing == {"total": 0, "employees": [], "next_cursor": None}
+
+    def test_invalid_cursor(self):
+        """Test that malformed cursors are rejected"""
+        with pytest.raises(InvalidCursorError):
+            self.service.decode_list_cursor("not-a-cursor")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
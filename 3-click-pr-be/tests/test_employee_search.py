@@ -0,0 +1,80 @@
+"""
+Tests for Employee Search
+
+Tests the prefix tokens stored on employees and the filters built from
+directory searches.
+"""
+
+import pytest
+from types import SimpleNamespace
+from src.schemas.employee import Employee
+from src.services.employee_search_service import EmployeeSearchService
+from src.utils.search_tokens import build_search_tokens, build_search_terms, SEARCH_TOKEN_MAX_LENGTH
+
+
+class TestSearchTokens:
+    """Test token building"""
+
+    def test_tokens_are_folded_prefixes(self):
+        """Test that every prefix of every word is stored without accents or case"""
+        tokens = build_search_tokens(["Zoë", "Côté-Roy", None])
+
+        assert {"z", "zo", "zoe", "c", "co", "cote", "r", "roy", "coteroy"} <= set(tokens)
+        assert "Zoë" not in tokens
+        assert tokens == sorted(set(tokens))
+
+    def test_employee_number_matches_without_punctuation(self):
+        """Test that multi-word values are also indexed joined"""
+        tokens = build_search_tokens(["EMP-0042"])
+
+        assert {"emp", "0042", "emp0", "emp0042"} <= set(tokens)
+
+    def test_long_words_are_cut(self):
+        """Test that prefixes stop at the maximum token length"""
+        tokens = build_search_tokens(["Wolfeschlegelsteinhausenbergerdorff"])
+
+        assert max(len(token) for token in tokens) == SEARCH_TOKEN_MAX_LENGTH
+
+    def test_search_terms(self):
+        """Test that search terms are normalized, cut and longest first"""
+        assert build_search_terms("  jo SMÍTH jo ") == ["smith", "jo"]
+        assert build_search_terms("x" * 40) == ["x" * SEARCH_TOKEN_MAX_LENGTH]
+        assert build_search_terms("--") == []
+
+    def test_employee_tokens_rebuilt_on_write(self):
+        """Test that the write hook indexes name, email and employee number"""
+        employee = SimpleNamespace(
+            first_name="Amélie", last_name="Tremblay", email="a.tremblay@example.com",
+            employee_number="EMP001", job_title="Analyst", search_tokens=[]
+        )
+
+        Employee.update_search_tokens(employee)
+
+        assert {"amelie", "tremb", "a", "example", "emp001"} <= set(employee.search_tokens)
+        assert "analyst" not in employee.search_tokens
+
+
+class TestSearchFilters:
+    """Test search filters"""
+
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.service = EmployeeSearchService()
+
+    def test_prefix_filter(self):
+        """Test that every search term must be a stored prefix"""
+        assert self.service.build_prefix_filter("Tremb amé") == {
+            "search_tokens": {"$all": ["tremb", "ame"]}
+        }
+        assert self.service.build_prefix_filter("@") is None
+
+    def test_text_filter_strips_operators(self):
+        """Test that quotes and dashes are not read as phrase or negation"""
+        text_filter = self.service.build_text_filter('"jon" -smith')
+
+        assert '"' not in text_filter["$text"]["$search"]
+        assert "-" not in text_filter["$text"]["$search"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
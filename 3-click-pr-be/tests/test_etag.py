@@ -0,0 +1,105 @@
+"""
+Tests for Entity Tag Helpers
+
+Tests ETag derivation, header matching and the If-Match version claim
+used for optimistic concurrency.
+"""
+
+import asyncio
+import pytest
+from datetime import datetime
+from types import SimpleNamespace
+from src.utils.etag import (
+    claim_version,
+    collection_etag,
+    document_etag,
+    etag_matches,
+    version_of
+)
+
+
+def make_document(updated_at, document_id="65a1b2c3d4e5f6a7b8c9d0e1"):
+    """Build a document-like object with an ID and updated_at"""
+    return SimpleNamespace(id=document_id, updated_at=updated_at)
+
+
+class FakeDocument:
+    """Document type whose collection the fake_collection fixture replaces"""
+
+    def __init__(self, updated_at):
+        self.id = "65a1b2c3d4e5f6a7b8c9d0e1"
+        self.updated_at = updated_at
+
+    @classmethod
+    def get_motor_collection(cls):
+        return None
+
+
+class TestETag:
+    """Test ETag derivation and matching"""
+
+    def test_version_at_stored_precision(self):
+        """Test that a saved document and the same document read back share a tag"""
+        saved = make_document(datetime(2026, 1, 5, 9, 30, 0, 123456))
+        read_back = make_document(datetime(2026, 1, 5, 9, 30, 0, 123000))
+
+        assert version_of(saved.updated_at) == version_of(read_back.updated_at) == 1767605400123
+        assert document_etag(saved) == document_etag(read_back)
+        assert document_etag(saved).startswith('"') and document_etag(saved).endswith('"')
+
+    def test_collection_etag_changes(self):
+        """Test that edits, removals and context change a list tag"""
+        first = make_document(datetime(2026, 1, 1), "a")
+        second = make_document(datetime(2026, 1, 2), "b")
+        etag = collection_etag([first, second], True)
+
+        assert collection_etag([first, second], True) == etag
+        assert collection_etag([first], True) != etag
+        assert collection_etag([first, second], None) != etag
+        assert collection_etag([first, make_document(datetime(2026, 1, 3), "b")], True) != etag
+
+    def test_header_matching(self):
+        """Test lists, weak tags and wildcards in conditional headers"""
+        etag = '"abc"'
+
+        assert etag_matches('"abc"', etag)
+        assert etag_matches('"old", W/"abc"', etag)
+        assert etag_matches("*", etag)
+        assert not etag_matches('"abcd"', etag)
+        assert not etag_matches(None, etag)
+
+
+class TestClaimVersion:
+    """Test optimistic concurrency with If-Match"""
+
+    def test_without_if_match(self):
+        """Test that updates without If-Match always proceed"""
+        document = FakeDocument(datetime(2026, 1, 1))
+
+        assert asyncio.run(claim_version(document, None)) is True
+        assert document.updated_at == datetime(2026, 1, 1)
+
+    def test_only_first_update_of_a_version(self, fake_collection):
+        """Test that two updates based on one version cannot both apply"""
+        updated_at = datetime(2026, 1, 1)
+        fake_collection(FakeDocument, updated_at=updated_at)
+        first = FakeDocument(updated_at)
+        second = FakeDocument(updated_at)
+        etag = document_etag(first)
+
+        assert asyncio.run(claim_version(first, etag)) is True
+        assert asyncio.run(claim_version(second, etag)) is False
+        assert first.updated_at > updated_at
+
+    def test_stale_tag_rejected(self, fake_collection):
+        """Test that a tag of an older version is rejected without writing"""
+        collection = fake_collection(FakeDocument, updated_at=datetime(2026, 1, 2))
+        document = FakeDocument(datetime(2026, 1, 2))
+        stale = document_etag(make_document(datetime(2026, 1, 1)))
+
+        assert asyncio.run(claim_version(document, stale)) is False
+        assert collection.stored_updated_at == datetime(2026, 1, 2)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
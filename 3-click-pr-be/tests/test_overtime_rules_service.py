@@ -0,0 +1,170 @@
+"""
+Tests for Overtime Rules Service
+
+Tests provincial daily, weekly and double-time overtime splits.
+"""
+
+import pytest
+from datetime import date, timedelta
+from types import SimpleNamespace
+from src.services.overtime_rules_service import OvertimeRulesService, OvertimeTotals
+
+
+def make_entry(work_date, hours, employee_id="emp_001", entry_type="regular", hourly_rate=20.0):
+    """Build a minimal time entry"""
+    return SimpleNamespace(
+        employee_id=employee_id,
+        work_date=work_date,
+        entry_type=entry_type,
+        hours_worked=hours,
+        regular_hours=0.0,
+        overtime_hours=0.0,
+        double_time_hours=0.0,
+        hourly_rate=hourly_rate,
+        overtime_rate=None
+    )
+
+
+def week_of(start, hours_per_day, **kwargs):
+    """Build one entry per day starting on a Monday"""
+    return [
+        make_entry(start + timedelta(days=offset), hours, **kwargs)
+        for offset, hours in enumerate(hours_per_day)
+    ]
+
+
+class TestOvertimeRules:
+    """Test overtime classification"""
+
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.service = OvertimeRulesService()
+        self.monday = date(2025, 1, 6)
+
+    def test_province_code_normalization(self):
+        """Test that province names and codes both resolve"""
+        assert self.service.get_province_code("British Columbia") == "BC"
+        assert self.service.get_province_code("on") == "ON"
+        assert self.service.get_province_code(None) == "ON"
+        assert self.service.get_province_code("Atlantis") == "ON"
+
+    def test_ontario_weekly_threshold(self):
+        """Test Ontario overtime after 44 hours a week with no daily limit"""
+        entries = week_of(self.monday, [10, 10, 10, 10, 10])
+
+        self.service.apply(entries, {"emp_001": {"province": "Ontario"}})
+
+        assert [e.regular_hours for e in entries] == [10, 10, 10, 10, 4]
+        assert entries[4].overtime_hours == 6
+        assert sum(e.double_time_hours for e in entries) == 0
+        assert entries[0].overtime_rate == 30.0
+
+    def test_bc_daily_and_double_time(self):
+        """Test BC daily overtime after 8 hours and double-time after 12"""
+        entries = [make_entry(self.monday, 14)]
+
+        self.service.apply(entries, {"emp_001": {"province": "BC"}})
+
+        assert entries[0].regular_hours == 8
+        assert entries[0].overtime_hours == 4
+        assert entries[0].double_time_hours == 2
+
+    def test_daily_threshold_spans_entries_on_same_day(self):
+        """Test that the daily threshold counts every entry on that day"""
+        entries = [make_entry(self.monday, 6), make_entry(self.monday, 4, entry_type="overtime")]
+
+        self.service.apply(entries, {"emp_001": {"province": "MB"}})
+
+        assert (entries[0].regular_hours, entries[0].overtime_hours) == (6, 0)
+        assert (entries[1].regular_hours, entries[1].overtime_hours) == (2, 2)
+
+    def test_daily_overtime_excluded_from_weekly_limit(self):
+        """Test that weekly overtime only counts regular hours"""
+        entries = week_of(self.monday, [10, 10, 10, 10, 10, 4])
+
+        self.service.apply(entries, {"emp_001": {"province": "SK"}})
+
+        # 8 regular per weekday = 40, so Saturday's 4 hours are all weekly overtime
+        assert sum(e.regular_hours for e in entries) == 40
+        assert sum(e.overtime_hours for e in entries) == 14
+
+    def test_weeks_are_independent(self):
+        """Test that weekly totals reset on the ISO week boundary"""
+        entries = week_of(self.monday, [11, 11, 11, 11]) + week_of(self.monday + timedelta(days=7), [11])
+
+        self.service.apply(entries, {"emp_001": {"province": "AB"}})
+
+        assert entries[3].overtime_hours == 0
+        assert entries[3].regular_hours == 11
+        assert entries[4].regular_hours == 11
+        assert entries[4].overtime_hours == 0
+
+    def test_entries_processed_out_of_order(self):
+        """Test that input order does not affect the result"""
+        entries = week_of(self.monday, [10, 10, 10, 10, 10])
+        shuffled = list(reversed(entries))
+
+        self.service.apply(shuffled, {"emp_001": {"province": "ON"}})
+
+        assert entries[4].overtime_hours == 6
+        assert entries[0].overtime_hours == 0
+
+    def test_non_worked_entry_types_untouched(self):
+        """Test that vacation hours are not classified"""
+        vacation = make_entry(self.monday, 8, entry_type="vacation")
+        entries = [vacation] + week_of(self.monday + timedelta(days=1), [10, 10, 10, 10])
+
+        self.service.apply(entries, {"emp_001": {"province": "ON"}})
+
+        assert vacation.regular_hours == 0
+        assert sum(e.overtime_hours for e in entries) == 0
+
+    def test_agent_workers_not_overtime_eligible(self):
+        """Test that agent workers get all hours as regular"""
+        entries = [make_entry(self.monday, 14)]
+
+        self.service.apply(entries, {"emp_001": {"province": "BC", "worker_category": "agent_worker"}})
+
+        assert entries[0].regular_hours == 14
+        assert entries[0].overtime_hours == 0
+
+    def test_employees_are_independent(self):
+        """Test that each employee has their own weekly totals"""
+        entries = week_of(self.monday, [10, 10, 10, 10, 10], employee_id="emp_001")
+        entries += week_of(self.monday, [8, 8], employee_id="emp_002")
+
+        stats = self.service.apply(entries, {
+            "emp_001": {"province": "ON"},
+            "emp_002": {"province": "ON"}
+        })
+
+        assert stats == {"entries_classified": 7, "entries_with_overtime": 1}
+        assert entries[5].overtime_hours == 0
+
+    def test_totals_carry_across_batches(self):
+        """Test that a week split over two batches matches classifying it at once"""
+        entries = week_of(self.monday, [10, 10, 10, 10, 10])
+        totals = OvertimeTotals()
+
+        self.service.apply(entries[:3], {"emp_001": {"province": "ON"}}, totals)
+        self.service.apply(entries[3:], {"emp_001": {"province": "ON"}}, totals)
+
+        assert [e.regular_hours for e in entries] == [10, 10, 10, 10, 4]
+        assert totals.week_regular[("emp_001", 2025, 2)] == 44
+        assert totals.unordered_weeks == set()
+
+    def test_batches_out_of_date_order_recorded(self):
+        """Test that a later batch with earlier dates is classified in file order and its week recorded"""
+        entries = week_of(self.monday, [10, 10, 10, 10, 10])
+        totals = OvertimeTotals()
+
+        self.service.apply(entries[2:], {"emp_001": {"province": "ON"}}, totals)
+        self.service.apply(entries[:2], {"emp_001": {"province": "ON"}}, totals)
+
+        assert [e.regular_hours for e in entries] == [10, 4, 10, 10, 10]
+        assert totals.week_regular[("emp_001", 2025, 2)] == 44
+        assert totals.unordered_weeks == {("emp_001", 2025, 2)}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,54 @@
+"""
+Tests for Keyset Pagination Helpers
+
+Tests cursor encoding and the seek filters built from cursors.
+"""
+
+import pytest
+from datetime import date
+from src.utils.pagination import InvalidCursorError, decode_cursor, encode_cursor, seek_filter
+
+
+class TestCursor:
+    """Test cursor encoding and decoding"""
+
+    def test_round_trip(self):
+        """Test that encoded values decode back as strings"""
+        cursor = encode_cursor(date(2025, 1, 15), "65a1b2c3d4e5f6a7b8c9d0e1")
+
+        assert "=" not in cursor
+        assert decode_cursor(cursor, 2) == ["2025-01-15", "65a1b2c3d4e5f6a7b8c9d0e1"]
+
+    def test_malformed_cursor_rejected(self):
+        """Test that garbage and wrong-sized cursors are rejected"""
+        with pytest.raises(InvalidCursorError):
+            decode_cursor("not a cursor!", 2)
+        with pytest.raises(InvalidCursorError):
+            decode_cursor(encode_cursor("2025-01-15"), 2)
+
+
+class TestSeekFilter:
+    """Test seek filter construction"""
+
+    def test_descending_compound_key(self):
+        """Test the filter for a descending (work_date, _id) sort"""
+        assert seek_filter(["work_date", "_id"], [date(2025, 1, 15), "abc"]) == {
+            "$or": [
+                {"work_date": {"$lt": date(2025, 1, 15)}},
+                {"work_date": date(2025, 1, 15), "_id": {"$lt": "abc"}},
+            ]
+        }
+
+    def test_ascending_key(self):
+        """Test the filter for an ascending sort"""
+        assert seek_filter(["last_name", "first_name", "_id"], ["Doe", "Jane", "x"], descending=False) == {
+            "$or": [
+                {"last_name": {"$gt": "Doe"}},
+                {"last_name": "Doe", "first_name": {"$gt": "Jane"}},
+                {"last_name": "Doe", "first_name": "Jane", "_id": {"$gt": "x"}},
+            ]
+        }
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,138 @@
+"""
+Tests for Statutory Holiday Service
+
+Tests holiday date rules, per-province calendars and generating holiday
+entries for a workforce.
+"""
+
+import asyncio
+import pytest
+from datetime import date
+from types import SimpleNamespace
+from beanie import PydanticObjectId
+from src.schemas.employee import Employee
+from src.services.statutory_holiday_service import (
+    STATUTORY_HOLIDAY_RULES,
+    HolidayEmployeeView,
+    StatutoryHolidayService,
+    easter_sunday,
+    get_holiday_calendar,
+)
+from src.services.timesheet_import_service import TimesheetImportService
+from src.services.worker_category_service import OVERTIME_RULES
+from tests.conftest import FakeCursor
+
+
+class TestHolidayRules:
+    """Test holiday date rules"""
+
+    def test_easter_sunday(self):
+        """Test Easter against known dates"""
+        assert easter_sunday(2024) == date(2024, 3, 31)
+        assert easter_sunday(2025) == date(2025, 4, 20)
+        assert easter_sunday(2038) == date(2038, 4, 25)
+
+    def test_every_province_has_a_calendar(self):
+        """Test that every province with overtime rules has holiday rules"""
+        assert set(STATUTORY_HOLIDAY_RULES) == set(OVERTIME_RULES)
+
+
+class TestHolidayCalendar:
+    """Test provincial holiday calendars"""
+
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.service = StatutoryHolidayService()
+
+    def test_ontario_2025(self):
+        """Test fixed, floating Monday and Easter-based holidays"""
+        holidays = [holiday.date for holiday in self.service.get_holidays("ON", 2025)]
+
+        assert holidays == [
+            date(2025, 1, 1), date(2025, 2, 17), date(2025, 4, 18), date(2025, 5, 19),
+            date(2025, 7, 1), date(2025, 9, 1), date(2025, 10, 13), date(2025, 12, 25),
+            date(2025, 12, 26),
+        ]
+
+    def test_monday_before_and_sunday_canada_day(self):
+        """Test Victoria Day on May 24 and Canada Day moved off a Sunday"""
+        assert self.service.get_holiday("ON", date(2027, 5, 24)).name == "Victoria Day"
+        assert self.service.get_holiday("QC", date(2027, 5, 24)).name == "National Patriots' Day"
+        assert self.service.get_holiday("ON", date(2029, 7, 2)).name == "Canada Day"
+        assert self.service.get_holiday("ON", date(2029, 7, 1)) is None
+
+    def test_provincial_names_and_start_years(self):
+        """Test provincial holidays, lookup by province name and start years"""
+        bc_2022 = {holiday.name for holiday in self.service.get_holidays("British Columbia", 2022)}
+        bc_2025 = {holiday.name for holiday in self.service.get_holidays("BC", 2025)}
+
+        assert "British Columbia Day" in bc_2022
+        assert "National Day for Truth and Reconciliation" not in bc_2022
+        assert "National Day for Truth and Reconciliation" in bc_2025
+        assert self.service.get_holiday("YT", date(2025, 8, 18)).name == "Discovery Day"
+
+    def test_holidays_between_spans_years(self):
+        """Test a range across a year boundary"""
+        holidays = self.service.get_holidays_between("ON", date(2025, 12, 20), date(2026, 1, 5))
+
+        assert [holiday.date for holiday in holidays] == [date(2025, 12, 25), date(2025, 12, 26), date(2026, 1, 1)]
+
+    def test_calendar_cached(self):
+        """Test that a (province, year) calendar is computed once"""
+        get_holiday_calendar.cache_clear()
+
+        first = get_holiday_calendar("MB", 2030)
+        second = get_holiday_calendar("MB", 2030)
+
+        assert first is second
+        assert isinstance(first, tuple)
+        assert get_holiday_calendar.cache_info().hits == 1
+
+
+class TestHolidayEntries:
+    """Test generating holiday entries for eligible employees"""
+
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.service = StatutoryHolidayService()
+        self.employees = [
+            HolidayEmployeeView(
+                id=PydanticObjectId(), first_name="Jane", last_name=f"Doe{index}",
+                employee_number=f"EMP{index}", province_of_employment="Ontario"
+            )
+            for index in range(5)
+        ]
+
+    def test_streamed_in_batches(self, monkeypatch):
+        """Test that employees are streamed and their entries inserted a batch at a time"""
+        queries = []
+        inserted = []
+
+        def find(query):
+            queries.append(query)
+            return SimpleNamespace(project=lambda view: FakeCursor(self.employees))
+
+        def build_holiday_entries(employees, start_date, end_date, hours):
+            holidays = self.service.get_holidays_between("ON", start_date, end_date)
+            return [SimpleNamespace(work_date=holiday.date) for _ in employees for holiday in holidays]
+
+        async def insert_entries(self, entries):
+            inserted.append(len(entries))
+            return {"inserted": list(range(len(entries))), "duplicates": [], "failed": {}}
+
+        monkeypatch.setattr(Employee, "find", find)
+        monkeypatch.setattr(self.service, "build_holiday_entries", build_holiday_entries)
+        monkeypatch.setattr(TimesheetImportService, "insert_entries", insert_entries)
+        monkeypatch.setattr("src.services.statutory_holiday_service.HOLIDAY_EMPLOYEE_BATCH_SIZE", 2)
+
+        summary = asyncio.run(self.service.generate_holiday_entries(date(2025, 12, 20), date(2025, 12, 31)))
+
+        assert queries[0]["worker_category"] == {"$in": ["direct_employee"]}
+        assert inserted == [4, 4, 2]
+        assert summary["employee_count"] == 5
+        assert summary["created"] == 10
+        assert summary["work_dates"] == [date(2025, 12, 25), date(2025, 12, 26)]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,126 @@
+"""
+Tests for Tabular File Reader
+
+Tests header mapping, cell conversion and CSV/XLSX row iteration.
+"""
+
+import io
+import pytest
+from datetime import date, datetime, time
+from openpyxl import Workbook
+from src.utils.tabular_reader import (
+    TabularFileError,
+    build_header_map,
+    cell_to_text,
+    iter_csv_rows,
+    iter_csv_file_chunks,
+    iter_csv_file_rows,
+    split_csv_header,
+    iter_xlsx_rows,
+)
+
+
+ALIASES = {"date": "work_date", "hours": "hours_worked"}
+
+
+def make_workbook(rows):
+    """Build an in-memory XLSX workbook from a list of rows"""
+    workbook = Workbook()
+    worksheet = workbook.active
+    for row in rows:
+        worksheet.append(row)
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    buffer.seek(0)
+    return buffer
+
+
+class TestHeaderMapping:
+    """Test header normalization and aliasing"""
+
+    def test_headers_normalized_and_aliased(self):
+        """Test that headers are snake_cased and aliases applied"""
+        headers = ["Employee ID", " Date ", "Hours", "Break-Minutes", None]
+        assert build_header_map(headers, ALIASES) == [
+            "employee_id", "work_date", "hours_worked", "break_minutes", ""
+        ]
+
+    def test_cell_conversion(self):
+        """Test that spreadsheet values become CSV-style text"""
+        assert cell_to_text(None) == ""
+        assert cell_to_text(datetime(2025, 1, 6)) == "2025-01-06"
+        assert cell_to_text(date(2025, 1, 6)) == "2025-01-06"
+        assert cell_to_text(time(9, 30)) == "09:30"
+        assert cell_to_text(8.0) == "8"
+        assert cell_to_text(7.5) == "7.5"
+        assert cell_to_text("  EMP001 ") == "EMP001"
+
+
+class TestRowIteration:
+    """Test CSV and XLSX row iteration"""
+
+    def test_csv_rows(self):
+        """Test that CSV rows are keyed by canonical columns"""
+        text = "Employee ID,Date,Hours\nEMP001,2025-01-06,8\n,,\nEMP002,2025-01-07\n"
+
+        rows = list(iter_csv_rows(text, ALIASES))
+
+        assert rows == [
+            {"employee_id": "EMP001", "work_date": "2025-01-06", "hours_worked": "8"},
+            {"employee_id": "EMP002", "work_date": "2025-01-07", "hours_worked": ""},
+        ]
+
+    def test_csv_file_rows_match_text(self):
+        """Test that a streamed CSV file with a BOM gives the same rows and stays open"""
+        text = "Employee ID,Date,Hours\r\nEMP001,2025-01-06,8\r\n\"EMP,002\",2025-01-07\r\n"
+        file = io.BytesIO(("\ufeff" + text).encode("utf-8"))
+
+        rows = list(iter_csv_file_rows(file, ALIASES))
+
+        assert rows == list(iter_csv_rows(text, ALIASES))
+        assert rows[1]["employee_id"] == "EMP,002"
+        assert not file.closed
+
+    def test_csv_file_chunks_end_on_records(self):
+        """Test that streamed chunks hold whole records, including quoted line breaks"""
+        text = 'a,b\n1,"x\ny"\n2,z\n3,"q""\n"\n4,w'
+        file = io.BytesIO(("\ufeff" + text).encode("utf-8"))
+
+        chunks = list(iter_csv_file_chunks(file, 3))
+        headers, first = split_csv_header(chunks[0])
+
+        assert "".join(chunks) == text
+        assert all(chunk.endswith("\n") for chunk in chunks[:-1])
+        assert headers == ["a", "b"]
+        assert list(iter_csv_rows("a,b\n" + first + "".join(chunks[1:]))) == list(iter_csv_rows(text))
+        assert not file.closed
+
+    def test_xlsx_rows_match_csv(self):
+        """Test that typed XLSX cells produce the same rows as CSV"""
+        workbook = make_workbook([
+            ["Employee ID", "Date", "Hours", "Shift Start"],
+            ["EMP001", datetime(2025, 1, 6), 8, time(9, 0)],
+            [None, None, None, None],
+            ["EMP002", datetime(2025, 1, 7), 7.5, None],
+        ])
+
+        rows = list(iter_xlsx_rows(workbook, ALIASES))
+
+        assert rows == [
+            {"employee_id": "EMP001", "work_date": "2025-01-06", "hours_worked": "8", "shift_start": "09:00"},
+            {"employee_id": "EMP002", "work_date": "2025-01-07", "hours_worked": "7.5", "shift_start": ""},
+        ]
+
+    def test_empty_file_yields_nothing(self):
+        """Test that a file without rows yields no data"""
+        assert list(iter_csv_rows("", ALIASES)) == []
+        assert list(iter_xlsx_rows(make_workbook([]), ALIASES)) == []
+
+    def test_invalid_xlsx_raises(self):
+        """Test that a non-workbook file is rejected"""
+        with pytest.raises(TabularFileError):
+            iter_xlsx_rows(io.BytesIO(b"employee_id,work_date\n"), ALIASES)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
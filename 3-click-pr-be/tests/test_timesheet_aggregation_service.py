@@ -383,5 +383,173 @@ class TestTimesheetAggregation:
         assert earning_types == expected_types
 
 
+class TestServerSideHourRollup:
+    """Test folding of aggregation-pipeline hour buckets"""
+
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.service = TimesheetAggregationService()
+
+    def test_pipeline_groups_by_employee_and_entry_type(self):
+        """Test that the pipeline groups on employee_id and entry_type"""
+        pipeline = self.service.build_hours_pipeline()
+
+        group = pipeline[0]["$group"]
+        assert group["_id"] == {
+            "employee_id": "$employee_id",
+            "entry_type": "$entry_type"
+        }
+        assert group["hours_worked"] == {"$sum": "$hours_worked"}
+        assert group["entry_ids"] == {"$push": "$_id"}
+
+    def test_fold_buckets_matches_entry_aggregation(self):
+        """Test that folded buckets give the same hours as aggregate_hours"""
+        buckets = [
+            {
+                "_id": {"employee_id": "emp_001", "entry_type": "regular"},
+                "hours_worked": 10.0,
+                "regular_hours": 8.0,
+                "overtime_hours": 2.0,
+                "double_time_hours": 0.0,
+                "hourly_rate": 25.0,
+                "entry_ids": ["e1"]
+            },
+            {
+                "_id": {"employee_id": "emp_001", "entry_type": "overtime"},
+                "hours_worked": 3.0,
+                "regular_hours": 0.0,
+                "overtime_hours": 3.0,
+                "double_time_hours": 0.0,
+                "hourly_rate": 25.0,
+                "entry_ids": ["e2"]
+            },
+            {
+                "_id": {"employee_id": "emp_001", "entry_type": "vacation"},
+                "hours_worked": 8.0,
+                "regular_hours": 0.0,
+                "overtime_hours": 0.0,
+                "double_time_hours": 0.0,
+                "hourly_rate": 25.0,
+                "entry_ids": ["e3"]
+            }
+        ]
+
+        rollup = self.service.fold_hour_buckets(buckets)
+
+        hours = rollup["emp_001"]["hours"]
+        assert hours["total_hours"] == 21.0
+        assert hours["regular_hours"] == 8.0
+        assert hours["overtime_hours"] == 5.0
+        assert hours["vacation_hours"] == 8.0
+        assert hours["sick_leave_hours"] == 0.0
+        assert sorted(rollup["emp_001"]["time_entry_ids"]) == ["e1", "e2", "e3"]
+        assert rollup["emp_001"]["hourly_rate"] == 25.0
+
+    def test_fold_buckets_separates_employees(self):
+        """Test that buckets for different employees are kept apart"""
+        buckets = [
+            {
+                "_id": {"employee_id": "emp_001", "entry_type": "regular"},
+                "hours_worked": 8.0,
+                "regular_hours": 8.0,
+                "overtime_hours": 0.0,
+                "double_time_hours": 0.0,
+                "hourly_rate": None,
+                "entry_ids": ["e1"]
+            },
+            {
+                "_id": {"employee_id": "emp_002", "entry_type": "unpaid"},
+                "hours_worked": 4.0,
+                "regular_hours": 0.0,
+                "overtime_hours": 0.0,
+                "double_time_hours": 0.0,
+                "hourly_rate": 30.0,
+                "entry_ids": ["e2"]
+            }
+        ]
+
+        rollup = self.service.fold_hour_buckets(buckets)
+
+        assert set(rollup.keys()) == {"emp_001", "emp_002"}
+        assert rollup["emp_001"]["hourly_rate"] is None
+        assert rollup["emp_002"]["hours"]["unpaid_hours"] == 4.0
+        assert rollup["emp_002"]["hours"]["regular_hours"] == 0.0
+
+    def test_fold_empty_buckets(self):
+        """Test folding with no buckets"""
+        assert self.service.fold_hour_buckets([]) == {}
+
+
+
+class TestServerSideSummary:
+    """Test folding of employee summary buckets"""
+
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.service = TimesheetAggregationService()
+
+    def test_pipeline_groups_by_entry_type_and_status(self):
+        """Test that the summary pipeline sorts by date then groups"""
+        pipeline = self.service.build_summary_pipeline()
+
+        assert pipeline[0] == {"$sort": {"work_date": 1}}
+        group = pipeline[1]["$group"]
+        assert group["_id"] == {"entry_type": "$entry_type", "status": "$status"}
+        assert group["entry_count"] == {"$sum": 1}
+
+    def test_fold_totals_and_status_breakdown(self):
+        """Test that buckets fold into totals, counts and earliest rate"""
+        buckets = [
+            {
+                "_id": {"entry_type": "regular", "status": "approved"},
+                "entry_count": 3,
+                "hours_worked": 26.0,
+                "regular_hours": 24.0,
+                "overtime_hours": 2.0,
+                "double_time_hours": 0.0,
+                "first_work_date": datetime(2025, 1, 7),
+                "hourly_rate": 26.0
+            },
+            {
+                "_id": {"entry_type": "regular", "status": "draft"},
+                "entry_count": 1,
+                "hours_worked": 8.0,
+                "regular_hours": 8.0,
+                "overtime_hours": 0.0,
+                "double_time_hours": 0.0,
+                "first_work_date": datetime(2025, 1, 6),
+                "hourly_rate": 25.0
+            },
+            {
+                "_id": {"entry_type": "sick_leave", "status": "approved"},
+                "entry_count": 1,
+                "hours_worked": 8.0,
+                "regular_hours": 0.0,
+                "overtime_hours": 0.0,
+                "double_time_hours": 0.0,
+                "first_work_date": datetime(2025, 1, 10),
+                "hourly_rate": None
+            }
+        ]
+
+        summary = self.service.fold_summary_buckets(buckets)
+
+        assert summary["total_entries"] == 5
+        assert summary["status_breakdown"] == {"approved": 4, "draft": 1}
+        assert summary["hours"]["total_hours"] == 42.0
+        assert summary["hours"]["regular_hours"] == 32.0
+        assert summary["hours"]["overtime_hours"] == 2.0
+        assert summary["hours"]["sick_leave_hours"] == 8.0
+        assert summary["hourly_rate"] == 25.0
+
+    def test_fold_empty_range(self):
+        """Test the summary of a range without entries"""
+        summary = self.service.fold_summary_buckets([])
+
+        assert summary["total_entries"] == 0
+        assert summary["status_breakdown"] == {}
+        assert summary["hours"]["total_hours"] == 0.0
+        assert summary["hourly_rate"] is None
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,80 @@
+"""
+Tests for Timesheet Archive Service
+
+Tests the archive cutoff, grouping of entries into monthly buckets and the
+stages that read archived entries back.
+"""
+
+import pytest
+from datetime import date, datetime
+from beanie import PydanticObjectId
+from src.services.timesheet_archive_service import TimesheetArchiveService
+from src.services.timesheet_rollup_service import TimeEntryHoursView
+
+
+def make_entry(employee_id, work_date, hours, entry_type="regular"):
+    """Build a processed entry projection"""
+    return TimeEntryHoursView(
+        id=PydanticObjectId(),
+        employee_id=employee_id,
+        employee_number=f"EMP-{employee_id}",
+        employee_name=f"Employee {employee_id}",
+        work_date=work_date,
+        entry_type=entry_type,
+        status="processed",
+        hours_worked=hours,
+        regular_hours=min(hours, 8.0),
+        overtime_hours=max(hours - 8.0, 0.0)
+    )
+
+
+class TestTimesheetArchive:
+    """Test archive bucketing"""
+
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.service = TimesheetArchiveService()
+
+    def test_archive_cutoff(self):
+        """Test that the cutoff is the first day of a whole month"""
+        today = date(2026, 3, 15)
+
+        assert self.service.get_archive_cutoff(12, today) == date(2025, 3, 1)
+        assert self.service.get_archive_cutoff(3, today) == date(2025, 12, 1)
+        assert self.service.get_archive_cutoff(0, today) == date(2026, 3, 1)
+
+    def test_build_bucket_updates(self):
+        """Test that entries are grouped per employee and month with totals"""
+        entries = [
+            make_entry("a", date(2025, 1, 6), 8.0),
+            make_entry("a", date(2025, 1, 7), 10.0),
+            make_entry("a", date(2025, 2, 3), 8.0),
+            make_entry("b", date(2025, 1, 6), 4.0, "vacation"),
+        ]
+
+        updates = self.service.build_bucket_updates(entries)
+
+        assert set(updates) == {("a", date(2025, 1, 1)), ("a", date(2025, 2, 1)), ("b", date(2025, 1, 1))}
+        january = updates[("a", date(2025, 1, 1))]
+        assert january["employee_name"] == "Employee a"
+        assert january["inc"]["entry_count"] == 2
+        assert january["inc"]["total_hours_worked"] == 18.0
+        assert january["inc"]["total_overtime_hours"] == 2.0
+        assert [entry.entry_id for entry in january["entries"]] == [entries[0].id, entries[1].id]
+        assert updates[("b", date(2025, 1, 1))]["entries"][0].entry_type.value == "vacation"
+
+    def test_archived_entries_pipeline(self):
+        """Test that buckets unwind into time-entry-shaped documents"""
+        pipeline = self.service.build_archived_entries_pipeline(date(2025, 1, 1), date(2025, 1, 31))
+
+        assert pipeline[0] == {"$unwind": "$entries"}
+        assert pipeline[1]["$match"]["entries.work_date"] == {
+            "$gte": datetime(2025, 1, 1), "$lte": datetime(2025, 1, 31)
+        }
+        new_root = pipeline[2]["$replaceRoot"]["newRoot"]["$mergeObjects"][1]
+        assert new_root["_id"] == "$entries.entry_id"
+        assert new_root["status"] == "processed"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
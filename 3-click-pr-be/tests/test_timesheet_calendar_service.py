@@ -0,0 +1,120 @@
+"""
+Tests for Timesheet Calendar Service
+
+Tests folding of (day, department) buckets into a month calendar and
+invalidation of the in-process month cache.
+"""
+
+import asyncio
+import pytest
+from datetime import date, datetime
+from src.services.timesheet_calendar_service import TimesheetCalendarService
+
+
+def make_bucket(work_date, department_id, hours, entries=1, employees=1, department_name=None):
+    """Build an aggregation bucket"""
+    return {
+        "_id": {"work_date": work_date, "department_id": department_id},
+        "department_name": department_name,
+        "entry_count": entries,
+        "employee_count": employees,
+        "hours_worked": hours,
+        "regular_hours": hours,
+        "overtime_hours": 0.0,
+        "double_time_hours": 0.0
+    }
+
+
+class TestCalendarFold:
+    """Test building a month calendar from buckets"""
+
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.service = TimesheetCalendarService()
+
+    def test_every_day_of_month_present(self):
+        """Test that days without entries are returned with zero totals"""
+        calendar = self.service.fold_calendar_buckets([], 2024, 2)
+
+        assert len(calendar["days"]) == 29
+        assert calendar["days"][0]["date"] == "2024-02-01"
+        assert calendar["days"][-1]["entry_count"] == 0
+        assert calendar["totals"]["hours_worked"] == 0.0
+
+    def test_departments_per_day_and_month(self):
+        """Test per-department totals, merging live and archived buckets"""
+        buckets = [
+            make_bucket(datetime(2025, 1, 6), "ops", 16.0, entries=2, employees=2, department_name="Operations"),
+            make_bucket(datetime(2025, 1, 6), "ops", 8.0),
+            make_bucket(datetime(2025, 1, 6), None, 4.0),
+            make_bucket(datetime(2025, 1, 7), "ops", 8.0, department_name="Operations"),
+        ]
+
+        calendar = self.service.fold_calendar_buckets(buckets, 2025, 1)
+
+        monday = calendar["days"][5]
+        assert monday["date"] == "2025-01-06"
+        assert monday["hours_worked"] == 28.0
+        assert monday["entry_count"] == 4
+        ops, unassigned = monday["departments"]
+        assert (ops["department_id"], ops["department_name"], ops["hours_worked"], ops["employee_count"]) == \
+            ("ops", "Operations", 24.0, 3)
+        assert unassigned["department_id"] == "unassigned"
+        assert calendar["departments"][0]["hours_worked"] == 32.0
+        assert calendar["totals"]["entry_count"] == 5
+
+
+class TestCalendarCache:
+    """Test the month cache"""
+
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.service = TimesheetCalendarService()
+        self.computed = []
+
+        async def fake_compute(year, month):
+            self.computed.append((year, month))
+            return {"year": year, "month": month}
+
+        self.service.compute_month_calendar = fake_compute
+
+    def test_cached_until_invalidated(self):
+        """Test that a month is computed once until an entry in it changes"""
+        first = asyncio.run(self.service.get_month_calendar(2025, 1))
+        second = asyncio.run(self.service.get_month_calendar(2025, 1))
+        self.service.invalidate([date(2025, 2, 3)])
+        third = asyncio.run(self.service.get_month_calendar(2025, 1))
+        self.service.invalidate([date(2025, 1, 31)])
+        asyncio.run(self.service.get_month_calendar(2025, 1))
+
+        assert (first["cached"], second["cached"], third["cached"]) == (False, True, True)
+        assert self.computed == [(2025, 1), (2025, 1)]
+
+    def test_not_cached_if_invalidated_while_computing(self):
+        """Test that a result computed across an invalidation is not cached"""
+        async def racing_compute(year, month):
+            self.computed.append((year, month))
+            self.service.invalidate([date(year, month, 1)])
+            return {"year": year, "month": month}
+
+        self.service.compute_month_calendar = racing_compute
+
+        asyncio.run(self.service.get_month_calendar(2025, 3))
+        asyncio.run(self.service.get_month_calendar(2025, 3))
+
+        assert self.computed == [(2025, 3), (2025, 3)]
+
+    def test_invalidate_range(self):
+        """Test that every month overlapping a range is dropped"""
+        for month in (1, 2, 3, 4):
+            asyncio.run(self.service.get_month_calendar(2025, month))
+
+        self.service.invalidate_range(date(2025, 1, 31), date(2025, 3, 1))
+        for month in (1, 2, 3, 4):
+            asyncio.run(self.service.get_month_calendar(2025, month))
+
+        assert self.computed[4:] == [(2025, 1), (2025, 2), (2025, 3)]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,139 @@
+"""
+Tests for Timesheet Dedupe Service
+
+Tests which duplicate time entries are removed before the unique index is
+built, how duplicate periods are merged, and that startup degrades
+instead of failing when an index cannot be built.
+"""
+
+import asyncio
+import pytest
+from datetime import date, datetime
+from pymongo.errors import OperationFailure
+from src.schemas.timesheet import (
+    TimeEntry, TimeEntryStatus, TimesheetPeriod,
+    TIME_ENTRY_UNIQUE_INDEX, TIMESHEET_PERIOD_UNIQUE_INDEX,
+)
+from src.services.timesheet_dedupe_service import TimesheetDedupeService
+
+
+def make_group(*statuses):
+    """Build a duplicate group of entries with the given statuses, oldest first"""
+    return {"documents": [{"_id": f"e{index}", "status": status.value} for index, status in enumerate(statuses)]}
+
+
+class TestDuplicateSelection:
+    """Test which entries of a duplicate group are deleted"""
+
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.service = TimesheetDedupeService()
+
+    def test_keeps_oldest(self):
+        """Test that the oldest entry is kept when none is processed"""
+        group = make_group(TimeEntryStatus.DRAFT, TimeEntryStatus.APPROVED, TimeEntryStatus.DRAFT)
+
+        assert self.service.select_duplicate_entries(group["documents"]) == ["e1", "e2"]
+
+    def test_keeps_processed(self):
+        """Test that processed entries are kept over older ones"""
+        group = make_group(TimeEntryStatus.APPROVED, TimeEntryStatus.PROCESSED, TimeEntryStatus.DRAFT)
+
+        assert self.service.select_duplicate_entries(group["documents"]) == ["e0", "e2"]
+
+    def test_pipeline_groups_on_index_keys(self):
+        """Test that duplicates are grouped on the unique index fields"""
+        pipeline = self.service.build_duplicate_pipeline(TIME_ENTRY_UNIQUE_INDEX, ["status"])
+
+        assert pipeline[1]["$group"]["_id"] == {
+            "employee_id": "$employee_id", "work_date": "$work_date", "entry_type": "$entry_type"
+        }
+        assert pipeline[-1] == {"$match": {"count": {"$gt": 1}}}
+
+
+class TestPeriodMerge:
+    """Test merging duplicate timesheet periods"""
+
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.service = TimesheetDedupeService()
+        self.repairs = []
+        self.service.rollup_service.repair_rollups = lambda *args, **kwargs: asyncio.sleep(
+            0, result=self.repairs.append((args, kwargs))
+        )
+
+    def test_merged_into_pay_run_period(self):
+        """Test that the period in a pay run keeps every entry of the group"""
+        documents = [
+            {"_id": "p0", "pay_run_id": None, "time_entry_ids": ["e1", "e2"]},
+            {"_id": "p1", "pay_run_id": "run", "time_entry_ids": ["e2", "e3"]},
+        ]
+
+        assert self.service.select_period_merge(documents) == ("p1", ["p0"], ["e1", "e2", "e3"])
+
+    def test_two_pay_runs_left_alone(self):
+        """Test that periods in different pay runs are not merged"""
+        documents = [{"_id": "p0", "pay_run_id": "a"}, {"_id": "p1", "pay_run_id": "b"}]
+
+        assert self.service.select_period_merge(documents) is None
+
+    def test_merge_recomputes_totals(self, fake_collection):
+        """Test that the kept period gains the entry IDs and its totals are repaired"""
+        collection = fake_collection(TimesheetPeriod, results=[{
+            "_id": {"employee_id": "emp_001", "period_start_date": datetime(2025, 1, 6)},
+            "documents": [
+                {"_id": "p0", "time_entry_ids": ["e1"], "period_end_date": datetime(2025, 1, 19)},
+                {"_id": "p1", "time_entry_ids": ["e2"], "period_end_date": datetime(2025, 1, 19)},
+            ]
+        }])
+
+        assert asyncio.run(self.service.merge_duplicate_periods()) == 1
+        assert collection.updates == [({"_id": "p0"}, {"$addToSet": {"time_entry_ids": {"$each": ["e1", "e2"]}}})]
+        assert collection.deleted == [{"_id": {"$in": ["p1"]}}]
+        assert self.repairs == [
+            ((date(2025, 1, 6), date(2025, 1, 19)), {"employee_ids": ["emp_001"]})
+        ]
+
+
+class TestUniqueIndexes:
+    """Test building the unique index at startup"""
+
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.service = TimesheetDedupeService()
+        self.service.rollup_service.fetch_entries = lambda ids: asyncio.sleep(0, result=[])
+        self.service.rollup_service.apply_changes = lambda changes: asyncio.sleep(0, result=0)
+
+    def test_duplicates_removed_then_indexed(self, fake_collection):
+        """Test that duplicates are deleted before the index is built"""
+        collection = fake_collection(TimeEntry, results=[make_group(TimeEntryStatus.DRAFT, TimeEntryStatus.DRAFT)])
+        fake_collection(TimesheetPeriod, indexes=[TIMESHEET_PERIOD_UNIQUE_INDEX.document["name"]])
+
+        summary = asyncio.run(self.service.ensure_unique_indexes())
+
+        assert summary == {"entries_removed": 1, "time_entry_index": True, "periods_merged": 0, "period_index": True}
+        assert collection.deleted == [{"_id": {"$in": ["e1"]}}]
+        assert TIME_ENTRY_UNIQUE_INDEX.document["name"] in collection.indexes
+
+    def test_skipped_once_indexed(self, fake_collection):
+        """Test that nothing is scanned when the index already exists"""
+        collection = fake_collection(TimeEntry, indexes=[TIME_ENTRY_UNIQUE_INDEX.document["name"]])
+        periods = fake_collection(TimesheetPeriod, indexes=[TIMESHEET_PERIOD_UNIQUE_INDEX.document["name"]])
+
+        asyncio.run(self.service.ensure_unique_indexes())
+
+        assert collection.pipelines == [] and periods.pipelines == []
+
+    def test_failed_build_degrades(self, fake_collection):
+        """Test that an index that cannot be built is reported, not raised"""
+        fake_collection(TimeEntry, index_error=OperationFailure("E11000 duplicate key error", code=11000))
+        fake_collection(TimesheetPeriod)
+
+        summary = asyncio.run(self.service.ensure_unique_indexes())
+
+        assert summary["time_entry_index"] is False
+        assert summary["period_index"] is True
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,211 @@
+"""
+Tests for Timesheet Import Service
+
+Tests that unordered bulk inserts report duplicates and failures per entry,
+and the lookups used to validate a dry-run upload.
+"""
+
+import asyncio
+import pytest
+from datetime import date, timedelta
+from types import SimpleNamespace
+from beanie import PydanticObjectId
+from pymongo.errors import BulkWriteError
+from src.schemas.timesheet import TimeEntry, UploadErrorClass
+from src.services.overtime_rules_service import OvertimeRulesService, OvertimeTotals
+from src.services.timesheet_import_service import (
+    TimeEntryKeyView, TimeEntryOvertimeView, TimesheetImportService,
+)
+from src.services.timesheet_row_parser import ParsedRow
+
+
+def make_entries(count):
+    """Build entries without IDs"""
+    return [SimpleNamespace(id=None) for _ in range(count)]
+
+
+class TestTimesheetImport:
+    """Test bulk insert result classification"""
+
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.service = TimesheetImportService()
+
+    def test_classify_write_errors(self):
+        """Test that duplicate-key errors are separated from other failures"""
+        write_errors = [
+            {"index": 0, "code": 11000, "errmsg": "E11000 duplicate key error"},
+            {"index": 2, "code": 121, "errmsg": "Document failed validation"}
+        ]
+
+        result = self.service.classify_write_errors(write_errors, offset=10)
+
+        assert result == {"duplicates": [10], "failed": {12: "Document failed validation"}}
+
+    def test_insert_entries_chunks_and_skips_duplicates(self, monkeypatch):
+        """Test that every chunk is inserted and rejected rows reported"""
+        calls = []
+
+        async def fake_insert_many(documents, ordered=True):
+            calls.append((len(documents), ordered))
+            if len(calls) == 2:
+                raise BulkWriteError({
+                    "writeErrors": [{"index": 1, "code": 11000, "errmsg": "E11000 duplicate key error"}]
+                })
+
+        monkeypatch.setattr(TimeEntry, "insert_many", fake_insert_many)
+        entries = make_entries(5)
+
+        result = asyncio.run(self.service.insert_entries(entries, chunk_size=2))
+
+        assert calls == [(2, False), (2, False), (1, False)]
+        assert result["inserted"] == [0, 1, 2, 4]
+        assert result["duplicates"] == [3]
+        assert result["failed"] == {}
+        assert all(entry.id is not None for entry in entries)
+
+    def test_insert_entries_reports_chunk_failure(self, monkeypatch):
+        """Test that an unexpected error fails only its own chunk"""
+        async def fake_insert_many(documents, ordered=True):
+            if len(documents) == 1:
+                raise RuntimeError("connection reset")
+
+        monkeypatch.setattr(TimeEntry, "insert_many", fake_insert_many)
+
+        result = asyncio.run(self.service.insert_entries(make_entries(3), chunk_size=2))
+
+        assert result["inserted"] == [0, 1]
+        assert result["failed"] == {2: "connection reset"}
+
+    def test_count_error_classes(self):
+        """Test that errors are counted per class, defaulting to other"""
+        errors = [
+            {"row": 2, "error": "Invalid hours format", "error_class": UploadErrorClass.INVALID_HOURS},
+            {"row": 3, "error": "Invalid hours format", "error_class": "invalid_hours"},
+            {"row": 4, "error": "Legacy error without a class"}
+        ]
+
+        assert self.service.count_error_classes(errors) == {"invalid_hours": 2, "other": 1}
+
+
+class TestDryRun:
+    """Test the lookups and entries used by dry-run uploads"""
+
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.service = TimesheetImportService()
+
+    def test_dry_run_entry_is_classified_by_overtime_rules(self):
+        """Test that dry-run entries carry what the overtime rules need"""
+        employee = SimpleNamespace(id="emp_1", first_name="Ada", last_name="Lovelace", hourly_rate=20.0)
+        row = ParsedRow(0, "emp_1", date(2025, 1, 6), "regular", 10.0, 0.0, 0.0,
+                        None, None, 0, None, "", "", "", None)
+
+        entry = self.service.build_dry_run_entry(row, employee)
+        OvertimeRulesService().apply([entry], {"emp_1": {"province": "ON"}})
+
+        assert entry.employee_name == "Ada Lovelace"
+        assert entry.hourly_rate == 20.0
+        assert entry.regular_hours == 10.0
+        assert entry.overtime_hours == 0.0
+
+    def test_find_existing_entry_keys(self, monkeypatch):
+        """Test that existing keys are found with one query per employee chunk"""
+        queries = []
+        stored = [
+            TimeEntryKeyView(employee_id="a", work_date=date(2025, 1, 6), entry_type="regular"),
+            TimeEntryKeyView(employee_id="b", work_date=date(2025, 1, 7), entry_type="overtime"),
+        ]
+
+        def fake_find(query):
+            queries.append(query)
+            found = [entry for entry in stored if entry.employee_id in query["employee_id"]["$in"]]
+            to_list = lambda: asyncio.sleep(0, result=found)
+            return SimpleNamespace(project=lambda view: SimpleNamespace(to_list=to_list))
+
+        monkeypatch.setattr(TimeEntry, "find", fake_find)
+        keys = {
+            ("a", date(2025, 1, 6), "regular"),
+            ("b", date(2025, 1, 7), "regular"),
+            ("c", date(2025, 1, 9), "regular"),
+        }
+
+        existing = asyncio.run(self.service.find_existing_entry_keys(keys, chunk_size=2))
+
+        assert existing == {("a", date(2025, 1, 6), "regular")}
+        assert [query["employee_id"]["$in"] for query in queries] == [["a", "b"], ["c"]]
+        assert queries[0]["work_date"] == {"$gte": date(2025, 1, 6), "$lte": date(2025, 1, 9)}
+
+    def test_stored_hours_count_towards_weekly_overtime(self, monkeypatch):
+        """Test that hours stored for an uploaded week are loaded once and count towards its limit"""
+        queries = []
+        stored = [
+            TimeEntryKeyView(employee_id="a", work_date=date(2025, 1, 6), entry_type="regular",
+                             hours_worked=40.0, regular_hours=40.0),
+            TimeEntryKeyView(employee_id="a", work_date=date(2025, 1, 7), entry_type="vacation",
+                             hours_worked=8.0, regular_hours=8.0),
+        ]
+
+        def fake_find(query):
+            queries.append(query)
+            to_list = lambda: asyncio.sleep(0, result=stored)
+            return SimpleNamespace(project=lambda view: SimpleNamespace(to_list=to_list))
+
+        monkeypatch.setattr(TimeEntry, "find", fake_find)
+        totals = OvertimeTotals()
+        keys = {("a", date(2025, 1, 9), "regular")}
+
+        asyncio.run(self.service.find_existing_entry_keys(keys, totals))
+        asyncio.run(self.service.find_existing_entry_keys(keys, totals))
+        entry = self.service.build_dry_run_entry(
+            ParsedRow(0, "a", date(2025, 1, 9), "regular", 8.0, 0.0, 0.0, None, None, 0, None, "", "", "", None),
+            SimpleNamespace(id="a", first_name="Ada", last_name="Lovelace", hourly_rate=20.0)
+        )
+        OvertimeRulesService().apply([entry], {"a": {"province": "ON"}}, totals)
+
+        assert queries[0]["work_date"] == {"$gte": date(2025, 1, 6), "$lte": date(2025, 1, 12)}
+        assert totals.week_regular[("a", 2025, 2)] == 44.0
+        assert (entry.regular_hours, entry.overtime_hours) == (4.0, 4.0)
+
+    def test_unordered_week_reclassified_by_work_date(self, monkeypatch, fake_collection):
+        """Test that an upload's week stored in file order is classified again by work date"""
+        monday = date(2025, 1, 6)
+        # Inserted Wednesday to Friday first, then Monday and Tuesday
+        ids = {offset: PydanticObjectId() for offset in [2, 3, 4, 0, 1]}
+        file_order = {0: 10.0, 1: 4.0, 2: 10.0, 3: 10.0, 4: 10.0}
+        stored = [
+            TimeEntryOvertimeView(
+                _id=ids[offset], employee_id="a", work_date=monday + timedelta(days=offset),
+                entry_type="regular", hours_worked=10.0, regular_hours=regular,
+                overtime_hours=10.0 - regular, upload_id="upload"
+            )
+            for offset, regular in file_order.items()
+        ] + [
+            TimeEntryOvertimeView(
+                _id=PydanticObjectId(), employee_id="a", work_date=monday + timedelta(days=5),
+                entry_type="regular", hours_worked=4.0, regular_hours=4.0, upload_id="earlier"
+            )
+        ]
+
+        def fake_find(query):
+            to_list = lambda: asyncio.sleep(0, result=stored)
+            return SimpleNamespace(project=lambda view: SimpleNamespace(to_list=to_list))
+
+        monkeypatch.setattr(TimeEntry, "find", fake_find)
+        collection = fake_collection(TimeEntry)
+
+        result = asyncio.run(self.service.reclassify_upload_weeks(
+            "upload", {("a", 2025, 2)}, {"a": {"province": "ON"}}, OvertimeRulesService()
+        ))
+
+        updates = {
+            operation._filter["_id"]: operation._doc["$set"]["regular_hours"]
+            for operation in collection.operations[0]
+        }
+        assert updates == {ids[1]: 10.0, ids[4]: 0.0}
+        assert result["entries_reclassified"] == 2
+        assert result["work_dates"] == {monday + timedelta(days=1), monday + timedelta(days=4)}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
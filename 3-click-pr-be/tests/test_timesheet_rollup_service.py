@@ -0,0 +1,178 @@
+"""
+Tests for Timesheet Rollup Service
+
+Tests pay period boundaries and the rollup deltas produced by entry changes.
+"""
+
+import pytest
+from datetime import date
+from beanie import PydanticObjectId
+from src.services.timesheet_rollup_service import TimesheetRollupService, TimeEntryHoursView
+from src.schemas.timesheet import TimeEntryType, TimeEntryStatus
+
+
+def make_entry(**overrides):
+    """Build a rollup projection of a time entry"""
+    values = {
+        "id": PydanticObjectId(),
+        "employee_id": "emp_001",
+        "employee_number": "EMP001",
+        "employee_name": "John Doe",
+        "work_date": date(2025, 1, 8),
+        "entry_type": TimeEntryType.REGULAR,
+        "status": TimeEntryStatus.APPROVED,
+        "hours_worked": 10.0,
+        "regular_hours": 8.0,
+        "overtime_hours": 2.0,
+        "double_time_hours": 0.0
+    }
+    values.update(overrides)
+    return TimeEntryHoursView(**values)
+
+
+class TestPeriodBounds:
+    """Test pay period boundary calculation"""
+
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.service = TimesheetRollupService()
+
+    def test_weekly_period_starts_monday(self):
+        """Test that weekly periods run Monday to Sunday"""
+        start, end = self.service.get_period_bounds(date(2025, 1, 9), "weekly")
+        assert start == date(2025, 1, 6)
+        assert end == date(2025, 1, 12)
+
+    def test_biweekly_period(self):
+        """Test biweekly periods on both sides of the anchor"""
+        assert self.service.get_period_bounds(date(2025, 1, 19), "biweekly") == (
+            date(2025, 1, 6), date(2025, 1, 19)
+        )
+        assert self.service.get_period_bounds(date(2025, 1, 20), "biweekly") == (
+            date(2025, 1, 20), date(2025, 2, 2)
+        )
+        assert self.service.get_period_bounds(date(2025, 1, 5), "biweekly") == (
+            date(2024, 12, 23), date(2025, 1, 5)
+        )
+
+    def test_semi_monthly_period(self):
+        """Test semi-monthly periods split on the 15th"""
+        assert self.service.get_period_bounds(date(2025, 2, 15), "semi_monthly") == (
+            date(2025, 2, 1), date(2025, 2, 15)
+        )
+        assert self.service.get_period_bounds(date(2025, 2, 16), "semi-monthly") == (
+            date(2025, 2, 16), date(2025, 2, 28)
+        )
+
+    def test_monthly_period(self):
+        """Test monthly periods cover the calendar month"""
+        assert self.service.get_period_bounds(date(2024, 2, 10), "monthly") == (
+            date(2024, 2, 1), date(2024, 2, 29)
+        )
+
+
+class TestRollupDeltas:
+    """Test rollup deltas built from entry changes"""
+
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.service = TimesheetRollupService()
+        self.frequencies = {"emp_001": "biweekly"}
+
+    def test_draft_entry_does_not_contribute(self):
+        """Test that non-payable entries are ignored"""
+        entry = make_entry(status=TimeEntryStatus.DRAFT)
+        assert self.service.entry_contribution(entry) == {}
+        assert self.service.build_deltas([(None, entry)], self.frequencies) == {}
+
+    def test_approval_adds_hours(self):
+        """Test that approving an entry increments its period"""
+        before = make_entry(status=TimeEntryStatus.SUBMITTED)
+        after = before.model_copy(update={"status": TimeEntryStatus.APPROVED})
+
+        deltas = self.service.build_deltas([(before, after)], self.frequencies)
+
+        delta = deltas[("emp_001", date(2025, 1, 6), "biweekly")]
+        assert delta["inc"]["total_hours_worked"] == 10.0
+        assert delta["inc"]["total_regular_hours"] == 8.0
+        assert delta["inc"]["total_overtime_hours"] == 2.0
+        assert delta["add_ids"] == {str(after.id)}
+        assert delta["period_end_date"] == date(2025, 1, 19)
+
+    def test_vacation_entry_fills_type_bucket(self):
+        """Test that typed entries also add to their own bucket"""
+        entry = make_entry(
+            entry_type=TimeEntryType.VACATION,
+            hours_worked=8.0,
+            regular_hours=0.0,
+            overtime_hours=0.0
+        )
+        contribution = self.service.entry_contribution(entry)
+        assert contribution["total_vacation_hours"] == 8.0
+        assert contribution["total_hours_worked"] == 8.0
+
+    def test_update_applies_difference(self):
+        """Test that editing an approved entry applies only the difference"""
+        before = make_entry()
+        after = before.model_copy(update={"hours_worked": 12.0, "overtime_hours": 4.0})
+
+        deltas = self.service.build_deltas([(before, after)], self.frequencies)
+
+        delta = deltas[("emp_001", date(2025, 1, 6), "biweekly")]
+        assert delta["inc"]["total_hours_worked"] == 2.0
+        assert delta["inc"]["total_overtime_hours"] == 2.0
+        assert delta["inc"]["total_regular_hours"] == 0.0
+        assert delta["remove_ids"] == set()
+
+    def test_moving_entry_across_periods(self):
+        """Test that a changed work date moves hours between periods"""
+        before = make_entry()
+        after = before.model_copy(update={"work_date": date(2025, 1, 21)})
+
+        deltas = self.service.build_deltas([(before, after)], self.frequencies)
+
+        assert deltas[("emp_001", date(2025, 1, 6), "biweekly")]["inc"]["total_hours_worked"] == -10.0
+        assert deltas[("emp_001", date(2025, 1, 6), "biweekly")]["remove_ids"] == {str(before.id)}
+        assert deltas[("emp_001", date(2025, 1, 20), "biweekly")]["inc"]["total_hours_worked"] == 10.0
+
+    def test_delete_removes_hours(self):
+        """Test that deleting an approved entry decrements its period"""
+        entry = make_entry()
+
+        deltas = self.service.build_deltas([(entry, None)], {"emp_001": "weekly"})
+
+        delta = deltas[("emp_001", date(2025, 1, 6), "weekly")]
+        assert delta["inc"]["total_hours_worked"] == -10.0
+        assert delta["remove_ids"] == {str(entry.id)}
+        assert delta["add_ids"] == set()
+
+    def test_held_entries_stay_in_their_period(self):
+        """Test that after a pay frequency change an entry's hours leave and stay in the period holding it"""
+        deleted = make_entry()
+        edited = make_entry()
+        held = {
+            str(deleted.id): (date(2025, 1, 6), date(2025, 1, 19), "biweekly"),
+            str(edited.id): (date(2025, 1, 6), date(2025, 1, 19), "biweekly")
+        }
+        changes = [
+            (deleted, None),
+            (edited, edited.model_copy(update={"hours_worked": 12.0, "hourly_rate": 30.0}))
+        ]
+
+        deltas = self.service.build_deltas(changes, {"emp_001": "weekly"}, held)
+
+        assert list(deltas) == [("emp_001", date(2025, 1, 6), "biweekly")]
+        delta = deltas[("emp_001", date(2025, 1, 6), "biweekly")]
+        assert delta["inc"]["total_hours_worked"] == -8.0
+        assert delta["remove_ids"] == {str(deleted.id)}
+        assert delta["hourly_rate"] == 30.0
+
+    def test_unheld_entry_removes_nothing(self):
+        """Test that an entry no period holds leaves no negative delta"""
+        entry = make_entry()
+
+        assert self.service.build_deltas([(entry, None)], self.frequencies, {}) == {}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
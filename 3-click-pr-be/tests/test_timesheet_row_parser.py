@@ -0,0 +1,154 @@
+"""
+Tests for Timesheet Row Parser
+
+Tests compiled row parsing, record-boundary splitting and parallel parsing.
+"""
+
+import asyncio
+import io
+import pytest
+from datetime import date
+from src.services.timesheet_row_parser import (
+    ParsedRow,
+    RowError,
+    compile_row_parser,
+    iter_csv_batches,
+    iter_row_batches,
+    parse_date,
+    shutdown_parse_executor,
+)
+from src.utils.tabular_reader import iter_csv_file_chunks, split_csv_header
+
+
+COLUMNS = [
+    "employee_id", "work_date", "entry_type", "hours_worked",
+    "shift_start", "shift_end", "break_minutes", "hourly_rate", "notes"
+]
+
+
+async def collect(batches):
+    """Gather every batch of an async iterator"""
+    return [batch async for batch in batches]
+
+
+def make_csv(rows):
+    """Build CSV text with a header and one line per row"""
+    lines = ["Employee ID,Date,Type,Hours,Notes"]
+    lines += [f"emp_{i % 7},2025-01-{i % 28 + 1:02d},regular,{i % 12},row {i}" for i in range(rows)]
+    return "\n".join(lines) + "\n"
+
+
+class TestRowParser:
+    """Test parsing of individual rows"""
+
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.parse = compile_row_parser(COLUMNS)
+
+    def test_valid_row(self):
+        """Test that a complete row is converted"""
+        row = self.parse(["emp_1", "2025-01-06", "Overtime", "9.5", "09:00", "18:30", "30", "25.5", "Late"], 3)
+
+        assert isinstance(row, ParsedRow)
+        assert row.index == 3
+        assert row.work_date == date(2025, 1, 6)
+        assert row.entry_type == "overtime"
+        assert row.hours_worked == 9.5
+        assert (row.shift_start, row.shift_end, row.break_minutes) == ("09:00", "18:30", 30)
+        assert row.hourly_rate == 25.5
+        assert row.notes == "Late"
+        assert row.employee_name == ""
+
+    def test_short_row_and_defaults(self):
+        """Test that missing cells default and unknown entry types become regular"""
+        row = self.parse(["emp_1", "2025-1-6", "bogus"], 0)
+
+        assert row.work_date == date(2025, 1, 6)
+        assert row.entry_type == "regular"
+        assert row.hours_worked == 0.0
+        assert row.shift_start is None
+        assert row.hourly_rate is None
+
+    def test_invalid_shift_is_dropped(self):
+        """Test that bad shift times drop the shift but keep the row"""
+        row = self.parse(["emp_1", "2025-01-06", "", "8", "25:00", "17:00", "30"], 0)
+
+        assert isinstance(row, ParsedRow)
+        assert row.shift_start is None
+        assert row.break_minutes == 0
+
+    def test_row_errors(self):
+        """Test the error class of each validation failure"""
+        missing = self.parse(["", "2025-01-06"], 0)
+        bad_date = self.parse(["emp_1", "06/01/2025"], 1)
+        bad_hours = self.parse(["emp_1", "2025-01-06", "", "eight"], 2)
+
+        assert isinstance(missing, RowError) and missing.error_class == "missing_field"
+        assert bad_date.error_class == "invalid_date"
+        assert bad_date.error == "Invalid date format: 06/01/2025. Expected YYYY-MM-DD"
+        assert bad_hours.error_class == "invalid_hours"
+        assert bad_hours.data["hours_worked"] == "eight"
+
+    def test_blank_row_skipped(self):
+        """Test that blank rows produce nothing"""
+        assert self.parse(["", "", ""], 0) is None
+
+    def test_parse_date(self):
+        """Test date validation"""
+        assert parse_date("2024-02-29") == date(2024, 2, 29)
+        assert parse_date("2025-02-29") is None
+        assert parse_date("2025-01-06T00:00") is None
+
+
+class TestBatches:
+    """Test splitting and batch parsing"""
+
+    def test_split_respects_quoted_line_breaks(self):
+        """Test that chunks never end inside a quoted field"""
+        text = 'a,b\n1,"x\ny"\n2,z\n3,"q""\n"\n4,w'
+
+        chunks = list(iter_csv_file_chunks(io.BytesIO(text.encode()), 1))
+        headers, first = split_csv_header(chunks[0])
+
+        assert headers == ["a", "b"]
+        assert first == ""
+        assert chunks[1:] == ['1,"x\ny"\n', '2,z\n', '3,"q""\n"\n', '4,w']
+        assert "".join(chunks) == text
+
+    def test_row_numbers_continue_across_batches(self):
+        """Test that batches carry file row numbers and skip blank lines"""
+        text = "employee_id,work_date\nemp_1,2025-01-06\n\nemp_2,bad\n"
+
+        batches = asyncio.run(collect(iter_csv_batches(io.BytesIO(text.encode()), parallel=False)))
+
+        assert sum(batch.row_count for batch in batches) == 2
+        assert batches[0].first_row == 2
+        assert batches[0].errors[0].index == 1
+
+    def test_row_dict_batches(self):
+        """Test batching of pre-split rows such as XLSX reader output"""
+        rows = [{"employee_id": f"emp_{i}", "work_date": "2025-01-06"} for i in range(5)]
+
+        batches = asyncio.run(collect(iter_row_batches(iter(rows), batch_size=2)))
+
+        assert [(batch.first_row, batch.row_count) for batch in batches] == [(2, 2), (4, 2), (6, 1)]
+
+    def test_parallel_matches_in_process(self, monkeypatch):
+        """Test that the process pool yields the same rows in the same order"""
+        monkeypatch.setattr("src.services.timesheet_row_parser.CSV_CHUNK_SIZE", 2048)
+        text = make_csv(500)
+        aliases = {"date": "work_date", "type": "entry_type", "hours": "hours_worked"}
+
+        try:
+            serial = asyncio.run(collect(iter_csv_batches(io.BytesIO(text.encode()), aliases, parallel=False)))
+            parallel = asyncio.run(collect(iter_csv_batches(io.BytesIO(text.encode()), aliases, parallel=True)))
+        finally:
+            shutdown_parse_executor()
+
+        assert len(parallel) > 1
+        assert [(b.first_row, b.rows, b.errors, b.row_count) for b in parallel] == \
+            [(b.first_row, b.rows, b.errors, b.row_count) for b in serial]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -163,6 +163,7 @@ export default function EmployeeWizard({ onCancel, onFinish, mode = "create", em
     // legacy text field replaced by city/province/postal
     location: "Head Office",
     designation: "", // designation title (for display and storage)
+    designationId: "", // designation ID
     department: "", // department ID
     departmentName: "", // department name for display
     division: "",
@@ -294,6 +295,7 @@ export default function EmployeeWizard({ onCancel, onFinish, mode = "create", em
             locationPostal: data.postal_code || "",
             location: data.work_location_name || "Head Office",
             designation: data.job_title || "",
+            designationId: data.designation_id || "",
             department: data.department_id || "",
             departmentName: data.department_name || "",
             division: data.division || "",
@@ -887,6 +889,7 @@ export default function EmployeeWizard({ onCancel, onFinish, mode = "create", em
                       locationPostal: "",
                       location: "Head Office",
                       designation: "",
+                      designationId: "",
                       department: "",
                       enablePortal: false,
                       cppEnabled: true,
@@ -1168,7 +1171,8 @@ export default function EmployeeWizard({ onCancel, onFinish, mode = "create", em
                       onChange={(opt) => {
                         setForm((s) => ({
                           ...s,
-                          designation: opt?.label || ""
+                          designation: opt?.label || "",
+                          designationId: designations.find(desig => desig.title === opt?.value)?.id || ""
                         }));
                       }}
                       placeholder="Select Designation"
@@ -113,8 +113,9 @@ export default function TimesheetView() {
 
   const handleFileUpload = async (file) => {
     // Validate file type
-    if (!file.name.endsWith('.csv')) {
-      alert('Only CSV files are allowed');
+    const fileName = file.name.toLowerCase();
+    if (!fileName.endsWith('.csv') && !fileName.endsWith('.xlsx')) {
+      alert('Only CSV or XLSX files are allowed');
       return;
     }
 
@@ -122,7 +123,7 @@ export default function TimesheetView() {
     setUploadResult(null);
 
     try {
-      // Upload CSV file to backend
+      // Upload timesheet file to backend
       const result = await timesheetAPI.uploadCSV(file);
 
       setUploadResult(result);
@@ -183,7 +184,7 @@ export default function TimesheetView() {
       <div>
         <h2 className="text-xl font-semibold text-slate-900">Timesheet Management</h2>
         <p className="mt-1 text-sm text-slate-600">
-          Upload and manage employee timesheet files. Only CSV format is supported.
+          Upload and manage employee timesheet files. CSV and XLSX formats are supported.
         </p>
       </div>
 
@@ -202,7 +203,7 @@ export default function TimesheetView() {
         <input
           ref={fileInputRef}
           type="file"
-          accept=".csv"
+          accept=".csv,.xlsx"
           onChange={handleFileInput}
           className="hidden"
         />
@@ -228,7 +229,7 @@ export default function TimesheetView() {
 
           <p className="text-sm text-slate-600">or drag and drop</p>
           <p className="mt-2 text-xs text-slate-500">
-            CSV files only (max. 800x400px)
+            CSV or XLSX files only
           </p>
 
           {uploading && (
@@ -12,13 +12,14 @@ class APIError extends Error {
 }
 
 async function request(endpoint, options = {}) {
+  const { onResponse, ...fetchOptions } = options;
   const url = `${API_BASE_URL}${endpoint}`;
   const config = {
     headers: {
       'Content-Type': 'application/json',
-      ...options.headers,
+      ...fetchOptions.headers,
     },
-    ...options,
+    ...fetchOptions,
   };
 
   try {
@@ -39,6 +40,11 @@ async function request(endpoint, options = {}) {
       );
     }
 
+    // Let callers read response headers
+    if (onResponse) {
+      onResponse(response);
+    }
+
     // Handle 204 No Content
     if (response.status === 204) {
       return null;
@@ -58,6 +64,18 @@ async function request(endpoint, options = {}) {
   }
 }
 
+// Fetch a list page whose next-page cursor is sent in the X-Next-Cursor header
+async function requestPage(endpoint, options = {}) {
+  let nextCursor = null;
+  const entries = await request(endpoint, {
+    ...options,
+    onResponse: (response) => {
+      nextCursor = response.headers.get('X-Next-Cursor');
+    },
+  });
+  return { entries, nextCursor };
+}
+
 // Employee API endpoints
 export const employeeAPI = {
   /**
@@ -73,8 +91,9 @@ export const employeeAPI = {
 
   /**
    * Get all employees with optional filtering and pagination
-   * @param {Object} params - Query parameters
-   * @returns {Promise<Object>} List of employees with pagination info
+   * @param {Object} params - Query parameters (page or cursor, page_size, status, search, ...);
+   *   pass a response's next_cursor as cursor to read the following page
+   * @returns {Promise<Object>} List of employees with pagination info and next_cursor
    */
   getAll: (params = {}) => {
     const queryString = new URLSearchParams(
@@ -133,6 +152,98 @@ export const employeeAPI = {
     request(`/api/v1/employees/${employeeId}/status?status=${status}`, {
       method: 'PATCH',
     }),
+
+  /**
+   * Apply one patch to many employees
+   * @param {Object} payload - employee_ids and/or filter, plus set and/or multiply
+   *   (e.g. { filter: { department_id }, multiply: { annual_salary: 1.03 }, reason })
+   * @returns {Promise<Object>} audit_id, matched_count and modified_count
+   */
+  bulkUpdate: (payload) =>
+    request('/api/v1/employees/bulk', {
+      method: 'PATCH',
+      body: JSON.stringify(payload),
+    }),
+
+  /**
+   * Create employees in bulk from a CSV or XLSX file
+   * @param {File} file - CSV or XLSX file with EmployeeCreate columns
+   * @returns {Promise<Object>} Import job summary with the first rejected rows
+   */
+  importFile: async (file) => {
+    const formData = new FormData();
+    formData.append('file', file);
+
+    const response = await fetch(`${API_BASE_URL}/api/v1/employees/import`, {
+      method: 'POST',
+      body: formData,
+    });
+
+    if (!response.ok) {
+      let errorData;
+      try {
+        errorData = await response.json();
+      } catch {
+        errorData = { detail: response.statusText };
+      }
+      throw new APIError(
+        errorData.detail || errorData.message || 'Import failed',
+        response.status,
+        errorData
+      );
+    }
+
+    return await response.json();
+  },
+
+  /**
+   * Get an employee import job summary
+   * @param {string} jobId - Import job ID
+   * @returns {Promise<Object>} Import job summary
+   */
+  getImport: (jobId) => request(`/api/v1/employees/import/${jobId}`),
+
+  /**
+   * Get the per-row results of an employee import job
+   * @param {string} jobId - Import job ID
+   * @param {Object} params - created (true/false), limit, cursor
+   * @returns {Promise<Object>} Row results and next_cursor
+   */
+  getImportRows: (jobId, params = {}) => {
+    const queryString = new URLSearchParams(
+      Object.entries(params).filter(([_, v]) => v != null)
+    ).toString();
+    return request(`/api/v1/employees/import/${jobId}/rows${queryString ? `?${queryString}` : ''}`);
+  },
+
+  /**
+   * Download employees as a CSV or XLSX file
+   * @param {Object} params - format (csv, xlsx), status, department_id, work_location_id, worker_category, search
+   * @returns {Promise<Blob>} Export file blob
+   */
+  exportFile: async (params = {}) => {
+    const queryString = new URLSearchParams(
+      Object.entries(params).filter(([_, v]) => v != null)
+    ).toString();
+    const url = `${API_BASE_URL}/api/v1/employees/export${queryString ? `?${queryString}` : ''}`;
+    const response = await fetch(url);
+
+    if (!response.ok) {
+      let errorData;
+      try {
+        errorData = await response.json();
+      } catch {
+        errorData = { detail: response.statusText };
+      }
+      throw new APIError(
+        errorData.detail || errorData.message || 'Export failed',
+        response.status,
+        errorData
+      );
+    }
+
+    return await response.blob();
+  },
 };
 
 // Dashboard API endpoints
@@ -400,15 +511,22 @@ export const organizationAPI = {
 // Timesheet API endpoints
 export const timesheetAPI = {
   /**
-   * Upload CSV timesheet file
-   * @param {File} file - CSV file to upload
-   * @returns {Promise<Object>} Upload response with created entries summary
+   * Upload CSV or XLSX timesheet file
+   * @param {File} file - CSV or XLSX file to upload
+   * @param {boolean} force - Reprocess the file even if it was uploaded before
+   * @param {boolean} dryRun - Validate the file without saving anything
+   * @returns {Promise<Object>} Upload response with created entries summary,
+   *   or a validation report when dryRun is set
    */
-  uploadCSV: async (file) => {
+  uploadCSV: async (file, force = false, dryRun = false) => {
     const formData = new FormData();
     formData.append('file', file);
 
-    const response = await fetch(`${API_BASE_URL}/api/v1/timesheets/upload`, {
+    const params = new URLSearchParams();
+    if (force) params.append('force', 'true');
+    if (dryRun) params.append('dry_run', 'true');
+    const query = params.toString() ? `?${params.toString()}` : '';
+    const response = await fetch(`${API_BASE_URL}/api/v1/timesheets/upload${query}`, {
       method: 'POST',
       body: formData,
     });
@@ -467,6 +585,37 @@ export const timesheetAPI = {
     return request(endpoint);
   },
 
+  /**
+   * Get hours and entry counts per day and department for a month
+   * @param {number} year - Calendar year
+   * @param {number} month - Calendar month (1-12)
+   * @returns {Promise<Object>} Month calendar with days, departments and totals
+   */
+  getCalendar: (year, month) =>
+    request(`/api/v1/timesheets/calendar?year=${year}&month=${month}`),
+
+  /**
+   * Get statutory holidays for a year
+   * @param {number} year - Calendar year
+   * @param {string} province - Optional province code; all provinces if omitted
+   * @returns {Promise<Object>} Holidays keyed by province code
+   */
+  getHolidays: (year, province = null) => {
+    const query = province ? `&province=${encodeURIComponent(province)}` : '';
+    return request(`/api/v1/timesheets/holidays?year=${year}${query}`);
+  },
+
+  /**
+   * Create draft statutory holiday entries for eligible employees
+   * @param {Object} data - start_date, end_date, optional employee_ids, hours and dry_run
+   * @returns {Promise<Object>} Counts of entries created and skipped
+   */
+  generateHolidayEntries: (data) =>
+    request('/api/v1/timesheets/holidays/generate', {
+      method: 'POST',
+      body: JSON.stringify(data),
+    }),
+
   /**
    * Get a single time entry by ID
    * @param {string} entryId - Time entry ID
@@ -501,7 +650,7 @@ export const timesheetAPI = {
    * @param {string} employeeId - Employee ID
    * @param {string} startDate - Period start date (YYYY-MM-DD)
    * @param {string} endDate - Period end date (YYYY-MM-DD)
-   * @returns {Promise<Object>} Summary with hours and entries
+   * @returns {Promise<Object>} Summary with hour totals and status breakdown
    */
   getEmployeeSummary: (employeeId, startDate, endDate) => {
     const params = new URLSearchParams({
@@ -511,6 +660,24 @@ export const timesheetAPI = {
     return request(`/api/v1/timesheets/summary/${employeeId}?${params}`);
   },
 
+  /**
+   * Get one page of the time entries behind an employee's summary
+   * @param {string} employeeId - Employee ID
+   * @param {string} startDate - Period start date (YYYY-MM-DD)
+   * @param {string} endDate - Period end date (YYYY-MM-DD)
+   * @param {Object} params - Optional { limit, cursor } (pass the previous page's nextCursor as cursor)
+   * @returns {Promise<Object>} { entries, nextCursor }: time entries, newest first, and the
+   *   cursor of the following page (null on the last page)
+   */
+  getEmployeeSummaryEntries: (employeeId, startDate, endDate, params = {}) => {
+    const queryString = new URLSearchParams({
+      start_date: startDate,
+      end_date: endDate,
+      ...Object.fromEntries(Object.entries(params).filter(([_, v]) => v != null)),
+    }).toString();
+    return requestPage(`/api/v1/timesheets/summary/${employeeId}/entries?${queryString}`);
+  },
+
   /**
    * Approve multiple time entries
    * @param {Array<string>} entryIds - Array of time entry IDs
@@ -550,11 +717,27 @@ export const timesheetAPI = {
    */
   getUploadById: (uploadId) => request(`/api/v1/timesheets/uploads/${uploadId}`),
 
+  /**
+   * Get one page of the rows that failed in a file upload
+   * @param {string} uploadId - File upload ID
+   * @param {Object} params - Optional { limit, cursor, error_class }
+   * @returns {Promise<Object>} { errors, next_cursor }
+   */
+  getUploadErrors: (uploadId, params = {}) => {
+    const queryString = new URLSearchParams(
+      Object.entries(params).filter(([_, v]) => v != null)
+    ).toString();
+    const endpoint = queryString
+      ? `/api/v1/timesheets/uploads/${uploadId}/errors?${queryString}`
+      : `/api/v1/timesheets/uploads/${uploadId}/errors`;
+    return request(endpoint);
+  },
+
   /**
    * Delete a file upload record
    * @param {string} uploadId - File upload ID
    * @param {boolean} deleteEntries - If true, also delete associated time entries
-   * @returns {Promise<null>} No content on success
+   * @returns {Promise<Object>} { file_upload_id, requested_count, deleted_count }
    */
   deleteUpload: (uploadId, deleteEntries = false) => {
     const params = deleteEntries ? '?delete_entries=true' : '';
@@ -65,6 +65,8 @@ export function mapWizardDataToEmployeeCreate(wizardData) {
 
     // Job details
     job_title: form.designation?.trim() || null,
+    designation_id: form.designationId || null,
+    designation_name: form.designation?.trim() || null,
     department_id: form.department?.trim() || null,
     department_name: form.departmentName?.trim() || null,
 